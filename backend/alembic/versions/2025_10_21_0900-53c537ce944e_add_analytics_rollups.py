@@ -0,0 +1,107 @@
+"""add_analytics_rollups
+
+Revision ID: 53c537ce944e
+Revises: 8df303f4dfbe
+Create Date: 2025-10-21 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '53c537ce944e'
+down_revision: Union[str, None] = '8df303f4dfbe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ROLLUP_COLUMNS = """
+    business_id, platform, period_type, period_start, period_end,
+    total_posts, total_likes, total_comments, total_shares,
+    total_impressions, total_reach, total_clicks,
+    avg_engagement_rate, avg_impressions, follower_growth,
+    best_post_id, best_post_engagement_rate, created_at
+"""
+
+
+def _rate(engagement: str, impressions: str) -> str:
+    """Engagement rate (percent) clamped to Numeric(5, 2)."""
+    return (
+        f"CASE WHEN {impressions} > 0 "
+        f"THEN LEAST(ROUND({engagement} * 100.0 / {impressions}, 2), 999.99) ELSE 0 END"
+    )
+
+
+def upgrade() -> None:
+    """
+    Add the lookup index for analytics rollups and backfill them.
+
+    Daily rollups (one row per business, platform and publish day, built from
+    the latest analytics row of each post) are maintained incrementally by
+    AnalyticsRollupService from now on; weekly and monthly rollups are
+    derived from them.
+    """
+    # Used by: rollup refresh (delete/insert) and every dashboard read
+    op.create_index(
+        'idx_analytics_summaries_rollup',
+        'analytics_summaries',
+        ['business_id', 'period_type', 'period_start'],
+        unique=False
+    )
+
+    # Backfill daily rollups
+    daily_engagement = "SUM(latest.likes_count + latest.comments_count + latest.shares_count)"
+    op.execute(sa.text(f"""
+        INSERT INTO analytics_summaries ({ROLLUP_COLUMNS})
+        SELECT
+            latest.business_id, latest.platform, 'daily', latest.day, latest.day,
+            COUNT(*), SUM(latest.likes_count), SUM(latest.comments_count), SUM(latest.shares_count),
+            SUM(latest.impressions), SUM(latest.reach), SUM(latest.clicks),
+            {_rate(daily_engagement, "SUM(latest.impressions)")},
+            ROUND(SUM(latest.impressions) * 1.0 / COUNT(*))::integer, 0,
+            (ARRAY_AGG(latest.published_post_id ORDER BY latest.engagement_rate DESC))[1],
+            MAX(latest.engagement_rate), NOW()
+        FROM (
+            SELECT DISTINCT ON (pa.published_post_id)
+                pa.business_id, pa.published_post_id, pa.platform,
+                pa.likes_count, pa.comments_count, pa.shares_count,
+                pa.impressions, pa.reach, pa.clicks, pa.engagement_rate,
+                pp.published_at::date AS day
+            FROM post_analytics pa
+            JOIN published_posts pp ON pp.id = pa.published_post_id
+            WHERE pp.published_at IS NOT NULL
+            ORDER BY pa.published_post_id, pa.fetched_at DESC
+        ) AS latest
+        GROUP BY latest.business_id, latest.platform, latest.day
+    """))
+
+    # Backfill weekly and monthly rollups from the dailies
+    period_engagement = "SUM(total_likes + total_comments + total_shares)"
+    for period_type, unit in (('weekly', 'week'), ('monthly', 'month')):
+        op.execute(sa.text(f"""
+            INSERT INTO analytics_summaries ({ROLLUP_COLUMNS})
+            SELECT
+                business_id, platform, '{period_type}',
+                date_trunc('{unit}', period_start)::date,
+                (date_trunc('{unit}', period_start) + INTERVAL '1 {unit}' - INTERVAL '1 day')::date,
+                SUM(total_posts), SUM(total_likes), SUM(total_comments), SUM(total_shares),
+                SUM(total_impressions), SUM(total_reach), SUM(total_clicks),
+                {_rate(period_engagement, "SUM(total_impressions)")},
+                ROUND(SUM(total_impressions) * 1.0 / NULLIF(SUM(total_posts), 0))::integer, 0,
+                (ARRAY_AGG(best_post_id ORDER BY best_post_engagement_rate DESC NULLS LAST))[1],
+                MAX(best_post_engagement_rate), NOW()
+            FROM analytics_summaries
+            WHERE period_type = 'daily' AND platform != 'all'
+            GROUP BY business_id, platform, date_trunc('{unit}', period_start)
+        """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text(
+        "DELETE FROM analytics_summaries "
+        "WHERE platform != 'all' AND period_type IN ('daily', 'weekly', 'monthly')"
+    ))
+    op.drop_index('idx_analytics_summaries_rollup', table_name='analytics_summaries')
@@ -0,0 +1,94 @@
+"""add_post_analytics_snapshots
+
+Revision ID: 35c0527de08b
+Revises: 53c537ce944e
+Create Date: 2025-10-21 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '35c0527de08b'
+down_revision: Union[str, None] = '53c537ce944e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SNAPSHOT_COLUMNS = """
+    published_post_id, business_id, platform,
+    likes_count, comments_count, shares_count, reactions_count, retweets_count, quote_tweets_count,
+    impressions, reach, clicks, video_views, video_watch_time,
+    engagement_rate, click_through_rate,
+    fetched_at, platform_post_id, platform_post_url, created_at
+"""
+
+
+def upgrade() -> None:
+    """
+    Add post_analytics_snapshots: the latest analytics of each post.
+
+    post_analytics stays the append-only fetch history; the analytics sync
+    upserts the snapshot of every post it fetches from now on.
+    """
+    op.create_table(
+        'post_analytics_snapshots',
+        sa.Column('published_post_id', sa.Integer(), nullable=False),
+        sa.Column('business_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+
+        # Engagement Metrics
+        sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('comments_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shares_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('reactions_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('retweets_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('quote_tweets_count', sa.Integer(), nullable=False, server_default='0'),
+
+        # Reach Metrics
+        sa.Column('impressions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('reach', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('clicks', sa.Integer(), nullable=False, server_default='0'),
+
+        # Video Metrics
+        sa.Column('video_views', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('video_watch_time', sa.Integer(), nullable=False, server_default='0'),
+
+        # Calculated Metrics
+        sa.Column('engagement_rate', sa.Numeric(precision=5, scale=2), nullable=False, server_default='0.0'),
+        sa.Column('click_through_rate', sa.Numeric(precision=5, scale=2), nullable=False, server_default='0.0'),
+
+        # Metadata
+        sa.Column('fetched_at', sa.TIMESTAMP(), nullable=False),
+        sa.Column('platform_post_id', sa.String(length=255), nullable=True),
+        sa.Column('platform_post_url', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+
+        sa.PrimaryKeyConstraint('published_post_id'),
+        sa.ForeignKeyConstraint(['published_post_id'], ['published_posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ondelete='CASCADE'),
+    )
+
+    # Used by: dashboard top posts, posting times and rollup refreshes
+    op.create_index(
+        'idx_post_analytics_snapshots_business_platform',
+        'post_analytics_snapshots',
+        ['business_id', 'platform']
+    )
+
+    # Backfill from the latest history row of each post
+    op.execute(sa.text(f"""
+        INSERT INTO post_analytics_snapshots ({SNAPSHOT_COLUMNS})
+        SELECT DISTINCT ON (published_post_id) {SNAPSHOT_COLUMNS}
+        FROM post_analytics
+        ORDER BY published_post_id, fetched_at DESC
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_post_analytics_snapshots_business_platform', table_name='post_analytics_snapshots')
+    op.drop_table('post_analytics_snapshots')
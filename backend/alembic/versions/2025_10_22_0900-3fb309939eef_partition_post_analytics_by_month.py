@@ -0,0 +1,161 @@
+"""partition_post_analytics_by_month
+
+Revision ID: 3fb309939eef
+Revises: 35c0527de08b
+Create Date: 2025-10-22 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3fb309939eef'
+down_revision: Union[str, None] = '35c0527de08b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = """
+    id, published_post_id, business_id, platform,
+    likes_count, comments_count, shares_count, reactions_count, retweets_count, quote_tweets_count,
+    impressions, reach, clicks, video_views, video_watch_time,
+    engagement_rate, click_through_rate,
+    fetched_at, platform_post_id, platform_post_url, created_at, updated_at
+"""
+
+OLD_INDEXES = [
+    'ix_post_analytics_id',
+    'ix_post_analytics_post_id',
+    'ix_post_analytics_business_id',
+    'ix_post_analytics_platform',
+    'ix_post_analytics_fetched_at',
+]
+
+# Partitions are created this many months past the current one; the
+# maintain_post_analytics task keeps extending them
+MONTHS_AHEAD = 2
+
+
+def _create_table(name: str, partitioned: bool) -> None:
+    """Create a post_analytics table (the primary key includes fetched_at when partitioned)."""
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=False),  # default set from the shared sequence
+        sa.Column('published_post_id', sa.Integer(), nullable=False),
+        sa.Column('business_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(length=20), nullable=False),
+
+        # Engagement Metrics
+        sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('comments_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shares_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('reactions_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('retweets_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('quote_tweets_count', sa.Integer(), nullable=False, server_default='0'),
+
+        # Reach Metrics
+        sa.Column('impressions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('reach', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('clicks', sa.Integer(), nullable=False, server_default='0'),
+
+        # Video Metrics
+        sa.Column('video_views', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('video_watch_time', sa.Integer(), nullable=False, server_default='0'),
+
+        # Calculated Metrics
+        sa.Column('engagement_rate', sa.Numeric(precision=5, scale=2), nullable=False, server_default='0.0'),
+        sa.Column('click_through_rate', sa.Numeric(precision=5, scale=2), nullable=False, server_default='0.0'),
+
+        # Metadata
+        sa.Column('fetched_at', sa.TIMESTAMP(), nullable=False),
+        sa.Column('platform_post_id', sa.String(length=255), nullable=True),
+        sa.Column('platform_post_url', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+
+        sa.PrimaryKeyConstraint('id', 'fetched_at') if partitioned else sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['published_post_id'], ['published_posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ondelete='CASCADE'),
+        **({'postgresql_partition_by': 'RANGE (fetched_at)'} if partitioned else {})
+    )
+
+
+def upgrade() -> None:
+    """
+    Convert post_analytics into a table range-partitioned by month on
+    fetched_at.
+
+    Range scans on fetched_at only touch the months they cover, and the
+    retention job can drop or downsample old months without bloating the
+    recent ones. The primary key becomes (id, fetched_at) because a
+    partitioned table's unique constraints must include the partition key;
+    id values keep coming from the same sequence.
+    """
+    # Move the existing table out of the way
+    for index_name in OLD_INDEXES:
+        op.drop_index(index_name, table_name='post_analytics')
+    op.rename_table('post_analytics', 'post_analytics_unpartitioned')
+    op.execute("ALTER TABLE post_analytics_unpartitioned RENAME CONSTRAINT post_analytics_pkey TO post_analytics_unpartitioned_pkey")
+
+    _create_table('post_analytics', partitioned=True)
+
+    # Keep using the existing id sequence
+    op.execute("ALTER TABLE post_analytics ALTER COLUMN id SET DEFAULT nextval('post_analytics_id_seq')")
+    op.execute("ALTER SEQUENCE post_analytics_id_seq OWNED BY post_analytics.id")
+
+    # One partition per month from the oldest row to MONTHS_AHEAD months
+    # from now, plus a default partition as a safety net
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month_start date;
+            last_month date := (date_trunc('month', NOW()) + INTERVAL '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            SELECT COALESCE(date_trunc('month', MIN(fetched_at)), date_trunc('month', NOW()))::date
+            INTO month_start
+            FROM post_analytics_unpartitioned;
+
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF post_analytics FOR VALUES FROM (%L) TO (%L)',
+                    'post_analytics_' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    (month_start + INTERVAL '1 month')::date
+                );
+                month_start := (month_start + INTERVAL '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+    op.execute("CREATE TABLE post_analytics_default PARTITION OF post_analytics DEFAULT")
+
+    op.execute(f"INSERT INTO post_analytics ({COLUMNS}) SELECT {COLUMNS} FROM post_analytics_unpartitioned")
+    op.drop_table('post_analytics_unpartitioned')
+
+    # Indexes on the parent are created on every partition
+    op.create_index('ix_post_analytics_business_fetched_at', 'post_analytics', ['business_id', 'fetched_at'])
+    op.create_index('ix_post_analytics_post_fetched_at', 'post_analytics', ['published_post_id', 'fetched_at'])
+    op.create_index('ix_post_analytics_platform', 'post_analytics', ['platform'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_analytics_platform', table_name='post_analytics')
+    op.drop_index('ix_post_analytics_post_fetched_at', table_name='post_analytics')
+    op.drop_index('ix_post_analytics_business_fetched_at', table_name='post_analytics')
+    op.rename_table('post_analytics', 'post_analytics_partitioned')
+    op.execute("ALTER TABLE post_analytics_partitioned RENAME CONSTRAINT post_analytics_pkey TO post_analytics_partitioned_pkey")
+
+    _create_table('post_analytics', partitioned=False)
+    op.execute("ALTER TABLE post_analytics ALTER COLUMN id SET DEFAULT nextval('post_analytics_id_seq')")
+    op.execute("ALTER SEQUENCE post_analytics_id_seq OWNED BY post_analytics.id")
+
+    op.execute(f"INSERT INTO post_analytics ({COLUMNS}) SELECT {COLUMNS} FROM post_analytics_partitioned")
+    op.drop_table('post_analytics_partitioned')  # drops every partition
+
+    op.create_index('ix_post_analytics_id', 'post_analytics', ['id'])
+    op.create_index('ix_post_analytics_post_id', 'post_analytics', ['published_post_id'])
+    op.create_index('ix_post_analytics_business_id', 'post_analytics', ['business_id'])
+    op.create_index('ix_post_analytics_platform', 'post_analytics', ['platform'])
+    op.create_index('ix_post_analytics_fetched_at', 'post_analytics', ['fetched_at'])
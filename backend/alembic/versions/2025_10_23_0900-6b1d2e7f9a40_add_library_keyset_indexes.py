@@ -0,0 +1,49 @@
+"""add_library_keyset_indexes
+
+Revision ID: 6b1d2e7f9a40
+Revises: 3fb309939eef
+Create Date: 2025-10-23 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1d2e7f9a40'
+down_revision: Union[str, None] = '3fb309939eef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Index the content library in listing order.
+
+    The library lists saved content and published posts together, newest
+    saved first (COALESCE(library_saved_at, created_at) DESC, id DESC).
+    With these partial indexes each side of the UNION ALL is an ordered
+    index scan, so a page reads page_size rows per table instead of the
+    whole library.
+    """
+    op.create_index(
+        'ix_content_library_keyset',
+        'content',
+        ['business_id', sa.text('COALESCE(library_saved_at, created_at) DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('saved_to_library')
+    )
+    op.create_index(
+        'ix_published_posts_library_keyset',
+        'published_posts',
+        ['business_id', sa.text('COALESCE(library_saved_at, created_at) DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('saved_to_library')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_published_posts_library_keyset', table_name='published_posts')
+    op.drop_index('ix_content_library_keyset', table_name='content')
@@ -0,0 +1,67 @@
+"""add_text_search_indexes
+
+Revision ID: 9c4e5a1b7d23
+Revises: 6b1d2e7f9a40
+Create Date: 2025-10-23 10:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e5a1b7d23'
+down_revision: Union[str, None] = '6b1d2e7f9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Index post text for full-text search and image filenames for trigram search.
+
+    1. content.search_vector: generated tsvector of text + hashtags, GIN indexed
+    2. published_posts.search_vector: generated tsvector of content_text, GIN indexed
+    3. images.original_filename: pg_trgm GIN index (ILIKE '%term%' and similarity)
+
+    Adding a stored generated column rewrites the table; run during a quiet
+    period on large installations.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('content', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(text, '') || ' ' || coalesce(hashtags, ''))", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_content_search_vector', 'content', ['search_vector'], unique=False, postgresql_using='gin')
+
+    op.add_column('published_posts', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', content_text)", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_published_posts_search_vector', 'published_posts', ['search_vector'], unique=False, postgresql_using='gin')
+
+    op.create_index(
+        'ix_images_original_filename_trgm',
+        'images',
+        ['original_filename'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'original_filename': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    # pg_trgm is left installed: other objects may depend on it
+    op.drop_index('ix_images_original_filename_trgm', table_name='images')
+    op.drop_index('ix_published_posts_search_vector', table_name='published_posts')
+    op.drop_column('published_posts', 'search_vector')
+    op.drop_index('ix_content_search_vector', table_name='content')
+    op.drop_column('content', 'search_vector')
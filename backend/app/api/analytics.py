@@ -2,14 +2,25 @@
 Analytics API endpoints - Session 13: Comprehensive Analytics & Insights
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import Dict, List, Any, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime, date, timedelta
 from io import StringIO
+import asyncio
 import csv
 
-from app.db.database import get_db
+from app.db.database import get_async_db, new_async_session, SessionLocal
+from app.db.replicas import get_async_read_db, async_read_session
 from app.core.auth import get_current_user
+from app.core.query_cache import (
+    analytics_cache,
+    ainvalidate_business_cache,
+    abusiness_data_version,
+    business_tag,
+    family_tag,
+    versioned_cache_key,
+)
 from app.services.analytics_aggregator import AnalyticsAggregator
 from app.models.business import Business
 from app.schemas.analytics import (
@@ -28,6 +39,49 @@ from app.schemas.analytics import (
 router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
 
 
+async def _cached_analytics(
+    family: str,
+    business_id: int,
+    params: Dict[str, Any],
+    compute: Callable[[AnalyticsAggregator], Any]
+) -> Any:
+    """
+    Serve an analytics response through analytics_cache.
+    
+    The key includes the business's data version, which the analytics sync
+    and the publishing routes bump on every write, so a response computed
+    before a write is never served after it. Cache fills therefore read
+    from the primary: a lagging replica could return pre-write data that
+    would then be cached under the new version for the whole TTL. Only
+    uncached responses (Redis unavailable) are computed on a replica
+    (see app.db.replicas). Either way the computation uses its own session
+    because a stale entry may be refreshed after the request ended.
+    
+    Args:
+        family: Endpoint name (cache key family and tag)
+        business_id: Business ID
+        params: Request parameters the response depends on
+        compute: Function producing the response from an aggregator (runs
+                 on the session's connection via run_sync)
+    
+    Returns:
+        Cached or freshly computed response
+    """
+    async def run(new_session=new_async_session):
+        async with new_session() as db:
+            return await db.run_sync(lambda session: compute(AnalyticsAggregator(session)))
+    
+    version = await abusiness_data_version(business_id)
+    if version is None:
+        return await run(async_read_session)
+    
+    # Default date ranges are relative to today
+    key = versioned_cache_key(family, business_id, version, {**params, "today": date.today()})
+    return await analytics_cache.aget_or_compute(
+        key, run, tags=[business_tag(business_id), family_tag(family)]
+    )
+
+
 # ===============================================================================
 # MAIN ANALYTICS ENDPOINTS
 # ===============================================================================
@@ -38,7 +92,7 @@ async def get_analytics_overview(
     start_date: Optional[date] = Query(None, description="Start date (default: 30 days ago)"),
     end_date: Optional[date] = Query(None, description="End date (default: today)"),
     platform: str = Query("all", description="Platform filter (linkedin, twitter, facebook, instagram, all)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -52,30 +106,34 @@ async def get_analytics_overview(
         - Best posting times (days and hours)
     """
     # Verify business belongs to user
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Use aggregator to fetch comprehensive data
-    aggregator = AnalyticsAggregator(db)
-    overview = await aggregator.get_overview(
-        business_id=business_id,
-        start_date=start_date,
-        end_date=end_date,
-        platform=platform if platform != "all" else None
+    return await _cached_analytics(
+        "overview",
+        business_id,
+        {"start_date": start_date, "end_date": end_date, "platform": platform},
+        lambda aggregator: aggregator.get_overview(
+            business_id=business_id,
+            start_date=start_date,
+            end_date=end_date,
+            platform=platform if platform != "all" else None
+        )
     )
-    
-    return overview
 
 
 @router.get("/posts/{post_id}", response_model=PostAnalyticsResponse)
 async def get_post_analytics(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -88,22 +146,25 @@ async def get_post_analytics(
         - Calculated metrics (engagement rate, CTR)
         - Post content preview
     """
-    aggregator = AnalyticsAggregator(db)
-    analytics = await aggregator.get_post_analytics(post_id)
+    analytics = await db.run_sync(
+        lambda session: AnalyticsAggregator(session).get_post_analytics(post_id)
+    )
     
     if not analytics:
         raise HTTPException(status_code=404, detail="Post analytics not found")
     
     # Verify post belongs to user's business
     from app.models.published_post import PublishedPost
-    post = db.query(PublishedPost).filter(PublishedPost.id == post_id).first()
+    post = await db.get(PublishedPost, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    business = db.query(Business).filter(
-        Business.id == post.business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == post.business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -118,7 +179,7 @@ async def get_engagement_trends(
     end_date: Optional[date] = Query(None, description="End date (default: today)"),
     platform: Optional[str] = Query(None, description="Platform filter"),
     period: str = Query("daily", description="Period: daily, weekly, monthly"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -132,24 +193,29 @@ async def get_engagement_trends(
         - total_impressions: Total impressions
     """
     # Verify business belongs to user
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    # Get overview which includes trends
-    aggregator = AnalyticsAggregator(db)
-    overview = await aggregator.get_overview(
-        business_id=business_id,
-        start_date=start_date,
-        end_date=end_date,
-        platform=platform
+    # Trends are read from the daily/weekly/monthly rollups
+    return await _cached_analytics(
+        "trends",
+        business_id,
+        {"start_date": start_date, "end_date": end_date, "platform": platform, "period": period},
+        lambda aggregator: aggregator.get_trends(
+            business_id=business_id,
+            start_date=start_date,
+            end_date=end_date,
+            platform=platform,
+            period=period
+        )
     )
-    
-    return overview.get("trends", [])
 
 
 @router.get("/platform-comparison", response_model=PlatformComparison)
@@ -157,7 +223,7 @@ async def get_platform_comparison(
     business_id: int = Query(..., description="Business ID"),
     start_date: Optional[date] = Query(None, description="Start date (default: 30 days ago)"),
     end_date: Optional[date] = Query(None, description="End date (default: today)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -169,22 +235,26 @@ async def get_platform_comparison(
         - insights: AI-generated insights about platform performance
     """
     # Verify business belongs to user
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    aggregator = AnalyticsAggregator(db)
-    comparison = await aggregator.get_platform_comparison(
-        business_id=business_id,
-        start_date=start_date,
-        end_date=end_date
+    return await _cached_analytics(
+        "platform_comparison",
+        business_id,
+        {"start_date": start_date, "end_date": end_date},
+        lambda aggregator: aggregator.get_platform_comparison(
+            business_id=business_id,
+            start_date=start_date,
+            end_date=end_date
+        )
     )
-    
-    return comparison
 
 
 @router.get("/best-times", response_model=BestTimesToPost)
@@ -192,7 +262,7 @@ async def get_best_posting_times(
     business_id: int = Query(..., description="Business ID"),
     platform: Optional[str] = Query(None, description="Platform filter"),
     days: int = Query(30, ge=7, le=90, description="Number of days to analyze"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -204,22 +274,26 @@ async def get_best_posting_times(
         - recommendations: Top 3 recommended posting times
     """
     # Verify business belongs to user
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    aggregator = AnalyticsAggregator(db)
-    best_times = await aggregator.get_best_times(
-        business_id=business_id,
-        platform=platform,
-        days=days
+    return await _cached_analytics(
+        "best_times",
+        business_id,
+        {"platform": platform, "days": days},
+        lambda aggregator: aggregator.get_best_times(
+            business_id=business_id,
+            platform=platform,
+            days=days
+        )
     )
-    
-    return best_times
 
 
 @router.get("/top-posts", response_model=List[TopPost])
@@ -230,7 +304,7 @@ async def get_top_performing_posts(
     platform: Optional[str] = Query(None, description="Platform filter"),
     metric: str = Query("engagement_rate", description="Sort by: engagement_rate, likes_count, impressions, total_engagement"),
     limit: int = Query(10, ge=1, le=50, description="Number of posts to return"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -243,24 +317,32 @@ async def get_top_performing_posts(
         - Published date
     """
     # Verify business belongs to user
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Get overview which includes top posts
-    aggregator = AnalyticsAggregator(db)
-    overview = await aggregator.get_overview(
-        business_id=business_id,
-        start_date=start_date,
-        end_date=end_date,
-        platform=platform
-    )
+    def top_posts(aggregator: AnalyticsAggregator):
+        overview = aggregator.get_overview(
+            business_id=business_id,
+            start_date=start_date,
+            end_date=end_date,
+            platform=platform
+        )
+        return overview.get("top_posts", [])[:limit]
     
-    return overview.get("top_posts", [])[:limit]
+    return await _cached_analytics(
+        "top_posts",
+        business_id,
+        {"start_date": start_date, "end_date": end_date, "platform": platform, "metric": metric, "limit": limit},
+        top_posts
+    )
 
 
 # ===============================================================================
@@ -270,7 +352,7 @@ async def get_top_performing_posts(
 @router.post("/refresh", response_model=AnalyticsRefreshResponse)
 async def refresh_analytics(
     request: AnalyticsRefreshRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -291,25 +373,41 @@ async def refresh_analytics(
         - Error messages (if any)
     """
     # Verify business belongs to user
-    business = db.query(Business).filter(
-        Business.id == request.business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == request.business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Initialize analytics sync service
     from app.services.platform_fetchers.analytics_sync_service import AnalyticsSyncService
-    sync_service = AnalyticsSyncService(db)
+    from app.services.platform_fetchers.http_transport import get_shared_transport
+    
+    def sync_business_analytics():
+        # The platform fetchers make blocking HTTP calls, so the sync runs on
+        # a worker thread with its own session instead of on the event loop
+        sync_db = SessionLocal()
+        try:
+            sync_service = AnalyticsSyncService(sync_db, transport=get_shared_transport())
+            return sync_service.sync_business_analytics(
+                business_id=request.business_id,
+                platforms=request.platforms,
+                limit=request.limit
+            )
+        finally:
+            sync_db.close()
     
     try:
         # Sync analytics from platforms
-        sync_results = sync_service.sync_business_analytics(
-            business_id=request.business_id,
-            platforms=request.platforms,
-            limit=request.limit
-        )
+        sync_results = await asyncio.to_thread(sync_business_analytics)
+        
+        # Drop cached dashboards computed from the old metrics
+        if sync_results["synced"] > 0:
+            await ainvalidate_business_cache(request.business_id)
         
         # Determine status
         if sync_results["rate_limited"] > 0:
@@ -384,7 +482,7 @@ async def export_analytics(
     start_date: Optional[date] = Query(None, description="Start date"),
     end_date: Optional[date] = Query(None, description="End date"),
     format: str = Query("csv", description="Export format: csv or json"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -395,21 +493,24 @@ async def export_analytics(
     from fastapi.responses import StreamingResponse
     
     # Verify business belongs to user
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.user_id == current_user["sub"]
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == business_id,
+            Business.user_id == current_user["sub"]
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Get analytics data
-    aggregator = AnalyticsAggregator(db)
-    overview = await aggregator.get_overview(
-        business_id=business_id,
-        start_date=start_date,
-        end_date=end_date,
-        platform=None
+    overview = await db.run_sync(
+        lambda session: AnalyticsAggregator(session).get_overview(
+            business_id=business_id,
+            start_date=start_date,
+            end_date=end_date,
+            platform=None
+        )
     )
     
     if format == "csv":
@@ -465,7 +566,7 @@ async def export_analytics(
 async def get_analytics_overview_legacy(
     business_id: int,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -491,7 +592,7 @@ async def get_analytics_overview_legacy(
 async def get_content_performance_legacy(
     business_id: int,
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> List[Dict[str, Any]]:
     """
@@ -514,7 +615,7 @@ async def get_content_performance_legacy(
 async def get_platform_comparison_legacy(
     business_id: int,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -538,7 +639,7 @@ async def get_platform_comparison_legacy(
 async def get_engagement_trends_legacy(
     business_id: int,
     days: int = Query(30, ge=7, le=90),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> List[Dict[str, Any]]:
     """
@@ -563,7 +664,7 @@ async def get_engagement_trends_legacy(
 @router.get("/insights/{business_id}")
 async def get_ai_insights_legacy(
     business_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -611,7 +712,7 @@ async def get_ai_insights_legacy(
 @router.get("/sync-status/{business_id}")
 async def get_sync_status(
     business_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -625,7 +726,7 @@ async def get_sync_status(
     from app.services.oauth_meta import meta_oauth
     
     # Validate business exists and user has access
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = await db.get(Business, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
@@ -633,10 +734,12 @@ async def get_sync_status(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Get all social accounts for this business
-    social_accounts = db.query(SocialAccount).filter(
-        SocialAccount.business_id == business_id,
-        SocialAccount.is_active == True
-    ).all()
+    social_accounts = (await db.scalars(
+        select(SocialAccount).where(
+            SocialAccount.business_id == business_id,
+            SocialAccount.is_active == True
+        )
+    )).all()
     
     # Map platforms to their OAuth services
     oauth_services = {
@@ -700,7 +803,7 @@ async def get_sync_status(
 async def get_sync_history(
     business_id: int,
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -709,7 +812,7 @@ async def get_sync_history(
     Returns the last N sync operations with timestamps and results
     """
     # Validate business exists and user has access
-    business = db.query(Business).filter(Business.id == business_id).first()
+    business = await db.get(Business, business_id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
@@ -719,11 +822,13 @@ async def get_sync_history(
     # Get analytics summaries (which track sync operations)
     from app.models.analytics_summary import AnalyticsSummary
     
-    summaries = db.query(AnalyticsSummary).filter(
-        AnalyticsSummary.business_id == business_id
-    ).order_by(
-        AnalyticsSummary.created_at.desc()
-    ).limit(limit).all()
+    summaries = (await db.scalars(
+        select(AnalyticsSummary).where(
+            AnalyticsSummary.business_id == business_id
+        ).order_by(
+            AnalyticsSummary.created_at.desc()
+        ).limit(limit)
+    )).all()
     
     history = []
     for summary in summaries:
@@ -760,7 +865,7 @@ async def get_sync_history(
 @router.get("/sync-progress/{job_id}")
 async def get_sync_progress(
     job_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Dict = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -3,15 +3,20 @@ Content Library API Endpoints
 Save and reuse successful posts
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc
-from typing import Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import String, or_, and_, desc, func, literal_column, select, tuple_, union_all
+from typing import Optional, List, Tuple
 from datetime import datetime
+import base64
+import json
 
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.db.replicas import get_async_read_db
 from app.core.auth import get_current_user
 from app.models.content import Content
 from app.models.published_post import PublishedPost
+from app.services.text_search import text_match, text_rank
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/content-library", tags=["content-library"])
@@ -46,6 +51,7 @@ class LibraryListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
 
 
 class SaveToLibraryRequest(BaseModel):
@@ -104,15 +110,96 @@ def published_post_to_library_item(post: PublishedPost) -> LibraryItemBase:
     )
 
 
+def library_filters(business_id: int, platform: Optional[str] = None, search: Optional[str] = None):
+    """Where clauses selecting a business's saved content and saved posts"""
+    content_filters = [Content.business_id == business_id, Content.saved_to_library == True]
+    post_filters = [PublishedPost.business_id == business_id, PublishedPost.saved_to_library == True]
+    
+    if platform:
+        content_filters.append(Content.platform == platform)
+        post_filters.append(PublishedPost.platform == platform)
+    
+    if search:
+        content_filters.append(text_match(Content.search_vector, search))
+        post_filters.append(text_match(PublishedPost.search_vector, search))
+    
+    return content_filters, post_filters
+
+
+def library_keys_query(business_id: int, platform: Optional[str] = None, search: Optional[str] = None):
+    """
+    UNION ALL of the library's sort keys (source, id, saved_at, and rank
+    when searching)
+    
+    Both sides match the ix_*_library_keyset indexes, so ordering by
+    (saved_at, id, source) DESC with a LIMIT reads only one page per table.
+    Searches are narrowed by the search_vector GIN indexes first.
+    """
+    content_filters, post_filters = library_filters(business_id, platform, search)
+    
+    content_columns = [
+        literal_column("'content'", String).label("source"),
+        Content.id.label("id"),
+        func.coalesce(Content.library_saved_at, Content.created_at).label("saved_at")
+    ]
+    post_columns = [
+        literal_column("'published_post'", String).label("source"),
+        PublishedPost.id.label("id"),
+        func.coalesce(PublishedPost.library_saved_at, PublishedPost.created_at).label("saved_at")
+    ]
+    
+    if search:
+        content_columns.append(text_rank(Content.search_vector, search).label("rank"))
+        post_columns.append(text_rank(PublishedPost.search_vector, search).label("rank"))
+    
+    content_keys = select(*content_columns).where(*content_filters)
+    post_keys = select(*post_columns).where(*post_filters)
+    
+    return union_all(content_keys, post_keys).subquery("library_items")
+
+
+def library_count_query(business_id: int, platform: Optional[str] = None, search: Optional[str] = None):
+    """Total saved items as one round trip of two index-only counts"""
+    content_filters, post_filters = library_filters(business_id, platform, search)
+    
+    content_count = select(func.count(Content.id)).where(*content_filters).scalar_subquery()
+    post_count = select(func.count(PublishedPost.id)).where(*post_filters).scalar_subquery()
+    
+    return select(content_count + post_count)
+
+
+def encode_cursor(saved_at: datetime, item_id: int, source: str, rank: Optional[float] = None) -> str:
+    """Opaque cursor for the page after the given item (rank: search results)"""
+    key = [saved_at.isoformat(), item_id, source]
+    if rank is not None:
+        key.append(rank)
+    raw = json.dumps(key)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int, str, Optional[float]]:
+    """Parse a cursor from encode_cursor (400 if it is malformed)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+        if not isinstance(key, list) or len(key) not in (3, 4):
+            raise ValueError("Unexpected cursor")
+        saved_at, item_id, source = key[:3]
+        rank = float(key[3]) if len(key) == 4 else None
+        return datetime.fromisoformat(saved_at), int(item_id), str(source), rank
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 # ============================================
 # ENDPOINTS
 # ============================================
 
 @router.post("/save", response_model=SaveToLibraryResponse)
-def save_to_library(
+async def save_to_library(
     request: SaveToLibraryRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Save a content item or published post to the library
@@ -125,9 +212,7 @@ def save_to_library(
         
         if request.source == "content":
             # Find the content item
-            item = db.query(Content).filter(
-                Content.id == request.item_id
-            ).first()
+            item = await db.get(Content, request.item_id, options=[joinedload(Content.business)])
             
             if not item:
                 raise HTTPException(status_code=404, detail="Content not found")
@@ -139,8 +224,8 @@ def save_to_library(
             # Save to library
             item.saved_to_library = True
             item.library_saved_at = datetime.utcnow()
-            db.commit()
-            db.refresh(item)
+            await db.commit()
+            await db.refresh(item)
             
             return SaveToLibraryResponse(
                 success=True,
@@ -150,9 +235,7 @@ def save_to_library(
             
         elif request.source == "published_post":
             # Find the published post
-            item = db.query(PublishedPost).filter(
-                PublishedPost.id == request.item_id
-            ).first()
+            item = await db.get(PublishedPost, request.item_id, options=[joinedload(PublishedPost.business)])
             
             if not item:
                 raise HTTPException(status_code=404, detail="Published post not found")
@@ -164,8 +247,8 @@ def save_to_library(
             # Save to library
             item.saved_to_library = True
             item.library_saved_at = datetime.utcnow()
-            db.commit()
-            db.refresh(item)
+            await db.commit()
+            await db.refresh(item)
             
             return SaveToLibraryResponse(
                 success=True,
@@ -178,94 +261,103 @@ def save_to_library(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to save to library: {str(e)}")
 
 
 @router.get("", response_model=LibraryListResponse)
-def list_library_items(
+async def list_library_items(
     business_id: int = Query(..., description="Business ID"),
     platform: Optional[str] = Query(None, description="Filter by platform"),
     search: Optional[str] = Query(None, description="Search in text"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    List all saved library items for a business
+    List all saved library items for a business, newest saved first
     
     - **business_id**: ID of the business
     - **platform**: Filter by platform (optional)
-    - **search**: Search in content text (optional)
+    - **search**: Full-text search in content text, results ranked by relevance (optional)
+    - **cursor**: Continue after the previous page (preferred over page)
     - **page**: Page number (default: 1)
     - **page_size**: Items per page (default: 20, max: 100)
     """
     try:
         user_id = current_user["sub"]
         
-        # Build queries for both tables
-        content_query = db.query(Content).filter(
-            and_(
-                Content.business_id == business_id,
-                Content.saved_to_library == True
-            )
-        )
+        # One page of sort keys from both tables (most relevant first when searching)
+        keys = library_keys_query(business_id, platform, search)
+        sort_key = [keys.c.saved_at, keys.c.id, keys.c.source]
+        if search:
+            sort_key.insert(0, keys.c.rank)
         
-        posts_query = db.query(PublishedPost).filter(
-            and_(
-                PublishedPost.business_id == business_id,
-                PublishedPost.saved_to_library == True
-            )
-        )
+        page_query = select(*sort_key).order_by(*[column.desc() for column in sort_key]).limit(page_size + 1)
         
-        # Apply platform filter
-        if platform:
-            content_query = content_query.filter(Content.platform == platform)
-            posts_query = posts_query.filter(PublishedPost.platform == platform)
+        if cursor:
+            # Keyset: rows strictly after the cursor's item
+            saved_at, item_id, source, rank = decode_cursor(cursor)
+            values = [saved_at, item_id, source]
+            if search:
+                if rank is None:
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+                values.insert(0, rank)
+            page_query = page_query.where(tuple_(*sort_key) < tuple_(*values))
+        else:
+            page_query = page_query.offset((page - 1) * page_size)
         
-        # Apply search filter
-        if search:
-            content_query = content_query.filter(Content.text.ilike(f"%{search}%"))
-            posts_query = posts_query.filter(PublishedPost.content_text.ilike(f"%{search}%"))
+        rows = (await db.execute(page_query)).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        
+        # Load the page's items from their tables
+        content_ids = [row.id for row in rows if row.source == "content"]
+        post_ids = [row.id for row in rows if row.source == "published_post"]
         
-        # Get all items
-        content_items = content_query.all()
-        published_items = posts_query.all()
+        contents = {}
+        if content_ids:
+            contents = {item.id: item for item in await db.scalars(select(Content).where(Content.id.in_(content_ids)))}
+        posts = {}
+        if post_ids:
+            posts = {item.id: item for item in await db.scalars(select(PublishedPost).where(PublishedPost.id.in_(post_ids)))}
         
-        # Convert to library items
-        all_items = []
-        for item in content_items:
-            all_items.append(content_to_library_item(item))
-        for item in published_items:
-            all_items.append(published_post_to_library_item(item))
+        paginated_items = []
+        for row in rows:
+            if row.source == "content" and row.id in contents:
+                paginated_items.append(content_to_library_item(contents[row.id]))
+            elif row.source == "published_post" and row.id in posts:
+                paginated_items.append(published_post_to_library_item(posts[row.id]))
         
-        # Sort by saved_at descending
-        all_items.sort(key=lambda x: x.saved_at, reverse=True)
+        total = await db.scalar(library_count_query(business_id, platform, search))
         
-        # Calculate pagination
-        total = len(all_items)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_items = all_items[start_idx:end_idx]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.saved_at, last.id, last.source, last.rank if search else None)
         
         return LibraryListResponse(
             items=paginated_items,
-            total=total,
+            total=total or 0,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=next_cursor
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list library items: {str(e)}")
 
 
 @router.delete("/{source}/{item_id}", response_model=RemoveFromLibraryResponse)
-def remove_from_library(
+async def remove_from_library(
     source: str,
     item_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove an item from the library (doesn't delete the item, just unsaves it)
@@ -277,7 +369,7 @@ def remove_from_library(
         user_id = current_user["sub"]
         
         if source == "content":
-            item = db.query(Content).filter(Content.id == item_id).first()
+            item = await db.get(Content, item_id, options=[joinedload(Content.business)])
             
             if not item:
                 raise HTTPException(status_code=404, detail="Content not found")
@@ -290,7 +382,7 @@ def remove_from_library(
             item.library_saved_at = None
             
         elif source == "published_post":
-            item = db.query(PublishedPost).filter(PublishedPost.id == item_id).first()
+            item = await db.get(PublishedPost, item_id, options=[joinedload(PublishedPost.business)])
             
             if not item:
                 raise HTTPException(status_code=404, detail="Published post not found")
@@ -304,7 +396,7 @@ def remove_from_library(
         else:
             raise HTTPException(status_code=400, detail="Invalid source")
         
-        db.commit()
+        await db.commit()
         
         return RemoveFromLibraryResponse(
             success=True,
@@ -314,15 +406,15 @@ def remove_from_library(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to remove from library: {str(e)}")
 
 
 @router.get("/stats")
-def get_library_stats(
+async def get_library_stats(
     business_id: int = Query(..., description="Business ID"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get statistics about the content library
@@ -331,48 +423,55 @@ def get_library_stats(
     """
     try:
         # Count items by source
-        content_count = db.query(Content).filter(
-            and_(
-                Content.business_id == business_id,
-                Content.saved_to_library == True
+        content_count = await db.scalar(
+            select(func.count(Content.id)).where(
+                and_(
+                    Content.business_id == business_id,
+                    Content.saved_to_library == True
+                )
             )
-        ).count()
+        )
         
-        posts_count = db.query(PublishedPost).filter(
-            and_(
-                PublishedPost.business_id == business_id,
-                PublishedPost.saved_to_library == True
+        posts_count = await db.scalar(
+            select(func.count(PublishedPost.id)).where(
+                and_(
+                    PublishedPost.business_id == business_id,
+                    PublishedPost.saved_to_library == True
+                )
             )
-        ).count()
+        )
         
         # Count by platform
         platform_counts = {}
         
         # Content platforms
-        from sqlalchemy import func
-        content_platforms = db.query(
-            Content.platform,
-            func.count(Content.id)
-        ).filter(
-            and_(
-                Content.business_id == business_id,
-                Content.saved_to_library == True
-            )
-        ).group_by(Content.platform).all()
+        content_platforms = (await db.execute(
+            select(
+                Content.platform,
+                func.count(Content.id)
+            ).where(
+                and_(
+                    Content.business_id == business_id,
+                    Content.saved_to_library == True
+                )
+            ).group_by(Content.platform)
+        )).all()
         
         for platform, count in content_platforms:
             platform_counts[platform.value] = platform_counts.get(platform.value, 0) + count
         
         # Published post platforms
-        post_platforms = db.query(
-            PublishedPost.platform,
-            func.count(PublishedPost.id)
-        ).filter(
-            and_(
-                PublishedPost.business_id == business_id,
-                PublishedPost.saved_to_library == True
-            )
-        ).group_by(PublishedPost.platform).all()
+        post_platforms = (await db.execute(
+            select(
+                PublishedPost.platform,
+                func.count(PublishedPost.id)
+            ).where(
+                and_(
+                    PublishedPost.business_id == business_id,
+                    PublishedPost.saved_to_library == True
+                )
+            ).group_by(PublishedPost.platform)
+        )).all()
         
         for platform, count in post_platforms:
             platform_counts[platform] = platform_counts.get(platform, 0) + count
@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.db.database import get_db
+from app.db.replicas import get_read_db
 from app.core.auth import get_current_user
 from app.models.content_template import ContentTemplate
 from app.models.business import Business
@@ -123,7 +124,7 @@ async def list_templates(
     skip: int = 0,
     limit: int = 50,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """List content templates for a business"""
     query = db.query(ContentTemplate)
@@ -285,7 +286,7 @@ async def use_template(
 async def list_categories(
     business_id: Optional[int] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of all unique template categories"""
     query = db.query(ContentTemplate.category).distinct()
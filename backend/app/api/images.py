@@ -22,6 +22,7 @@ from app.schemas.image import (
 )
 from app.services.image_storage import ImageStorageService
 from app.services.ai_image_generator import AIImageGenerator
+from app.services.text_search import fuzzy_match, fuzzy_rank
 
 router = APIRouter(prefix="/images", tags=["images"])
 
@@ -95,7 +96,7 @@ def list_images(
     - **page**: Page number (default: 1)
     - **page_size**: Items per page (default: 20, max: 100)
     - **ai_generated**: Filter by AI generated (optional)
-    - **search**: Search by filename (optional)
+    - **search**: Search by filename, substring or fuzzy, best matches first (optional)
     """
     try:
         # Build query
@@ -111,7 +112,7 @@ def list_images(
             query = query.filter(Image.ai_generated == ai_generated)
         
         if search:
-            query = query.filter(Image.original_filename.ilike(f"%{search}%"))
+            query = query.filter(fuzzy_match(Image.original_filename, search))
         
         # Get total count
         total = query.count()
@@ -121,7 +122,12 @@ def list_images(
         offset = (page - 1) * page_size
         
         # Get paginated results
-        images = query.order_by(Image.created_at.desc()).offset(offset).limit(page_size).all()
+        if search:
+            query = query.order_by(fuzzy_rank(Image.original_filename, search).desc(), Image.created_at.desc())
+        else:
+            query = query.order_by(Image.created_at.desc())
+        
+        images = query.offset(offset).limit(page_size).all()
         
         return ImageListResponse(
             images=[ImageResponse.from_orm(img) for img in images],
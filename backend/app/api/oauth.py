@@ -110,7 +110,7 @@ async def initiate_oauth(
         # Store the OAuth provider's state with business_id and platform for validation
         # We use the state generated by the OAuth service, not create a new one
         # This also stores code_verifier for Twitter (PKCE)
-        state_manager.store_state(
+        await state_manager.astore_state(
             state=oauth_state,
             business_id=business_id,
             platform=platform,
@@ -159,7 +159,7 @@ async def handle_oauth_callback(
     # First, retrieve state data to get business_id
     try:
         # Validate state and get stored data (business_id, platform, code_verifier)
-        state_data = state_manager.validate_state_no_business(state)
+        state_data = await state_manager.avalidate_state_no_business(state)
         business_id = state_data.get("business_id")
         stored_platform = state_data.get("platform")
         code_verifier = state_data.get("code_verifier")  # For Twitter PKCE
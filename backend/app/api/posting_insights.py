@@ -10,7 +10,7 @@ from pydantic import BaseModel, Field
 from datetime import datetime, timedelta
 import statistics
 
-from app.db.database import get_db
+from app.db.replicas import get_read_db
 from app.core.auth import get_current_user
 from app.models.published_post import PublishedPost
 from app.models.business import Business
@@ -230,7 +230,7 @@ async def get_posting_recommendations(
     business_id: int,
     days: int = 90,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get posting time recommendations based on engagement analysis
@@ -296,7 +296,7 @@ async def get_best_time_now(
     business_id: int,
     platform: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Check if now is a good time to post on a specific platform
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.core.auth import get_current_user_id
+from app.core.query_cache import abump_business_data_version
 from app.models.business import Business
 from app.models.social_account import SocialAccount
 from app.models.published_post import PublishedPost
@@ -130,6 +131,7 @@ async def publish_to_linkedin(
         
         db.commit()
         db.refresh(published_post)
+        await abump_business_data_version(published_post.business_id)
         
         return PublishResponse(
             id=published_post.id,
@@ -317,6 +319,7 @@ async def publish_to_twitter(
         
         db.commit()
         db.refresh(published_post)
+        await abump_business_data_version(published_post.business_id)
         
         return PublishResponse(
             id=published_post.id,
@@ -541,6 +544,7 @@ async def retry_failed_post(
         
         db.commit()
         db.refresh(post)
+        await abump_business_data_version(post.business_id)
         
         return PublishResponse(
             id=post.id,
@@ -653,6 +657,7 @@ async def publish_to_facebook(
         db.add(published_post)
         db.commit()
         db.refresh(published_post)
+        await abump_business_data_version(published_post.business_id)
         
         return PublishResponse(
             success=True,
@@ -780,6 +785,7 @@ async def publish_to_instagram(
         db.add(published_post)
         db.commit()
         db.refresh(published_post)
+        await abump_business_data_version(published_post.business_id)
         
         return PublishResponse(
             success=True,
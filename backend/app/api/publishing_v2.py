@@ -4,15 +4,18 @@ Publishing API v2 Endpoints
 Clean API routes using the new publishing service architecture.
 Handles immediate publishing, multi-platform publishing, and scheduling.
 """
+import asyncio
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, Dict, List, Set
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from app.db.database import get_db
+from app.db.database import get_async_db, new_async_session
 from app.core.auth import get_current_user_id
 from app.core.encryption import decrypt_token
+from app.core.query_cache import abump_business_data_version
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +52,7 @@ from app.schemas.publishing_v2 import (
     CancelScheduledPostResponse,
     UpdateScheduledPostRequest
 )
+from app.services.scheduled_post_queue import aschedule_post, aunschedule_post
 from app.services.publishing import (
     linkedin_publisher,
     twitter_publisher,
@@ -57,6 +61,38 @@ from app.services.publishing import (
 
 router = APIRouter()
 
+# Seconds a multi-platform publish waits for each platform. Meta covers
+# Instagram's two-step flow (create media container, then publish it).
+PLATFORM_PUBLISH_TIMEOUTS = {
+    "linkedin": 30.0,
+    "twitter": 45.0,  # Threads are posted tweet by tweet
+    "meta": 90.0,
+}
+DEFAULT_PUBLISH_TIMEOUT = 60.0
+
+# Publishes still running after their response timed out (the event loop
+# only keeps weak references to tasks)
+_background_publishes: Set[asyncio.Task] = set()
+
+
+def _log_background_publish(task: asyncio.Task):
+    """Log the outcome of a publish that outlived its response."""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        detail = error.detail if isinstance(error, HTTPException) else error
+        logger.error(
+            f"Background publish failed: {detail}",
+            extra={"event_type": "background_publish_failed"}
+        )
+    else:
+        result = task.result()
+        logger.info(
+            f"Background publish to {result.platform} finished (success={result.success})",
+            extra={"event_type": "background_publish_finished", "platform": result.platform}
+        )
+
 
 def get_publisher(platform: str):
     """Get the appropriate publisher for the platform."""
@@ -78,7 +114,7 @@ def get_publisher(platform: str):
 async def publish_now(
     request: Request,
     publish_request: PublishRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -95,18 +131,18 @@ async def publish_now(
     """
     try:
         # Get social account
-        social_account = db.query(SocialAccount).filter(
-            SocialAccount.id == publish_request.social_account_id
-        ).first()
+        social_account = await db.get(SocialAccount, publish_request.social_account_id)
         
         if not social_account:
             raise HTTPException(status_code=404, detail="Social account not found")
         
         # Verify user owns this social account through business
-        business = db.query(Business).filter(
-            Business.id == social_account.business_id,
-            Business.user_id == user_id
-        ).first()
+        business = await db.scalar(
+            select(Business).where(
+                Business.id == social_account.business_id,
+                Business.user_id == user_id
+            )
+        )
         
         if not business:
             raise HTTPException(status_code=403, detail="Access denied to this social account")
@@ -165,8 +201,9 @@ async def publish_now(
                 published_at=result.published_at or datetime.utcnow()
             )
             db.add(published_post)
-            db.commit()
-            db.refresh(published_post)
+            await db.commit()
+            await db.refresh(published_post)
+            await abump_business_data_version(published_post.business_id)
         else:
             # Save failed post
             published_post = PublishedPost(
@@ -178,7 +215,7 @@ async def publish_now(
                 error_message=result.error
             )
             db.add(published_post)
-            db.commit()
+            await db.commit()
         
         return PublishResponse(
             success=result.success,
@@ -201,7 +238,6 @@ async def publish_now(
 async def publish_multi_platform(
     request: Request,
     publish_request: MultiPlatformPublishRequest,
-    db: Session = Depends(get_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -209,14 +245,28 @@ async def publish_multi_platform(
     
     **Rate Limit:** 10 requests per hour per user
     
+    Platforms are published to concurrently, each with its own database
+    session and timeout (PLATFORM_PUBLISH_TIMEOUTS), so the call takes as
+    long as the slowest platform rather than the sum of all of them. A
+    failing or timed-out platform does not affect the others; a timed-out
+    publish keeps running and is recorded when the platform responds.
+    
     Each platform config should include:
     - platform: 'linkedin', 'twitter', or 'meta'
     - social_account_id: The account ID to publish from
     - platform_params: Platform-specific parameters (optional)
     """
-    results = []
-    
-    for platform_config in publish_request.platforms:
+    async def publish_and_record(publish_req: PublishRequest) -> PublishResponse:
+        # Sessions are not safe for concurrent use, so each platform gets
+        # its own, owned by the task so it outlives a timed-out wait
+        async with new_async_session() as platform_db:
+            # Bypass rate limit for internal call
+            return await publish_now(request, publish_req, platform_db, user_id)
+    
+    async def publish_to_platform(platform_config: Dict[str, Any]) -> PublishResponse:
+        platform = platform_config.get("platform", "unknown")
+        timeout = PLATFORM_PUBLISH_TIMEOUTS.get(str(platform).lower(), DEFAULT_PUBLISH_TIMEOUT)
+        
         try:
             # Create publish request for this platform
             publish_req = PublishRequest(
@@ -226,23 +276,37 @@ async def publish_multi_platform(
                 platform_params=platform_config.get("platform_params")
             )
             
-            # Publish to this platform (bypass rate limit for internal call)
-            result = await publish_now(request, publish_req, db, user_id)
-            results.append(result)
+            # The timeout only bounds how long this response waits. Cancelling
+            # the publish could leave a post on the platform with no
+            # PublishedPost row, so it is shielded and finishes in the background.
+            task = asyncio.create_task(publish_and_record(publish_req))
+            _background_publishes.add(task)
+            task.add_done_callback(_background_publishes.discard)
+            
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
         
         except HTTPException as e:
-            # Add failed result
-            results.append(PublishResponse(
+            return PublishResponse(success=False, platform=platform, error=e.detail)
+        except asyncio.TimeoutError:
+            task.add_done_callback(_log_background_publish)
+            logger.warning(
+                f"Publishing to {platform} still running after {timeout}s",
+                extra={"event_type": "publish_timeout", "platform": platform}
+            )
+            return PublishResponse(
                 success=False,
-                platform=platform_config.get("platform", "unknown"),
-                error=e.detail
-            ))
+                platform=platform,
+                error=(
+                    f"Publishing to {platform} did not finish within {timeout:.0f} seconds; "
+                    "it continues in the background and will appear in your published posts"
+                )
+            )
         except Exception as e:
-            results.append(PublishResponse(
-                success=False,
-                platform=platform_config.get("platform", "unknown"),
-                error=str(e)
-            ))
+            return PublishResponse(success=False, platform=platform, error=str(e))
+    
+    results = list(await asyncio.gather(
+        *(publish_to_platform(platform_config) for platform_config in publish_request.platforms)
+    ))
     
     # Calculate success/failure counts
     successful = sum(1 for r in results if r.success)
@@ -261,7 +325,7 @@ async def publish_multi_platform(
 async def schedule_post(
     request: Request,
     schedule_request: SchedulePublishRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -269,22 +333,23 @@ async def schedule_post(
     
     **Rate Limit:** 50 requests per hour per user
     
-    Note: Requires Celery worker to be running for scheduled posts to be published.
+    Note: Requires the scheduled post dispatcher and a Celery worker to be
+    running for scheduled posts to be published.
     """
     try:
         # Get social account
-        social_account = db.query(SocialAccount).filter(
-            SocialAccount.id == schedule_request.social_account_id
-        ).first()
+        social_account = await db.get(SocialAccount, schedule_request.social_account_id)
         
         if not social_account:
             raise HTTPException(status_code=404, detail="Social account not found")
         
         # Verify ownership
-        business = db.query(Business).filter(
-            Business.id == social_account.business_id,
-            Business.user_id == user_id
-        ).first()
+        business = await db.scalar(
+            select(Business).where(
+                Business.id == social_account.business_id,
+                Business.user_id == user_id
+            )
+        )
         
         if not business:
             raise HTTPException(status_code=403, detail="Access denied to this social account")
@@ -309,36 +374,24 @@ async def schedule_post(
         )
         
         db.add(scheduled_post)
-        db.commit()
-        db.refresh(scheduled_post)
+        await db.commit()
+        await db.refresh(scheduled_post)
         
-        # Create Celery task for publishing at scheduled time
+        # Hand the post to the delayed-job store; if Redis is unavailable,
+        # reconciliation adds it from the database
         try:
-            from app.tasks.publishing_tasks import publish_scheduled_post
-            
-            # Calculate ETA (when to execute the task)
-            task = publish_scheduled_post.apply_async(
-                args=[scheduled_post.id],
-                eta=schedule_request.scheduled_for
-            )
-            
-            # Store Celery task ID for potential cancellation
-            scheduled_post.celery_task_id = task.id
-            db.commit()
+            await aschedule_post(scheduled_post.id, scheduled_post.scheduled_for)
             
             logger.info(
-                f"Scheduled post {scheduled_post.id} queued for Celery execution",
+                f"Scheduled post {scheduled_post.id} queued for dispatch",
                 extra={
-                    "event_type": "celery_task_scheduled",
+                    "event_type": "scheduled_post_enqueued",
                     "scheduled_post_id": scheduled_post.id,
-                    "task_id": task.id,
                     "eta": schedule_request.scheduled_for.isoformat()
                 }
             )
-        except ImportError:
-            logger.warning("Celery not available - scheduled post created but won't auto-publish")
         except Exception as e:
-            logger.error(f"Failed to create Celery task: {e}", exc_info=True)
+            logger.error(f"Failed to queue scheduled post {scheduled_post.id}: {e}", exc_info=True)
         
         return ScheduledPostResponse(
             id=scheduled_post.id,
@@ -360,28 +413,32 @@ async def schedule_post(
 @router.get("/v2/scheduled", response_model=ScheduledPostListResponse)
 async def get_scheduled_posts(
     business_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     Get all scheduled posts for a business.
     
-    Returns only pending and publishing posts (excludes published, failed, cancelled).
+    Returns only pending, queued and publishing posts (excludes published, failed, cancelled).
     """
     # Verify business ownership
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.user_id == user_id
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == business_id,
+            Business.user_id == user_id
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Query scheduled posts
-    scheduled_posts = db.query(ScheduledPost).filter(
-        ScheduledPost.business_id == business_id,
-        ScheduledPost.status.in_(["pending", "publishing"])
-    ).order_by(ScheduledPost.scheduled_for).all()
+    scheduled_posts = (await db.scalars(
+        select(ScheduledPost).where(
+            ScheduledPost.business_id == business_id,
+            ScheduledPost.status.in_(["pending", "queued", "publishing"])
+        ).order_by(ScheduledPost.scheduled_for)
+    )).all()
     
     return ScheduledPostListResponse(
         scheduled_posts=[
@@ -405,27 +462,27 @@ async def get_scheduled_posts(
 async def update_scheduled_post(
     scheduled_post_id: int,
     update_request: UpdateScheduledPostRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     Update a scheduled post's time and/or content.
     
-    Reschedules the Celery task with the new time.
+    Moves the post to its new time in the delayed-job store.
     """
     # Get scheduled post
-    scheduled_post = db.query(ScheduledPost).filter(
-        ScheduledPost.id == scheduled_post_id
-    ).first()
+    scheduled_post = await db.get(ScheduledPost, scheduled_post_id)
     
     if not scheduled_post:
         raise HTTPException(status_code=404, detail="Scheduled post not found")
     
     # Verify ownership
-    business = db.query(Business).filter(
-        Business.id == scheduled_post.business_id,
-        Business.user_id == user_id
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == scheduled_post.business_id,
+            Business.user_id == user_id
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -454,13 +511,11 @@ async def update_scheduled_post(
     scheduled_post.scheduled_for = update_request.scheduled_for
     scheduled_post.updated_at = datetime.utcnow()
     
-    # Reschedule Celery task if exists
+    # Posts scheduled before the delayed-job store have an ETA task
     if scheduled_post.celery_task_id:
         try:
             from app.celery_app import celery_app
-            from app.tasks.publishing_tasks import publish_scheduled_post
             
-            # Revoke old task
             celery_app.control.revoke(scheduled_post.celery_task_id, terminate=True)
             logger.info(
                 f"Revoked old Celery task {scheduled_post.celery_task_id} for scheduled post {scheduled_post_id}",
@@ -470,32 +525,29 @@ async def update_scheduled_post(
                     "old_task_id": scheduled_post.celery_task_id
                 }
             )
-            
-            # Schedule new task
-            result = publish_scheduled_post.apply_async(
-                args=[scheduled_post_id],
-                eta=update_request.scheduled_for
-            )
-            scheduled_post.celery_task_id = result.id
-            
-            logger.info(
-                f"Rescheduled post {scheduled_post_id} from {old_scheduled_for} to {update_request.scheduled_for}",
-                extra={
-                    "event_type": "post_rescheduled",
-                    "scheduled_post_id": scheduled_post_id,
-                    "old_time": old_scheduled_for.isoformat(),
-                    "new_time": update_request.scheduled_for.isoformat(),
-                    "new_task_id": result.id
-                }
-            )
+            scheduled_post.celery_task_id = None
         except ImportError:
-            logger.warning("Celery not available - cannot reschedule task")
+            logger.warning("Celery not available - cannot revoke task")
         except Exception as e:
-            logger.error(f"Failed to reschedule Celery task: {e}", exc_info=True)
-            # Don't fail the update if Celery fails
+            logger.error(f"Failed to revoke Celery task: {e}", exc_info=True)
+    
+    await db.commit()
+    await db.refresh(scheduled_post)
     
-    db.commit()
-    db.refresh(scheduled_post)
+    # Move the post in the delayed-job store (reconciliation retries on failure)
+    try:
+        await aschedule_post(scheduled_post_id, scheduled_post.scheduled_for)
+        logger.info(
+            f"Rescheduled post {scheduled_post_id} from {old_scheduled_for} to {update_request.scheduled_for}",
+            extra={
+                "event_type": "post_rescheduled",
+                "scheduled_post_id": scheduled_post_id,
+                "old_time": old_scheduled_for.isoformat(),
+                "new_time": update_request.scheduled_for.isoformat()
+            }
+        )
+    except Exception as e:
+        logger.error(f"Failed to reschedule post {scheduled_post_id}: {e}", exc_info=True)
     
     return ScheduledPostResponse(
         id=scheduled_post.id,
@@ -512,27 +564,27 @@ async def update_scheduled_post(
 @router.delete("/v2/schedule/{scheduled_post_id}", response_model=CancelScheduledPostResponse)
 async def cancel_scheduled_post(
     scheduled_post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id)
 ):
     """
     Cancel a scheduled post.
     
-    Also revokes the Celery task if it exists.
+    Removes it from the delayed-job store and revokes its Celery task if it exists.
     """
     # Get scheduled post
-    scheduled_post = db.query(ScheduledPost).filter(
-        ScheduledPost.id == scheduled_post_id
-    ).first()
+    scheduled_post = await db.get(ScheduledPost, scheduled_post_id)
     
     if not scheduled_post:
         raise HTTPException(status_code=404, detail="Scheduled post not found")
     
     # Verify ownership
-    business = db.query(Business).filter(
-        Business.id == scheduled_post.business_id,
-        Business.user_id == user_id
-    ).first()
+    business = await db.scalar(
+        select(Business).where(
+            Business.id == scheduled_post.business_id,
+            Business.user_id == user_id
+        )
+    )
     
     if not business:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -562,7 +614,13 @@ async def cancel_scheduled_post(
     # Update status
     scheduled_post.status = "cancelled"
     scheduled_post.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    
+    # Dispatch skips cancelled posts, so a failure here is only cleanup
+    try:
+        await aunschedule_post(scheduled_post_id)
+    except Exception as e:
+        logger.warning(f"Failed to remove scheduled post {scheduled_post_id} from queue: {e}")
     
     return CancelScheduledPostResponse(
         success=True,
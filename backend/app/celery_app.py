@@ -16,7 +16,7 @@ celery_app = Celery(
     'ai_growth_manager',
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=['app.tasks.publishing_tasks']  # Auto-discover tasks
+    include=['app.tasks.publishing_tasks', 'app.tasks.analytics_tasks']  # Auto-discover tasks
 )
 
 # Celery configuration
@@ -47,15 +47,27 @@ celery_app.conf.update(
     
     # Beat schedule (for periodic tasks)
     beat_schedule={
-        'check-scheduled-posts-every-minute': {
-            'task': 'app.tasks.publishing_tasks.check_and_publish_scheduled_posts',
-            'schedule': crontab(minute='*/1'),  # Every minute
-            'options': {'expires': 55}  # Expire if not executed within 55 seconds
+        # Due posts are dispatched by app.tasks.scheduled_post_dispatcher;
+        # this only repairs the delayed-job store from the database
+        'reconcile-scheduled-posts': {
+            'task': 'app.tasks.publishing_tasks.reconcile_scheduled_posts',
+            'schedule': crontab(minute='*/5'),  # Every 5 minutes
+            'options': {'expires': 280}
         },
         'cleanup-old-scheduled-posts': {
             'task': 'app.tasks.publishing_tasks.cleanup_old_scheduled_posts',
             'schedule': crontab(hour='*/6'),  # Every 6 hours
             'options': {'expires': 3500}  # Expire if not executed within ~1 hour
+        },
+        'dispatch-analytics-sync-hourly': {
+            'task': 'app.tasks.analytics_tasks.dispatch_analytics_sync',
+            'schedule': crontab(minute=0),  # Every hour at :00
+            'options': {'expires': 3000}  # Expire if not executed within 50 minutes
+        },
+        'maintain-post-analytics-daily': {
+            'task': 'app.tasks.analytics_tasks.maintain_post_analytics',
+            'schedule': crontab(hour=3, minute=30),  # Daily at 03:30 UTC
+            'options': {'expires': 7200}
         }
     },
     
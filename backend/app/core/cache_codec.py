@@ -0,0 +1,248 @@
+"""
+Cache Payload Codecs
+
+Binary serialization and compression of QueryCache payloads.
+
+Every payload starts with a header byte naming its format: the high nibble
+is the serializer, the low nibble the compression. Decoding dispatches on
+that byte, so the encoding can change (or a package can go missing)
+without flushing Redis; entries in a format this process cannot read are
+treated as cache misses.
+
+Serializers keep the types JSON loses: datetime, date and Decimal values
+come back as the same types.
+"""
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Optional codecs (the stdlib JSON/zlib pair is always available)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+
+# Serializer IDs (header high nibble)
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+
+# Compression IDs (header low nibble)
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_LZ4 = 3
+
+# msgpack extension type codes
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_DECIMAL = 3
+
+# Payloads smaller than this are stored uncompressed
+DEFAULT_COMPRESS_THRESHOLD = 1024
+
+
+class CacheCodecError(ValueError):
+    """Raised when a payload cannot be decoded by this process."""
+    pass
+
+
+def _json_default(value: Any) -> Dict[str, str]:
+    """Tag the types JSON cannot represent."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    return {"__str__": str(value)}
+
+
+def _json_object_hook(obj: Dict[str, Any]) -> Any:
+    """Restore values tagged by _json_default."""
+    if len(obj) == 1:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+        if "__decimal__" in obj:
+            return Decimal(obj["__decimal__"])
+        if "__str__" in obj:
+            return obj["__str__"]
+    return obj
+
+
+def _msgpack_default(value: Any):
+    """Encode the types msgpack cannot represent as extension types."""
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+    return str(value)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Decode the extension types written by _msgpack_default."""
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+def _serialize(serializer: int, value: Any) -> bytes:
+    if serializer == SERIALIZER_MSGPACK:
+        return msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+def _deserialize(serializer: int, data: bytes) -> Any:
+    if serializer == SERIALIZER_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise CacheCodecError("msgpack payload but msgpack is not installed")
+        return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+    if serializer == SERIALIZER_JSON:
+        return json.loads(data, object_hook=_json_object_hook)
+    raise CacheCodecError(f"Unknown cache serializer {serializer}")
+
+
+def _compress(compression: int, data: bytes) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if compression == COMPRESSION_LZ4:
+        return lz4.frame.compress(data)
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(data, 6)
+    return data
+
+
+def _decompress(compression: int, data: bytes) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return data
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise CacheCodecError("zstd payload but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == COMPRESSION_LZ4:
+        if not LZ4_AVAILABLE:
+            raise CacheCodecError("lz4 payload but lz4 is not installed")
+        return lz4.frame.decompress(data)
+    raise CacheCodecError(f"Unknown cache compression {compression}")
+
+
+class CacheCodec:
+    """
+    Encodes cache payloads as a header byte plus (compressed) body.
+
+    Usage:
+        codec = CacheCodec()  # msgpack + zstd when installed
+        payload = codec.encode({"day": date.today()})
+        codec.decode(payload)  # {"day": date.today()}
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[int] = None,
+        compression: Optional[int] = None,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            serializer: SERIALIZER_* used for writing (default: msgpack if
+                        installed, else JSON)
+            compression: COMPRESSION_* used above the threshold (default:
+                         zstd, else lz4, else zlib)
+            compress_threshold: Serialized size in bytes from which payloads
+                                are compressed
+        """
+        if serializer is None:
+            serializer = SERIALIZER_MSGPACK if MSGPACK_AVAILABLE else SERIALIZER_JSON
+        if compression is None:
+            if ZSTD_AVAILABLE:
+                compression = COMPRESSION_ZSTD
+            elif LZ4_AVAILABLE:
+                compression = COMPRESSION_LZ4
+            else:
+                compression = COMPRESSION_ZLIB
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Encode a value.
+
+        Args:
+            value: Value made of dicts, lists, scalars, datetimes, dates
+                   and Decimals (other objects are stored as strings)
+
+        Returns:
+            Header byte followed by the payload
+        """
+        body = _serialize(self.serializer, value)
+        compression = COMPRESSION_NONE
+
+        if len(body) >= self.compress_threshold and self.compression != COMPRESSION_NONE:
+            compressed = _compress(self.compression, body)
+            if len(compressed) < len(body):
+                body, compression = compressed, self.compression
+
+        return bytes([(self.serializer << 4) | compression]) + body
+
+    def decode(self, payload: Union[bytes, str]) -> Any:
+        """
+        Decode a payload written by any codec configuration.
+
+        Args:
+            payload: Bytes read from Redis
+
+        Returns:
+            Decoded value
+
+        Raises:
+            CacheCodecError: If the payload's format is unknown or its
+                             package is not installed
+        """
+        if isinstance(payload, str):
+            payload = payload.encode()
+        if not payload:
+            raise CacheCodecError("Empty cache payload")
+
+        # Plain JSON written before payloads had a header
+        if payload[:1] in (b"{", b"["):
+            return json.loads(payload)
+
+        header = payload[0]
+        body = _decompress(header & 0x0F, payload[1:])
+        return _deserialize(header >> 4, body)
+
+
+# Codec used by QueryCache unless one is passed in
+default_codec = CacheCodec()
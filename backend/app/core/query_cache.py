@@ -4,21 +4,291 @@ Query Result Caching
 Redis-based caching for expensive database queries.
 Useful for analytics and dashboard data that doesn't change frequently.
 """
+import asyncio
 import json
 import hashlib
 import logging
-from typing import Optional, Any, Callable
+import math
+import os
+import random
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, List, Set, Tuple, Union
 from functools import wraps
 from datetime import datetime
 
-from app.core.redis_client import get_redis_client
+from app.core.cache_codec import CacheCodec, CacheCodecError, default_codec
+from app.core.redis_client import get_binary_redis_client, get_async_binary_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Pub/sub channel carrying invalidations to every process's local cache
+INVALIDATION_CHANNEL = "query_cache:invalidate"
+
+# Deletes a recompute lock only if this worker still holds it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Background stale-while-revalidate refreshes
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query-cache-refresh")
+
+# Pending async refreshes (the event loop only keeps weak references to tasks)
+_refresh_tasks: Set[asyncio.Task] = set()
+
+# Cache keys deleted per pipelined DELETE when invalidating a tag
+INVALIDATE_BATCH_SIZE = 500
+
+# Tags: a static list, or a function of the cached function's arguments
+TagsSpec = Union[Iterable[str], Callable[..., Iterable[str]], None]
+
+
+def business_tag(business_id: int) -> str:
+    """Tag of entries derived from a business's data."""
+    return f"business:{business_id}"
+
+
+def platform_tag(platform: str) -> str:
+    """Tag of entries derived from one platform's data."""
+    return f"platform:{platform}"
+
+
+def family_tag(name: str) -> str:
+    """Tag of entries produced by one endpoint or query family."""
+    return f"family:{name}"
+
+
+def _get_redis_or_none():
+    """Get the shared Redis client, or None if Redis is not reachable."""
+    try:
+        return get_binary_redis_client()
+    except Exception as e:
+        logger.warning(f"Redis not available for query cache: {e}")
+        return None
+
+
+class LocalLRUCache:
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL.
+    
+    Holds decoded values, so a hit costs a dict lookup instead of a Redis
+    round trip and a JSON decode. Values are shared between callers and
+    must be treated as read-only.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        """
+        Initialize the local cache.
+        
+        Args:
+            max_entries: Maximum entries kept (least recently used evicted first)
+            ttl: Seconds an entry is served before it must be re-read from Redis
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store an entry, evicting the least recently used ones if full."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, *keys: str) -> int:
+        """Delete entries; returns how many existed."""
+        with self._lock:
+            return sum(1 for key in keys if self._entries.pop(key, None) is not None)
+    
+    def delete_matching(self, pattern: str) -> int:
+        """Delete entries whose key matches a glob pattern."""
+        with self._lock:
+            matching = [key for key in self._entries if fnmatchcase(key, pattern)]
+            for key in matching:
+                del self._entries[key]
+            return len(matching)
+    
+    def clear(self):
+        """Delete all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheInvalidationBus:
+    """
+    Fans out cache invalidations to the local caches of every process.
+    
+    Each process runs one pub/sub listener thread on INVALIDATION_CHANNEL.
+    Messages name a cache prefix and either keys or a glob pattern; the
+    listener clears the matching entries from that prefix's local cache.
+    A missed message (e.g. during a Redis reconnect) is bounded by the
+    local cache TTL.
+    """
+    
+    def __init__(self, redis_client):
+        """
+        Initialize the bus.
+        
+        Args:
+            redis_client: Redis client used to publish and subscribe
+        """
+        self.redis = redis_client
+        self.origin = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._caches: "weakref.WeakValueDictionary[str, QueryCache]" = weakref.WeakValueDictionary()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def register(self, cache: "QueryCache"):
+        """Register a cache's local tier and start listening if needed."""
+        self._caches[cache.prefix] = cache
+        
+        with self._lock:
+            if self._thread is None:
+                try:
+                    pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(**{INVALIDATION_CHANNEL: self._handle_message})
+                    self._thread = pubsub.run_in_thread(
+                        sleep_time=1.0,
+                        daemon=True,
+                        exception_handler=self._handle_error
+                    )
+                    logger.info("Query cache invalidation listener started")
+                except Exception as e:
+                    logger.warning(f"Query cache invalidation listener not started: {e}")
+    
+    def publish(self, prefix: str, keys: Optional[List[str]] = None, pattern: Optional[str] = None):
+        """
+        Tell every process to drop entries from a cache's local tier.
+        
+        Args:
+            prefix: Cache prefix
+            keys: Keys to drop (without prefix)
+            pattern: Glob pattern of keys to drop (without prefix)
+        """
+        try:
+            self.redis.publish(INVALIDATION_CHANNEL, self.message(prefix, keys, pattern))
+        except Exception as e:
+            logger.warning(f"Failed to publish cache invalidation for {prefix}: {e}")
+    
+    async def apublish(
+        self,
+        async_redis,
+        prefix: str,
+        keys: Optional[List[str]] = None,
+        pattern: Optional[str] = None
+    ):
+        """Async variant of publish() over an asyncio Redis client."""
+        try:
+            await async_redis.publish(INVALIDATION_CHANNEL, self.message(prefix, keys, pattern))
+        except Exception as e:
+            logger.warning(f"Failed to publish cache invalidation for {prefix}: {e}")
+    
+    def message(self, prefix: str, keys: Optional[List[str]] = None, pattern: Optional[str] = None) -> str:
+        """Encode an invalidation message."""
+        return json.dumps({"origin": self.origin, "prefix": prefix, "keys": keys or [], "pattern": pattern})
+    
+    def _handle_message(self, message: Dict[str, Any]):
+        """Apply an invalidation published by another process."""
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        
+        # The publisher already updated its own local tier
+        if data.get("origin") == self.origin:
+            return
+        
+        cache = self._caches.get(data.get("prefix"))
+        if cache is None or cache.local is None:
+            return
+        
+        if data.get("keys"):
+            cache.local.delete(*data["keys"])
+        if data.get("pattern"):
+            cache.local.delete_matching(data["pattern"])
+    
+    def _handle_error(self, error: Exception, pubsub, thread):
+        """Keep the listener alive across Redis errors; local TTLs bound staleness."""
+        logger.warning(f"Query cache invalidation listener error: {error}")
+        time.sleep(1.0)
+
+
+_invalidation_bus: Optional[CacheInvalidationBus] = None
+_invalidation_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus(redis_client) -> CacheInvalidationBus:
+    """Get the process-wide invalidation bus."""
+    global _invalidation_bus
+    
+    with _invalidation_bus_lock:
+        if _invalidation_bus is None:
+            _invalidation_bus = CacheInvalidationBus(redis_client)
+        return _invalidation_bus
+
 
 class QueryCache:
     """
-    Redis-based query result caching.
+    Redis-based query result caching, with an optional in-process L1.
+    
+    With local_max_entries > 0, decoded values are also kept in a
+    size- and TTL-bounded LRU in front of Redis. Deletes and invalidations
+    are published over Redis pub/sub so every worker drops its local copy.
+    
+    get_or_compute() (and the cached() decorator) protect expensive queries
+    from stampedes:
+    - single flight: on a miss one worker takes a Redis lock per key and
+      recomputes; the others wait for its result
+    - early refresh: shortly before expiry a request may recompute early,
+      with a probability growing as expiry nears and with the cost of the
+      last computation (XFetch), so hot keys rarely expire at all
+    - stale-while-revalidate: with stale_ttl > 0 entries outlive their TTL
+      by stale_ttl; a stale entry is served while one worker refreshes it
+      in the background
+    
+    Values are stored in an envelope with their expiry and computation time,
+    encoded by a CacheCodec (binary, compressed above a size threshold, and
+    type-preserving for dates and Decimals).
+    
+    Entries can be registered under tags (see business_tag, platform_tag,
+    family_tag): each tag is a Redis set of the keys cached under it, so
+    invalidate_tags() deletes exactly those keys without scanning Redis.
+    
+    Async endpoints use the a-prefixed variants (aget, aset, aget_or_compute,
+    ainvalidate_tags, acached), which go through the pooled asyncio Redis
+    client instead of blocking the event loop. Both share the same keys,
+    envelope and local tier.
     
     Usage:
         cache = QueryCache(ttl=300)  # 5 minutes
@@ -35,21 +305,68 @@ class QueryCache:
             return db.query(...).all()
     """
     
-    def __init__(self, ttl: int = 300, prefix: str = "query_cache"):
+    def __init__(
+        self,
+        ttl: int = 300,
+        prefix: str = "query_cache",
+        local_max_entries: int = 0,
+        local_ttl: float = 30.0,
+        stale_ttl: int = 0,
+        early_refresh_beta: float = 1.0,
+        lock_timeout: float = 30.0,
+        lock_wait: float = 5.0,
+        redis_client=None,
+        async_redis_client=None,
+        codec: Optional[CacheCodec] = None
+    ):
         """
         Initialize query cache.
         
         Args:
             ttl: Time-to-live in seconds (default: 5 minutes)
             prefix: Redis key prefix (default: "query_cache")
+            local_max_entries: Size of the in-process L1 (0 = disabled)
+            local_ttl: Maximum seconds a value is served from the L1
+            stale_ttl: Seconds an expired value may still be served while it
+                       is refreshed in the background (0 = disabled)
+            early_refresh_beta: Eagerness of early refreshes (0 = disabled,
+                                >1 refreshes earlier)
+            lock_timeout: Seconds a recompute lock is held at most
+            lock_wait: Seconds a follower waits for the lock holder's result
+                       before computing the value itself
+            redis_client: Redis client returning bytes (defaults to the shared binary client)
+            async_redis_client: asyncio Redis client (defaults to the shared
+                                async client, created on first async use)
+            codec: Payload codec (defaults to msgpack + zstd when installed)
         """
-        self.redis = get_redis_client()
+        self.redis = redis_client if redis_client is not None else _get_redis_or_none()
+        self._async_redis = async_redis_client
+        self.codec = codec or default_codec
         self.ttl = ttl
         self.prefix = prefix
+        self.stale_ttl = stale_ttl
+        self.early_refresh_beta = early_refresh_beta
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
         self.enabled = self.redis is not None
+        self.local: Optional[LocalLRUCache] = None
+        self.bus: Optional[CacheInvalidationBus] = None
         
         if not self.enabled:
             logger.warning("Query caching disabled: Redis not available")
+            return
+        
+        if local_max_entries > 0:
+            self.local = LocalLRUCache(max_entries=local_max_entries, ttl=min(local_ttl, ttl))
+            self.bus = get_invalidation_bus(self.redis)
+            self.bus.register(self)
+    
+    @property
+    def aredis(self):
+        """asyncio Redis client used by the async API."""
+        if self._async_redis is None:
+            self._async_redis = get_async_binary_redis_client()
+        return self._async_redis
     
     def _make_key(self, key: str) -> str:
         """Generate Redis key with prefix"""
@@ -60,6 +377,90 @@ class QueryCache:
         json_str = json.dumps(data, sort_keys=True, default=str)
         return hashlib.sha256(json_str.encode()).hexdigest()
     
+    def _tag_key(self, tag: str) -> str:
+        """Generate the Redis key of a tag's member set"""
+        return f"{self.prefix}:tag:{tag}"
+    
+    def _lock_key(self, key: str) -> str:
+        """Generate the Redis key of a key's recompute lock"""
+        return f"{self.prefix}:lock:{key}"
+    
+    def _get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a key's envelope, fresh or stale.
+        
+        Returns:
+            {"value", "fresh_until", "delta"} or None if not cached
+        """
+        if self.local is not None:
+            entry = self.local.get(key)
+            if entry is not None:
+                return entry
+        
+        try:
+            return self._decode_entry(key, self.redis.get(self._make_key(key)))
+        except Exception as e:
+            logger.warning(f"Cache get error for {key}: {e}")
+            return None
+    
+    def _decode_entry(self, key: str, value: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """Decode an envelope read from Redis and keep it in the local tier."""
+        if not value:
+            logger.debug(f"Cache MISS: {key}")
+            return None
+        
+        try:
+            entry = self.codec.decode(value)
+        except CacheCodecError as e:
+            # Written in a format this process cannot read
+            logger.debug(f"Cache MISS: {key} ({e})")
+            return None
+        
+        if not isinstance(entry, dict) or "fresh_until" not in entry:
+            # Written before values were wrapped in an envelope
+            return None
+        
+        logger.debug(f"Cache HIT: {key}")
+        if self.local is not None:
+            self.local.set(key, entry, ttl=max(entry["fresh_until"] + self.stale_ttl - time.time(), 0))
+        return entry
+    
+    def _queue_set(
+        self,
+        pipe,
+        key: str,
+        value: Any,
+        ttl_seconds: int,
+        delta: float,
+        tags: Optional[Iterable[str]]
+    ) -> bytes:
+        """
+        Queue an envelope write (and its tag registrations) on a pipeline.
+        
+        Returns:
+            The encoded envelope
+        """
+        entry = {"value": value, "fresh_until": time.time() + ttl_seconds, "delta": delta}
+        payload = self.codec.encode(entry)
+        
+        pipe.setex(self._make_key(key), ttl_seconds + self.stale_ttl, payload)
+        
+        # Tag sets outlive their members; deleting an expired member is a no-op
+        tag_ttl = max(ttl_seconds, self.ttl) + self.stale_ttl
+        for tag in tags or ():
+            pipe.sadd(self._tag_key(tag), key)
+            pipe.expire(self._tag_key(tag), tag_ttl)
+        
+        return payload
+    
+    @staticmethod
+    def _decode_members(tag_sets: Iterable[Iterable[Union[bytes, str]]]) -> List[str]:
+        """Merge tag member sets read from Redis into sorted cache keys."""
+        keys = set()
+        for members in tag_sets:
+            keys.update(member.decode() if isinstance(member, bytes) else member for member in members)
+        return sorted(keys)
+    
     def get(self, key: str) -> Optional[Any]:
         """
         Get cached value.
@@ -73,29 +474,29 @@ class QueryCache:
         if not self.enabled:
             return None
         
-        try:
-            redis_key = self._make_key(key)
-            value = self.redis.get(redis_key)
-            
-            if value:
-                logger.debug(f"Cache HIT: {key}")
-                return json.loads(value)
-            
-            logger.debug(f"Cache MISS: {key}")
+        entry = self._get_entry(key)
+        if entry is None or entry["fresh_until"] <= time.time():
             return None
         
-        except Exception as e:
-            logger.warning(f"Cache get error for {key}: {e}")
-            return None
+        return entry["value"]
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        delta: float = 0.0,
+        tags: Optional[Iterable[str]] = None
+    ) -> bool:
         """
         Set cached value.
         
         Args:
             key: Cache key
-            value: Value to cache (must be JSON serializable)
+            value: Value to cache (anything the codec can encode)
             ttl: Custom TTL for this key (optional)
+            delta: Seconds the value took to compute (drives early refresh)
+            tags: Tags to register the key under (optional)
         
         Returns:
             True if successful, False otherwise
@@ -104,11 +505,16 @@ class QueryCache:
             return False
         
         try:
-            redis_key = self._make_key(key)
             ttl_seconds = ttl or self.ttl
             
-            json_value = json.dumps(value, default=str)
-            self.redis.setex(redis_key, ttl_seconds, json_value)
+            pipe = self.redis.pipeline(transaction=False)
+            payload = self._queue_set(pipe, key, value, ttl_seconds, delta, tags)
+            pipe.execute()
+            
+            if self.local is not None:
+                # Other workers may hold the previous value
+                self.local.set(key, self.codec.decode(payload), ttl=ttl_seconds + self.stale_ttl)
+                self.bus.publish(self.prefix, keys=[key])
             
             logger.debug(f"Cache SET: {key} (TTL: {ttl_seconds}s)")
             return True
@@ -117,6 +523,135 @@ class QueryCache:
             logger.warning(f"Cache set error for {key}: {e}")
             return False
     
+    def _acquire_lock(self, key: str) -> Optional[str]:
+        """Try to take a key's recompute lock; returns the lock token if taken."""
+        token = uuid.uuid4().hex
+        
+        try:
+            if self.redis.set(self._lock_key(key), token, nx=True, px=int(self.lock_timeout * 1000)):
+                return token
+            return None
+        
+        except Exception as e:
+            # Without Redis locking, fall back to computing in this worker
+            logger.warning(f"Cache lock error for {key}: {e}")
+            return token
+    
+    def _release_lock(self, key: str, token: str):
+        """Release a key's recompute lock if this worker still holds it."""
+        try:
+            self.redis.eval(RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+        except Exception as e:
+            logger.warning(f"Cache unlock error for {key}: {e}")
+    
+    def _compute_and_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int],
+        tags: Optional[Iterable[str]]
+    ) -> Any:
+        """Run the computation and cache its result with its duration."""
+        started = time.monotonic()
+        value = compute()
+        self.set(key, value, ttl=ttl, delta=time.monotonic() - started, tags=tags)
+        return value
+    
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int],
+        tags: Optional[Iterable[str]],
+        token: str
+    ):
+        """Recompute a stale entry, releasing its lock afterwards."""
+        def refresh():
+            try:
+                self._compute_and_set(key, compute, ttl, tags)
+            except Exception as e:
+                logger.warning(f"Cache background refresh failed for {key}: {e}")
+            finally:
+                self._release_lock(key, token)
+        
+        _refresh_executor.submit(refresh)
+    
+    def _should_refresh_early(self, entry: Dict[str, Any], now: float) -> bool:
+        """
+        Decide whether to recompute a fresh entry before it expires (XFetch).
+        
+        Refreshes when now - delta * beta * ln(rand) >= expiry, i.e. with a
+        probability that rises towards expiry, sooner for costly values.
+        """
+        if self.early_refresh_beta <= 0 or not entry.get("delta"):
+            return False
+        
+        jitter = -entry["delta"] * self.early_refresh_beta * math.log(1.0 - random.random())
+        return now + jitter >= entry["fresh_until"]
+    
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> Any:
+        """
+        Get a cached value, computing it at most once across workers.
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value. With
+                     stale_ttl it may run in a background thread, so it must
+                     not depend on request-scoped resources (e.g. the
+                     request's DB session).
+            ttl: Custom TTL for this key (optional)
+            tags: Tags to register the key under (optional)
+        
+        Returns:
+            Cached or freshly computed value
+        """
+        if not self.enabled:
+            return compute()
+        
+        entry = self._get_entry(key)
+        now = time.time()
+        
+        if entry is not None:
+            if entry["fresh_until"] > now:
+                if self._should_refresh_early(entry, now):
+                    token = self._acquire_lock(key)
+                    if token:
+                        try:
+                            return self._compute_and_set(key, compute, ttl, tags)
+                        finally:
+                            self._release_lock(key, token)
+                return entry["value"]
+            
+            # Stale: serve it while one worker refreshes
+            token = self._acquire_lock(key)
+            if token:
+                self._refresh_in_background(key, compute, ttl, tags, token)
+            return entry["value"]
+        
+        token = self._acquire_lock(key)
+        if token:
+            try:
+                return self._compute_and_set(key, compute, ttl, tags)
+            finally:
+                self._release_lock(key, token)
+        
+        # Another worker is computing: wait for its result
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self._get_entry(key)
+            if entry is not None:
+                return entry["value"]
+        
+        logger.warning(f"Cache wait timed out for {key}, computing locally")
+        return self._compute_and_set(key, compute, ttl, tags)
+    
     def delete(self, key: str) -> bool:
         """
         Delete cached value.
@@ -133,6 +668,11 @@ class QueryCache:
         try:
             redis_key = self._make_key(key)
             result = self.redis.delete(redis_key)
+            
+            if self.local is not None:
+                self.local.delete(key)
+                self.bus.publish(self.prefix, keys=[key])
+            
             logger.debug(f"Cache DELETE: {key}")
             return result > 0
         
@@ -140,10 +680,60 @@ class QueryCache:
             logger.warning(f"Cache delete error for {key}: {e}")
             return False
     
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalidate every key registered under any of the tags.
+        
+        Costs one pipelined round trip to read the tag sets and one per
+        INVALIDATE_BATCH_SIZE keys to delete them (and the tag sets).
+        
+        Args:
+            tags: Tags to invalidate (e.g. business_tag(42))
+        
+        Returns:
+            Number of keys deleted
+        """
+        if not self.enabled or not tags:
+            return 0
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tag in tags:
+                pipe.smembers(self._tag_key(tag))
+            keys = self._decode_members(pipe.execute())
+            
+            if self.local is not None and keys:
+                self.local.delete(*keys)
+                self.bus.publish(self.prefix, keys=keys)
+            
+            count = 0
+            redis_keys = [self._make_key(key) for key in keys]
+            for start in range(0, len(redis_keys), INVALIDATE_BATCH_SIZE):
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.delete(*redis_keys[start:start + INVALIDATE_BATCH_SIZE])
+                count += pipe.execute()[0]
+            
+            # Keys cached under a tag after the SMEMBERS above stay registered
+            if keys:
+                pipe = self.redis.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.srem(self._tag_key(tag), *keys)
+                pipe.execute()
+            
+            logger.info(f"Cache INVALIDATE tags {', '.join(tags)} ({count} keys)")
+            return count
+        
+        except Exception as e:
+            logger.warning(f"Cache invalidate error for tags {', '.join(tags)}: {e}")
+            return 0
+    
     def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate all keys matching pattern.
         
+        Walks the keyspace with SCAN, so prefer invalidate_tags(); keys
+        produced by cached() are hashes and only match "*".
+        
         Args:
             pattern: Redis key pattern (e.g., "analytics:*")
         
@@ -153,31 +743,48 @@ class QueryCache:
         if not self.enabled:
             return 0
         
+        if self.local is not None:
+            self.local.delete_matching(pattern)
+            self.bus.publish(self.prefix, pattern=pattern)
+        
         try:
             redis_pattern = self._make_key(pattern)
-            keys = self.redis.keys(redis_pattern)
+            count = 0
+            batch = []
             
-            if keys:
-                count = self.redis.delete(*keys)
-                logger.info(f"Cache INVALIDATE: {pattern} ({count} keys)")
-                return count
+            for redis_key in self.redis.scan_iter(match=redis_pattern, count=INVALIDATE_BATCH_SIZE):
+                batch.append(redis_key)
+                if len(batch) >= INVALIDATE_BATCH_SIZE:
+                    count += self.redis.delete(*batch)
+                    batch = []
+            if batch:
+                count += self.redis.delete(*batch)
             
-            return 0
+            logger.info(f"Cache INVALIDATE: {pattern} ({count} keys)")
+            return count
         
         except Exception as e:
             logger.warning(f"Cache invalidate error for {pattern}: {e}")
             return 0
     
-    def cached(self, ttl: Optional[int] = None, key_func: Optional[Callable] = None):
+    def cached(
+        self,
+        ttl: Optional[int] = None,
+        key_func: Optional[Callable] = None,
+        tags: TagsSpec = None
+    ):
         """
         Decorator for caching function results.
         
+        Results are always tagged with family_tag(<function name>).
+        
         Args:
             ttl: Custom TTL for cached results (optional)
             key_func: Custom function to generate cache key from args/kwargs
+            tags: Extra tags, or a function of args/kwargs returning them
         
         Usage:
-            @query_cache.cached(ttl=60)
+            @query_cache.cached(ttl=60, tags=lambda business_id, date: [business_tag(business_id)])
             def get_analytics(business_id: int, date: str):
                 return expensive_query(business_id, date)
         """
@@ -196,16 +803,301 @@ class QueryCache:
                     }
                     cache_key = self._hash_key(key_data)
                 
-                # Try to get from cache
-                cached_result = self.get(cache_key)
-                if cached_result is not None:
-                    return cached_result
+                entry_tags = [family_tag(func.__name__)]
+                if callable(tags):
+                    entry_tags.extend(tags(*args, **kwargs))
+                elif tags:
+                    entry_tags.extend(tags)
                 
-                # Execute function and cache result
-                result = func(*args, **kwargs)
-                self.set(cache_key, result, ttl=ttl)
+                # Cached result, computed once across workers on a miss
+                return self.get_or_compute(
+                    cache_key, lambda: func(*args, **kwargs), ttl=ttl, tags=entry_tags
+                )
+            
+            return wrapper
+        return decorator
+    
+    # ------------------------------------------------------------------
+    # Async API (for async endpoints; same keys, envelope and local tier)
+    # ------------------------------------------------------------------
+    
+    async def _aget_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Async variant of _get_entry()."""
+        if self.local is not None:
+            entry = self.local.get(key)
+            if entry is not None:
+                return entry
+        
+        try:
+            return self._decode_entry(key, await self.aredis.get(self._make_key(key)))
+        except Exception as e:
+            logger.warning(f"Cache get error for {key}: {e}")
+            return None
+    
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Get cached value without blocking the event loop.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value or None if not found/expired
+        """
+        if not self.enabled:
+            return None
+        
+        entry = await self._aget_entry(key)
+        if entry is None or entry["fresh_until"] <= time.time():
+            return None
+        
+        return entry["value"]
+    
+    async def aset(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        delta: float = 0.0,
+        tags: Optional[Iterable[str]] = None
+    ) -> bool:
+        """
+        Set cached value without blocking the event loop.
+        
+        Args:
+            key: Cache key
+            value: Value to cache (anything the codec can encode)
+            ttl: Custom TTL for this key (optional)
+            delta: Seconds the value took to compute (drives early refresh)
+            tags: Tags to register the key under (optional)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled:
+            return False
+        
+        try:
+            ttl_seconds = ttl or self.ttl
+            
+            pipe = self.aredis.pipeline(transaction=False)
+            payload = self._queue_set(pipe, key, value, ttl_seconds, delta, tags)
+            await pipe.execute()
+            
+            if self.local is not None:
+                # Other workers may hold the previous value
+                self.local.set(key, self.codec.decode(payload), ttl=ttl_seconds + self.stale_ttl)
+                await self.bus.apublish(self.aredis, self.prefix, keys=[key])
+            
+            logger.debug(f"Cache SET: {key} (TTL: {ttl_seconds}s)")
+            return True
+        
+        except Exception as e:
+            logger.warning(f"Cache set error for {key}: {e}")
+            return False
+    
+    async def adelete(self, key: str) -> bool:
+        """Async variant of delete()."""
+        if not self.enabled:
+            return False
+        
+        try:
+            result = await self.aredis.delete(self._make_key(key))
+            
+            if self.local is not None:
+                self.local.delete(key)
+                await self.bus.apublish(self.aredis, self.prefix, keys=[key])
+            
+            logger.debug(f"Cache DELETE: {key}")
+            return result > 0
+        
+        except Exception as e:
+            logger.warning(f"Cache delete error for {key}: {e}")
+            return False
+    
+    async def ainvalidate_tags(self, *tags: str) -> int:
+        """Async variant of invalidate_tags()."""
+        if not self.enabled or not tags:
+            return 0
+        
+        try:
+            pipe = self.aredis.pipeline(transaction=False)
+            for tag in tags:
+                pipe.smembers(self._tag_key(tag))
+            keys = self._decode_members(await pipe.execute())
+            
+            if self.local is not None and keys:
+                self.local.delete(*keys)
+                await self.bus.apublish(self.aredis, self.prefix, keys=keys)
+            
+            count = 0
+            redis_keys = [self._make_key(key) for key in keys]
+            for start in range(0, len(redis_keys), INVALIDATE_BATCH_SIZE):
+                pipe = self.aredis.pipeline(transaction=False)
+                pipe.delete(*redis_keys[start:start + INVALIDATE_BATCH_SIZE])
+                count += (await pipe.execute())[0]
+            
+            if keys:
+                pipe = self.aredis.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.srem(self._tag_key(tag), *keys)
+                await pipe.execute()
+            
+            logger.info(f"Cache INVALIDATE tags {', '.join(tags)} ({count} keys)")
+            return count
+        
+        except Exception as e:
+            logger.warning(f"Cache invalidate error for tags {', '.join(tags)}: {e}")
+            return 0
+    
+    async def _aacquire_lock(self, key: str) -> Optional[str]:
+        """Async variant of _acquire_lock()."""
+        token = uuid.uuid4().hex
+        
+        try:
+            if await self.aredis.set(self._lock_key(key), token, nx=True, px=int(self.lock_timeout * 1000)):
+                return token
+            return None
+        
+        except Exception as e:
+            logger.warning(f"Cache lock error for {key}: {e}")
+            return token
+    
+    async def _arelease_lock(self, key: str, token: str):
+        """Async variant of _release_lock()."""
+        try:
+            await self.aredis.eval(RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+        except Exception as e:
+            logger.warning(f"Cache unlock error for {key}: {e}")
+    
+    async def _acompute_and_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        tags: Optional[Iterable[str]]
+    ) -> Any:
+        """Await the computation and cache its result with its duration."""
+        started = time.monotonic()
+        value = await compute()
+        await self.aset(key, value, ttl=ttl, delta=time.monotonic() - started, tags=tags)
+        return value
+    
+    def _arefresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        tags: Optional[Iterable[str]],
+        token: str
+    ):
+        """Recompute a stale entry in a task, releasing its lock afterwards."""
+        async def refresh():
+            try:
+                await self._acompute_and_set(key, compute, ttl, tags)
+            except Exception as e:
+                logger.warning(f"Cache background refresh failed for {key}: {e}")
+            finally:
+                await self._arelease_lock(key, token)
+        
+        task = asyncio.create_task(refresh())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+    
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> Any:
+        """
+        Async variant of get_or_compute().
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument coroutine function producing the value.
+                     With stale_ttl it may run in a background task after the
+                     request finished, so it must not depend on
+                     request-scoped resources.
+            ttl: Custom TTL for this key (optional)
+            tags: Tags to register the key under (optional)
+        
+        Returns:
+            Cached or freshly computed value
+        """
+        if not self.enabled:
+            return await compute()
+        
+        entry = await self._aget_entry(key)
+        now = time.time()
+        
+        if entry is not None:
+            if entry["fresh_until"] > now:
+                if self._should_refresh_early(entry, now):
+                    token = await self._aacquire_lock(key)
+                    if token:
+                        try:
+                            return await self._acompute_and_set(key, compute, ttl, tags)
+                        finally:
+                            await self._arelease_lock(key, token)
+                return entry["value"]
+            
+            # Stale: serve it while one worker refreshes
+            token = await self._aacquire_lock(key)
+            if token:
+                self._arefresh_in_background(key, compute, ttl, tags, token)
+            return entry["value"]
+        
+        token = await self._aacquire_lock(key)
+        if token:
+            try:
+                return await self._acompute_and_set(key, compute, ttl, tags)
+            finally:
+                await self._arelease_lock(key, token)
+        
+        # Another worker is computing: wait for its result
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            entry = await self._aget_entry(key)
+            if entry is not None:
+                return entry["value"]
+        
+        logger.warning(f"Cache wait timed out for {key}, computing locally")
+        return await self._acompute_and_set(key, compute, ttl, tags)
+    
+    def acached(
+        self,
+        ttl: Optional[int] = None,
+        key_func: Optional[Callable] = None,
+        tags: TagsSpec = None
+    ):
+        """
+        Decorator for caching coroutine function results (async cached()).
+        
+        Usage:
+            @query_cache.acached(ttl=60, tags=lambda business_id: [business_tag(business_id)])
+            async def get_analytics(business_id: int):
+                return await expensive_query(business_id)
+        """
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                if key_func:
+                    cache_key = key_func(*args, **kwargs)
+                else:
+                    cache_key = self._hash_key({"func": func.__name__, "args": args, "kwargs": kwargs})
+                
+                entry_tags = [family_tag(func.__name__)]
+                if callable(tags):
+                    entry_tags.extend(tags(*args, **kwargs))
+                elif tags:
+                    entry_tags.extend(tags)
                 
-                return result
+                return await self.aget_or_compute(
+                    cache_key, lambda: func(*args, **kwargs), ttl=ttl, tags=entry_tags
+                )
             
             return wrapper
         return decorator
@@ -213,11 +1105,17 @@ class QueryCache:
 
 # Global query cache instances for different use cases
 
-# Analytics cache: 5 minutes (frequently updated)
-analytics_cache = QueryCache(ttl=300, prefix="analytics_cache")
+# Analytics cache: 5 minutes (frequently updated), hot entries kept in-process for 30s,
+# served up to 1 minute stale while refreshing
+analytics_cache = QueryCache(
+    ttl=300, prefix="analytics_cache", local_max_entries=1024, local_ttl=30, stale_ttl=60
+)
 
-# Dashboard cache: 1 minute (real-time data)
-dashboard_cache = QueryCache(ttl=60, prefix="dashboard_cache")
+# Dashboard cache: 1 minute (real-time data), hot entries kept in-process for 10s,
+# served up to 30 seconds stale while refreshing
+dashboard_cache = QueryCache(
+    ttl=60, prefix="dashboard_cache", local_max_entries=512, local_ttl=10, stale_ttl=30
+)
 
 # Strategy cache: 15 minutes (rarely changes)
 strategy_cache = QueryCache(ttl=900, prefix="strategy_cache")
@@ -233,7 +1131,10 @@ def cache_analytics_summary(business_id: int, date: str):
     Cache key generator for analytics summary.
     
     Usage:
-        @analytics_cache.cached(key_func=cache_analytics_summary)
+        @analytics_cache.cached(
+            key_func=cache_analytics_summary,
+            tags=lambda business_id, date: [business_tag(business_id)]
+        )
         def get_analytics_summary(business_id: int, date: str):
             # Expensive query...
     """
@@ -248,21 +1149,144 @@ def invalidate_business_cache(business_id: int):
     - Publishing new content
     - Syncing analytics
     - Updating strategies
+    
+    Only entries cached under business_tag(business_id) are found.
     """
-    patterns = [
-        f"analytics_cache:*:{business_id}:*",
-        f"dashboard_cache:*:{business_id}:*",
-        f"posts_cache:*:{business_id}:*"
-    ]
+    tag = business_tag(business_id)
     
+    # Each cache also clears its local tier on every worker
     total_deleted = 0
-    for pattern in patterns:
-        total_deleted += analytics_cache.invalidate_pattern(pattern)
+    for cache in (analytics_cache, dashboard_cache, strategy_cache, posts_cache):
+        total_deleted += cache.invalidate_tags(tag)
     
     logger.info(f"Invalidated {total_deleted} cache keys for business {business_id}")
     return total_deleted
 
 
+async def ainvalidate_business_cache(business_id: int):
+    """Async variant of invalidate_business_cache()."""
+    tag = business_tag(business_id)
+    
+    total_deleted = 0
+    for cache in (analytics_cache, dashboard_cache, strategy_cache, posts_cache):
+        total_deleted += await cache.ainvalidate_tags(tag)
+    
+    logger.info(f"Invalidated {total_deleted} cache keys for business {business_id}")
+    return total_deleted
+
+
+# Per-business data version, part of every cached analytics response's key
+DATA_VERSION_KEY = "data_version:business:{business_id}"
+
+
+def _initial_data_version() -> int:
+    """Versions start at the current time (ms), so a lost counter never reuses one."""
+    return int(time.time() * 1000)
+
+
+def business_data_version(business_id: int) -> Optional[int]:
+    """
+    Get a business's analytics data version.
+    
+    Cached analytics responses are keyed by this version, and every write
+    to the business's posts or analytics bumps it, so invalidation is a
+    single INCR and a response cached before a write is never served after
+    it (the old keys simply expire).
+    
+    Args:
+        business_id: Business ID
+    
+    Returns:
+        Current version, or None if Redis is unavailable (callers should
+        then bypass the cache)
+    """
+    if not analytics_cache.enabled:
+        return None
+    
+    key = DATA_VERSION_KEY.format(business_id=business_id)
+    try:
+        pipe = analytics_cache.redis.pipeline(transaction=False)
+        pipe.set(key, _initial_data_version(), nx=True)
+        pipe.get(key)
+        return int(pipe.execute()[1])
+    except Exception as e:
+        logger.warning(f"Failed to read data version for business {business_id}: {e}")
+        return None
+
+
+async def abusiness_data_version(business_id: int) -> Optional[int]:
+    """Async variant of business_data_version()."""
+    if not analytics_cache.enabled:
+        return None
+    
+    key = DATA_VERSION_KEY.format(business_id=business_id)
+    try:
+        pipe = analytics_cache.aredis.pipeline(transaction=False)
+        pipe.set(key, _initial_data_version(), nx=True)
+        pipe.get(key)
+        return int((await pipe.execute())[1])
+    except Exception as e:
+        logger.warning(f"Failed to read data version for business {business_id}: {e}")
+        return None
+
+
+def bump_business_data_version(business_id: int) -> Optional[int]:
+    """
+    Bump a business's analytics data version after its data changed.
+    
+    Args:
+        business_id: Business ID
+    
+    Returns:
+        New version, or None if Redis is unavailable
+    """
+    if not analytics_cache.enabled:
+        return None
+    
+    key = DATA_VERSION_KEY.format(business_id=business_id)
+    try:
+        pipe = analytics_cache.redis.pipeline(transaction=False)
+        pipe.set(key, _initial_data_version(), nx=True)
+        pipe.incr(key)
+        return pipe.execute()[1]
+    except Exception as e:
+        logger.warning(f"Failed to bump data version for business {business_id}: {e}")
+        return None
+
+
+async def abump_business_data_version(business_id: int) -> Optional[int]:
+    """Async variant of bump_business_data_version()."""
+    if not analytics_cache.enabled:
+        return None
+    
+    key = DATA_VERSION_KEY.format(business_id=business_id)
+    try:
+        pipe = analytics_cache.aredis.pipeline(transaction=False)
+        pipe.set(key, _initial_data_version(), nx=True)
+        pipe.incr(key)
+        return (await pipe.execute())[1]
+    except Exception as e:
+        logger.warning(f"Failed to bump data version for business {business_id}: {e}")
+        return None
+
+
+def versioned_cache_key(family: str, business_id: int, version: int, params: Dict[str, Any]) -> str:
+    """
+    Build the cache key of a business-scoped response.
+    
+    Args:
+        family: Endpoint or query family (e.g. "overview")
+        business_id: Business ID
+        version: Business data version
+        params: Request parameters the response depends on
+    
+    Returns:
+        Key like "overview:42:v1729584000123:<params hash>"
+    """
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:32]
+    return f"{family}:{business_id}:v{version}:{digest}"
+
+
 def invalidate_all_analytics():
     """
     Invalidate all analytics cache.
@@ -273,7 +1297,7 @@ def invalidate_all_analytics():
 
 
 # Example: Cached query function
-@analytics_cache.cached(ttl=300)
+@analytics_cache.cached(ttl=300, tags=lambda business_id, *args, **kwargs: [business_tag(business_id)])
 def get_cached_analytics_summary(business_id: int, start_date: str, end_date: str):
     """
     Example of a cached analytics query.
@@ -1,9 +1,11 @@
 """
 Redis Client Configuration
 
-Provides a singleton Redis client for caching, state management, and rate limiting.
+Provides a singleton Redis client for caching, state management, and rate limiting,
+plus a pooled asyncio client for use inside async endpoints.
 """
 import redis
+import redis.asyncio as aioredis
 from typing import Optional
 import logging
 from app.core.config import settings
@@ -23,6 +25,7 @@ class RedisClient:
     """
     
     _instance: Optional[redis.Redis] = None
+    _binary_instance: Optional[redis.Redis] = None
     
     @classmethod
     def get_client(cls) -> redis.Redis:
@@ -62,6 +65,33 @@ class RedisClient:
         
         return cls._instance
     
+    @classmethod
+    def get_binary_client(cls) -> redis.Redis:
+        """
+        Get or create a Redis client returning raw bytes.
+        
+        Used for binary payloads (e.g. compressed query cache values), which
+        the decoding client would fail to read.
+        
+        Returns:
+            Redis client without response decoding
+        """
+        if cls._binary_instance is None:
+            redis_url = getattr(settings, 'REDIS_URL', 'redis://localhost:6379/0')
+            
+            client = redis.from_url(
+                redis_url,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True,
+                health_check_interval=30
+            )
+            client.ping()
+            cls._binary_instance = client
+        
+        return cls._binary_instance
+    
     @classmethod
     def close(cls):
         """Close Redis connection (for graceful shutdown)."""
@@ -69,6 +99,77 @@ class RedisClient:
             cls._instance.close()
             cls._instance = None
             logger.info("Redis connection closed")
+        if cls._binary_instance:
+            cls._binary_instance.close()
+            cls._binary_instance = None
+
+
+class AsyncRedisClient:
+    """
+    Singleton asyncio Redis client for async endpoints.
+    
+    Calls on the sync client block the event loop (and every other request
+    on it) for a full round trip; this client awaits them instead. It is
+    created lazily without a ping, so connection errors surface on first
+    use, and shares one connection pool per process.
+    """
+    
+    _instance: Optional[aioredis.Redis] = None
+    _binary_instance: Optional[aioredis.Redis] = None
+    
+    # Connections kept by each async pool
+    MAX_CONNECTIONS = 50
+    
+    @classmethod
+    def _create(cls, decode_responses: bool) -> aioredis.Redis:
+        """Create an asyncio client with its own connection pool."""
+        redis_url = getattr(settings, 'REDIS_URL', 'redis://localhost:6379/0')
+        
+        pool = aioredis.ConnectionPool.from_url(
+            redis_url,
+            decode_responses=decode_responses,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+            health_check_interval=30,
+            max_connections=cls.MAX_CONNECTIONS
+        )
+        logger.info(f"Async Redis client created: {redis_url}")
+        return aioredis.Redis(connection_pool=pool)
+    
+    @classmethod
+    def get_client(cls) -> aioredis.Redis:
+        """
+        Get or create the asyncio Redis client.
+        
+        Returns:
+            asyncio Redis client backed by a connection pool
+        """
+        if cls._instance is None:
+            cls._instance = cls._create(decode_responses=True)
+        return cls._instance
+    
+    @classmethod
+    def get_binary_client(cls) -> aioredis.Redis:
+        """
+        Get or create the asyncio Redis client returning raw bytes.
+        
+        Returns:
+            asyncio Redis client without response decoding
+        """
+        if cls._binary_instance is None:
+            cls._binary_instance = cls._create(decode_responses=False)
+        return cls._binary_instance
+    
+    @classmethod
+    async def close(cls):
+        """Close the async clients and their pools (for graceful shutdown)."""
+        for attr in ("_instance", "_binary_instance"):
+            client = getattr(cls, attr)
+            if client:
+                await client.aclose()
+                setattr(cls, attr, None)
+        logger.info("Async Redis connections closed")
 
 
 # Convenience function for getting client
@@ -77,6 +178,21 @@ def get_redis_client() -> redis.Redis:
     return RedisClient.get_client()
 
 
+def get_binary_redis_client() -> redis.Redis:
+    """Get Redis client instance returning raw bytes."""
+    return RedisClient.get_binary_client()
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    """Get asyncio Redis client instance."""
+    return AsyncRedisClient.get_client()
+
+
+def get_async_binary_redis_client() -> aioredis.Redis:
+    """Get asyncio Redis client instance returning raw bytes."""
+    return AsyncRedisClient.get_binary_client()
+
+
 # Test connection on module import
 try:
     redis_client = get_redis_client()
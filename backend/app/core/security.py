@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 
 # Import Redis client (will fallback to in-memory if Redis unavailable)
 try:
-    from app.core.redis_client import get_redis_client
+    from app.core.redis_client import get_redis_client, get_async_redis_client
     REDIS_AVAILABLE = True
 except Exception as e:
     logger.warning(f"Redis not available, using in-memory state storage: {e}")
@@ -106,6 +106,9 @@ class StateManager:
     """
     Manages OAuth state parameters for CSRF protection
     Uses Redis for production or in-memory dict for development/fallback
+    
+    Async endpoints use the a-prefixed methods, which go through the asyncio
+    Redis client instead of blocking the event loop.
     """
     
     def __init__(self):
@@ -119,6 +122,7 @@ class StateManager:
         if REDIS_AVAILABLE:
             try:
                 self.redis_client = get_redis_client()
+                self.async_redis_client = get_async_redis_client()
                 self.use_redis = True
                 logger.info("✅ StateManager using Redis for state storage")
             except Exception as e:
@@ -158,15 +162,7 @@ class StateManager:
             platform: Platform name (linkedin, twitter, meta)
             code_verifier: Optional PKCE code verifier (for Twitter)
         """
-        state_data = {
-            "business_id": business_id,
-            "platform": platform,
-            "created_at": datetime.utcnow().isoformat(),
-            "expires_at": (datetime.utcnow() + timedelta(seconds=self.state_expiry_seconds)).isoformat()
-        }
-        
-        if code_verifier:
-            state_data["code_verifier"] = code_verifier
+        state_data = self._build_state_data(business_id, platform, code_verifier)
         
         # Store in Redis or in-memory
         if self.use_redis:
@@ -187,6 +183,161 @@ class StateManager:
             self._states[state] = state_data
             logger.info(f"Stored state for {platform} OAuth (business_id={business_id}) [In-Memory]")
     
+    async def astore_state(
+        self,
+        state: str,
+        business_id: int,
+        platform: str,
+        code_verifier: Optional[str] = None
+    ) -> None:
+        """
+        Store an existing state parameter with associated data (async)
+        
+        Args:
+            state: State parameter (usually from OAuth service)
+            business_id: Business ID for OAuth connection
+            platform: Platform name (linkedin, twitter, meta)
+            code_verifier: Optional PKCE code verifier (for Twitter)
+        """
+        state_data = self._build_state_data(business_id, platform, code_verifier)
+        
+        if self.use_redis:
+            try:
+                await self.async_redis_client.setex(
+                    self._get_state_key(state),
+                    self.state_expiry_seconds,
+                    json.dumps(state_data)
+                )
+                logger.info(f"Stored state for {platform} OAuth (business_id={business_id}) [Redis]")
+            except Exception as e:
+                logger.error(f"Failed to store state in Redis: {e}")
+                self._states[state] = state_data
+                logger.warning("Stored state in memory as fallback")
+        else:
+            self._states[state] = state_data
+            logger.info(f"Stored state for {platform} OAuth (business_id={business_id}) [In-Memory]")
+    
+    def _build_state_data(self, business_id: int, platform: str, code_verifier: Optional[str]) -> Dict:
+        """Build the data stored for a state parameter"""
+        state_data = {
+            "business_id": business_id,
+            "platform": platform,
+            "created_at": datetime.utcnow().isoformat(),
+            "expires_at": (datetime.utcnow() + timedelta(seconds=self.state_expiry_seconds)).isoformat()
+        }
+        
+        if code_verifier:
+            state_data["code_verifier"] = code_verifier
+        
+        return state_data
+    
+    async def _apop_state(self, state: str) -> Dict:
+        """
+        Retrieve and delete (one-time use) state data without blocking
+        
+        Raises:
+            ValueError: If state is unknown or expired
+        """
+        if self.use_redis:
+            try:
+                # GET and DELETE in one MULTI/EXEC round trip
+                pipe = self.async_redis_client.pipeline(transaction=True)
+                pipe.get(self._get_state_key(state))
+                pipe.delete(self._get_state_key(state))
+                state_json, _ = await pipe.execute()
+                
+                if not state_json:
+                    logger.warning(f"Invalid or expired state parameter: {state[:8]}... [Redis]")
+                    raise ValueError("Invalid or expired state parameter")
+                
+                return json.loads(state_json)
+            
+            except ValueError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to retrieve state from Redis: {e}")
+                if state in self._states:
+                    return self._states.pop(state)
+                raise ValueError("Invalid or expired state parameter")
+        
+        self._cleanup_expired_states()
+        
+        if state not in self._states:
+            logger.warning(f"Invalid state parameter: {state[:8]}... [In-Memory]")
+            raise ValueError("Invalid or expired state parameter")
+        
+        return self._states.pop(state)
+    
+    def _check_expiry(self, state: str, state_data: Dict) -> None:
+        """
+        Validate expiration (double-check even with TTL)
+        
+        Raises:
+            ValueError: If the state has expired
+        """
+        expires_at = datetime.fromisoformat(state_data["expires_at"])
+        if datetime.utcnow() > expires_at:
+            logger.warning(f"Expired state parameter: {state[:8]}...")
+            raise ValueError("State parameter has expired")
+    
+    def _check_owner(self, state: str, state_data: Dict, business_id: int, platform: str) -> None:
+        """
+        Validate the state belongs to the business and platform
+        
+        Raises:
+            ValueError: If business_id or platform don't match
+        """
+        if state_data["business_id"] != business_id:
+            logger.warning(f"Business ID mismatch for state: {state[:8]}...")
+            raise ValueError("Business ID mismatch")
+        
+        if state_data["platform"] != platform:
+            logger.warning(f"Platform mismatch for state: {state[:8]}...")
+            raise ValueError("Platform mismatch")
+    
+    async def avalidate_state(self, state: str, business_id: int, platform: str) -> Dict:
+        """
+        Validate and retrieve state data (async)
+        
+        Args:
+            state: State parameter from OAuth callback
+            business_id: Business ID from callback
+            platform: Platform name from callback
+            
+        Returns:
+            State data including code_verifier (if present)
+            
+        Raises:
+            ValueError: If state is invalid, expired, or doesn't match
+        """
+        state_data = await self._apop_state(state)
+        self._check_expiry(state, state_data)
+        self._check_owner(state, state_data, business_id, platform)
+        
+        logger.info(f"Successfully validated state for {platform} OAuth (business_id={business_id})")
+        return state_data
+    
+    async def avalidate_state_no_business(self, state: str) -> Dict:
+        """
+        Validate and retrieve state data without business_id validation (async)
+        
+        Args:
+            state: State parameter from OAuth callback
+            
+        Returns:
+            State data including business_id, platform, and code_verifier (if present)
+            
+        Raises:
+            ValueError: If state is invalid or expired
+        """
+        state_data = await self._apop_state(state)
+        self._check_expiry(state, state_data)
+        
+        business_id = state_data.get("business_id")
+        platform = state_data.get("platform")
+        logger.info(f"Successfully validated state for {platform} OAuth (business_id={business_id})")
+        return state_data
+    
     def validate_state(self, state: str, business_id: int, platform: str) -> Dict:
         """
         Validate and retrieve state data
@@ -239,21 +390,8 @@ class StateManager:
             
             state_data = self._states.pop(state)  # Remove immediately (one-time use)
         
-        # Validate expiration (double-check even with TTL)
-        expires_at = datetime.fromisoformat(state_data["expires_at"])
-        if datetime.utcnow() > expires_at:
-            logger.warning(f"Expired state parameter: {state[:8]}...")
-            raise ValueError("State parameter has expired")
-        
-        # Validate business_id
-        if state_data["business_id"] != business_id:
-            logger.warning(f"Business ID mismatch for state: {state[:8]}...")
-            raise ValueError("Business ID mismatch")
-        
-        # Validate platform
-        if state_data["platform"] != platform:
-            logger.warning(f"Platform mismatch for state: {state[:8]}...")
-            raise ValueError("Platform mismatch")
+        self._check_expiry(state, state_data)
+        self._check_owner(state, state_data, business_id, platform)
         
         logger.info(f"Successfully validated state for {platform} OAuth (business_id={business_id})")
         return state_data
@@ -309,11 +447,7 @@ class StateManager:
             
             state_data = self._states.pop(state)  # Remove immediately (one-time use)
         
-        # Validate expiration (double-check even with TTL)
-        expires_at = datetime.fromisoformat(state_data["expires_at"])
-        if datetime.utcnow() > expires_at:
-            logger.warning(f"Expired state parameter: {state[:8]}...")
-            raise ValueError("State parameter has expired")
+        self._check_expiry(state, state_data)
         
         business_id = state_data.get("business_id")
         platform = state_data.get("platform")
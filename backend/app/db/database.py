@@ -1,7 +1,11 @@
 """
 Database session management and base model
 """
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
@@ -31,6 +35,17 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async session factory, bound to the async engine on first use.
+# Objects stay loaded after commit: lazy loads cannot run outside the
+# greenlet that drives an AsyncSession.
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+_async_engine: Optional[AsyncEngine] = None
+
 # Base class for models
 Base = declarative_base()
 
@@ -45,3 +60,85 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+
+def async_database_url(url: str) -> str:
+    """
+    Convert a sync PostgreSQL URL to its asyncpg equivalent.
+    
+    asyncpg takes ``ssl`` instead of libpq's ``sslmode`` query parameter.
+    
+    Args:
+        url: Database URL as configured (postgresql:// or postgresql+psycopg2://)
+    
+    Returns:
+        postgresql+asyncpg:// URL
+    """
+    parsed = make_url(url)
+    if not parsed.drivername.startswith("postgresql"):
+        return url
+    
+    query = dict(parsed.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    
+    return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async database engine, creating it on first use.
+    
+    Created lazily so that processes which never touch it (Celery workers,
+    scripts) do not need the asyncpg driver. Pool settings mirror the sync
+    engine; the two pools are separate.
+    """
+    global _async_engine
+    
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL),
+            pool_size=10,
+            max_overflow=20,
+            pool_timeout=30,
+            pool_recycle=3600,
+            pool_pre_ping=True,
+            echo=settings.DEBUG,
+            connect_args={
+                "timeout": 10,
+                "server_settings": {"application_name": "ai-growth-manager"},
+            }
+        )
+        AsyncSessionLocal.configure(bind=_async_engine)
+    
+    return _async_engine
+
+
+async def dispose_async_engine():
+    """Close the async engine's pooled connections (application shutdown)."""
+    global _async_engine
+    
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+def new_async_session() -> AsyncSession:
+    """
+    Create an async session outside a request (use as ``async with``).
+    """
+    get_async_engine()
+    return AsyncSessionLocal()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for getting an async database session
+    Use in FastAPI endpoints with Depends(get_async_db)
+    
+    Sync services can run on the session's connection with
+    ``await db.run_sync(lambda session: Service(session).method())``.
+    """
+    async with new_async_session() as db:
+        yield db
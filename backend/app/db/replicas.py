@@ -0,0 +1,254 @@
+"""
+Read Replica Routing
+
+Routes read-only sessions to streaming replicas of the primary database.
+
+Each replica's replication lag is measured at most once per
+DATABASE_REPLICA_CHECK_INTERVAL seconds per process. Sessions go to the
+next replica (round robin) whose lag is within
+DATABASE_REPLICA_MAX_LAG_SECONDS; when none qualifies (no replicas
+configured, or all unreachable or behind) they fall back to the primary.
+
+Read sessions may see data up to the maximum lag old and must not write.
+
+Usage:
+    @router.get("/overview")
+    async def overview(db: AsyncSession = Depends(get_async_read_db)):
+        ...
+"""
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_database_url,
+    engine as primary_engine,
+    get_async_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary. 0 when it has replayed all
+# the WAL it received (an idle primary writes no new transactions) or when
+# the server is not in recovery; NULL when it has not replayed anything yet.
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class Replica:
+    """A replica URL with its lazily created engines and last lag check."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.name = make_url(url).host or url
+        self.engine: Optional[Engine] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.lag: Optional[float] = None  # None: unreachable or unknown
+        self.checked_at: Optional[float] = None
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for read-only sessions.
+
+    Usage:
+        router = ReplicaRouter(["postgresql://replica-1/app"], max_lag=10.0)
+        session = SessionLocal(bind=router.get_engine())
+    """
+
+    def __init__(self, urls: List[str], max_lag: float = 10.0, check_interval: float = 5.0):
+        """
+        Initialize the router.
+
+        Args:
+            urls: Replica database URLs (sync form, like DATABASE_URL)
+            max_lag: Replication lag in seconds above which a replica is skipped
+            check_interval: Seconds between lag checks of a replica
+        """
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def _rotation(self) -> List[Replica]:
+        """Replicas in round-robin order, starting one further each call."""
+        start = next(self._counter) % len(self.replicas)
+        return self.replicas[start:] + self.replicas[:start]
+
+    def _needs_check(self, replica: Replica) -> bool:
+        return replica.checked_at is None or time.monotonic() - replica.checked_at >= self.check_interval
+
+    def _usable(self, replica: Replica) -> bool:
+        return replica.lag is not None and replica.lag <= self.max_lag
+
+    def _record(self, replica: Replica, lag: Optional[float]):
+        was_usable = self._usable(replica)
+        replica.lag = float(lag) if lag is not None else None
+        replica.checked_at = time.monotonic()
+
+        if was_usable and not self._usable(replica):
+            logger.warning(f"Read replica {replica.name} taken out of rotation (lag: {replica.lag})")
+        elif not was_usable and self._usable(replica):
+            logger.info(f"Read replica {replica.name} in rotation (lag: {replica.lag:.1f}s)")
+
+    def _sync_engine(self, replica: Replica) -> Engine:
+        with self._lock:
+            if replica.engine is None:
+                replica.engine = create_engine(
+                    replica.url,
+                    pool_size=10,
+                    max_overflow=20,
+                    pool_timeout=30,
+                    pool_recycle=3600,
+                    pool_pre_ping=True,
+                    echo=settings.DEBUG,
+                    connect_args={
+                        "connect_timeout": 5,
+                        "application_name": "ai-growth-manager-read",
+                    }
+                )
+            return replica.engine
+
+    def _async_engine(self, replica: Replica) -> AsyncEngine:
+        with self._lock:
+            if replica.async_engine is None:
+                replica.async_engine = create_async_engine(
+                    async_database_url(replica.url),
+                    pool_size=10,
+                    max_overflow=20,
+                    pool_timeout=30,
+                    pool_recycle=3600,
+                    pool_pre_ping=True,
+                    echo=settings.DEBUG,
+                    connect_args={
+                        "timeout": 5,
+                        "server_settings": {"application_name": "ai-growth-manager-read"},
+                    }
+                )
+            return replica.async_engine
+
+    def check(self, replica: Replica) -> Optional[float]:
+        """Measure a replica's lag over its sync engine (None if unreachable)."""
+        try:
+            with self._sync_engine(replica).connect() as conn:
+                lag = conn.execute(LAG_QUERY).scalar()
+        except Exception as e:
+            logger.warning(f"Read replica {replica.name} lag check failed: {e}")
+            lag = None
+
+        self._record(replica, lag)
+        return replica.lag
+
+    async def acheck(self, replica: Replica) -> Optional[float]:
+        """Measure a replica's lag over its async engine (None if unreachable)."""
+        try:
+            async with self._async_engine(replica).connect() as conn:
+                lag = (await conn.execute(LAG_QUERY)).scalar()
+        except Exception as e:
+            logger.warning(f"Read replica {replica.name} lag check failed: {e}")
+            lag = None
+
+        self._record(replica, lag)
+        return replica.lag
+
+    def choose(self) -> Optional[Replica]:
+        """Next replica within the lag budget, or None for the primary."""
+        if not self.enabled:
+            return None
+
+        for replica in self._rotation():
+            if self._needs_check(replica):
+                self.check(replica)
+            if self._usable(replica):
+                return replica
+
+        return None
+
+    async def achoose(self) -> Optional[Replica]:
+        """Async counterpart of choose()."""
+        if not self.enabled:
+            return None
+
+        for replica in self._rotation():
+            if self._needs_check(replica):
+                await self.acheck(replica)
+            if self._usable(replica):
+                return replica
+
+        return None
+
+    def get_engine(self) -> Engine:
+        """Engine for a read-only sync session."""
+        replica = self.choose()
+        return self._sync_engine(replica) if replica else primary_engine
+
+    async def aget_engine(self) -> AsyncEngine:
+        """Engine for a read-only async session."""
+        replica = await self.achoose()
+        return self._async_engine(replica) if replica else get_async_engine()
+
+    async def dispose(self):
+        """Close every replica connection pool (application shutdown)."""
+        for replica in self.replicas:
+            if replica.engine is not None:
+                replica.engine.dispose()
+                replica.engine = None
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+                replica.async_engine = None
+
+
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_REPLICA_CHECK_INTERVAL,
+)
+
+
+def get_read_db() -> Iterator[Session]:
+    """
+    Dependency for a read-only database session
+    Use in FastAPI endpoints with Depends(get_read_db)
+    """
+    db = SessionLocal(bind=replica_router.get_engine())
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def async_read_session() -> AsyncIterator[AsyncSession]:
+    """Read-only async session outside a request (use as ``async with``)."""
+    async with AsyncSessionLocal(bind=await replica_router.aget_engine()) as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for a read-only async database session
+    Use in FastAPI endpoints with Depends(get_async_read_db)
+    """
+    async with async_read_session() as db:
+        yield db
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -99,6 +101,13 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to start background scheduler: {e}", exc_info=True)
     
+    # Start the pooled HTTP transport shared by publishers, OAuth and AI services
+    try:
+        from app.services.platform_fetchers.http_transport import get_shared_transport
+        get_shared_transport().start()
+    except Exception as e:
+        logger.error(f"Failed to start shared HTTP transport: {e}", exc_info=True)
+    
     logger.info("AI Growth Manager API started successfully")
 
 
@@ -119,6 +128,30 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Failed to shut down background scheduler: {e}", exc_info=True)
     
+    # Close pooled connections to the platform, OAuth and AI APIs
+    try:
+        from app.services.platform_fetchers.http_transport import close_shared_transport
+        # Closing joins the transport's loop thread; keep this loop responsive
+        await asyncio.to_thread(close_shared_transport)
+    except Exception as e:
+        logger.error(f"Failed to close platform HTTP transport: {e}", exc_info=True)
+    
+    # Close the async Redis connection pool
+    try:
+        from app.core.redis_client import AsyncRedisClient
+        await AsyncRedisClient.close()
+    except Exception as e:
+        logger.error(f"Failed to close async Redis client: {e}", exc_info=True)
+    
+    # Close the async database and read replica connection pools
+    try:
+        from app.db.database import dispose_async_engine
+        from app.db.replicas import replica_router
+        await replica_router.dispose()
+        await dispose_async_engine()
+    except Exception as e:
+        logger.error(f"Failed to close database engines: {e}", exc_info=True)
+    
     logger.info("AI Growth Manager API shut down complete")
 
 
@@ -2,8 +2,9 @@
 Content model - stores generated social media posts
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Enum, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Enum, Boolean, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 import enum
 
 from app.db.database import Base
@@ -55,6 +56,12 @@ class Content(Base):
     media_urls = Column(Text, nullable=True)  # JSON string of URLs
     hashtags = Column(Text, nullable=True)  # Comma-separated hashtags
     
+    # Full-text search document, maintained by Postgres (see app/services/text_search.py)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(text, '') || ' ' || coalesce(hashtags, ''))", persisted=True)
+    ))
+    
     # Scheduling
     status = Column(Enum(ContentStatus), default=ContentStatus.DRAFT, nullable=False)
     scheduled_for = Column(DateTime, nullable=True)
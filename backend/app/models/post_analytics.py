@@ -1,6 +1,6 @@
 """PostAnalytics model for storing post performance metrics."""
 
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, TIMESTAMP, Text, text
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, TIMESTAMP, Text, event, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from typing import Dict, Any
@@ -9,12 +9,19 @@ from app.db.database import Base
 
 
 class PostAnalytics(Base):
-    """PostAnalytics model for storing post performance metrics"""
+    """
+    PostAnalytics model for storing post performance metrics (fetch history).
+    
+    The table is range-partitioned by month on fetched_at, so the primary
+    key includes fetched_at. See PostAnalyticsSnapshot for the current
+    metrics of each post.
+    """
     
     __tablename__ = "post_analytics"
+    __table_args__ = {"postgresql_partition_by": "RANGE (fetched_at)"}
     
-    # Primary Key
-    id = Column(Integer, primary_key=True, index=True)
+    # Primary Key (id is unique on its own; fetched_at is the partition key)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     
     # Foreign Keys
     published_post_id = Column(Integer, ForeignKey("published_posts.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -45,7 +52,7 @@ class PostAnalytics(Base):
     click_through_rate = Column(Numeric(5, 2), nullable=False, default=0.0, server_default="0.0")  # clicks/impressions * 100
     
     # Metadata
-    fetched_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    fetched_at = Column(TIMESTAMP, primary_key=True, nullable=False, default=datetime.utcnow)
     platform_post_id = Column(String(255), nullable=True)  # Platform's internal post ID
     platform_post_url = Column(Text, nullable=True)
     
@@ -116,3 +123,26 @@ class PostAnalytics(Base):
     
     def __repr__(self):
         return f"<PostAnalytics(id={self.id}, post_id={self.published_post_id}, platform={self.platform}, engagement_rate={self.engagement_rate}%)>"
+
+
+@event.listens_for(PostAnalytics.__table__, "after_create")
+def create_initial_partitions(target, connection, **kw):
+    """
+    Partition a post_analytics table built by metadata.create_all.
+
+    scripts/init_db.py creates tables without Alembic. A partitioned table
+    without partitions rejects every insert, so create the default
+    partition and the current months' partitions, as the migration does.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+
+    # Imported here: the retention service imports this model
+    from app.services.analytics_retention import AnalyticsRetentionService
+
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {AnalyticsRetentionService.DEFAULT_PARTITION} "
+        f"PARTITION OF post_analytics DEFAULT"
+    ))
+    for _, statement in AnalyticsRetentionService.partition_statements():
+        connection.execute(text(statement))
@@ -0,0 +1,108 @@
+"""PostAnalyticsSnapshot model for the current metrics of each post."""
+
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, TIMESTAMP, Text, Index, text
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import Dict, Any
+
+from app.db.database import Base
+
+
+class PostAnalyticsSnapshot(Base):
+    """
+    Latest analytics of each published post (one row per post).
+    
+    post_analytics keeps the full fetch history for trends; this table is
+    upserted by the analytics sync with the newest fetch, so dashboard
+    queries read one row per post instead of scanning the history.
+    """
+    
+    __tablename__ = "post_analytics_snapshots"
+    __table_args__ = (
+        Index("idx_post_analytics_snapshots_business_platform", "business_id", "platform"),
+    )
+    
+    # Primary Key (one snapshot per post)
+    published_post_id = Column(Integer, ForeignKey("published_posts.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Foreign Keys
+    business_id = Column(Integer, ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False)
+    
+    # Platform
+    platform = Column(String(20), nullable=False)  # linkedin, twitter, facebook, instagram
+    
+    # Engagement Metrics
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    shares_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reactions_count = Column(Integer, nullable=False, default=0, server_default="0")
+    retweets_count = Column(Integer, nullable=False, default=0, server_default="0")
+    quote_tweets_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # Reach Metrics
+    impressions = Column(Integer, nullable=False, default=0, server_default="0")
+    reach = Column(Integer, nullable=False, default=0, server_default="0")
+    clicks = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # Video Metrics (optional)
+    video_views = Column(Integer, nullable=False, default=0, server_default="0")
+    video_watch_time = Column(Integer, nullable=False, default=0, server_default="0")  # seconds
+    
+    # Calculated Metrics
+    engagement_rate = Column(Numeric(5, 2), nullable=False, default=0.0, server_default="0.0")
+    click_through_rate = Column(Numeric(5, 2), nullable=False, default=0.0, server_default="0.0")
+    
+    # Metadata
+    fetched_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)  # fetch this snapshot came from
+    platform_post_id = Column(String(255), nullable=True)
+    platform_post_url = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, server_default=text("NOW()"))
+    updated_at = Column(TIMESTAMP, nullable=True, onupdate=datetime.utcnow)
+    
+    # Relationships
+    published_post = relationship("PublishedPost")
+    
+    @property
+    def total_engagement(self) -> int:
+        """Calculate total engagement (likes + comments + shares)."""
+        return self.likes_count + self.comments_count + self.shares_count
+    
+    @property
+    def total_interactions(self) -> int:
+        """Calculate total interactions including reactions and retweets."""
+        return (self.likes_count + self.comments_count + self.shares_count +
+                self.reactions_count + self.retweets_count + self.quote_tweets_count)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (same keys as PostAnalytics.to_dict; id is the post ID)."""
+        return {
+            "id": self.published_post_id,
+            "published_post_id": self.published_post_id,
+            "business_id": self.business_id,
+            "platform": self.platform,
+            "likes_count": self.likes_count,
+            "comments_count": self.comments_count,
+            "shares_count": self.shares_count,
+            "reactions_count": self.reactions_count,
+            "retweets_count": self.retweets_count,
+            "quote_tweets_count": self.quote_tweets_count,
+            "impressions": self.impressions,
+            "reach": self.reach,
+            "clicks": self.clicks,
+            "video_views": self.video_views,
+            "video_watch_time": self.video_watch_time,
+            "engagement_rate": float(self.engagement_rate),
+            "click_through_rate": float(self.click_through_rate),
+            "total_engagement": self.total_engagement,
+            "total_interactions": self.total_interactions,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "platform_post_id": self.platform_post_id,
+            "platform_post_url": self.platform_post_url,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+    
+    def __repr__(self):
+        return f"<PostAnalyticsSnapshot(post_id={self.published_post_id}, platform={self.platform}, engagement_rate={self.engagement_rate}%)>"
@@ -4,8 +4,9 @@ Published Post Model
 Tracks content published to social media platforms.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Boolean, ARRAY, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Boolean, ARRAY, ForeignKey, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from app.db.database import Base
 
 
@@ -30,6 +31,12 @@ class PublishedPost(Base):
     content_images = Column(ARRAY(Text), nullable=True)  # Future: array of image URLs
     content_links = Column(ARRAY(Text), nullable=True)   # Array of links shared
     
+    # Full-text search document, maintained by Postgres (see app/services/text_search.py)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', content_text)", persisted=True)
+    ))
+    
     # Platform Details
     platform = Column(String(50), nullable=False, index=True)  # 'linkedin', 'twitter', 'facebook'
     platform_post_id = Column(String(255), nullable=True)      # LinkedIn: 'urn:li:share:123'
@@ -33,7 +33,7 @@ class ScheduledPost(Base):
     
     # Scheduling Info
     scheduled_for = Column(TIMESTAMP, nullable=False, index=True)  # When to publish
-    status = Column(String(50), nullable=False, default="pending", index=True)  # pending, publishing, published, failed, cancelled
+    status = Column(String(50), nullable=False, default="pending", index=True)  # pending, queued, publishing, published, failed, cancelled, expired
     
     # Publishing Results (populated after publishing)
     published_post_id = Column(Integer, ForeignKey("published_posts.id"), nullable=True)
@@ -9,12 +9,14 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime
+import asyncio
 import logging
 from typing import Optional
 
 from app.db.database import SessionLocal
 from app.models.business import Business
 from app.services.platform_fetchers.analytics_sync_service import AnalyticsSyncService
+from app.services.platform_fetchers.http_transport import get_shared_transport
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +28,35 @@ def sync_all_businesses_job():
     """
     Background job to sync analytics for all businesses.
     
+    Dispatches the sync to the Celery ``analytics`` queue, one task per
+    shard of businesses. Every uvicorn worker runs this job, but the Redis
+    dispatch lock lets only one of them enqueue each hourly run. If Redis or
+    the broker is unavailable, falls back to syncing in this process.
+    """
+    try:
+        from app.tasks.analytics_tasks import dispatch_analytics_sync
+        
+        result = dispatch_analytics_sync()
+        if result.get("dispatched"):
+            logger.info(
+                f"Dispatched analytics sync run {result['run_key']} "
+                f"({result['businesses']} businesses, {result['shards']} shards)"
+            )
+        return
+        
+    except Exception as e:
+        logger.warning(f"Could not dispatch analytics sync to Celery, syncing in-process: {e}")
+    
+    sync_all_businesses_in_process()
+
+
+def sync_all_businesses_in_process():
+    """
+    Sync analytics for all businesses serially in the current process.
+    
     Runs periodically to fetch latest analytics data from all platforms
-    for all active businesses in the system.
+    for all active businesses in the system. Only posts that are due for a
+    sync are fetched (see SyncPlanner).
     """
     job_start = datetime.utcnow()
     logger.info("Starting scheduled analytics sync for all businesses")
@@ -50,11 +79,13 @@ def sync_all_businesses_job():
             try:
                 logger.info(f"Syncing analytics for business {business.id} ({business.name})")
                 
-                sync_service = AnalyticsSyncService(db)
-                result = sync_service.sync_business_analytics(
+                sync_service = AnalyticsSyncService(db, transport=get_shared_transport())
+                
+                # Only posts that are due, within each platform's run budget
+                result = asyncio.run(sync_service.sync_business_analytics_async(
                     business_id=business.id,
-                    limit=100  # Limit per platform to avoid overwhelming APIs
-                )
+                    due_only=True
+                ))
                 
                 total_synced += result["synced"]
                 total_failed += result["failed"]
@@ -97,8 +128,10 @@ def sync_business_job(business_id: int):
     
     db = SessionLocal()
     try:
-        sync_service = AnalyticsSyncService(db)
-        result = sync_service.sync_business_analytics(business_id=business_id)
+        sync_service = AnalyticsSyncService(db, transport=get_shared_transport())
+        result = asyncio.run(
+            sync_service.sync_business_analytics_async(business_id=business_id, due_only=True)
+        )
         
         logger.info(
             f"Business {business_id} sync complete: "
@@ -205,10 +238,14 @@ def get_scheduler_status():
     """
     global scheduler
     
+    from app.tasks.analytics_tasks import get_last_sync_report
+    last_distributed_sync = get_last_sync_report()
+    
     if scheduler is None:
         return {
             "running": False,
-            "jobs": []
+            "jobs": [],
+            "last_distributed_sync": last_distributed_sync
         }
     
     jobs = []
@@ -223,7 +260,8 @@ def get_scheduler_status():
     return {
         "running": scheduler.running,
         "jobs": jobs,
-        "state": str(scheduler.state)
+        "state": str(scheduler.state),
+        "last_distributed_sync": last_distributed_sync
     }
 
 
@@ -12,6 +12,7 @@ import json
 
 from app.core.config import settings
 from app.services.image_storage import ImageStorageService
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 # In-memory job tracking (replace with Redis in production)
 generation_jobs: Dict[str, Dict[str, Any]] = {}
@@ -105,7 +106,7 @@ class AIImageGenerator:
                     "modalities": ["image", "text"]
                 }
                 
-                async with httpx.AsyncClient(timeout=120.0) as client:
+                async with shared_http_client(timeout=120.0) as client:
                     response = await client.post(
                         "https://openrouter.ai/api/v1/chat/completions",
                         headers=headers,
@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional
 import httpx
 import json
 from app.core.config import settings
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 
 class AIService:
@@ -71,7 +72,7 @@ class AIService:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with shared_http_client(timeout=60.0) as client:
                 response = await client.post(
                     self.base_url,
                     headers=headers,
@@ -1,30 +1,40 @@
 """Analytics aggregator service - combines data from all platform fetchers."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, extract, func
 
-from app.models.post_analytics import PostAnalytics
+from app.models.post_analytics_snapshot import PostAnalyticsSnapshot
 from app.models.analytics_summary import AnalyticsSummary
 from app.models.published_post import PublishedPost
 from app.services.analytics_calculator import AnalyticsCalculator
+from app.services.analytics_rollup import AnalyticsRollupService
 
 
 class AnalyticsAggregator:
-    """Service for aggregating analytics data from all platforms."""
+    """
+    Service for aggregating analytics data from all platforms.
+    
+    Synchronous so the API can run it on an AsyncSession's connection:
+    ``await db.run_sync(lambda session: AnalyticsAggregator(session).get_overview(...))``
+    """
+    
+    # EXTRACT(dow ...) numbering: 0 = Sunday
+    POSTGRES_DAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
     
     def __init__(self, db: Session):
         self.db = db
         self.calculator = AnalyticsCalculator()
+        self.rollups = AnalyticsRollupService(db)
     
-    async def get_post_analytics(
+    def get_post_analytics(
         self,
         published_post_id: int
     ) -> Optional[Dict[str, Any]]:
-        """Get analytics for a single post."""
-        analytics = self.db.query(PostAnalytics).filter(
-            PostAnalytics.published_post_id == published_post_id
+        """Get the current analytics snapshot of a single post."""
+        analytics = self.db.query(PostAnalyticsSnapshot).filter(
+            PostAnalyticsSnapshot.published_post_id == published_post_id
         ).first()
         
         if not analytics:
@@ -42,7 +52,7 @@ class AnalyticsAggregator:
         
         return result
     
-    async def get_overview(
+    def get_overview(
         self,
         business_id: int,
         start_date: Optional[date] = None,
@@ -51,147 +61,103 @@ class AnalyticsAggregator:
     ) -> Dict[str, Any]:
         """
         Get comprehensive analytics overview for dashboard.
-        """
-        # Default to last 30 days if no dates provided
-        if not end_date:
-            end_date = date.today()
-        if not start_date:
-            start_date = end_date - timedelta(days=30)
         
-        # Build query
-        query = self.db.query(PostAnalytics).join(PublishedPost).filter(
-            PostAnalytics.business_id == business_id,
-            func.date(PostAnalytics.fetched_at) >= start_date,
-            func.date(PostAnalytics.fetched_at) <= end_date
-        )
-        
-        if platform and platform != 'all':
-            query = query.filter(PostAnalytics.platform == platform)
+        Covers posts published in the range, each counted once with its
+        latest metrics. The summary, platform breakdown and trends are read
+        from the daily rollups (see AnalyticsRollupService); top posts and
+        posting times are grouped in the database over the per-post
+        snapshots, never the fetch history.
+        """
+        start_date, end_date = self._default_range(start_date, end_date)
         
-        analytics_records = query.all()
+        # Platform breakdown (the overall summary is the sum of its rows)
+        platform_rows = self.rollups.get_platform_totals(business_id, start_date, end_date, platform)
         
-        if not analytics_records:
+        total_posts_all = sum(row.total_posts for row in platform_rows)
+        if total_posts_all == 0:
             return self._empty_overview(start_date, end_date)
         
-        # Convert to dicts for processing
-        analytics_list = []
-        for record in analytics_records:
-            data = record.to_dict()
-            # Add published_at from relationship
-            if record.published_post:
-                data["published_at"] = record.published_post.published_at
-                data["content_text"] = record.published_post.content_text
-                data["content_images"] = record.published_post.content_images
-                data["content_links"] = record.published_post.content_links
-            analytics_list.append(data)
-        
-        # Calculate overall summary
         summary = {
-            "total_posts": len(analytics_list),
-            "total_likes": sum(a["likes_count"] for a in analytics_list),
-            "total_comments": sum(a["comments_count"] for a in analytics_list),
-            "total_shares": sum(a["shares_count"] for a in analytics_list),
-            "total_impressions": sum(a["impressions"] for a in analytics_list),
-            "total_reach": sum(a["reach"] for a in analytics_list),
-            "total_clicks": sum(a["clicks"] for a in analytics_list),
+            "total_posts": total_posts_all,
+            "total_likes": sum(row.total_likes or 0 for row in platform_rows),
+            "total_comments": sum(row.total_comments or 0 for row in platform_rows),
+            "total_shares": sum(row.total_shares or 0 for row in platform_rows),
+            "total_impressions": sum(row.total_impressions or 0 for row in platform_rows),
+            "total_reach": sum(row.total_reach or 0 for row in platform_rows),
+            "total_clicks": sum(row.total_clicks or 0 for row in platform_rows),
         }
-        
-        if summary["total_impressions"] > 0:
-            total_engagement = summary["total_likes"] + summary["total_comments"] + summary["total_shares"]
-            summary["avg_engagement_rate"] = round(
-                (total_engagement / summary["total_impressions"]) * 100,
-                2
-            )
-        else:
-            summary["avg_engagement_rate"] = 0.0
-        
-        # Platform breakdown
-        platforms_data = {}
-        for record in analytics_list:
-            platform_key = record["platform"]
-            if platform_key not in platforms_data:
-                platforms_data[platform_key] = []
-            platforms_data[platform_key].append(record)
+        summary["avg_engagement_rate"] = self.calculator.calculate_engagement_rate(
+            summary["total_likes"],
+            summary["total_comments"],
+            summary["total_shares"],
+            summary["total_impressions"]
+        )
         
         by_platform = []
-        total_posts_all = len(analytics_list)
-        
-        for plat, plat_analytics in platforms_data.items():
-            plat_posts = len(plat_analytics)
-            plat_likes = sum(a["likes_count"] for a in plat_analytics)
-            plat_comments = sum(a["comments_count"] for a in plat_analytics)
-            plat_shares = sum(a["shares_count"] for a in plat_analytics)
-            plat_impressions = sum(a["impressions"] for a in plat_analytics)
-            plat_reach = sum(a["reach"] for a in plat_analytics)
-            
-            plat_engagement = plat_likes + plat_comments + plat_shares
-            plat_eng_rate = round(
-                (plat_engagement / plat_impressions * 100) if plat_impressions > 0 else 0.0,
-                2
-            )
-            
+        for row in platform_rows:
             by_platform.append({
-                "platform": plat,
-                "total_posts": plat_posts,
-                "total_likes": plat_likes,
-                "total_comments": plat_comments,
-                "total_shares": plat_shares,
-                "total_impressions": plat_impressions,
-                "total_reach": plat_reach,
-                "avg_engagement_rate": plat_eng_rate,
-                "percentage_of_total": round((plat_posts / total_posts_all) * 100, 1)
+                "platform": row.platform,
+                "total_posts": row.total_posts,
+                "total_likes": row.total_likes or 0,
+                "total_comments": row.total_comments or 0,
+                "total_shares": row.total_shares or 0,
+                "total_impressions": row.total_impressions or 0,
+                "total_reach": row.total_reach or 0,
+                "avg_engagement_rate": self.calculator.calculate_engagement_rate(
+                    row.total_likes or 0,
+                    row.total_comments or 0,
+                    row.total_shares or 0,
+                    row.total_impressions or 0
+                ),
+                "percentage_of_total": round((row.total_posts / total_posts_all) * 100, 1)
             })
         
         # Sort by engagement rate
         by_platform.sort(key=lambda x: x["avg_engagement_rate"], reverse=True)
         
-        # Calculate trends
-        trends = self.calculator.calculate_engagement_trends(analytics_list, period="daily")
+        # Daily trends by publish date
+        trends = self._format_trends(
+            self.rollups.get_trends(business_id, start_date, end_date, platform)
+        )
+        
+        filters = self._snapshot_filters(business_id, start_date, end_date, platform)
         
-        # Find top posts
-        top_posts_data = self.calculator.identify_top_posts(analytics_list, limit=10)
+        # Top posts by engagement rate
         top_posts = []
-        for post_data in top_posts_data:
+        for analytics, content_text, published_at in self._query_top_posts(filters, limit=10):
             top_posts.append({
-                "id": post_data.get("id"),
-                "published_post_id": post_data.get("published_post_id"),
-                "content_preview": post_data.get("content_text", "")[:100] + "..." if post_data.get("content_text") and len(post_data.get("content_text", "")) > 100 else post_data.get("content_text", ""),
-                "platform": post_data.get("platform"),
-                "published_at": post_data.get("published_at"),
-                "engagement_rate": post_data.get("engagement_rate"),
-                "likes_count": post_data.get("likes_count"),
-                "comments_count": post_data.get("comments_count"),
-                "shares_count": post_data.get("shares_count"),
-                "impressions": post_data.get("impressions"),
-                "platform_post_url": post_data.get("platform_post_url")
+                "id": analytics.published_post_id,
+                "published_post_id": analytics.published_post_id,
+                "content_preview": content_text[:100] + "..." if content_text and len(content_text) > 100 else (content_text or ""),
+                "platform": analytics.platform,
+                "published_at": published_at,
+                "engagement_rate": float(analytics.engagement_rate),
+                "likes_count": analytics.likes_count,
+                "comments_count": analytics.comments_count,
+                "shares_count": analytics.shares_count,
+                "impressions": analytics.impressions,
+                "platform_post_url": analytics.platform_post_url
             })
         
-        # Best posting times
-        best_times_data = self.calculator.find_best_posting_times(analytics_list)
+        # Best posting times: average engagement per weekday, and the best
+        # hour within each weekday
+        day_rows, day_hour_rows = self._query_posting_time_stats(filters)
+        
+        best_hours: Dict[int, Any] = {}
+        for row in day_hour_rows:
+            dow = int(row.dow)
+            if dow not in best_hours or row.avg_engagement_rate > best_hours[dow][1]:
+                best_hours[dow] = (int(row.hour), row.avg_engagement_rate)
         
-        # Convert to API format
         best_times = []
-        for day, stats in best_times_data.get("by_day", {}).items():
-            # Find best hour for this day
-            day_posts = [a for a in analytics_list if datetime.fromisoformat(str(a["published_at"]).replace('Z', '+00:00')).strftime("%A") == day]
-            best_hour = 12  # default
-            if day_posts:
-                hour_rates = {}
-                for post in day_posts:
-                    pub_at = datetime.fromisoformat(str(post["published_at"]).replace('Z', '+00:00'))
-                    hour = pub_at.hour
-                    if hour not in hour_rates:
-                        hour_rates[hour] = []
-                    hour_rates[hour].append(post["engagement_rate"])
-                if hour_rates:
-                    best_hour = max(hour_rates.items(), key=lambda x: sum(x[1])/len(x[1]))[0]
-            
+        for row in day_rows:
+            dow = int(row.dow)
             best_times.append({
-                "day_of_week": day,
-                "hour_of_day": best_hour,
-                "avg_engagement_rate": stats["avg_engagement_rate"],
-                "posts_count": stats["posts_count"],
-                "confidence_score": stats["confidence"]
+                "day_of_week": self.POSTGRES_DAY_NAMES[dow],
+                "hour_of_day": best_hours.get(dow, (12, None))[0],
+                "avg_engagement_rate": round(float(row.avg_engagement_rate or 0), 2),
+                "posts_count": row.posts_count,
+                "confidence_score": min(row.posts_count / 5.0, 1.0) * 100  # 5+ posts = 100% confidence
             })
         
         # Sort by engagement rate
@@ -207,29 +173,156 @@ class AnalyticsAggregator:
             "best_times": best_times[:7]  # Top 7 days
         }
     
-    async def get_platform_comparison(
+    def get_trends(
+        self,
+        business_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        platform: Optional[str] = None,
+        period: str = "daily"
+    ) -> List[Dict[str, Any]]:
+        """
+        Get engagement trends by publish day, week or month.
+        
+        Args:
+            business_id: Business ID
+            start_date: Range start (default: 30 days before end_date)
+            end_date: Range end (default: today)
+            platform: Platform filter (None or 'all' = every platform)
+            period: daily, weekly or monthly
+            
+        Returns:
+            Trend points ordered by date; weekly and monthly points are dated
+            by the first day of their period
+        """
+        start_date, end_date = self._default_range(start_date, end_date)
+        
+        return self._format_trends(
+            self.rollups.get_trends(business_id, start_date, end_date, platform, period=period)
+        )
+    
+    def _default_range(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Tuple[date, date]:
+        """Default to the last 30 days if no dates provided."""
+        if not end_date:
+            end_date = date.today()
+        if not start_date:
+            start_date = end_date - timedelta(days=30)
+        return start_date, end_date
+    
+    def _format_trends(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        """Convert grouped trend rows into trend points."""
+        trends = []
+        for row in rows:
+            likes = row.likes or 0
+            comments = row.comments or 0
+            shares = row.shares or 0
+            impressions = row.impressions or 0
+            
+            trends.append({
+                "date": row.day.date().isoformat() if isinstance(row.day, datetime) else str(row.day),
+                "engagement_rate": self.calculator.calculate_engagement_rate(likes, comments, shares, impressions),
+                "total_engagement": likes + comments + shares,
+                "impressions": impressions,
+                "posts_count": row.posts_count,
+                "likes": likes,
+                "comments": comments,
+                "shares": shares
+            })
+        return trends
+    
+    def _snapshot_filters(
         self,
         business_id: int,
         start_date: date,
-        end_date: date
+        end_date: date,
+        platform: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Build the snapshot filters for posts a business published in a range.
+        
+        The range is expressed on the raw published_at column (not
+        DATE(...)) so the (business_id, published_at) index can be used.
+        Queries using them must join PublishedPost.
+        """
+        filters = [
+            PostAnalyticsSnapshot.business_id == business_id,
+            PublishedPost.business_id == business_id,
+            PublishedPost.published_at >= datetime.combine(start_date, datetime.min.time()),
+            PublishedPost.published_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        ]
+        
+        if platform and platform != 'all':
+            filters.append(PostAnalyticsSnapshot.platform == platform)
+        
+        return filters
+    
+    def _query_top_posts(self, filters: List[Any], limit: int = 10) -> List[Any]:
+        """Get the highest engagement rate post snapshots with their post content."""
+        return self.db.query(
+            PostAnalyticsSnapshot,
+            PublishedPost.content_text,
+            PublishedPost.published_at
+        ).join(PublishedPost).filter(
+            *filters
+        ).order_by(PostAnalyticsSnapshot.engagement_rate.desc()).limit(limit).all()
+    
+    def _query_posting_time_stats(self, filters: List[Any]) -> Tuple[List[Any], List[Any]]:
+        """
+        Average engagement rate by publish weekday, and by weekday and hour.
+        
+        Returns:
+            (rows grouped by dow, rows grouped by dow and hour); dow follows
+            PostgreSQL (0 = Sunday)
+        """
+        dow = extract("dow", PublishedPost.published_at)
+        hour = extract("hour", PublishedPost.published_at)
+        
+        day_rows = self.db.query(
+            dow.label("dow"),
+            func.count(PostAnalyticsSnapshot.published_post_id).label("posts_count"),
+            func.avg(PostAnalyticsSnapshot.engagement_rate).label("avg_engagement_rate"),
+        ).join(PublishedPost).filter(*filters).group_by(dow).all()
+        
+        day_hour_rows = self.db.query(
+            dow.label("dow"),
+            hour.label("hour"),
+            func.avg(PostAnalyticsSnapshot.engagement_rate).label("avg_engagement_rate"),
+        ).join(PublishedPost).filter(*filters).group_by(dow, hour).all()
+        
+        return day_rows, day_hour_rows
+    
+    def get_platform_comparison(
+        self,
+        business_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
     ) -> Dict[str, Any]:
-        """Compare performance across all platforms."""
-        analytics_records = self.db.query(PostAnalytics).filter(
-            PostAnalytics.business_id == business_id,
-            func.date(PostAnalytics.fetched_at) >= start_date,
-            func.date(PostAnalytics.fetched_at) <= end_date
-        ).all()
-        
-        # Group by platform
-        by_platform = {}
-        for record in analytics_records:
-            platform = record.platform
-            if platform not in by_platform:
-                by_platform[platform] = []
-            by_platform[platform].append(record.to_dict())
-        
-        # Use calculator to compare
-        comparison = self.calculator.compare_platforms(by_platform)
+        """Compare performance across all platforms (read from the daily rollups)."""
+        start_date, end_date = self._default_range(start_date, end_date)
+        
+        platform_metrics = []
+        for row in self.rollups.get_platform_totals(business_id, start_date, end_date):
+            platform_metrics.append({
+                "platform": row.platform,
+                "total_posts": row.total_posts or 0,
+                "total_likes": row.total_likes or 0,
+                "total_comments": row.total_comments or 0,
+                "total_shares": row.total_shares or 0,
+                "total_impressions": row.total_impressions or 0,
+                "avg_engagement_rate": self.calculator.calculate_engagement_rate(
+                    row.total_likes or 0,
+                    row.total_comments or 0,
+                    row.total_shares or 0,
+                    row.total_impressions or 0
+                )
+            })
+        
+        # Use calculator to rank
+        comparison = self.calculator.rank_platforms(platform_metrics)
         
         return {
             "period_start": start_date,
@@ -237,7 +330,7 @@ class AnalyticsAggregator:
             **comparison
         }
     
-    async def get_best_times(
+    def get_best_times(
         self,
         business_id: int,
         platform: Optional[str] = None,
@@ -247,21 +340,22 @@ class AnalyticsAggregator:
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        query = self.db.query(PostAnalytics).join(PublishedPost).filter(
-            PostAnalytics.business_id == business_id,
-            func.date(PostAnalytics.fetched_at) >= start_date
+        # Select published_at in the join instead of lazy loading each post
+        query = self.db.query(
+            PostAnalyticsSnapshot,
+            PublishedPost.published_at
+        ).join(PublishedPost).filter(
+            PostAnalyticsSnapshot.business_id == business_id,
+            PublishedPost.published_at >= datetime.combine(start_date, datetime.min.time())
         )
         
         if platform and platform != 'all':
-            query = query.filter(PostAnalytics.platform == platform)
-        
-        analytics_records = query.all()
+            query = query.filter(PostAnalyticsSnapshot.platform == platform)
         
         analytics_list = []
-        for record in analytics_records:
+        for record, published_at in query.all():
             data = record.to_dict()
-            if record.published_post:
-                data["published_at"] = record.published_post.published_at
+            data["published_at"] = published_at
             analytics_list.append(data)
         
         best_times_data = self.calculator.find_best_posting_times(analytics_list)
@@ -300,7 +394,7 @@ class AnalyticsAggregator:
             "recommendations": recommendations
         }
     
-    async def generate_summary(
+    def generate_summary(
         self,
         business_id: int,
         period_type: str,
@@ -309,15 +403,10 @@ class AnalyticsAggregator:
         platform: str = "all"
     ) -> Dict[str, Any]:
         """Generate an analytics summary for a time period."""
-        query = self.db.query(PostAnalytics).filter(
-            PostAnalytics.business_id == business_id,
-            func.date(PostAnalytics.fetched_at) >= period_start,
-            func.date(PostAnalytics.fetched_at) <= period_end
+        query = self.db.query(PostAnalyticsSnapshot).join(PublishedPost).filter(
+            *self._snapshot_filters(business_id, period_start, period_end, platform)
         )
         
-        if platform != "all":
-            query = query.filter(PostAnalytics.platform == platform)
-        
         analytics_records = query.all()
         
         if not analytics_records:
@@ -309,7 +309,7 @@ class AnalyticsCalculator:
                 "insights": []
             }
         
-        platform_metrics = {}
+        platform_metrics = []
         
         for platform, analytics_list in analytics_by_platform.items():
             if not analytics_list:
@@ -327,7 +327,7 @@ class AnalyticsCalculator:
                 2
             )
             
-            platform_metrics[platform] = {
+            platform_metrics.append({
                 "platform": platform,
                 "total_posts": total_posts,
                 "total_likes": total_likes,
@@ -335,11 +335,21 @@ class AnalyticsCalculator:
                 "total_shares": total_shares,
                 "total_impressions": total_impressions,
                 "avg_engagement_rate": avg_engagement_rate
-            }
+            })
         
+        return AnalyticsCalculator.rank_platforms(platform_metrics)
+    
+    @staticmethod
+    def rank_platforms(
+        platform_metrics: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Rank per-platform totals by engagement rate.
+        Returns winner, rankings, and insights.
+        """
         # Rank platforms by engagement rate
         rankings = sorted(
-            platform_metrics.values(),
+            platform_metrics,
             key=lambda x: x["avg_engagement_rate"],
             reverse=True
         )
@@ -0,0 +1,216 @@
+"""Partition maintenance and downsampling of the post_analytics history."""
+
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import logging
+
+from sqlalchemy import delete, func, literal_column, select, text
+from sqlalchemy.orm import Session
+
+from app.models.post_analytics import PostAnalytics
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsRetentionService:
+    """
+    Keeps the post_analytics history (monthly range partitions on
+    fetched_at) bounded.
+
+    Every sync appends a row per post, so the history grows by
+    posts x 24 rows per day. Older points are worth less, so they are
+    downsampled by keeping only the last fetch of each post per bucket:
+    - older than 7 days: one point per day
+    - older than 90 days: one point per week
+
+    Metrics are cumulative counters, so the last point of a bucket is the
+    bucket's value. The latest row of every post is always the last of its
+    bucket and is never removed; the current metrics also live in
+    post_analytics_snapshots, which is not touched.
+
+    Usage:
+        retention = AnalyticsRetentionService(db)
+        retention.ensure_partitions()
+        retention.downsample()
+    """
+
+    # (minimum age, bucket kept per post), youngest first
+    RETENTION_TIERS: List[Tuple[timedelta, str]] = [
+        (timedelta(days=7), "day"),
+        (timedelta(days=90), "week"),
+    ]
+
+    # A daily run only re-scans this much history below each tier's cutoff
+    DOWNSAMPLE_LOOKBACK_DAYS = 14
+
+    # Monthly partitions created ahead of time
+    PARTITION_MONTHS_AHEAD = 2
+
+    # Catches rows for months without a partition
+    DEFAULT_PARTITION = "post_analytics_default"
+
+    def __init__(self, db: Session):
+        """
+        Initialize the retention service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    @staticmethod
+    def partition_name(month_start: date) -> str:
+        """Get the name of the partition holding a month."""
+        return f"post_analytics_{month_start:%Y_%m}"
+
+    @staticmethod
+    def bucket_start(moment: datetime, unit: str) -> datetime:
+        """
+        Truncate a timestamp to the start of its day or (Monday-based) week.
+
+        Args:
+            moment: Timestamp
+            unit: "day" or "week"
+
+        Returns:
+            Start of the bucket containing the timestamp
+        """
+        start = datetime.combine(moment.date(), datetime.min.time())
+        if unit == "week":
+            start -= timedelta(days=start.weekday())
+        return start
+
+    @classmethod
+    def partition_statements(
+        cls,
+        months_ahead: int = PARTITION_MONTHS_AHEAD,
+        now: Optional[datetime] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Get the DDL creating the current and upcoming monthly partitions.
+
+        Args:
+            months_ahead: Months after the current one to create
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            List of (partition name, CREATE TABLE IF NOT EXISTS statement)
+        """
+        month_start = (now or datetime.utcnow()).date().replace(day=1)
+        statements = []
+
+        for _ in range(months_ahead + 1):
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            name = cls.partition_name(month_start)
+            statements.append((
+                name,
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF post_analytics "
+                f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{next_month.isoformat()}')"
+            ))
+            month_start = next_month
+
+        return statements
+
+    def ensure_partitions(
+        self,
+        months_ahead: int = PARTITION_MONTHS_AHEAD,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create the monthly partitions of the current and upcoming months.
+
+        Rows for months without a partition land in DEFAULT_PARTITION,
+        which then blocks creating that month's partition, so this runs well
+        before the month starts.
+
+        Args:
+            months_ahead: Months after the current one to create
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Names of the partitions ensured
+        """
+        names = []
+        for name, statement in self.partition_statements(months_ahead, now):
+            self.db.execute(text(statement))
+            names.append(name)
+
+        self.db.commit()
+        logger.info(f"Ensured post_analytics partitions: {', '.join(names)}")
+
+        return names
+
+    def build_downsample_delete(self, unit: str, end: datetime, start: Optional[datetime] = None):
+        """
+        Build the DELETE keeping only the last fetch per post per bucket.
+
+        Args:
+            unit: Bucket size, "day" or "week"
+            end: Only rows fetched before this (bucket-aligned) time
+            start: Only rows fetched at or after this (bucket-aligned) time
+                   (None = all older history)
+
+        Returns:
+            DELETE ... USING statement
+        """
+        bucket = func.date_trunc(literal_column(f"'{unit}'"), PostAnalytics.fetched_at)
+
+        window = [PostAnalytics.fetched_at < end]
+        if start is not None:
+            window.append(PostAnalytics.fetched_at >= start)
+
+        ranked = select(
+            PostAnalytics.id,
+            PostAnalytics.fetched_at,
+            func.row_number().over(
+                partition_by=(PostAnalytics.published_post_id, bucket),
+                order_by=(PostAnalytics.fetched_at.desc(), PostAnalytics.id.desc())
+            ).label("position")
+        ).where(*window).subquery("ranked")
+
+        # Matching on fetched_at too lets the planner prune partitions
+        return delete(PostAnalytics).where(
+            PostAnalytics.id == ranked.c.id,
+            PostAnalytics.fetched_at == ranked.c.fetched_at,
+            ranked.c.position > 1
+        ).execution_options(synchronize_session=False)
+
+    def downsample(
+        self,
+        now: Optional[datetime] = None,
+        lookback_days: Optional[int] = DOWNSAMPLE_LOOKBACK_DAYS
+    ) -> Dict[str, int]:
+        """
+        Collapse old history points, one tier per transaction.
+
+        Args:
+            now: Current time (defaults to utcnow)
+            lookback_days: History below each tier's cutoff to scan
+                           (None = all of it, for the first run)
+
+        Returns:
+            Rows deleted per bucket unit, e.g. {"day": 1200, "week": 300}
+        """
+        now = now or datetime.utcnow()
+        deleted: Dict[str, int] = {}
+
+        for min_age, unit in self.RETENTION_TIERS:
+            end = self.bucket_start(now - min_age, unit)
+            start = None
+            if lookback_days is not None:
+                start = self.bucket_start(end - timedelta(days=lookback_days), unit)
+
+            try:
+                result = self.db.execute(self.build_downsample_delete(unit, end, start))
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+            deleted[unit] = result.rowcount or 0
+            logger.info(
+                f"Downsampled post_analytics before {end.isoformat()} to one point per {unit}: "
+                f"{deleted[unit]} rows removed"
+            )
+
+        return deleted
@@ -0,0 +1,431 @@
+"""Pre-aggregated analytics rollups (daily, weekly and monthly summaries)."""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+from datetime import date, timedelta
+import logging
+
+from sqlalchemy import Date, Integer, case, cast, delete, func, insert, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.models.analytics_summary import AnalyticsSummary
+from app.models.post_analytics_snapshot import PostAnalyticsSnapshot
+from app.models.published_post import PublishedPost
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsRollupService:
+    """
+    Maintains per-business, per-platform analytics rollups in
+    ``analytics_summaries``.
+
+    Daily rollups are keyed by publish day and built from the current
+    snapshot of each post published that day (PostAnalyticsSnapshot). They are refreshed
+    incrementally: after a sync writes analytics, only the days the synced
+    posts were published on are recomputed. Weekly (Monday-based) and
+    monthly rollups are derived from the daily rows of the affected periods.
+
+    Dashboard reads then sum a handful of rollup rows per platform instead of
+    scanning per-post analytics, so their cost does not depend on how many posts
+    or analytics rows a business has.
+
+    Rows with platform 'all' are left to AnalyticsAggregator.generate_summary
+    and are never read or written here.
+
+    Usage:
+        rollups = AnalyticsRollupService(db)
+        rollups.refresh_for_posts(synced_posts)
+        rows = rollups.get_platform_totals(business_id, start_date, end_date)
+    """
+
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    PERIOD_TYPES = (DAILY, WEEKLY, MONTHLY)
+
+    # Upper bound of the Numeric(5, 2) rate columns
+    MAX_RATE = 999.99
+
+    def __init__(self, db: Session):
+        """
+        Initialize the rollup service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    @classmethod
+    def period_start(cls, day: date, period_type: str) -> date:
+        """
+        Get the first day of the period a day belongs to.
+
+        Args:
+            day: Day inside the period
+            period_type: daily, weekly or monthly
+
+        Returns:
+            Period start (weeks start on Monday)
+        """
+        if period_type == cls.WEEKLY:
+            return day - timedelta(days=day.weekday())
+        if period_type == cls.MONTHLY:
+            return day.replace(day=1)
+        return day
+
+    @classmethod
+    def period_end(cls, period_start: date, period_type: str) -> date:
+        """
+        Get the last day of a period.
+
+        Args:
+            period_start: First day of the period
+            period_type: daily, weekly or monthly
+
+        Returns:
+            Period end (inclusive)
+        """
+        if period_type == cls.WEEKLY:
+            return period_start + timedelta(days=6)
+        if period_type == cls.MONTHLY:
+            next_month = (period_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+            return next_month - timedelta(days=1)
+        return period_start
+
+    @classmethod
+    def is_aligned(cls, start_date: date, end_date: date, period_type: str) -> bool:
+        """
+        Check whether a date range covers whole periods only.
+
+        Args:
+            start_date: Range start (inclusive)
+            end_date: Range end (inclusive)
+            period_type: daily, weekly or monthly
+
+        Returns:
+            True if the range starts on a period start and ends on a period end
+        """
+        return (
+            cls.period_start(start_date, period_type) == start_date
+            and cls.period_end(cls.period_start(end_date, period_type), period_type) == end_date
+        )
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def refresh_for_posts(self, posts: Iterable[PublishedPost]) -> int:
+        """
+        Refresh the rollups affected by new analytics for some posts.
+
+        Args:
+            posts: Posts whose analytics were just written
+
+        Returns:
+            Number of (business, day) pairs refreshed
+        """
+        days_by_business: Dict[int, Set[date]] = {}
+
+        for post in posts:
+            if post.published_at is None:
+                continue
+            days_by_business.setdefault(post.business_id, set()).add(post.published_at.date())
+
+        refreshed = 0
+        for business_id, days in days_by_business.items():
+            refreshed += self.refresh_days(business_id, days)
+
+        return refreshed
+
+    def refresh_days(self, business_id: int, days: Iterable[date]) -> int:
+        """
+        Recompute the daily rollups of some days, then the weekly and monthly
+        rollups containing them, in one transaction.
+
+        Args:
+            business_id: Business ID
+            days: Publish days to recompute
+
+        Returns:
+            Number of days refreshed
+        """
+        days = sorted(set(days))
+        if not days:
+            return 0
+
+        try:
+            # Serialize concurrent refreshes of the same business (e.g. the
+            # hourly sync and a manual refresh) so rows are not duplicated
+            self.db.execute(select(func.pg_advisory_xact_lock(literal(business_id))))
+
+            self._refresh_daily(business_id, days)
+            for period_type in (self.WEEKLY, self.MONTHLY):
+                period_starts = sorted({self.period_start(day, period_type) for day in days})
+                self._refresh_period(business_id, period_type, period_starts)
+
+            self.db.commit()
+
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Refreshed analytics rollups for business {business_id}: {len(days)} days")
+
+        return len(days)
+
+    def rebuild(self, business_id: int, start_date: date, end_date: date) -> int:
+        """
+        Recompute every rollup of a business in a date range (backfill or
+        repair after a failed refresh).
+
+        Args:
+            business_id: Business ID
+            start_date: First publish day to rebuild
+            end_date: Last publish day to rebuild
+
+        Returns:
+            Number of days refreshed
+        """
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        return self.refresh_days(business_id, days)
+
+    def _refresh_daily(self, business_id: int, days: List[date]):
+        """Replace the daily rollup rows of some days."""
+        self.db.execute(
+            delete(AnalyticsSummary).where(
+                AnalyticsSummary.business_id == business_id,
+                AnalyticsSummary.period_type == self.DAILY,
+                AnalyticsSummary.platform != "all",
+                AnalyticsSummary.period_start.in_(days)
+            ).execution_options(synchronize_session=False)
+        )
+        self.db.execute(self.build_daily_insert(business_id, days))
+
+    def _refresh_period(self, business_id: int, period_type: str, period_starts: List[date]):
+        """Replace weekly or monthly rollup rows, re-deriving them from the dailies."""
+        self.db.execute(
+            delete(AnalyticsSummary).where(
+                AnalyticsSummary.business_id == business_id,
+                AnalyticsSummary.period_type == period_type,
+                AnalyticsSummary.platform != "all",
+                AnalyticsSummary.period_start.in_(period_starts)
+            ).execution_options(synchronize_session=False)
+        )
+        self.db.execute(self.build_period_insert(business_id, period_type, period_starts))
+
+    def _rate(self, engagement, impressions):
+        """SQL engagement rate (percent), clamped to the column's range."""
+        return case(
+            (impressions > 0, func.least(func.round(engagement * 100.0 / impressions, 2), self.MAX_RATE)),
+            else_=0
+        )
+
+    def build_daily_insert(self, business_id: int, days: List[date]):
+        """
+        Build the INSERT ... SELECT computing daily rollups of some days.
+
+        The snapshots of the posts published on those days (one row per
+        post) are grouped by platform and publish day.
+        """
+        publish_day = cast(PublishedPost.published_at, Date)
+
+        latest = select(
+            PostAnalyticsSnapshot.published_post_id,
+            PostAnalyticsSnapshot.platform,
+            PostAnalyticsSnapshot.likes_count,
+            PostAnalyticsSnapshot.comments_count,
+            PostAnalyticsSnapshot.shares_count,
+            PostAnalyticsSnapshot.impressions,
+            PostAnalyticsSnapshot.reach,
+            PostAnalyticsSnapshot.clicks,
+            PostAnalyticsSnapshot.engagement_rate,
+            publish_day.label("day"),
+        ).join(
+            PublishedPost, PublishedPost.id == PostAnalyticsSnapshot.published_post_id
+        ).where(
+            PostAnalyticsSnapshot.business_id == business_id,
+            PublishedPost.business_id == business_id,
+            publish_day.in_(days)
+        ).subquery("latest")
+
+        engagement = func.sum(latest.c.likes_count + latest.c.comments_count + latest.c.shares_count)
+        impressions = func.sum(latest.c.impressions)
+
+        rollup = select(
+            literal(business_id).label("business_id"),
+            latest.c.platform,
+            literal(self.DAILY).label("period_type"),
+            latest.c.day.label("period_start"),
+            latest.c.day.label("period_end"),
+            func.count().label("total_posts"),
+            func.sum(latest.c.likes_count).label("total_likes"),
+            func.sum(latest.c.comments_count).label("total_comments"),
+            func.sum(latest.c.shares_count).label("total_shares"),
+            impressions.label("total_impressions"),
+            func.sum(latest.c.reach).label("total_reach"),
+            func.sum(latest.c.clicks).label("total_clicks"),
+            self._rate(engagement, impressions).label("avg_engagement_rate"),
+            cast(func.round(impressions * 1.0 / func.count()), Integer).label("avg_impressions"),
+            func.array_agg(
+                aggregate_order_by(latest.c.published_post_id, latest.c.engagement_rate.desc())
+            )[1].label("best_post_id"),
+            func.max(latest.c.engagement_rate).label("best_post_engagement_rate"),
+        ).group_by(latest.c.platform, latest.c.day)
+
+        return self._insert_from(rollup)
+
+    def build_period_insert(self, business_id: int, period_type: str, period_starts: List[date]):
+        """Build the INSERT ... SELECT deriving weekly or monthly rollups from dailies."""
+        unit = "week" if period_type == self.WEEKLY else "month"
+        truncated = func.date_trunc(literal_column(f"'{unit}'"), AnalyticsSummary.period_start)
+        period_start = cast(truncated, Date)
+        period_end = cast(truncated + literal_column(f"INTERVAL '1 {unit}'") - literal_column("INTERVAL '1 day'"), Date)
+
+        engagement = func.sum(
+            AnalyticsSummary.total_likes + AnalyticsSummary.total_comments + AnalyticsSummary.total_shares
+        )
+        impressions = func.sum(AnalyticsSummary.total_impressions)
+        posts = func.sum(AnalyticsSummary.total_posts)
+
+        rollup = select(
+            literal(business_id).label("business_id"),
+            AnalyticsSummary.platform,
+            literal(period_type).label("period_type"),
+            period_start.label("period_start"),
+            period_end.label("period_end"),
+            posts.label("total_posts"),
+            func.sum(AnalyticsSummary.total_likes).label("total_likes"),
+            func.sum(AnalyticsSummary.total_comments).label("total_comments"),
+            func.sum(AnalyticsSummary.total_shares).label("total_shares"),
+            impressions.label("total_impressions"),
+            func.sum(AnalyticsSummary.total_reach).label("total_reach"),
+            func.sum(AnalyticsSummary.total_clicks).label("total_clicks"),
+            self._rate(engagement, impressions).label("avg_engagement_rate"),
+            cast(func.round(impressions * 1.0 / func.nullif(posts, 0)), Integer).label("avg_impressions"),
+            func.array_agg(
+                aggregate_order_by(
+                    AnalyticsSummary.best_post_id,
+                    AnalyticsSummary.best_post_engagement_rate.desc().nullslast()
+                )
+            )[1].label("best_post_id"),
+            func.max(AnalyticsSummary.best_post_engagement_rate).label("best_post_engagement_rate"),
+        ).where(
+            AnalyticsSummary.business_id == business_id,
+            AnalyticsSummary.period_type == self.DAILY,
+            AnalyticsSummary.platform != "all",
+            period_start.in_(period_starts)
+        ).group_by(AnalyticsSummary.platform, period_start, period_end)
+
+        return self._insert_from(rollup)
+
+    def _insert_from(self, rollup):
+        """INSERT the rows of a rollup SELECT into analytics_summaries."""
+        return insert(AnalyticsSummary).from_select(
+            [
+                "business_id", "platform", "period_type", "period_start", "period_end",
+                "total_posts", "total_likes", "total_comments", "total_shares",
+                "total_impressions", "total_reach", "total_clicks",
+                "avg_engagement_rate", "avg_impressions",
+                "best_post_id", "best_post_engagement_rate",
+            ],
+            rollup
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _rollup_filters(
+        self,
+        business_id: int,
+        period_type: str,
+        start_date: date,
+        end_date: date,
+        platform: Optional[str] = None
+    ) -> List[Any]:
+        """Filters selecting the rollup rows of one period type in a range."""
+        filters = [
+            AnalyticsSummary.business_id == business_id,
+            AnalyticsSummary.period_type == period_type,
+            AnalyticsSummary.period_start >= start_date,
+            AnalyticsSummary.period_start <= end_date,
+        ]
+
+        if platform and platform != "all":
+            filters.append(AnalyticsSummary.platform == platform)
+        else:
+            filters.append(AnalyticsSummary.platform != "all")
+
+        return filters
+
+    def get_platform_totals(
+        self,
+        business_id: int,
+        start_date: date,
+        end_date: date,
+        platform: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Sum rollups per platform for posts published in a date range.
+
+        Whole months and weeks inside the range would also work, but the
+        daily rows of a range are already few (days x platforms), so they are
+        summed directly.
+
+        Returns:
+            Rows with platform, total_posts, total_likes, total_comments,
+            total_shares, total_impressions, total_reach and total_clicks
+        """
+        return self.db.query(
+            AnalyticsSummary.platform.label("platform"),
+            func.sum(AnalyticsSummary.total_posts).label("total_posts"),
+            func.sum(AnalyticsSummary.total_likes).label("total_likes"),
+            func.sum(AnalyticsSummary.total_comments).label("total_comments"),
+            func.sum(AnalyticsSummary.total_shares).label("total_shares"),
+            func.sum(AnalyticsSummary.total_impressions).label("total_impressions"),
+            func.sum(AnalyticsSummary.total_reach).label("total_reach"),
+            func.sum(AnalyticsSummary.total_clicks).label("total_clicks"),
+        ).filter(
+            *self._rollup_filters(business_id, self.DAILY, start_date, end_date, platform)
+        ).group_by(AnalyticsSummary.platform).all()
+
+    def get_trends(
+        self,
+        business_id: int,
+        start_date: date,
+        end_date: date,
+        platform: Optional[str] = None,
+        period: str = DAILY
+    ) -> List[Any]:
+        """
+        Sum rollups per day, week or month for posts published in a range.
+
+        Weekly and monthly points are read from the weekly/monthly rollups
+        when the range covers whole periods; otherwise the daily rows inside
+        the range are grouped by period so partial periods at the edges are
+        not over-counted.
+
+        Returns:
+            Rows with day, posts_count, likes, comments, shares and
+            impressions, ordered by day
+        """
+        if period not in self.PERIOD_TYPES:
+            period = self.DAILY
+
+        if period == self.DAILY or self.is_aligned(start_date, end_date, period):
+            bucket = AnalyticsSummary.period_start
+            filters = self._rollup_filters(business_id, period, start_date, end_date, platform)
+        else:
+            unit = "week" if period == self.WEEKLY else "month"
+            bucket = cast(func.date_trunc(literal_column(f"'{unit}'"), AnalyticsSummary.period_start), Date)
+            filters = self._rollup_filters(business_id, self.DAILY, start_date, end_date, platform)
+
+        return self.db.query(
+            bucket.label("day"),
+            func.sum(AnalyticsSummary.total_posts).label("posts_count"),
+            func.sum(AnalyticsSummary.total_likes).label("likes"),
+            func.sum(AnalyticsSummary.total_comments).label("comments"),
+            func.sum(AnalyticsSummary.total_shares).label("shares"),
+            func.sum(AnalyticsSummary.total_impressions).label("impressions"),
+        ).filter(*filters).group_by(bucket).order_by(bucket).all()
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 
 from app.core.config import settings
 from app.core.logging_config import get_logger, log_event
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 logger = get_logger(__name__)
 
@@ -109,7 +110,7 @@ class LinkedInOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.post(
                     self.TOKEN_URL,
                     data=data,
@@ -158,7 +159,7 @@ class LinkedInOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 # Fetch basic profile using legacy API
                 profile_response = await client.get(
                     self.ME_URL,
@@ -215,7 +216,7 @@ class LinkedInOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 # Get organizations where user has admin access
                 response = await client.get(
                     f"{self.ORGANIZATIONS_URL}?q=roleAssignee",
@@ -249,7 +250,7 @@ class LinkedInOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.post(
                     self.REVOKE_URL,
                     data=data,
@@ -27,6 +27,7 @@ from urllib.parse import urlencode
 
 from app.core.config import settings
 from app.core.logging_config import get_logger, log_event
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 logger = get_logger(__name__)
 
@@ -115,7 +116,7 @@ class MetaOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(self.TOKEN_URL, params=params)
                 response.raise_for_status()
                 
@@ -157,7 +158,7 @@ class MetaOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(self.TOKEN_URL, params=params)
                 response.raise_for_status()
                 
@@ -198,7 +199,7 @@ class MetaOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -242,7 +243,7 @@ class MetaOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -284,7 +285,7 @@ class MetaOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -334,7 +335,7 @@ class MetaOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -375,7 +376,7 @@ class MetaOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 
@@ -444,7 +445,7 @@ class MetaOAuthService:
         params = {"access_token": access_token}
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.delete(url, params=params)
                 response.raise_for_status()
                 logger.info("Successfully revoked Meta access token")
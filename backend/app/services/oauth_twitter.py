@@ -18,6 +18,7 @@ from datetime import datetime, timedelta
 
 from app.core.config import settings
 from app.core.logging_config import get_logger, log_event
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 logger = get_logger(__name__)
 
@@ -172,7 +173,7 @@ class TwitterOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.post(
                     self.TOKEN_URL,
                     data=data,
@@ -216,7 +217,7 @@ class TwitterOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.post(
                     self.TOKEN_URL,
                     data=data,
@@ -258,7 +259,7 @@ class TwitterOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.post(
                     self.REVOKE_URL,
                     data=data,
@@ -304,7 +305,7 @@ class TwitterOAuthService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client() as client:
                 response = await client.get(
                     self.USER_URL,
                     headers=headers,
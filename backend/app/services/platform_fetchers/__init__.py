@@ -1,15 +1,21 @@
 """Platform analytics fetchers package."""
 
 from .base_fetcher import BasePlatformFetcher
+from .http_transport import AsyncHTTPTransport, get_shared_transport, close_shared_transport
 from .linkedin_fetcher import LinkedInAnalyticsFetcher
 from .twitter_fetcher import TwitterAnalyticsFetcher
 from .meta_fetcher import MetaAnalyticsFetcher
+from .sync_planner import SyncPlanner
 from .analytics_sync_service import AnalyticsSyncService
 
 __all__ = [
     "BasePlatformFetcher",
+    "AsyncHTTPTransport",
+    "get_shared_transport",
+    "close_shared_transport",
     "LinkedInAnalyticsFetcher",
     "TwitterAnalyticsFetcher",
     "MetaAnalyticsFetcher",
+    "SyncPlanner",
     "AnalyticsSyncService",
 ]
@@ -1,19 +1,27 @@
 """Analytics sync service to orchestrate fetching analytics from all platforms."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+import asyncio
 import logging
+from sqlalchemy import Integer, TIMESTAMP, column, insert, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.query_cache import bump_business_data_version
 from app.db.database import get_db
 from app.models.business import Business
 from app.models.published_post import PublishedPost
 from app.models.post_analytics import PostAnalytics
+from app.models.post_analytics_snapshot import PostAnalyticsSnapshot
 from app.models.social_account import SocialAccount
+from app.services.analytics_rollup import AnalyticsRollupService
 from .linkedin_fetcher import LinkedInAnalyticsFetcher
 from .twitter_fetcher import TwitterAnalyticsFetcher
 from .meta_fetcher import MetaAnalyticsFetcher
-from .exceptions import PlatformAPIError, RateLimitError, AuthenticationError
+from .http_transport import AsyncHTTPTransport
+from .sync_planner import SyncPlanner
+from .exceptions import PlatformAPIError, RateLimitError, AuthenticationError, PostNotFoundError
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +38,30 @@ class AnalyticsSyncService:
     5. Returns summary of sync results (successes, failures, rate limits)
     """
     
-    def __init__(self, db: Session):
+    # Fetched posts are written in batches of this size (one transaction each)
+    BULK_WRITE_SIZE = 100
+    
+    def __init__(self, db: Session, transport: Optional[AsyncHTTPTransport] = None):
         """
         Initialize the sync service.
         
         Args:
             db: Database session
+            transport: Shared pooled HTTP transport handed to every fetcher
+                       (None = each fetcher uses its own requests session)
         """
         self.db = db
+        self.transport = transport
         self.fetchers: Dict[str, Any] = {}
+        # Posts written since the last rollup refresh
+        self._rollup_posts: List[PublishedPost] = []
         
     def sync_business_analytics(
         self,
         business_id: int,
         platforms: Optional[List[str]] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        due_only: bool = False
     ) -> Dict[str, Any]:
         """
         Sync analytics for all published posts of a business.
@@ -53,6 +70,8 @@ class AnalyticsSyncService:
             business_id: Business ID
             platforms: List of platforms to sync (None = all platforms)
             limit: Maximum number of posts to sync per platform
+            due_only: Only sync posts whose staleness interval has passed,
+                      capped at the per-platform run budget (see SyncPlanner)
             
         Returns:
             Dictionary with sync results:
@@ -80,71 +99,124 @@ class AnalyticsSyncService:
         self._initialize_fetchers(business_id)
         
         # Get published posts
-        query = self.db.query(PublishedPost).filter(
-            PublishedPost.business_id == business_id,
-            PublishedPost.status == "published"
-        )
+        posts = self._get_posts_to_sync(business_id, platforms, limit, due_only)
         
-        if platforms:
-            query = query.filter(PublishedPost.platform.in_(platforms))
+        # Initialize results
+        results = self._empty_sync_results(len(posts))
         
-        if limit:
-            query = query.limit(limit)
+        # Fetched analytics waiting for the next bulk write
+        pending: List[Tuple[PublishedPost, Dict[str, Any]]] = []
         
-        posts = query.all()
+        # Sync posts chunk by chunk (a chunk is one batch lookup on the platform)
+        for platform, chunk in self._chunk_posts(posts):
+            for post, analytics_data, error in self._fetch_posts_chunk(platform, chunk):
+                if error is None:
+                    pending.append((post, analytics_data))
+                    continue
+                
+                self._record_sync_result(results, post, error)
+                
+                # Stop syncing this platform if rate limited or unauthorized
+                if isinstance(error, (RateLimitError, AuthenticationError)):
+                    self.fetchers.pop(platform, None)
+            
+            if len(pending) >= self.BULK_WRITE_SIZE:
+                self._write_pending(results, pending)
+                pending = []
         
-        # Initialize results
-        results = {
-            "total_posts": len(posts),
-            "synced": 0,
-            "failed": 0,
-            "rate_limited": 0,
-            "by_platform": {},
-            "errors": []
-        }
+        self._write_pending(results, pending)
+        self._refresh_rollups()
         
-        # Sync each post
-        for post in posts:
-            platform = post.platform.lower()
-            
-            # Initialize platform results if needed
-            if platform not in results["by_platform"]:
-                results["by_platform"][platform] = {
-                    "synced": 0,
-                    "failed": 0,
-                    "rate_limited": 0
-                }
+        logger.info(f"Completed analytics sync for business {business_id}: "
+                   f"{results['synced']}/{results['total_posts']} successful")
+        
+        return results
+    
+    async def sync_business_analytics_async(
+        self,
+        business_id: int,
+        platforms: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        due_only: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sync analytics for all published posts of a business concurrently.
+        
+        Same contract as sync_business_analytics(), but platform fetches are
+        fanned out on worker threads with at most
+        ``fetcher.MAX_CONCURRENT_REQUESTS`` requests (or batch lookups) in
+        flight per platform. Results are written in bulk as they complete;
+        database access stays on the calling thread.
+        
+        Args:
+            business_id: Business ID
+            platforms: List of platforms to sync (None = all platforms)
+            limit: Maximum number of posts to sync per platform
+            due_only: Only sync posts whose staleness interval has passed,
+                      capped at the per-platform run budget (see SyncPlanner)
             
-            try:
-                # Fetch and save analytics
-                analytics_data = self._fetch_post_analytics(post)
-                self._save_analytics(post, analytics_data)
-                
-                # Update counts
-                results["synced"] += 1
-                results["by_platform"][platform]["synced"] += 1
-                
-                logger.info(f"Synced analytics for post {post.id} ({platform})")
-                
-            except RateLimitError as e:
-                results["rate_limited"] += 1
-                results["by_platform"][platform]["rate_limited"] += 1
-                error_msg = f"Rate limited on {platform} for post {post.id}: {str(e)}"
-                results["errors"].append(error_msg)
-                logger.warning(error_msg)
+        Returns:
+            Dictionary with sync results (same shape as sync_business_analytics)
+        """
+        logger.info(f"Starting async analytics sync for business {business_id}")
+        
+        # Verify business exists
+        business = self.db.query(Business).filter(Business.id == business_id).first()
+        if not business:
+            raise ValueError(f"Business {business_id} not found")
+        
+        # Initialize fetchers for this business
+        self._initialize_fetchers(business_id)
+        
+        # Get published posts
+        posts = self._get_posts_to_sync(business_id, platforms, limit, due_only)
+        
+        # Initialize results
+        results = self._empty_sync_results(len(posts))
+        
+        # One semaphore per platform, sized from the fetcher's rate limits
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        for platform in {post.platform.lower() for post in posts}:
+            fetcher = self.fetchers.get(platform)
+            max_concurrent = getattr(fetcher, "MAX_CONCURRENT_REQUESTS", 1)
+            semaphores[platform] = asyncio.Semaphore(max(1, int(max_concurrent)))
+        
+        async def fetch(platform: str, chunk: List[PublishedPost]):
+            async with semaphores[platform]:
+                # Runs after waiting for a slot, so chunks queued behind a rate
+                # limit or rejected token see that the fetcher was dropped.
+                outcomes = await asyncio.to_thread(self._fetch_posts_chunk, platform, chunk)
                 
-                # Stop syncing this platform if rate limited
-                if platform in self.fetchers:
-                    del self.fetchers[platform]
+                if any(isinstance(error, (RateLimitError, AuthenticationError)) for _, _, error in outcomes):
+                    # Stop dispatching further requests to this platform
+                    self.fetchers.pop(platform, None)
                 
-            except Exception as e:
-                results["failed"] += 1
-                results["by_platform"][platform]["failed"] += 1
-                error_msg = f"Failed to sync post {post.id} ({platform}): {str(e)}"
-                results["errors"].append(error_msg)
-                logger.error(error_msg)
+                return outcomes
         
-        logger.info(f"Completed analytics sync for business {business_id}: "
+        tasks = [
+            asyncio.create_task(fetch(platform, chunk))
+            for platform, chunk in self._chunk_posts(posts)
+        ]
+        
+        # Queue each chunk's results as soon as its fetch completes and write
+        # them in bulk while other fetches are still in flight
+        pending: List[Tuple[PublishedPost, Dict[str, Any]]] = []
+        
+        for next_done in asyncio.as_completed(tasks):
+            for post, analytics_data, error in await next_done:
+                if error is None:
+                    pending.append((post, analytics_data))
+                else:
+                    self._record_sync_result(results, post, error)
+            
+            if len(pending) >= self.BULK_WRITE_SIZE:
+                self._write_pending(results, pending)
+                pending = []
+        
+        self._write_pending(results, pending)
+        self._refresh_rollups()
+        
+        logger.info(f"Completed async analytics sync for business {business_id}: "
                    f"{results['synced']}/{results['total_posts']} successful")
         
         return results
@@ -179,6 +251,8 @@ class AnalyticsSyncService:
             # Fetch and save analytics
             analytics_data = self._fetch_post_analytics(post)
             analytics_record = self._save_analytics(post, analytics_data)
+            self._rollup_posts.append(post)
+            self._refresh_rollups()
             
             return {
                 "success": True,
@@ -197,6 +271,186 @@ class AnalyticsSyncService:
                 "error": str(e)
             }
     
+    def _get_posts_to_sync(
+        self,
+        business_id: int,
+        platforms: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        due_only: bool = False
+    ) -> List[PublishedPost]:
+        """
+        Get published posts of a business that should be synced.
+        
+        Posts are prioritized by age and staleness, so a limit never starves
+        new posts.
+        
+        Args:
+            business_id: Business ID
+            platforms: List of platforms to include (None = all platforms)
+            limit: Maximum number of posts to return per platform
+            due_only: Only include posts that are due for a sync
+            
+        Returns:
+            List of PublishedPost model instances
+        """
+        return SyncPlanner(self.db).plan(
+            business_id,
+            platforms=platforms or None,
+            limit=limit,
+            due_only=due_only
+        )
+    
+    def _chunk_posts(
+        self,
+        posts: List[PublishedPost]
+    ) -> List[Tuple[str, List[PublishedPost]]]:
+        """
+        Group posts by platform and split them into batch-sized chunks.
+        
+        Chunk size is the platform fetcher's MAX_BATCH_SIZE. Posts without a
+        platform post ID always get a chunk of their own.
+        
+        Args:
+            posts: Posts to sync
+            
+        Returns:
+            List of (platform, posts) tuples
+        """
+        by_platform: Dict[str, List[PublishedPost]] = {}
+        chunks: List[Tuple[str, List[PublishedPost]]] = []
+        
+        for post in posts:
+            platform = post.platform.lower()
+            if post.platform_post_id:
+                by_platform.setdefault(platform, []).append(post)
+            else:
+                chunks.append((platform, [post]))
+        
+        for platform, platform_posts in by_platform.items():
+            batch_size = max(1, int(getattr(self.fetchers.get(platform), "MAX_BATCH_SIZE", 1)))
+            for start in range(0, len(platform_posts), batch_size):
+                chunks.append((platform, platform_posts[start:start + batch_size]))
+        
+        return chunks
+    
+    def _fetch_posts_chunk(
+        self,
+        platform: str,
+        posts: List[PublishedPost]
+    ) -> List[Tuple[PublishedPost, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Fetch analytics for a chunk of posts from the same platform.
+        
+        Single posts use fetch_post_analytics(); larger chunks use the
+        fetcher's batch lookup. Never raises and never touches the database,
+        so it is safe to run on a worker thread.
+        
+        Args:
+            platform: Platform of all posts in the chunk
+            posts: Posts to fetch
+            
+        Returns:
+            List of (post, analytics_data, error) tuples, one per post
+        """
+        fetcher = self.fetchers.get(platform)
+        if fetcher is None:
+            error = PlatformAPIError(
+                f"No fetcher initialized for platform {platform}",
+                platform=platform
+            )
+            return [(post, None, error) for post in posts]
+        
+        if len(posts) == 1:
+            post = posts[0]
+            try:
+                analytics_data = fetcher.fetch_post_analytics(
+                    post_id=str(post.id),
+                    platform_post_id=post.platform_post_id
+                )
+                return [(post, analytics_data, None)]
+            except Exception as e:
+                logger.error(f"Failed to fetch analytics for post {post.id}: {e}")
+                return [(post, None, e)]
+        
+        try:
+            batch = fetcher.fetch_posts_analytics_batch(
+                [post.platform_post_id for post in posts]
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch {platform} analytics batch of {len(posts)} posts: {e}")
+            return [(post, None, e) for post in posts]
+        
+        outcomes = []
+        for post in posts:
+            result = batch.get(post.platform_post_id)
+            if result is None:
+                result = PostNotFoundError(
+                    f"{platform} post {post.platform_post_id} missing from batch response",
+                    post_id=post.platform_post_id,
+                    platform=platform
+                )
+            
+            if isinstance(result, Exception):
+                outcomes.append((post, None, result))
+            else:
+                outcomes.append((post, result, None))
+        
+        return outcomes
+    
+    def _empty_sync_results(self, total_posts: int) -> Dict[str, Any]:
+        """Build an empty sync results dictionary."""
+        return {
+            "total_posts": total_posts,
+            "synced": 0,
+            "failed": 0,
+            "rate_limited": 0,
+            "by_platform": {},
+            "errors": []
+        }
+    
+    def _record_sync_result(
+        self,
+        results: Dict[str, Any],
+        post: PublishedPost,
+        error: Optional[Exception] = None
+    ):
+        """
+        Record the outcome of syncing one post in the results dictionary.
+        
+        Args:
+            results: Sync results dictionary to update
+            post: PublishedPost that was synced
+            error: Exception raised while syncing (None = success)
+        """
+        platform = post.platform.lower()
+        
+        # Initialize platform results if needed
+        if platform not in results["by_platform"]:
+            results["by_platform"][platform] = {
+                "synced": 0,
+                "failed": 0,
+                "rate_limited": 0
+            }
+        
+        if error is None:
+            results["synced"] += 1
+            results["by_platform"][platform]["synced"] += 1
+            logger.info(f"Synced analytics for post {post.id} ({platform})")
+            
+        elif isinstance(error, RateLimitError):
+            results["rate_limited"] += 1
+            results["by_platform"][platform]["rate_limited"] += 1
+            error_msg = f"Rate limited on {platform} for post {post.id}: {str(error)}"
+            results["errors"].append(error_msg)
+            logger.warning(error_msg)
+            
+        else:
+            results["failed"] += 1
+            results["by_platform"][platform]["failed"] += 1
+            error_msg = f"Failed to sync post {post.id} ({platform}): {str(error)}"
+            results["errors"].append(error_msg)
+            logger.error(error_msg)
+    
     def _initialize_fetchers(self, business_id: int):
         """
         Initialize platform fetchers with access tokens.
@@ -223,19 +477,22 @@ class AnalyticsSyncService:
                 if platform == "linkedin":
                     self.fetchers[platform] = LinkedInAnalyticsFetcher(
                         access_token=account.access_token,
-                        organization_id=account.page_id  # LinkedIn org ID
+                        organization_id=account.page_id,  # LinkedIn org ID
+                        transport=self.transport
                     )
                     
                 elif platform == "twitter":
                     self.fetchers[platform] = TwitterAnalyticsFetcher(
-                        access_token=account.access_token
+                        access_token=account.access_token,
+                        transport=self.transport
                     )
                     
                 elif platform in ["facebook", "instagram"]:
                     self.fetchers[platform] = MetaAnalyticsFetcher(
                         access_token=account.access_token,
                         page_id=account.page_id,
-                        instagram_account_id=account.instagram_account_id
+                        instagram_account_id=account.instagram_account_id,
+                        transport=self.transport
                     )
                     
                 else:
@@ -289,6 +546,103 @@ class AnalyticsSyncService:
             logger.error(f"Failed to fetch analytics for post {post.id}: {e}")
             raise
     
+    def _write_pending(
+        self,
+        results: Dict[str, Any],
+        pending: List[Tuple[PublishedPost, Dict[str, Any]]]
+    ):
+        """
+        Bulk write fetched analytics and record the outcome of each post.
+        
+        If the bulk write fails, the batch is rolled back and retried row by
+        row so one bad record does not fail the whole batch.
+        
+        Args:
+            results: Sync results dictionary to update
+            pending: (post, analytics_data) pairs to write
+        """
+        if not pending:
+            return
+        
+        try:
+            self._save_analytics_bulk(pending)
+        except Exception as e:
+            logger.error(f"Bulk analytics write of {len(pending)} posts failed, retrying per post: {e}")
+            self.db.rollback()
+            
+            for post, analytics_data in pending:
+                try:
+                    self._save_analytics(post, analytics_data)
+                    self._record_sync_result(results, post)
+                    self._rollup_posts.append(post)
+                except Exception as row_error:
+                    self.db.rollback()
+                    self._record_sync_result(results, post, row_error)
+            return
+        
+        for post, _ in pending:
+            self._record_sync_result(results, post)
+            self._rollup_posts.append(post)
+    
+    def _refresh_rollups(self):
+        """
+        Refresh the analytics rollups of the days the written posts were
+        published on, then bump the data version of their businesses so
+        cached analytics responses are recomputed.
+        
+        Rollups are derived data, so a failure is logged rather than failing
+        the sync; the days are recomputed the next time any of their posts is
+        synced (or by AnalyticsRollupService.rebuild).
+        """
+        posts, self._rollup_posts = self._rollup_posts, []
+        if not posts:
+            return
+        
+        try:
+            AnalyticsRollupService(self.db).refresh_for_posts(posts)
+        except Exception as e:
+            logger.error(f"Failed to refresh analytics rollups for {len(posts)} posts: {e}", exc_info=True)
+        
+        for business_id in sorted({post.business_id for post in posts}):
+            bump_business_data_version(business_id)
+    
+    def _build_analytics_row(
+        self,
+        post: PublishedPost,
+        analytics_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Map a fetched analytics dictionary onto PostAnalytics columns.
+        
+        Args:
+            post: PublishedPost model instance
+            analytics_data: Analytics data dictionary
+            
+        Returns:
+            Dictionary of PostAnalytics column values
+        """
+        return {
+            "published_post_id": post.id,
+            "business_id": post.business_id,
+            "platform": analytics_data.get("platform", post.platform),
+            "likes_count": analytics_data.get("likes_count", 0),
+            "comments_count": analytics_data.get("comments_count", 0),
+            "shares_count": analytics_data.get("shares_count", 0),
+            "reactions_count": analytics_data.get("reactions_count", 0),
+            "retweets_count": analytics_data.get("retweets_count", 0),
+            "quote_tweets_count": analytics_data.get("quote_tweets_count", 0),
+            "impressions": analytics_data.get("impressions", 0),
+            "reach": analytics_data.get("reach", 0),
+            "clicks": analytics_data.get("clicks", 0),
+            "video_views": analytics_data.get("video_views", 0),
+            "video_watch_time": analytics_data.get("video_watch_time", 0),
+            "engagement_rate": analytics_data.get("engagement_rate", 0.0),
+            "click_through_rate": analytics_data.get("click_through_rate", 0.0),
+            "fetched_at": analytics_data.get("fetched_at", datetime.utcnow()),
+            "platform_post_id": analytics_data.get("platform_post_id"),
+            "platform_post_url": analytics_data.get("platform_post_url", post.platform_post_url),
+        }
+    
     def _save_analytics(
         self,
         post: PublishedPost,
@@ -304,50 +658,133 @@ class AnalyticsSyncService:
         Returns:
             PostAnalytics model instance
         """
-        # Check if analytics record already exists
-        existing_analytics = self.db.query(PostAnalytics).filter(
-            PostAnalytics.published_post_id == post.id
-        ).order_by(PostAnalytics.fetched_at.desc()).first()
-        
-        # Create new analytics record
-        analytics = PostAnalytics(
-            published_post_id=post.id,
-            business_id=post.business_id,
-            platform=analytics_data.get("platform", post.platform),
-            likes_count=analytics_data.get("likes_count", 0),
-            comments_count=analytics_data.get("comments_count", 0),
-            shares_count=analytics_data.get("shares_count", 0),
-            reactions_count=analytics_data.get("reactions_count", 0),
-            retweets_count=analytics_data.get("retweets_count", 0),
-            quote_tweets_count=analytics_data.get("quote_tweets_count", 0),
-            impressions=analytics_data.get("impressions", 0),
-            reach=analytics_data.get("reach", 0),
-            clicks=analytics_data.get("clicks", 0),
-            video_views=analytics_data.get("video_views", 0),
-            video_watch_time=analytics_data.get("video_watch_time", 0),
-            engagement_rate=analytics_data.get("engagement_rate", 0.0),
-            click_through_rate=analytics_data.get("click_through_rate", 0.0),
-            fetched_at=analytics_data.get("fetched_at", datetime.utcnow()),
-            platform_post_id=analytics_data.get("platform_post_id"),
-            platform_post_url=analytics_data.get("platform_post_url", post.platform_post_url)
-        )
-        
+        # Create new analytics record (history) and upsert the post's snapshot
+        row = self._build_analytics_row(post, analytics_data)
+        analytics = PostAnalytics(**row)
         self.db.add(analytics)
-        self.db.commit()
-        self.db.refresh(analytics)
+        self.db.execute(self._build_snapshot_upsert([row], datetime.utcnow()))
         
-        # Update post's metrics cache
+        # Update post's metrics cache in the same transaction
         post.likes_count = analytics.likes_count
         post.comments_count = analytics.comments_count
         post.shares_count = analytics.shares_count
         post.impressions_count = analytics.impressions
         post.last_metrics_sync = datetime.utcnow()
+        
         self.db.commit()
+        self.db.refresh(analytics)
         
         logger.info(f"Saved analytics for post {post.id}")
         
         return analytics
     
+    def _save_analytics_bulk(
+        self,
+        items: List[Tuple[PublishedPost, Dict[str, Any]]]
+    ) -> int:
+        """
+        Save analytics for many posts in a single transaction.
+        
+        Writes all PostAnalytics rows with one multi-row INSERT, upserts the
+        posts' snapshots with one ``INSERT ... ON CONFLICT`` and refreshes
+        the denormalized PublishedPost metrics with one
+        ``UPDATE ... FROM (VALUES ...)`` statement, instead of two commits
+        per post.
+        
+        Args:
+            items: (post, analytics_data) pairs
+            
+        Returns:
+            Number of analytics rows written
+        """
+        if not items:
+            return 0
+        
+        synced_at = datetime.utcnow()
+        rows = [self._build_analytics_row(post, analytics_data) for post, analytics_data in items]
+        
+        # Latest row per post (a post can only appear once per batch, but
+        # keep the last row if it does; ON CONFLICT cannot touch a row twice)
+        latest_rows = list({row["published_post_id"]: row for row in rows}.values())
+        
+        metrics_by_post = {
+            row["published_post_id"]: (
+                row["published_post_id"],
+                row["likes_count"],
+                row["comments_count"],
+                row["shares_count"],
+                row["impressions"],
+                synced_at,
+            )
+            for row in latest_rows
+        }
+        
+        post_metrics = values(
+            column("id", Integer),
+            column("likes_count", Integer),
+            column("comments_count", Integer),
+            column("shares_count", Integer),
+            column("impressions_count", Integer),
+            column("last_metrics_sync", TIMESTAMP),
+            name="post_metrics"
+        ).data(list(metrics_by_post.values()))
+        
+        try:
+            self.db.execute(insert(PostAnalytics).values(rows))
+            self.db.execute(self._build_snapshot_upsert(latest_rows, synced_at))
+            self.db.execute(
+                update(PublishedPost)
+                .where(PublishedPost.id == post_metrics.c.id)
+                .values(
+                    likes_count=post_metrics.c.likes_count,
+                    comments_count=post_metrics.c.comments_count,
+                    shares_count=post_metrics.c.shares_count,
+                    impressions_count=post_metrics.c.impressions_count,
+                    last_metrics_sync=post_metrics.c.last_metrics_sync,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        logger.info(f"Saved analytics for {len(rows)} posts in one transaction")
+        
+        return len(rows)
+    
+    def _build_snapshot_upsert(self, rows: List[Dict[str, Any]], synced_at: datetime):
+        """
+        Build the upsert of post snapshots from analytics rows.
+        
+        A snapshot is only replaced by a fetch at least as recent as the one
+        it holds, so out-of-order writes cannot roll a post's metrics back.
+        
+        Args:
+            rows: Analytics rows (at most one per post)
+            synced_at: Time of the write (snapshot updated_at)
+            
+        Returns:
+            INSERT ... ON CONFLICT (published_post_id) DO UPDATE statement
+        """
+        statement = pg_insert(PostAnalyticsSnapshot).values([
+            {**row, "created_at": synced_at} for row in rows
+        ])
+        
+        updated_columns = {
+            name: statement.excluded[name]
+            for name in rows[0]
+            if name != "published_post_id"
+        }
+        updated_columns["updated_at"] = synced_at
+        
+        return statement.on_conflict_do_update(
+            index_elements=[PostAnalyticsSnapshot.published_post_id],
+            set_=updated_columns,
+            where=PostAnalyticsSnapshot.fetched_at <= statement.excluded.fetched_at
+        )
+    
     def get_sync_status(self, business_id: int) -> Dict[str, Any]:
         """
         Get sync status for a business (when was last sync, how many posts synced, etc.)
@@ -1,13 +1,17 @@
 """Base class for platform analytics fetchers."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 import time
 import logging
+import httpx
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+from .http_transport import AsyncHTTPTransport
+from .exceptions import PlatformAPIError, RateLimitError, AuthenticationError
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,12 +23,21 @@ class BasePlatformFetcher(ABC):
     the fetch_post_analytics() method.
     """
     
+    # Maximum number of in-flight requests the async sync engine may issue
+    # against this platform at once. Subclasses tune this to their rate limits.
+    MAX_CONCURRENT_REQUESTS = 5
+    
+    # Maximum number of posts fetch_posts_analytics_batch() looks up per call.
+    # 1 means the platform has no batch endpoint and posts are fetched one by one.
+    MAX_BATCH_SIZE = 1
+    
     def __init__(
         self, 
         access_token: str,
         max_retries: int = 3,
         backoff_factor: float = 2.0,
-        timeout: int = 30
+        timeout: int = 30,
+        transport: Optional[AsyncHTTPTransport] = None
     ):
         """
         Initialize the fetcher.
@@ -34,11 +47,13 @@ class BasePlatformFetcher(ABC):
             max_retries: Maximum number of retry attempts
             backoff_factor: Exponential backoff factor for retries
             timeout: Request timeout in seconds
+            transport: Shared pooled HTTP transport (None = per-fetcher requests session)
         """
         self.access_token = access_token
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
         self.timeout = timeout
+        self.transport = transport
         self.session = self._create_session()
         
     def _create_session(self) -> requests.Session:
@@ -89,6 +104,43 @@ class BasePlatformFetcher(ABC):
         """
         pass
     
+    def fetch_posts_analytics_batch(
+        self,
+        platform_post_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], PlatformAPIError]]:
+        """
+        Fetch analytics data for several posts.
+        
+        Platforms with a multi-post endpoint override this; the default
+        implementation calls fetch_post_analytics() once per post.
+        
+        Args:
+            platform_post_ids: Platform-specific post IDs
+            
+        Returns:
+            Dictionary mapping each platform post ID to its standardized
+            analytics dictionary, or to the PlatformAPIError (e.g.
+            PostNotFoundError) raised for that post alone
+            
+        Raises:
+            RateLimitError: If rate limit is exceeded
+            AuthenticationError: If the access token is rejected
+        """
+        results = {}
+        
+        for platform_post_id in platform_post_ids:
+            try:
+                results[platform_post_id] = self.fetch_post_analytics(
+                    post_id=platform_post_id,
+                    platform_post_id=platform_post_id
+                )
+            except (RateLimitError, AuthenticationError):
+                raise
+            except PlatformAPIError as e:
+                results[platform_post_id] = e
+        
+        return results
+    
     def _make_request(
         self,
         method: str,
@@ -128,14 +180,7 @@ class BasePlatformFetcher(ABC):
             try:
                 logger.info(f"Making {method} request to {url} (attempt {retry_count + 1})")
                 
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    json=json_data,
-                    timeout=self.timeout
-                )
+                response = self._send_request(method, url, headers, params, json_data)
                 
                 # Check for rate limiting
                 if response.status_code == 429:
@@ -146,7 +191,6 @@ class BasePlatformFetcher(ABC):
                         retry_count += 1
                         continue
                     else:
-                        from .exceptions import RateLimitError
                         raise RateLimitError(
                             "Rate limit exceeded",
                             retry_after=response.headers.get("Retry-After")
@@ -158,27 +202,58 @@ class BasePlatformFetcher(ABC):
                 # Return JSON data
                 return response.json()
                 
-            except requests.exceptions.Timeout:
+            except (requests.exceptions.Timeout, httpx.TimeoutException):
                 logger.error(f"Request timeout (attempt {retry_count + 1})")
                 retry_count += 1
                 if retry_count > self.max_retries:
-                    from .exceptions import PlatformAPIError
                     raise PlatformAPIError(
                         f"Request timed out after {self.max_retries} retries"
                     )
                 time.sleep(self.backoff_factor ** retry_count)
                 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, httpx.HTTPError) as e:
                 logger.error(f"Request failed: {e}")
-                from .exceptions import PlatformAPIError
                 raise PlatformAPIError(f"Request failed: {e}")
         
-        from .exceptions import PlatformAPIError
         raise PlatformAPIError(f"Request failed after {self.max_retries} retries")
     
+    def _send_request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]]
+    ) -> Union[requests.Response, httpx.Response]:
+        """
+        Send a single HTTP request through the shared transport or the session.
+        
+        Both retry 5xx responses internally; 429 handling is left to _make_request.
+        """
+        if self.transport is not None:
+            return self.transport.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                json=json_data,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                backoff_factor=self.backoff_factor
+            )
+        
+        return self.session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            json=json_data,
+            timeout=self.timeout
+        )
+    
     def _handle_rate_limit(
         self, 
-        response: requests.Response, 
+        response: Union[requests.Response, httpx.Response], 
         retry_count: int
     ) -> float:
         """
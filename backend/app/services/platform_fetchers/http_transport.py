@@ -0,0 +1,326 @@
+"""
+Shared async HTTP transport.
+
+One keep-alive connection pool per upstream host for the whole process,
+used by the platform analytics fetchers, the publishers, the OAuth
+services and the AI services. Started on application startup and closed
+on shutdown (see app.main).
+"""
+
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional "h2" package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AsyncHTTPTransport:
+    """
+    Process-wide pooled HTTP transport built on httpx.AsyncClient.
+
+    Fetchers are created per business per sync run and most services used
+    to open a client per call, so every request paid for DNS, TCP and TLS.
+    This transport keeps one keep-alive pool per upstream host for the
+    lifetime of the process instead.
+
+    The clients live on a dedicated event loop thread, which lets both
+    blocking callers (request) and coroutines on any event loop (arequest)
+    share the same connections.
+
+    Usage:
+        transport = get_shared_transport()
+
+        response = transport.request("GET", "https://api.twitter.com/2/tweets/1")
+        response = await transport.arequest("GET", "https://graph.facebook.com/v18.0/1")
+    """
+
+    # Per-host pool settings. All of these hosts serve their APIs over HTTP/2.
+    # The timeout applies to requests that do not pass their own.
+    HOST_SETTINGS: Dict[str, Dict[str, Any]] = {
+        "api.twitter.com": {"http2": True, "max_connections": 10, "timeout": 30.0},
+        # Instagram media containers are processed synchronously
+        "graph.facebook.com": {"http2": True, "max_connections": 10, "timeout": 60.0},
+        "api.linkedin.com": {"http2": True, "max_connections": 5, "timeout": 30.0},
+        # LinkedIn OAuth token endpoints
+        "www.linkedin.com": {"http2": True, "max_connections": 5, "timeout": 30.0},
+        # Strategy, content and image generation; completions take tens of seconds
+        "openrouter.ai": {"http2": True, "max_connections": 20, "timeout": 120.0},
+    }
+    DEFAULT_HOST_SETTINGS: Dict[str, Any] = {"http2": False, "max_connections": 5, "timeout": 30.0}
+
+    # Statuses retried by the transport, matching the requests Retry adapter
+    RETRY_STATUSES = {500, 502, 503, 504}
+
+    def __init__(
+        self,
+        keepalive_expiry: float = 60.0,
+        base_transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            keepalive_expiry: Seconds an idle connection is kept open
+            base_transport: Optional httpx transport to send requests through
+                           (used by tests instead of opening real connections)
+        """
+        self.keepalive_expiry = keepalive_expiry
+        self.base_transport = base_transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the transport's event loop thread if it is not running."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="platform-http-transport",
+                    daemon=True
+                )
+                self._thread.start()
+                logger.info("Started shared platform HTTP transport")
+
+            return self._loop
+
+    def _get_client(self, host: str) -> httpx.AsyncClient:
+        """
+        Get or create the pooled client for a host.
+
+        Only called from the transport's event loop thread.
+        """
+        client = self._clients.get(host)
+
+        if client is None:
+            host_settings = self.HOST_SETTINGS.get(host, self.DEFAULT_HOST_SETTINGS)
+            max_connections = host_settings["max_connections"]
+
+            client = httpx.AsyncClient(
+                http2=host_settings["http2"] and HTTP2_AVAILABLE,
+                timeout=host_settings["timeout"],
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                transport=self.base_transport
+            )
+            self._clients[host] = client
+            self._stats[host] = {"requests": 0, "connections_opened": 0, "tls_handshakes": 0}
+
+        return client
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        max_retries: int = 0,
+        backoff_factor: float = 0.0,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request on the transport's event loop."""
+        host = urlsplit(url).hostname or ""
+        client = self._get_client(host)
+        stats = self._stats[host]
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            # httpcore reports each new connection and TLS handshake
+            if event_name == "connection.connect_tcp.complete":
+                stats["connections_opened"] += 1
+            elif event_name == "connection.start_tls.complete":
+                stats["tls_handshakes"] += 1
+
+        attempt = 0
+        while True:
+            stats["requests"] += 1
+            response = await client.request(method, url, extensions={"trace": trace}, **kwargs)
+
+            if response.status_code not in self.RETRY_STATUSES or attempt >= max_retries:
+                return response
+
+            attempt += 1
+            wait_time = backoff_factor * (2 ** (attempt - 1))
+            logger.warning(
+                f"{method} {url} returned {response.status_code}, "
+                f"retrying in {wait_time}s (attempt {attempt})"
+            )
+            await asyncio.sleep(wait_time)
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request and block until the response is read.
+
+        Safe to call from any thread that is not running the transport loop.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx.AsyncClient.request (headers, params,
+                     json, timeout) plus max_retries / backoff_factor
+
+        Returns:
+            httpx.Response
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._send(method, url, **kwargs), loop)
+        return future.result()
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request from a coroutine running on any event loop.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Same as request()
+
+        Returns:
+            httpx.Response
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._send(method, url, **kwargs), loop)
+        return await asyncio.wrap_future(future)
+
+    def start(self):
+        """Start the event loop thread ahead of the first request."""
+        self._ensure_loop()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-host connection reuse statistics.
+
+        Returns:
+            Dictionary mapping host to request count, connections opened and
+            TLS handshakes performed, e.g.:
+            {"api.twitter.com": {"requests": 120, "connections_opened": 2, "tls_handshakes": 2}}
+        """
+        return {host: dict(stats) for host, stats in self._stats.items()}
+
+    def close(self):
+        """Close all pooled connections and stop the event loop thread."""
+        with self._lock:
+            loop = self._loop
+            if loop is None:
+                return
+
+            async def close_clients():
+                for client in self._clients.values():
+                    await client.aclose()
+                self._clients.clear()
+
+            asyncio.run_coroutine_threadsafe(close_clients(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join()
+            loop.close()
+
+            self._loop = None
+            self._thread = None
+            logger.info("Shared platform HTTP transport closed")
+
+
+class PooledHTTPClient:
+    """
+    httpx.AsyncClient-style view of a transport.
+
+    Lets code written against a per-call client keep its shape while
+    sending through the shared pools. Leaving the ``async with`` block keeps
+    the connections open.
+
+    Usage:
+        async with shared_http_client(timeout=30.0) as client:
+            response = await client.post(url, json=payload)
+    """
+
+    def __init__(self, transport: AsyncHTTPTransport, timeout: Optional[float] = None):
+        """
+        Initialize the client view.
+
+        Args:
+            transport: Transport to send requests through
+            timeout: Default timeout for requests made through this view
+                    (None: the host's timeout from HOST_SETTINGS)
+        """
+        self.transport = transport
+        self.timeout = timeout
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        return await self.transport.arequest(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self):
+        """Nothing to close: the connections belong to the transport."""
+
+    async def __aenter__(self) -> "PooledHTTPClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> bool:
+        return False
+
+
+_shared_transport: Optional[AsyncHTTPTransport] = None
+_shared_transport_lock = threading.Lock()
+
+
+def get_shared_transport() -> AsyncHTTPTransport:
+    """Get the process-wide transport instance."""
+    global _shared_transport
+
+    with _shared_transport_lock:
+        if _shared_transport is None:
+            _shared_transport = AsyncHTTPTransport()
+        return _shared_transport
+
+
+def close_shared_transport():
+    """Close the process-wide transport (for graceful shutdown)."""
+    global _shared_transport
+
+    with _shared_transport_lock:
+        if _shared_transport is not None:
+            _shared_transport.close()
+            _shared_transport = None
+
+
+def shared_http_client(timeout: Optional[float] = None) -> PooledHTTPClient:
+    """
+    Get a client view of the process-wide transport.
+
+    Args:
+        timeout: Default timeout in seconds for its requests (None: the
+                host's timeout)
+
+    Returns:
+        PooledHTTPClient usable in place of ``httpx.AsyncClient()``
+    """
+    return PooledHTTPClient(get_shared_transport(), timeout=timeout)
@@ -1,11 +1,12 @@
 """LinkedIn analytics fetcher."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import logging
 
 from .base_fetcher import BasePlatformFetcher
-from .exceptions import PlatformAPIError, PostNotFoundError
+from .http_transport import AsyncHTTPTransport
+from .exceptions import PlatformAPIError, PostNotFoundError, RateLimitError, AuthenticationError
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,8 @@ class LinkedInAnalyticsFetcher(BasePlatformFetcher):
     
     BASE_URL = "https://api.linkedin.com"
     API_VERSION = "v2"
+    MAX_CONCURRENT_REQUESTS = 2  # 100 requests / day on the free tier
+    MAX_BATCH_SIZE = 50  # URNs per share statistics request (keeps the URL short)
     
     def __init__(
         self,
@@ -33,7 +36,8 @@ class LinkedInAnalyticsFetcher(BasePlatformFetcher):
         organization_id: Optional[str] = None,
         max_retries: int = 3,
         backoff_factor: float = 2.0,
-        timeout: int = 30
+        timeout: int = 30,
+        transport: Optional[AsyncHTTPTransport] = None
     ):
         """
         Initialize LinkedIn fetcher.
@@ -44,8 +48,9 @@ class LinkedInAnalyticsFetcher(BasePlatformFetcher):
             max_retries: Maximum number of retry attempts
             backoff_factor: Exponential backoff factor
             timeout: Request timeout in seconds
+            transport: Shared pooled HTTP transport (optional)
         """
-        super().__init__(access_token, max_retries, backoff_factor, timeout)
+        super().__init__(access_token, max_retries, backoff_factor, timeout, transport)
         self.organization_id = organization_id
         
     def fetch_post_analytics(
@@ -102,6 +107,115 @@ class LinkedInAnalyticsFetcher(BasePlatformFetcher):
                 platform="linkedin"
             )
     
+    def fetch_posts_analytics_batch(
+        self,
+        platform_post_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], PlatformAPIError]]:
+        """
+        Fetch analytics for many LinkedIn posts with one statistics request.
+        
+        Statistics for up to MAX_BATCH_SIZE URNs are requested at once. Post
+        details are not fetched: the only metric they feed (video views) is
+        not part of the ugcPosts payload, so they would cost one request per
+        post against the daily limit for nothing.
+        
+        Args:
+            platform_post_ids: LinkedIn post URNs
+            
+        Returns:
+            Dictionary mapping each URN to its standardized analytics
+            dictionary, or to a PostNotFoundError if no statistics came back
+            
+        Raises:
+            RateLimitError: If rate limit is exceeded
+            AuthenticationError: If the access token is rejected
+            PlatformAPIError: If a statistics request fails
+        """
+        results: Dict[str, Union[Dict[str, Any], PlatformAPIError]] = {}
+        
+        # Drop duplicates while keeping order
+        urns = list(dict.fromkeys(urn for urn in platform_post_ids if urn))
+        
+        for start in range(0, len(urns), self.MAX_BATCH_SIZE):
+            chunk = urns[start:start + self.MAX_BATCH_SIZE]
+            logger.info(f"Fetching LinkedIn analytics for {len(chunk)} posts")
+            
+            share_stats_by_urn = self._fetch_share_statistics_batch(chunk)
+            
+            for urn in chunk:
+                share_stats = share_stats_by_urn.get(urn)
+                if share_stats is None:
+                    results[urn] = PostNotFoundError(
+                        f"LinkedIn post {urn} not found",
+                        post_id=urn,
+                        platform="linkedin"
+                    )
+                    continue
+                
+                analytics = self._parse_linkedin_analytics(share_stats, {})
+                analytics["fetched_at"] = datetime.utcnow()
+                analytics["platform"] = "linkedin"
+                analytics["platform_post_id"] = urn
+                results[urn] = analytics
+        
+        return results
+    
+    def _fetch_share_statistics_batch(self, urns: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch share statistics for several posts in one request.
+        
+        Args:
+            urns: LinkedIn share (urn:li:share) or UGC post (urn:li:ugcPost) URNs
+            
+        Returns:
+            Dictionary mapping URN to its share statistics element
+        """
+        url = f"{self.BASE_URL}/{self.API_VERSION}/organizationalEntityShareStatistics"
+        
+        params = {
+            "q": "organizationalEntity",
+            "organizationalEntity": self.organization_id or "urn:li:organization:0",
+        }
+        
+        # Indexed list parameters (shares[0]=...&shares[1]=...); UGC posts are
+        # passed in their own ugcPosts list
+        share_urns = [urn for urn in urns if not urn.startswith("urn:li:ugcPost:")]
+        ugc_post_urns = [urn for urn in urns if urn.startswith("urn:li:ugcPost:")]
+        for index, urn in enumerate(share_urns):
+            params[f"shares[{index}]"] = urn
+        for index, urn in enumerate(ugc_post_urns):
+            params[f"ugcPosts[{index}]"] = urn
+        
+        # Indexed list syntax is Rest.li protocol 1.0, so the 2.0 header is not sent
+        headers = {
+            "LinkedIn-Version": "202401"
+        }
+        
+        try:
+            response = self._make_request(
+                method="GET",
+                url=url,
+                headers=headers,
+                params=params
+            )
+            
+        except (RateLimitError, AuthenticationError):
+            raise
+        except Exception as e:
+            logger.error(f"Failed to fetch share statistics batch: {e}")
+            raise PlatformAPIError(
+                f"Failed to fetch share statistics batch: {str(e)}",
+                platform="linkedin"
+            )
+        
+        stats_by_urn = {}
+        for element in response.get("elements", []):
+            urn = element.get("share") or element.get("ugcPost")
+            if urn:
+                stats_by_urn[urn] = element
+        
+        return stats_by_urn
+    
     def _fetch_share_statistics(self, share_urn: str) -> Dict[str, Any]:
         """
         Fetch share statistics from LinkedIn API.
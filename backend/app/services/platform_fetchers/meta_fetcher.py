@@ -1,11 +1,13 @@
 """Meta (Facebook & Instagram) analytics fetcher."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
+import json
 import logging
 
 from .base_fetcher import BasePlatformFetcher
-from .exceptions import PlatformAPIError, PostNotFoundError
+from .http_transport import AsyncHTTPTransport
+from .exceptions import PlatformAPIError, PostNotFoundError, RateLimitError, AuthenticationError
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,13 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
     
     BASE_URL = "https://graph.facebook.com"
     API_VERSION = "v18.0"
+    MAX_CONCURRENT_REQUESTS = 4  # 200 requests / hour per user
+    MAX_BATCH_SIZE = 50  # Graph API batch requests accept up to 50 operations
+    
+    FACEBOOK_POST_FIELDS = "reactions.summary(total_count),comments.summary(total_count),shares,created_time,message,permalink_url"
+    FACEBOOK_INSIGHT_METRICS = "post_impressions,post_impressions_unique,post_engaged_users,post_clicks,post_video_views"
+    INSTAGRAM_MEDIA_FIELDS = "id,media_type,media_url,permalink,timestamp,like_count,comments_count,caption"
+    INSTAGRAM_INSIGHT_METRICS = "impressions,reach,engagement,saved,video_views"
     
     def __init__(
         self,
@@ -37,7 +46,8 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
         instagram_account_id: Optional[str] = None,
         max_retries: int = 3,
         backoff_factor: float = 2.0,
-        timeout: int = 30
+        timeout: int = 30,
+        transport: Optional[AsyncHTTPTransport] = None
     ):
         """
         Initialize Meta fetcher.
@@ -49,8 +59,9 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
             max_retries: Maximum number of retry attempts
             backoff_factor: Exponential backoff factor
             timeout: Request timeout in seconds
+            transport: Shared pooled HTTP transport (optional)
         """
-        super().__init__(access_token, max_retries, backoff_factor, timeout)
+        super().__init__(access_token, max_retries, backoff_factor, timeout, transport)
         self.page_id = page_id
         self.instagram_account_id = instagram_account_id
     
@@ -177,12 +188,166 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
                 platform="instagram"
             )
     
+    def fetch_posts_analytics_batch(
+        self,
+        platform_post_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], PlatformAPIError]]:
+        """
+        Fetch analytics for many Facebook posts / Instagram media at once.
+        
+        Each post becomes one operation of a Graph API batch request, with
+        its insights pulled in through field expansion, so up to
+        MAX_BATCH_SIZE posts cost a single HTTP round trip instead of two
+        requests per post. Operations that fail for reasons other than a
+        missing post are retried through fetch_post_analytics(), which keeps
+        insights failures non-critical.
+        
+        Args:
+            platform_post_ids: Meta post IDs (Facebook and Instagram may be mixed)
+            
+        Returns:
+            Dictionary mapping each post ID to its standardized analytics
+            dictionary, or to the PlatformAPIError raised for that post
+            
+        Raises:
+            RateLimitError: If rate limit is exceeded
+            AuthenticationError: If the access token is rejected
+            PlatformAPIError: If a batch request fails
+        """
+        results: Dict[str, Union[Dict[str, Any], PlatformAPIError]] = {}
+        
+        # Drop duplicates while keeping order
+        post_ids = list(dict.fromkeys(post_id for post_id in platform_post_ids if post_id))
+        
+        for start in range(0, len(post_ids), self.MAX_BATCH_SIZE):
+            chunk = post_ids[start:start + self.MAX_BATCH_SIZE]
+            logger.info(f"Fetching Meta analytics for {len(chunk)} posts in one batch request")
+            
+            responses = self._send_batch_request([
+                {"method": "GET", "relative_url": self._batch_relative_url(post_id)}
+                for post_id in chunk
+            ])
+            
+            for index, post_id in enumerate(chunk):
+                response = responses[index] if index < len(responses) else None
+                results[post_id] = self._parse_batch_response(post_id, response)
+        
+        return results
+    
+    def _batch_relative_url(self, post_id: str) -> str:
+        """Build the batch operation URL for a post's data plus insights."""
+        if "_" in post_id:
+            fields = f"{self.FACEBOOK_POST_FIELDS},insights.metric({self.FACEBOOK_INSIGHT_METRICS})"
+        else:
+            fields = f"{self.INSTAGRAM_MEDIA_FIELDS},insights.metric({self.INSTAGRAM_INSIGHT_METRICS})"
+        
+        return f"{self.API_VERSION}/{post_id}?fields={fields}"
+    
+    def _send_batch_request(self, operations: List[Dict[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Send a Graph API batch request.
+        
+        Args:
+            operations: Batch operations ({"method", "relative_url"})
+            
+        Returns:
+            One response per operation: {"code": int, "body": str}, or None
+            for operations Meta did not complete
+        """
+        try:
+            response = self._make_request(
+                method="POST",
+                url=f"{self.BASE_URL}/",
+                json_data={
+                    "batch": operations,
+                    "include_headers": False
+                }
+            )
+            
+        except (RateLimitError, AuthenticationError):
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send Meta batch request: {e}")
+            raise PlatformAPIError(
+                f"Failed to send Meta batch request: {str(e)}",
+                platform="facebook"
+            )
+        
+        if not isinstance(response, list):
+            raise PlatformAPIError(
+                f"Unexpected Meta batch response: {response}",
+                platform="facebook"
+            )
+        
+        return response
+    
+    def _parse_batch_response(
+        self,
+        post_id: str,
+        response: Optional[Dict[str, Any]]
+    ) -> Union[Dict[str, Any], PlatformAPIError]:
+        """
+        Demultiplex one batch operation result into standardized analytics.
+        
+        Args:
+            post_id: Meta post ID the operation was for
+            response: Batch operation result ({"code", "body"}) or None
+            
+        Returns:
+            Standardized analytics dictionary, or the error for this post
+        """
+        platform = "facebook" if "_" in post_id else "instagram"
+        
+        body: Dict[str, Any] = {}
+        if response is not None:
+            try:
+                body = json.loads(response.get("body") or "{}")
+            except ValueError:
+                body = {}
+        
+        error = body.get("error")
+        if response is not None and response.get("code") == 200 and not error:
+            insights = self._insights_to_dict(body.pop("insights", {}))
+            
+            if platform == "facebook":
+                analytics = self._parse_facebook_analytics(body, insights)
+            else:
+                analytics = self._parse_instagram_analytics(body, insights)
+            
+            analytics["fetched_at"] = datetime.utcnow()
+            analytics["platform"] = platform
+            analytics["platform_post_id"] = post_id
+            return analytics
+        
+        # The object does not exist (or was deleted): code 803, or code 100
+        # with subcode 33. Plain code 100 is any invalid parameter, such as
+        # a metric in the insights expansion, so it falls through below.
+        if error and (
+            error.get("code") == 803
+            or (error.get("code") == 100 and error.get("error_subcode") == 33)
+        ):
+            return PostNotFoundError(
+                f"{platform.capitalize()} post {post_id} not found",
+                post_id=post_id,
+                platform=platform
+            )
+        
+        # Timed out inside the batch, or failed because of the insights
+        # expansion: fall back to the per-post requests
+        logger.warning(f"Meta batch operation failed for post {post_id}, retrying individually")
+        try:
+            return self.fetch_post_analytics(post_id=post_id, platform_post_id=post_id)
+        except (RateLimitError, AuthenticationError):
+            raise
+        except PlatformAPIError as e:
+            return e
+    
     def _fetch_facebook_post_data(self, post_id: str) -> Dict[str, Any]:
         """Fetch Facebook post data."""
         url = f"{self.BASE_URL}/{self.API_VERSION}/{post_id}"
         
         params = {
-            "fields": "reactions.summary(total_count),comments.summary(total_count),shares,created_time,message,permalink_url"
+            "fields": self.FACEBOOK_POST_FIELDS
         }
         
         try:
@@ -216,7 +381,7 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
         
         # Request specific metrics
         params = {
-            "metric": "post_impressions,post_impressions_unique,post_engaged_users,post_clicks,post_video_views"
+            "metric": self.FACEBOOK_INSIGHT_METRICS
         }
         
         try:
@@ -226,14 +391,7 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
                 params=params
             )
             
-            # Convert insights array to dictionary
-            insights_dict = {}
-            for insight in response.get("data", []):
-                metric_name = insight.get("name")
-                metric_value = insight.get("values", [{}])[0].get("value", 0)
-                insights_dict[metric_name] = metric_value
-            
-            return insights_dict
+            return self._insights_to_dict(response)
             
         except Exception as e:
             logger.warning(f"Failed to fetch Facebook post insights (non-critical): {e}")
@@ -244,7 +402,7 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
         url = f"{self.BASE_URL}/{self.API_VERSION}/{media_id}"
         
         params = {
-            "fields": "id,media_type,media_url,permalink,timestamp,like_count,comments_count,caption"
+            "fields": self.INSTAGRAM_MEDIA_FIELDS
         }
         
         try:
@@ -281,7 +439,7 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
         # For videos: impressions, reach, video_views
         # For stories: impressions, reach, exits, replies
         params = {
-            "metric": "impressions,reach,engagement,saved,video_views"
+            "metric": self.INSTAGRAM_INSIGHT_METRICS
         }
         
         try:
@@ -291,19 +449,22 @@ class MetaAnalyticsFetcher(BasePlatformFetcher):
                 params=params
             )
             
-            # Convert insights array to dictionary
-            insights_dict = {}
-            for insight in response.get("data", []):
-                metric_name = insight.get("name")
-                metric_value = insight.get("values", [{}])[0].get("value", 0)
-                insights_dict[metric_name] = metric_value
-            
-            return insights_dict
+            return self._insights_to_dict(response)
             
         except Exception as e:
             logger.warning(f"Failed to fetch Instagram media insights (non-critical): {e}")
             return {}
     
+    def _insights_to_dict(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an insights response ({"data": [...]}) into {metric: value}."""
+        insights_dict = {}
+        for insight in response.get("data", []):
+            metric_name = insight.get("name")
+            metric_value = insight.get("values", [{}])[0].get("value", 0)
+            insights_dict[metric_name] = metric_value
+        
+        return insights_dict
+    
     def _parse_facebook_analytics(
         self,
         post_data: Dict[str, Any],
@@ -0,0 +1,226 @@
+"""Staleness-driven planning of which posts to sync in a run."""
+
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import logging
+
+from sqlalchemy import and_, case, or_, true
+from sqlalchemy.orm import Session, Query
+
+from app.models.published_post import PublishedPost
+
+logger = logging.getLogger(__name__)
+
+
+class SyncPlanner:
+    """
+    Picks the posts an analytics sync run should fetch.
+
+    Engagement on a post settles quickly, so how often it is re-fetched
+    depends on its age (published_at):
+    - under 48 hours: hourly
+    - under 30 days: daily
+    - older: weekly
+
+    A post is due once its last_metrics_sync is older than its interval
+    (never-synced posts are always due). Due posts are ordered youngest tier
+    first, then stalest first, and capped at a per-platform budget per run
+    so old posts cannot use up the API quota.
+
+    Usage:
+        planner = SyncPlanner(db)
+        posts = planner.plan(business_id=1)
+    """
+
+    # (max post age, sync interval); a max age of None matches all older posts
+    SYNC_TIERS: List[Tuple[Optional[timedelta], timedelta]] = [
+        (timedelta(hours=48), timedelta(hours=1)),
+        (timedelta(days=30), timedelta(days=1)),
+        (None, timedelta(days=7)),
+    ]
+
+    # Posts per platform per run, sized from each platform's rate limits
+    PLATFORM_BUDGETS: Dict[str, int] = {
+        "twitter": 300,  # 300 requests / 15 min, up to 100 tweets per request
+        "facebook": 100,  # 200 requests / hour per user, 50 posts per batch
+        "instagram": 100,
+        "linkedin": 50,  # 100 requests / day on the free tier
+    }
+    DEFAULT_BUDGET = 100
+
+    def __init__(self, db: Session):
+        """
+        Initialize the planner.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    @classmethod
+    def sync_interval(cls, published_at: Optional[datetime], now: Optional[datetime] = None) -> timedelta:
+        """
+        Get how often a post should be synced based on its age.
+
+        Args:
+            published_at: When the post was published (None = treated as old)
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Sync interval for the post's age tier
+        """
+        now = now or datetime.utcnow()
+
+        for max_age, interval in cls.SYNC_TIERS:
+            if max_age is None or (published_at is not None and now - published_at < max_age):
+                return interval
+
+        return cls.SYNC_TIERS[-1][1]
+
+    @classmethod
+    def is_due(
+        cls,
+        published_at: Optional[datetime],
+        last_metrics_sync: Optional[datetime],
+        now: Optional[datetime] = None
+    ) -> bool:
+        """
+        Check whether a post is due for a sync.
+
+        Args:
+            published_at: When the post was published
+            last_metrics_sync: When the post's metrics were last synced
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            True if the post has never been synced or its interval has passed
+        """
+        now = now or datetime.utcnow()
+
+        if last_metrics_sync is None:
+            return True
+
+        return now - last_metrics_sync >= cls.sync_interval(published_at, now)
+
+    def get_budget(self, platform: str) -> int:
+        """Get the per-run post budget for a platform."""
+        return self.PLATFORM_BUDGETS.get(platform.lower(), self.DEFAULT_BUDGET)
+
+    def plan(
+        self,
+        business_id: int,
+        platforms: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        due_only: bool = True,
+        now: Optional[datetime] = None
+    ) -> List[PublishedPost]:
+        """
+        Select the posts of a business to sync in this run.
+
+        Args:
+            business_id: Business ID
+            platforms: Platforms to include (None = all platforms)
+            limit: Maximum posts per platform (None = the platform's budget
+                   when due_only, otherwise no limit)
+            due_only: Only include posts whose sync interval has passed
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Posts to sync, ordered by priority within each platform
+        """
+        now = now or datetime.utcnow()
+
+        if platforms is None:
+            platforms = [
+                platform for (platform,) in self.db.query(PublishedPost.platform).filter(
+                    PublishedPost.business_id == business_id,
+                    PublishedPost.status == "published"
+                ).distinct().all()
+            ]
+
+        posts: List[PublishedPost] = []
+
+        for platform in platforms:
+            budget = limit
+            if budget is None and due_only:
+                budget = self.get_budget(platform)
+
+            query = self.build_query(business_id, platform, due_only=due_only, now=now)
+            if budget:
+                query = query.limit(budget)
+
+            platform_posts = query.all()
+            posts.extend(platform_posts)
+
+            logger.info(
+                f"Planned {len(platform_posts)} {platform} posts for business {business_id}"
+                + (f" (budget {budget})" if budget else "")
+            )
+
+        return posts
+
+    def build_query(
+        self,
+        business_id: int,
+        platform: str,
+        due_only: bool = True,
+        now: Optional[datetime] = None
+    ) -> Query:
+        """
+        Build the prioritized query of a business's posts on one platform.
+
+        Args:
+            business_id: Business ID
+            platform: Platform name
+            due_only: Only include posts whose sync interval has passed
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            SQLAlchemy query ordered by age tier, then staleness
+        """
+        now = now or datetime.utcnow()
+
+        query = self.db.query(PublishedPost).filter(
+            PublishedPost.business_id == business_id,
+            PublishedPost.status == "published",
+            PublishedPost.platform == platform
+        )
+
+        # Age tier of each post: 0 = youngest
+        tier_conditions = []
+        due_conditions = []
+        previous_cutoff = None
+
+        for tier, (max_age, interval) in enumerate(self.SYNC_TIERS):
+            if max_age is None:
+                # Last tier: everything older, plus posts without published_at
+                tier_condition = or_(
+                    PublishedPost.published_at < previous_cutoff,
+                    PublishedPost.published_at.is_(None)
+                ) if previous_cutoff is not None else true()
+            else:
+                cutoff = now - max_age
+                tier_condition = PublishedPost.published_at >= cutoff
+                if previous_cutoff is not None:
+                    tier_condition = and_(tier_condition, PublishedPost.published_at < previous_cutoff)
+                tier_conditions.append((tier_condition, tier))
+                previous_cutoff = cutoff
+
+            due_conditions.append(and_(
+                tier_condition,
+                PublishedPost.last_metrics_sync <= now - interval
+            ))
+
+        if due_only:
+            query = query.filter(or_(
+                PublishedPost.last_metrics_sync.is_(None),
+                *due_conditions
+            ))
+
+        age_tier = case(*tier_conditions, else_=len(self.SYNC_TIERS) - 1)
+
+        return query.order_by(
+            age_tier,
+            PublishedPost.last_metrics_sync.asc().nullsfirst(),
+            PublishedPost.published_at.desc()
+        )
@@ -1,11 +1,12 @@
 """Twitter/X analytics fetcher."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import logging
 
 from .base_fetcher import BasePlatformFetcher
-from .exceptions import PlatformAPIError, PostNotFoundError
+from .http_transport import AsyncHTTPTransport
+from .exceptions import PlatformAPIError, PostNotFoundError, RateLimitError, AuthenticationError
 
 logger = logging.getLogger(__name__)
 
@@ -27,13 +28,16 @@ class TwitterAnalyticsFetcher(BasePlatformFetcher):
     
     BASE_URL = "https://api.twitter.com"
     API_VERSION = "2"
+    MAX_CONCURRENT_REQUESTS = 10  # 300 requests / 15 min leaves room for ~10 in flight
+    MAX_BATCH_SIZE = 100  # /2/tweets?ids= accepts up to 100 IDs
     
     def __init__(
         self,
         access_token: str,
         max_retries: int = 3,
         backoff_factor: float = 2.0,
-        timeout: int = 30
+        timeout: int = 30,
+        transport: Optional[AsyncHTTPTransport] = None
     ):
         """
         Initialize Twitter fetcher.
@@ -43,8 +47,9 @@ class TwitterAnalyticsFetcher(BasePlatformFetcher):
             max_retries: Maximum number of retry attempts
             backoff_factor: Exponential backoff factor
             timeout: Request timeout in seconds
+            transport: Shared pooled HTTP transport (optional)
         """
-        super().__init__(access_token, max_retries, backoff_factor, timeout)
+        super().__init__(access_token, max_retries, backoff_factor, timeout, transport)
     
     def fetch_post_analytics(
         self,
@@ -81,10 +86,7 @@ class TwitterAnalyticsFetcher(BasePlatformFetcher):
             analytics = self._parse_twitter_analytics(tweet_data)
             
             # Add metadata
-            analytics["fetched_at"] = datetime.utcnow()
-            analytics["platform"] = "twitter"
-            analytics["platform_post_id"] = platform_post_id
-            analytics["platform_post_url"] = f"https://twitter.com/i/web/status/{platform_post_id}"
+            analytics = self._add_tweet_metadata(analytics, platform_post_id)
             
             logger.info(f"Successfully fetched Twitter analytics for tweet {platform_post_id}")
             return analytics
@@ -98,6 +100,106 @@ class TwitterAnalyticsFetcher(BasePlatformFetcher):
                 platform="twitter"
             )
     
+    def fetch_posts_analytics_batch(
+        self,
+        platform_post_ids: List[str]
+    ) -> Dict[str, Union[Dict[str, Any], PlatformAPIError]]:
+        """
+        Fetch analytics for many tweets using the multi-tweet lookup endpoint.
+        
+        IDs are sent in chunks of MAX_BATCH_SIZE, so each chunk costs one
+        request of the rate limit budget instead of one per tweet.
+        
+        Args:
+            platform_post_ids: Twitter tweet IDs
+            
+        Returns:
+            Dictionary mapping each tweet ID to its standardized analytics
+            dictionary, or to a PostNotFoundError if the tweet was not returned
+            
+        Raises:
+            RateLimitError: If rate limit is exceeded
+            AuthenticationError: If the access token is rejected
+            PlatformAPIError: If a lookup request fails
+        """
+        results: Dict[str, Union[Dict[str, Any], PlatformAPIError]] = {}
+        
+        # Drop duplicates while keeping order
+        tweet_ids = list(dict.fromkeys(tweet_id for tweet_id in platform_post_ids if tweet_id))
+        
+        for start in range(0, len(tweet_ids), self.MAX_BATCH_SIZE):
+            chunk = tweet_ids[start:start + self.MAX_BATCH_SIZE]
+            logger.info(f"Fetching Twitter analytics for {len(chunk)} tweets")
+            
+            response = self._fetch_tweets_metrics(chunk)
+            
+            for tweet in response.get("data", []):
+                tweet_id = tweet.get("id")
+                if tweet_id:
+                    analytics = self._parse_twitter_analytics(tweet)
+                    results[tweet_id] = self._add_tweet_metadata(analytics, tweet_id)
+            
+            # Partial errors: deleted/protected tweets are reported per ID
+            for error in response.get("errors", []):
+                tweet_id = error.get("value") or error.get("resource_id")
+                if tweet_id in chunk and tweet_id not in results:
+                    results[tweet_id] = PostNotFoundError(
+                        error.get("detail") or f"Twitter tweet {tweet_id} not found",
+                        post_id=tweet_id,
+                        platform="twitter"
+                    )
+            
+            for tweet_id in chunk:
+                if tweet_id not in results:
+                    results[tweet_id] = PostNotFoundError(
+                        f"Twitter tweet {tweet_id} not found",
+                        post_id=tweet_id,
+                        platform="twitter"
+                    )
+        
+        return results
+    
+    def _fetch_tweets_metrics(self, tweet_ids: List[str]) -> Dict[str, Any]:
+        """
+        Fetch up to 100 tweets with all available metrics in one request.
+        
+        Args:
+            tweet_ids: Twitter tweet IDs
+            
+        Returns:
+            Raw API response with "data" and, for missing tweets, "errors"
+        """
+        url = f"{self.BASE_URL}/{self.API_VERSION}/tweets"
+        
+        params = {
+            "ids": ",".join(tweet_ids),
+            "tweet.fields": "public_metrics,non_public_metrics,organic_metrics,created_at",
+        }
+        
+        try:
+            return self._make_request(
+                method="GET",
+                url=url,
+                params=params
+            )
+            
+        except (RateLimitError, AuthenticationError):
+            raise
+        except Exception as e:
+            logger.error(f"Failed to fetch tweets metrics: {e}")
+            raise PlatformAPIError(
+                f"Failed to fetch tweets metrics: {str(e)}",
+                platform="twitter"
+            )
+    
+    def _add_tweet_metadata(self, analytics: Dict[str, Any], tweet_id: str) -> Dict[str, Any]:
+        """Add fetch metadata to parsed tweet analytics."""
+        analytics["fetched_at"] = datetime.utcnow()
+        analytics["platform"] = "twitter"
+        analytics["platform_post_id"] = tweet_id
+        analytics["platform_post_url"] = f"https://twitter.com/i/web/status/{tweet_id}"
+        return analytics
+    
     def _fetch_tweet_metrics(self, tweet_id: str) -> Dict[str, Any]:
         """
         Fetch tweet with all available metrics.
@@ -239,40 +341,17 @@ class TwitterAnalyticsFetcher(BasePlatformFetcher):
         # Twitter allows max 100 IDs per request
         tweet_ids = tweet_ids[:min(len(tweet_ids), max_results)]
         
-        url = f"{self.BASE_URL}/{self.API_VERSION}/tweets"
+        response = self._fetch_tweets_metrics(tweet_ids)
         
-        params = {
-            "ids": ",".join(tweet_ids),
-            "tweet.fields": "public_metrics,non_public_metrics,organic_metrics,created_at",
-        }
+        # Parse each tweet
+        results = {}
+        for tweet in response.get("data", []):
+            tweet_id = tweet.get("id")
+            if tweet_id:
+                analytics = self._parse_twitter_analytics(tweet)
+                results[tweet_id] = self._add_tweet_metadata(analytics, tweet_id)
         
-        try:
-            response = self._make_request(
-                method="GET",
-                url=url,
-                params=params
-            )
-            
-            # Parse each tweet
-            results = {}
-            for tweet in response.get("data", []):
-                tweet_id = tweet.get("id")
-                if tweet_id:
-                    analytics = self._parse_twitter_analytics(tweet)
-                    analytics["fetched_at"] = datetime.utcnow()
-                    analytics["platform"] = "twitter"
-                    analytics["platform_post_id"] = tweet_id
-                    analytics["platform_post_url"] = f"https://twitter.com/i/web/status/{tweet_id}"
-                    results[tweet_id] = analytics
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"Failed to fetch multiple tweets: {e}")
-            raise PlatformAPIError(
-                f"Failed to fetch multiple tweets: {str(e)}",
-                platform="twitter"
-            )
+        return results
     
     def fetch_user_metrics(self, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -8,6 +8,7 @@ from datetime import datetime
 
 from app.services.publishing.base_publisher import BasePublisher, PublishResult
 from app.core.sentry_config import add_breadcrumb
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 
 class LinkedInPublisher(BasePublisher):
@@ -66,7 +67,7 @@ class LinkedInPublisher(BasePublisher):
             "X-Restli-Protocol-Version": "2.0.0"
         }
         
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(self.PROFILE_URL, headers=headers)
             response.raise_for_status()
             profile = response.json()
@@ -143,7 +144,7 @@ class LinkedInPublisher(BasePublisher):
                 "X-Restli-Protocol-Version": "2.0.0"
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with shared_http_client(timeout=30.0) as client:
                 response = await client.post(
                     self.UGC_POSTS_URL,
                     json=post_data,
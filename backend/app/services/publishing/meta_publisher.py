@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 import httpx
 from app.services.publishing.base_publisher import BasePublisher, PublishResult
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 try:
     import sentry_sdk
@@ -120,7 +121,7 @@ class MetaPublisher(BasePublisher):
         # Post to Facebook Page feed
         url = f"{self.GRAPH_API_BASE}/{page_id}/feed"
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with shared_http_client(timeout=30.0) as client:
             response = await client.post(url, data=post_data)
             response.raise_for_status()
         
@@ -181,7 +182,7 @@ class MetaPublisher(BasePublisher):
         
         container_url = f"{self.GRAPH_API_BASE}/{instagram_account_id}/media"
         
-        async with httpx.AsyncClient(timeout=60.0) as client:  # Longer timeout for media processing
+        async with shared_http_client(timeout=60.0) as client:  # Longer timeout for media processing
             # Create container
             container_response = await client.post(container_url, data=container_data)
             container_response.raise_for_status()
@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 import httpx
 from app.services.publishing.base_publisher import BasePublisher, PublishResult
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 try:
     import sentry_sdk
@@ -185,7 +186,7 @@ class TwitterPublisher(BasePublisher):
         }
         
         # Post tweet
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with shared_http_client(timeout=30.0) as client:
             response = await client.post(
                 self.TWEETS_URL,
                 json=tweet_data,
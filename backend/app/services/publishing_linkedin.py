@@ -10,6 +10,7 @@ import httpx
 from app.core.config import settings
 from app.core.encryption import decrypt_token
 from app.models.social_account import SocialAccount
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 
 class LinkedInPublishingService:
@@ -23,7 +24,7 @@ class LinkedInPublishingService:
     MAX_HASHTAGS = 30
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = shared_http_client(timeout=30.0)
     
     async def __aenter__(self):
         return self
@@ -21,9 +21,9 @@ Instagram:
 """
 
 from typing import Dict, Any, Optional
-import httpx
 import asyncio
 import logging
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +100,7 @@ class MetaPublishingService:
             payload["link"] = link
         
         # Make API request
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.post(url, data=payload)
             response.raise_for_status()
             
@@ -143,7 +143,7 @@ class MetaPublishingService:
             "access_token": page_access_token
         }
         
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.post(url, data=payload)
             response.raise_for_status()
             
@@ -253,7 +253,7 @@ class MetaPublishingService:
             "access_token": page_access_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with shared_http_client(timeout=30.0) as client:
             response = await client.post(url, data=payload)
             response.raise_for_status()
             
@@ -287,7 +287,7 @@ class MetaPublishingService:
             "access_token": page_access_token
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with shared_http_client(timeout=30.0) as client:
             response = await client.post(url, data=payload)
             response.raise_for_status()
             
@@ -344,7 +344,7 @@ class MetaPublishingService:
                 "access_token": access_token
             }
         
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             
@@ -382,7 +382,7 @@ class MetaPublishingService:
             "access_token": access_token
         }
         
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.delete(url, params=params)
             response.raise_for_status()
             
@@ -13,6 +13,7 @@ import re
 from app.core.config import settings
 from app.core.encryption import decrypt_token
 from app.models.social_account import SocialAccount
+from app.services.platform_fetchers.http_transport import shared_http_client
 
 
 class TwitterPublishingService:
@@ -27,7 +28,7 @@ class TwitterPublishingService:
     MAX_THREAD_TWEETS = 25  # Maximum tweets in a thread
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = shared_http_client(timeout=30.0)
     
     async def __aenter__(self):
         return self
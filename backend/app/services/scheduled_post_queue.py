@@ -0,0 +1,220 @@
+"""
+Scheduled Post Queue
+
+Delayed-job store for scheduled posts: a Redis sorted set of post IDs
+scored by their due time in epoch milliseconds.
+
+    API (schedule / reschedule / cancel)  -> ZADD / ZREM
+    scheduled post dispatcher             -> claim_due_posts() when due
+                                             -> publish_scheduled_post (no ETA)
+    reconcile_scheduled_posts (beat)      -> reconcile_schedule() against the DB
+
+Posts wait in Redis rather than as ETA tasks held in worker memory, and
+claiming pops them atomically, so concurrent dispatchers never send the
+same post twice. The database stays the source of truth: reconciliation
+re-adds pending posts missing from the set (e.g. Redis was unavailable
+when they were scheduled) and drops posts that are no longer pending.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import time
+
+from sqlalchemy.orm import Session
+
+from app.models.scheduled_post import ScheduledPost
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEY = "publishing:scheduled_posts"
+
+# Posts claimed by one dispatcher pass
+CLAIM_BATCH_SIZE = 100
+
+# Members written per reconciliation script call
+RECONCILE_BATCH_SIZE = 500
+
+# Pop up to ARGV[2] members scored at or before ARGV[1], with their scores
+CLAIM_DUE_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "WITHSCORES", "LIMIT", 0, ARGV[2])
+for i = 1, #due, 2 do
+    redis.call("zrem", KEYS[1], due[i])
+end
+return due
+"""
+
+# For each (member, score, expected) triple, set the member's score (or
+# remove it when score is "") only if its current score is still the one
+# reconciliation read (or it is still absent when expected is "")
+COMPARE_AND_SET_SCRIPT = """
+local changed = 0
+for i = 1, #ARGV, 3 do
+    local current = redis.call("zscore", KEYS[1], ARGV[i])
+    if tonumber(current) == tonumber(ARGV[i + 2]) then
+        if ARGV[i + 1] == "" then
+            redis.call("zrem", KEYS[1], ARGV[i])
+        else
+            redis.call("zadd", KEYS[1], ARGV[i + 1], ARGV[i])
+        end
+        changed = changed + 1
+    end
+end
+return changed
+"""
+
+
+def _get_redis():
+    """Get the shared Redis client (imported lazily so modules load without Redis)."""
+    from app.core.redis_client import get_redis_client
+    return get_redis_client()
+
+
+def _get_async_redis():
+    """Get the shared asyncio Redis client."""
+    from app.core.redis_client import get_async_redis_client
+    return get_async_redis_client()
+
+
+def due_score(when: datetime) -> int:
+    """
+    Get the sorted set score of a due time.
+
+    Args:
+        when: Due time (naive values are UTC, as stored in scheduled_posts)
+
+    Returns:
+        Epoch milliseconds
+    """
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp() * 1000)
+
+
+def schedule_post(post_id: int, due_at: datetime):
+    """
+    Add a post to the queue, or move it to a new due time.
+
+    Args:
+        post_id: Scheduled post ID
+        due_at: When to publish
+    """
+    _get_redis().zadd(SCHEDULE_KEY, {str(post_id): due_score(due_at)})
+
+
+async def aschedule_post(post_id: int, due_at: datetime):
+    """Async version of schedule_post for use inside async endpoints."""
+    await _get_async_redis().zadd(SCHEDULE_KEY, {str(post_id): due_score(due_at)})
+
+
+def unschedule_post(post_id: int):
+    """
+    Remove a post from the queue.
+
+    Args:
+        post_id: Scheduled post ID
+    """
+    _get_redis().zrem(SCHEDULE_KEY, str(post_id))
+
+
+async def aunschedule_post(post_id: int):
+    """Async version of unschedule_post for use inside async endpoints."""
+    await _get_async_redis().zrem(SCHEDULE_KEY, str(post_id))
+
+
+def claim_due_posts(now: Optional[datetime] = None, limit: int = CLAIM_BATCH_SIZE) -> List[Tuple[int, int]]:
+    """
+    Atomically pop the posts that are due.
+
+    Args:
+        now: Current time (defaults to now)
+        limit: Maximum number of posts to claim
+
+    Returns:
+        List of (post_id, score) in due order; each post is returned to
+        exactly one caller
+    """
+    score = due_score(now) if now else int(time.time() * 1000)
+    due = _get_redis().eval(CLAIM_DUE_SCRIPT, 1, SCHEDULE_KEY, score, limit)
+    return [(int(due[i]), int(float(due[i + 1]))) for i in range(0, len(due), 2)]
+
+
+def requeue_post(post_id: int, score: int):
+    """
+    Put a claimed post back with its original due time.
+
+    Args:
+        post_id: Scheduled post ID
+        score: Score returned by claim_due_posts
+    """
+    _get_redis().zadd(SCHEDULE_KEY, {str(post_id): score})
+
+
+def next_due_at() -> Optional[float]:
+    """
+    Get when the earliest queued post is due.
+
+    Returns:
+        Epoch seconds, or None if the queue is empty
+    """
+    head = _get_redis().zrange(SCHEDULE_KEY, 0, 0, withscores=True)
+    return head[0][1] / 1000 if head else None
+
+
+def _compare_and_set(redis, changes: List[Tuple[int, Any, Any]]) -> int:
+    """Apply (post_id, score or None, expected score or None) changes in batches."""
+    changed = 0
+    for start in range(0, len(changes), RECONCILE_BATCH_SIZE):
+        args = []
+        for post_id, score, expected in changes[start:start + RECONCILE_BATCH_SIZE]:
+            args += [str(post_id), "" if score is None else score, "" if expected is None else expected]
+        changed += redis.eval(COMPARE_AND_SET_SCRIPT, 1, SCHEDULE_KEY, *args)
+    return changed
+
+
+def reconcile_schedule(db: Session) -> Dict[str, int]:
+    """
+    Make the queue match the pending posts in the database.
+
+    The queue is read before the database, and every write is a
+    compare-and-set against what was read, so posts scheduled, moved or
+    claimed while reconciliation runs are left alone.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Counts of pending posts, posts added or moved, and stale members removed
+    """
+    redis = _get_redis()
+    queued = {int(member): int(score) for member, score in redis.zscan_iter(SCHEDULE_KEY)}
+
+    pending = db.query(ScheduledPost.id, ScheduledPost.scheduled_for).filter(
+        ScheduledPost.status == "pending"
+    ).yield_per(RECONCILE_BATCH_SIZE)
+
+    upserts = []
+    pending_count = 0
+    for post_id, scheduled_for in pending:
+        pending_count += 1
+        score = due_score(scheduled_for)
+        expected = queued.pop(post_id, None)
+        if expected != score:
+            upserts.append((post_id, score, expected))
+
+    # Whatever is left in the snapshot is no longer pending
+    removals = [(post_id, None, score) for post_id, score in queued.items()]
+
+    result = {
+        "pending": pending_count,
+        "added": _compare_and_set(redis, upserts),
+        "removed": _compare_and_set(redis, removals)
+    }
+
+    if result["added"] or result["removed"]:
+        logger.warning(
+            f"Reconciled scheduled post queue: {result['added']} added or moved, "
+            f"{result['removed']} removed",
+            extra={"event_type": "scheduled_posts_reconciled", **result}
+        )
+
+    return result
@@ -0,0 +1,60 @@
+"""
+Text Search
+
+Query builders for the indexed search of saved content and images.
+
+Post text is matched with Postgres full-text search against the generated
+``search_vector`` columns of ``content`` and ``published_posts`` (GIN
+indexed), so a search reads the matching rows instead of scanning the
+table. Filenames are matched with pg_trgm: a substring match (ILIKE
+'%term%') or a fuzzy match on trigram similarity, both served by a
+trigram GIN index.
+
+Usage:
+    query = select(Content).where(text_match(Content.search_vector, term))
+    query = query.order_by(text_rank(Content.search_vector, term).desc())
+"""
+from sqlalchemy import func, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+# Text search configuration the search_vector columns are built with
+SEARCH_CONFIG = "english"
+
+
+def search_query(term: str) -> ColumnElement:
+    """
+    Parse user input into a tsquery.
+
+    websearch_to_tsquery accepts free text ("quoted phrases", or, -excluded)
+    and never raises a syntax error, so raw input can be passed through.
+    """
+    return func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+
+def text_match(search_vector: ColumnElement, term: str) -> ColumnElement:
+    """Condition: the document matches the search term."""
+    return search_vector.op("@@")(search_query(term))
+
+
+def text_rank(search_vector: ColumnElement, term: str) -> ColumnElement:
+    """Relevance of the document to the search term (higher is better)."""
+    return func.ts_rank_cd(search_vector, search_query(term))
+
+
+def fuzzy_match(column: ColumnElement, term: str) -> ColumnElement:
+    """
+    Condition: the column contains the term, or is similar to it.
+
+    Similarity uses pg_trgm's ``%`` operator (threshold:
+    pg_trgm.similarity_threshold, 0.3 by default), which catches typos and
+    reordered words that a substring match misses.
+    """
+    return or_(
+        column.icontains(term, autoescape=True),
+        column.op("%")(term)
+    )
+
+
+def fuzzy_rank(column: ColumnElement, term: str) -> ColumnElement:
+    """Trigram similarity of the column to the term (0 to 1)."""
+    return func.similarity(column, term)
@@ -5,12 +5,22 @@ Celery tasks for async operations.
 """
 from app.tasks.publishing_tasks import (
     publish_scheduled_post,
-    check_and_publish_scheduled_posts,
+    reconcile_scheduled_posts,
     cleanup_old_scheduled_posts
 )
+from app.tasks.analytics_tasks import (
+    dispatch_analytics_sync,
+    sync_business_shard,
+    summarize_analytics_sync,
+    maintain_post_analytics
+)
 
 __all__ = [
     'publish_scheduled_post',
-    'check_and_publish_scheduled_posts',
+    'reconcile_scheduled_posts',
     'cleanup_old_scheduled_posts',
+    'dispatch_analytics_sync',
+    'sync_business_shard',
+    'summarize_analytics_sync',
+    'maintain_post_analytics',
 ]
@@ -0,0 +1,327 @@
+"""
+Analytics Background Tasks
+
+Celery tasks for the distributed hourly analytics sync.
+
+The hourly run is split into shards of businesses that are synced in
+parallel by the workers consuming the ``analytics`` queue:
+
+    dispatch_analytics_sync          (one per hour, guarded by a Redis lock)
+        -> sync_business_shard x N   (one per shard of businesses)
+        -> summarize_analytics_sync  (chord callback, aggregate report)
+
+maintain_post_analytics runs daily to create upcoming post_analytics
+partitions and downsample old history.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+
+from celery import chord
+
+from app.celery_app import celery_app
+from app.db.database import SessionLocal
+from app.models.business import Business
+from app.services.analytics_retention import AnalyticsRetentionService
+from app.services.platform_fetchers.analytics_sync_service import AnalyticsSyncService
+from app.services.platform_fetchers.http_transport import get_shared_transport
+
+logger = logging.getLogger(__name__)
+
+# Businesses synced by a single task
+ANALYTICS_SYNC_SHARD_SIZE = 10
+
+# Only one dispatcher may enqueue a given hourly run
+DISPATCH_LOCK_PREFIX = "analytics:sync:dispatch"
+DISPATCH_LOCK_TTL = 3600
+
+# Aggregate report of the last completed run
+LAST_REPORT_KEY = "analytics:sync:last_report"
+LAST_REPORT_TTL = 86400
+
+
+def _get_redis():
+    """Get the shared Redis client (imported lazily so tasks load without Redis)."""
+    from app.core.redis_client import get_redis_client
+    return get_redis_client()
+
+
+def get_run_key(now: Optional[datetime] = None) -> str:
+    """
+    Get the identifier of the hourly sync run a point in time belongs to.
+
+    Args:
+        now: Point in time (defaults to utcnow)
+
+    Returns:
+        Run key, e.g. "2025102014"
+    """
+    return (now or datetime.utcnow()).strftime("%Y%m%d%H")
+
+
+def acquire_dispatch_lock(run_key: str, ttl: int = DISPATCH_LOCK_TTL) -> bool:
+    """
+    Try to become the dispatcher of a sync run.
+
+    Every scheduler (each uvicorn worker's APScheduler and Celery beat)
+    races for the same key; SET NX lets exactly one of them win. The lock is
+    not released, so late schedulers for the same run are skipped too.
+
+    Args:
+        run_key: Sync run identifier
+        ttl: Lock lifetime in seconds
+
+    Returns:
+        True if this caller should enqueue the run
+    """
+    lock_key = f"{DISPATCH_LOCK_PREFIX}:{run_key}"
+    return bool(_get_redis().set(lock_key, datetime.utcnow().isoformat(), nx=True, ex=ttl))
+
+
+def shard_business_ids(business_ids: List[int], shard_size: int = ANALYTICS_SYNC_SHARD_SIZE) -> List[List[int]]:
+    """
+    Split business IDs into shards.
+
+    Args:
+        business_ids: Business IDs to sync
+        shard_size: Businesses per shard
+
+    Returns:
+        List of shards (lists of business IDs)
+    """
+    shard_size = max(1, shard_size)
+    return [
+        business_ids[start:start + shard_size]
+        for start in range(0, len(business_ids), shard_size)
+    ]
+
+
+def get_last_sync_report() -> Optional[Dict[str, Any]]:
+    """
+    Get the aggregate report of the last completed distributed sync.
+
+    Returns:
+        Report dictionary, or None if no run has completed recently
+    """
+    try:
+        report = _get_redis().get(LAST_REPORT_KEY)
+        return json.loads(report) if report else None
+    except Exception as e:
+        logger.warning(f"Failed to read last analytics sync report: {e}")
+        return None
+
+
+@celery_app.task
+def dispatch_analytics_sync(
+    shard_size: int = ANALYTICS_SYNC_SHARD_SIZE,
+    run_key: Optional[str] = None
+) -> dict:
+    """
+    Enqueue the analytics sync for all businesses, one task per shard.
+
+    Safe to call from every scheduler: only the first caller for a run
+    enqueues anything.
+
+    Args:
+        shard_size: Businesses per shard task
+        run_key: Sync run identifier (defaults to the current hour)
+
+    Returns:
+        Dict with dispatch details
+    """
+    run_key = run_key or get_run_key()
+
+    if not acquire_dispatch_lock(run_key):
+        logger.info(f"Analytics sync run {run_key} already dispatched by another scheduler")
+        return {
+            "success": True,
+            "dispatched": False,
+            "run_key": run_key
+        }
+
+    db = SessionLocal()
+    try:
+        business_ids = [business_id for (business_id,) in db.query(Business.id).order_by(Business.id).all()]
+    finally:
+        db.close()
+
+    if not business_ids:
+        logger.info("No businesses found to sync")
+        return {
+            "success": True,
+            "dispatched": False,
+            "run_key": run_key,
+            "businesses": 0
+        }
+
+    shards = shard_business_ids(business_ids, shard_size)
+    started_at = datetime.utcnow().isoformat()
+
+    result = chord(
+        sync_business_shard.s(shard) for shard in shards
+    )(summarize_analytics_sync.s(run_key=run_key, started_at=started_at))
+
+    logger.info(
+        f"Dispatched analytics sync run {run_key}: "
+        f"{len(business_ids)} businesses in {len(shards)} shards",
+        extra={
+            "event_type": "analytics_sync_dispatched",
+            "run_key": run_key,
+            "businesses": len(business_ids),
+            "shards": len(shards)
+        }
+    )
+
+    return {
+        "success": True,
+        "dispatched": True,
+        "run_key": run_key,
+        "businesses": len(business_ids),
+        "shards": len(shards),
+        "report_task_id": result.id
+    }
+
+
+@celery_app.task(soft_time_limit=1500, time_limit=1800)
+def sync_business_shard(business_ids: List[int], due_only: bool = True) -> dict:
+    """
+    Sync analytics for a shard of businesses.
+
+    A failing business never fails the shard, so the chord callback always
+    runs.
+
+    Args:
+        business_ids: Businesses in this shard
+        due_only: Only sync posts that are due (see SyncPlanner)
+
+    Returns:
+        Dict with per-shard totals and failed business IDs
+    """
+    db = SessionLocal()
+
+    totals = {
+        "businesses": len(business_ids),
+        "total_posts": 0,
+        "synced": 0,
+        "failed": 0,
+        "rate_limited": 0,
+        "failed_businesses": []
+    }
+
+    try:
+        for business_id in business_ids:
+            try:
+                sync_service = AnalyticsSyncService(db, transport=get_shared_transport())
+                result = asyncio.run(sync_service.sync_business_analytics_async(
+                    business_id=business_id,
+                    due_only=due_only
+                ))
+
+                totals["total_posts"] += result["total_posts"]
+                totals["synced"] += result["synced"]
+                totals["failed"] += result["failed"]
+                totals["rate_limited"] += result["rate_limited"]
+
+            except Exception as e:
+                logger.error(f"Failed to sync business {business_id}: {e}", exc_info=True)
+                db.rollback()
+                totals["failed_businesses"].append(business_id)
+
+        return totals
+
+    finally:
+        db.close()
+
+
+@celery_app.task
+def summarize_analytics_sync(
+    shard_results: List[dict],
+    run_key: str,
+    started_at: str
+) -> dict:
+    """
+    Aggregate shard results into a completion report for the run.
+
+    Args:
+        shard_results: Results of every sync_business_shard task
+        run_key: Sync run identifier
+        started_at: ISO timestamp of the dispatch
+
+    Returns:
+        Aggregate report (also stored in Redis under LAST_REPORT_KEY)
+    """
+    report = {
+        "run_key": run_key,
+        "started_at": started_at,
+        "completed_at": datetime.utcnow().isoformat(),
+        "shards": len(shard_results),
+        "businesses": 0,
+        "total_posts": 0,
+        "synced": 0,
+        "failed": 0,
+        "rate_limited": 0,
+        "failed_businesses": []
+    }
+
+    for shard_result in shard_results:
+        for key in ("businesses", "total_posts", "synced", "failed", "rate_limited"):
+            report[key] += shard_result.get(key, 0)
+        report["failed_businesses"].extend(shard_result.get("failed_businesses", []))
+
+    report["duration_seconds"] = round(
+        (datetime.fromisoformat(report["completed_at"]) - datetime.fromisoformat(started_at)).total_seconds(), 2
+    )
+
+    logger.info(
+        f"Analytics sync run {run_key} complete: "
+        f"{report['synced']}/{report['total_posts']} posts synced, "
+        f"{report['failed']} failures, "
+        f"{report['businesses']} businesses processed "
+        f"in {report['duration_seconds']:.2f}s",
+        extra={"event_type": "analytics_sync_completed", **report}
+    )
+
+    try:
+        _get_redis().set(LAST_REPORT_KEY, json.dumps(report), ex=LAST_REPORT_TTL)
+    except Exception as e:
+        logger.warning(f"Failed to store analytics sync report: {e}")
+
+    return report
+
+
+@celery_app.task(soft_time_limit=3000, time_limit=3600)
+def maintain_post_analytics(full: bool = False) -> dict:
+    """
+    Create upcoming post_analytics partitions and downsample old history.
+
+    Args:
+        full: Downsample all history instead of only the recent lookback
+              window (for the first run after enabling retention)
+
+    Returns:
+        Dict with the partitions ensured and rows removed per bucket unit
+    """
+    db = SessionLocal()
+
+    try:
+        retention = AnalyticsRetentionService(db)
+        partitions = retention.ensure_partitions()
+        deleted = retention.downsample(
+            lookback_days=None if full else AnalyticsRetentionService.DOWNSAMPLE_LOOKBACK_DAYS
+        )
+
+        logger.info(
+            f"post_analytics maintenance complete: {sum(deleted.values())} rows downsampled",
+            extra={"event_type": "post_analytics_maintenance", "deleted": deleted}
+        )
+
+        return {
+            "success": True,
+            "partitions": partitions,
+            "deleted": deleted
+        }
+
+    finally:
+        db.close()
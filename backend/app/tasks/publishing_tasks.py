@@ -6,8 +6,10 @@ Celery tasks for scheduled post publishing and maintenance.
 from datetime import datetime, timedelta
 from typing import Optional
 from celery import Task
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 import logging
+import time
 
 from app.celery_app import celery_app
 from app.db.database import SessionLocal
@@ -15,6 +17,14 @@ from app.models.scheduled_post import ScheduledPost
 from app.models.social_account import SocialAccount
 from app.models.published_post import PublishedPost
 from app.core.encryption import decrypt_token
+from app.core.query_cache import bump_business_data_version
+from app.services.scheduled_post_queue import (
+    CLAIM_BATCH_SIZE,
+    claim_due_posts,
+    due_score,
+    reconcile_schedule,
+    requeue_post
+)
 from app.services.publishing import (
     linkedin_publisher,
     twitter_publisher,
@@ -23,6 +33,10 @@ from app.services.publishing import (
 
 logger = logging.getLogger(__name__)
 
+# Posts claimed later than this after their due time (e.g. re-added by
+# reconciliation after an outage) are expired instead of published
+MAX_DISPATCH_LATENESS = timedelta(minutes=5)
+
 
 def get_publisher(platform: str):
     """Get the appropriate publisher for the platform."""
@@ -78,8 +92,19 @@ async def publish_scheduled_post(self, scheduled_post_id: int) -> dict:
                 "scheduled_post_id": scheduled_post_id
             }
         
-        # Check if already published or cancelled
-        if scheduled_post.status in ["published", "cancelled"]:
+        # Take the post with a conditional update, so a duplicate dispatch
+        # (or a worker racing a cancellation) cannot publish it twice
+        claimable = ["pending", "queued"] + (["failed"] if self.request.retries else [])
+        claimed = db.query(ScheduledPost).filter(
+            ScheduledPost.id == scheduled_post_id,
+            ScheduledPost.status.in_(claimable)
+        ).update(
+            {"status": "publishing", "updated_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+        
+        if not claimed:
             logger.warning(f"Scheduled post {scheduled_post_id} already {scheduled_post.status}")
             return {
                 "success": False,
@@ -88,10 +113,6 @@ async def publish_scheduled_post(self, scheduled_post_id: int) -> dict:
                 "status": scheduled_post.status
             }
         
-        # Update status to publishing
-        scheduled_post.status = "publishing"
-        db.commit()
-        
         logger.info(
             f"Publishing scheduled post {scheduled_post_id}",
             extra={
@@ -162,6 +183,9 @@ async def publish_scheduled_post(self, scheduled_post_id: int) -> dict:
             
             db.commit()
             
+            # Worker event loops are short-lived, so use the sync Redis client
+            bump_business_data_version(scheduled_post.business_id)
+            
             logger.info(
                 f"Successfully published scheduled post {scheduled_post_id}",
                 extra={
@@ -251,71 +275,147 @@ async def publish_scheduled_post(self, scheduled_post_id: int) -> dict:
         }
 
 
-@celery_app.task(base=DatabaseTask)
-def check_and_publish_scheduled_posts():
+def dispatch_due_posts(now: Optional[datetime] = None, limit: int = CLAIM_BATCH_SIZE) -> int:
     """
-    Periodic task to check for posts scheduled within the next minute and publish them.
+    Send the posts that are due to the publishing queue.
     
-    Runs every minute via Celery Beat.
+    Called in a loop by the scheduled post dispatcher. Posts are claimed
+    atomically from the delayed-job store, then moved from "pending" to
+    "queued" with a conditional update, so posts cancelled or already
+    dispatched in the meantime are skipped. Posts claimed more than
+    MAX_DISPATCH_LATENESS after their due time are marked "expired"
+    instead of being published late.
+    
+    Args:
+        now: Current time (defaults to now)
+        limit: Maximum number of posts to claim
+        
+    Returns:
+        Number of posts sent to the publishing queue
     """
+    claimed = claim_due_posts(now, limit)
+    if not claimed:
+        return 0
+    
+    now_score = due_score(now) if now else int(time.time() * 1000)
+    cutoff = now_score - int(MAX_DISPATCH_LATENESS.total_seconds() * 1000)
+    late = [(post_id, score) for post_id, score in claimed if score < cutoff]
+    due = [(post_id, score) for post_id, score in claimed if score >= cutoff]
+    
     db = SessionLocal()
     
     try:
-        # Find posts scheduled for the next minute
-        now = datetime.utcnow()
-        next_minute = now + timedelta(minutes=1)
-        
-        scheduled_posts = db.query(ScheduledPost).filter(
-            ScheduledPost.status == "pending",
-            ScheduledPost.scheduled_for <= next_minute,
-            ScheduledPost.scheduled_for > now - timedelta(minutes=5)  # Don't process posts more than 5 min old
-        ).all()
+        try:
+            expired_ids = set()
+            if late:
+                expired_ids = set(db.execute(
+                    update(ScheduledPost)
+                    .where(
+                        ScheduledPost.id.in_([post_id for post_id, _ in late]),
+                        ScheduledPost.status == "pending"
+                    )
+                    .values(
+                        status="expired",
+                        error_message="Post expired - not dispatched within 5 minutes of its scheduled time",
+                        updated_at=datetime.utcnow()
+                    )
+                    .returning(ScheduledPost.id)
+                    .execution_options(synchronize_session=False)
+                ).scalars())
+            
+            queued_ids = set()
+            if due:
+                queued_ids = set(db.execute(
+                    update(ScheduledPost)
+                    .where(
+                        ScheduledPost.id.in_([post_id for post_id, _ in due]),
+                        ScheduledPost.status == "pending"
+                    )
+                    .values(status="queued", updated_at=datetime.utcnow())
+                    .returning(ScheduledPost.id)
+                    .execution_options(synchronize_session=False)
+                ).scalars())
+            db.commit()
+        except Exception:
+            # The claim already removed the posts from Redis; put them back
+            # now rather than waiting for reconciliation
+            db.rollback()
+            for post_id, score in claimed:
+                requeue_post(post_id, score)
+            raise
         
-        logger.info(
-            f"Checking scheduled posts: {len(scheduled_posts)} posts ready to publish",
-            extra={
-                "event_type": "scheduled_posts_check",
-                "count": len(scheduled_posts),
-                "time_range": f"{now} to {next_minute}"
-            }
-        )
+        for post_id, score in late:
+            if post_id in expired_ids:
+                logger.warning(
+                    f"Expired scheduled post {post_id} instead of publishing it late",
+                    extra={
+                        "event_type": "scheduled_post_expired",
+                        "scheduled_post_id": post_id,
+                        "lateness_ms": now_score - score
+                    }
+                )
         
-        for post in scheduled_posts:
-            # Calculate delay (publish exactly at scheduled time)
-            delay_seconds = max(0, (post.scheduled_for - now).total_seconds())
+        dispatched = 0
+        for post_id, score in due:
+            if post_id not in queued_ids:
+                continue
             
-            # Queue the publish task with ETA
-            task = publish_scheduled_post.apply_async(
-                args=[post.id],
-                eta=post.scheduled_for
-            )
+            try:
+                task = publish_scheduled_post.apply_async(args=[post_id])
+            except Exception as e:
+                # Put the post back so the next pass retries it
+                logger.error(f"Failed to dispatch scheduled post {post_id}: {e}", exc_info=True)
+                db.execute(
+                    update(ScheduledPost)
+                    .where(ScheduledPost.id == post_id, ScheduledPost.status == "queued")
+                    .values(status="pending")
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                requeue_post(post_id, score)
+                continue
             
-            # Store Celery task ID
-            post.celery_task_id = task.id
-            post.status = "queued"
-            post.updated_at = datetime.utcnow()
+            db.execute(
+                update(ScheduledPost)
+                .where(ScheduledPost.id == post_id)
+                .values(celery_task_id=task.id)
+                .execution_options(synchronize_session=False)
+            )
+            dispatched += 1
             
             logger.info(
-                f"Queued scheduled post {post.id} for publishing at {post.scheduled_for}",
+                f"Dispatched scheduled post {post_id}",
                 extra={
                     "event_type": "scheduled_post_queued",
-                    "scheduled_post_id": post.id,
-                    "platform": post.platform,
-                    "scheduled_for": post.scheduled_for.isoformat(),
+                    "scheduled_post_id": post_id,
+                    "lateness_ms": int(time.time() * 1000) - score,
                     "celery_task_id": task.id
                 }
             )
         
         db.commit()
-        
-        return {
-            "success": True,
-            "checked_at": now.isoformat(),
-            "posts_queued": len(scheduled_posts)
-        }
+        return dispatched
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(base=DatabaseTask)
+def reconcile_scheduled_posts():
+    """
+    Periodic task to reconcile the delayed-job store with the database.
+    
+    Re-adds pending posts missing from Redis and drops posts that are no
+    longer pending. Runs every 5 minutes via Celery Beat.
+    """
+    db = SessionLocal()
+    
+    try:
+        result = reconcile_schedule(db)
+        return {"success": True, **result}
     
     except Exception as e:
-        logger.error(f"Error checking scheduled posts: {str(e)}", exc_info=True)
+        logger.error(f"Error reconciling scheduled posts: {str(e)}", exc_info=True)
         return {
             "success": False,
             "error": str(e)
@@ -0,0 +1,77 @@
+"""
+Scheduled Post Dispatcher
+
+Long-running process that sends scheduled posts to the publishing queue
+when they are due:
+
+    python -m app.tasks.scheduled_post_dispatcher
+
+It sleeps until the earliest post in the delayed-job store is due (at most
+DISPATCH_POLL_INTERVAL, so posts scheduled in the meantime are picked up),
+then claims and dispatches everything due. Claims are atomic, so several
+dispatchers can run side by side for availability.
+"""
+from typing import Optional
+import logging
+import signal
+import threading
+import time
+
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.services.scheduled_post_queue import next_due_at
+from app.tasks.publishing_tasks import dispatch_due_posts
+
+logger = logging.getLogger(__name__)
+
+# Longest sleep between passes, in seconds
+DISPATCH_POLL_INTERVAL = 1.0
+
+# Pause after an error (e.g. Redis or the database unreachable)
+DISPATCH_ERROR_BACKOFF = 5.0
+
+
+def run_dispatcher(
+    stop_event: Optional[threading.Event] = None,
+    poll_interval: float = DISPATCH_POLL_INTERVAL
+):
+    """
+    Dispatch due posts until stop_event is set.
+
+    Args:
+        stop_event: Event that ends the loop (default: run forever)
+        poll_interval: Longest sleep between passes, in seconds
+    """
+    stop_event = stop_event or threading.Event()
+    logger.info("Scheduled post dispatcher started")
+
+    while not stop_event.is_set():
+        try:
+            dispatch_due_posts()
+            next_due = next_due_at()
+        except Exception as e:
+            logger.error(f"Scheduled post dispatch failed: {e}", exc_info=True)
+            stop_event.wait(DISPATCH_ERROR_BACKOFF)
+            continue
+
+        wait = poll_interval
+        if next_due is not None:
+            wait = min(poll_interval, max(0.0, next_due - time.time()))
+        stop_event.wait(wait)
+
+    logger.info("Scheduled post dispatcher stopped")
+
+
+def main():
+    """Run the dispatcher until SIGINT or SIGTERM."""
+    configure_logging(log_level=getattr(settings, "LOG_LEVEL", "INFO"))
+    stop_event = threading.Event()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    run_dispatcher(stop_event)
+
+
+if __name__ == "__main__":
+    main()
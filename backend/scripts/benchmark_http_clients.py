@@ -0,0 +1,119 @@
+"""
+Benchmark per-call httpx clients against the shared pooled transport.
+
+Starts a local stub server and times the same sequence of requests sent
+the old way (a new httpx.AsyncClient per call, as the publishers, OAuth
+and AI services used to do) and through shared_http_client().
+
+Usage:
+    python scripts/benchmark_http_clients.py [--requests 200] [--delay-ms 2]
+
+The stub speaks plain HTTP on localhost, so the numbers only show the
+connection setup and client construction saved; against the real APIs
+each avoided connection also saves DNS and a TLS handshake.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.platform_fetchers.http_transport import AsyncHTTPTransport, PooledHTTPClient  # noqa: E402
+
+
+def start_stub_server(delay: float) -> ThreadingHTTPServer:
+    """Start a keep-alive JSON stub server on a free localhost port."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Send headers and body in one segment; otherwise delayed ACKs
+        # stall every response on a kept-alive connection
+        wbufsize = -1
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(delay)
+            body = b'{"id":"1","status":"ok"}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def per_call_client(url: str, count: int) -> list:
+    """Time requests that each open and close their own client."""
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def pooled_client(transport: AsyncHTTPTransport, url: str, count: int) -> list:
+    """Time requests sent through the shared transport."""
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        async with PooledHTTPClient(transport, timeout=30.0) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(name: str, timings: list):
+    """Print latency percentiles in milliseconds."""
+    ms = sorted(t * 1000 for t in timings)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{name:<22} mean {statistics.mean(ms):7.2f} ms   "
+        f"p50 {statistics.median(ms):7.2f} ms   p95 {p95:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+    parser.add_argument("--delay-ms", type=float, default=2.0, help="Stub server latency")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.delay_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_port}/v2/ugcPosts/1"
+    transport = AsyncHTTPTransport()
+
+    try:
+        before = asyncio.run(per_call_client(url, args.requests))
+        after = asyncio.run(pooled_client(transport, url, args.requests))
+
+        print(f"{args.requests} sequential GETs against {url}")
+        report("per-call AsyncClient", before)
+        report("shared transport", after)
+
+        stats = transport.get_stats()["127.0.0.1"]
+        print(f"shared transport opened {stats['connections_opened']} connection(s) "
+              f"for {stats['requests']} requests")
+    finally:
+        transport.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,35 @@ LINKEDIN_SHARE_STATISTICS_SUCCESS = {
     }]
 }
 
+LINKEDIN_SHARE_STATISTICS_BATCH_SUCCESS = {
+    "elements": [
+        {
+            "totalShareStatistics": {
+                "likeCount": 150,
+                "commentCount": 25,
+                "shareCount": 12,
+                "impressionCount": 5500,
+                "clickCount": 80,
+                "uniqueImpressionsCount": 4800,
+                "engagement": 187
+            },
+            "organizationalEntity": "urn:li:organization:123456",
+            "share": "urn:li:share:987654321"
+        },
+        {
+            "totalShareStatistics": {
+                "likeCount": 40,
+                "commentCount": 5,
+                "shareCount": 2,
+                "impressionCount": 1200,
+                "clickCount": 15
+            },
+            "organizationalEntity": "urn:li:organization:123456",
+            "ugcPost": "urn:li:ugcPost:555555555"
+        }
+    ]
+}
+
 LINKEDIN_POST_DETAILS_SUCCESS = {
     "id": "urn:li:share:987654321",
     "author": "urn:li:organization:123456",
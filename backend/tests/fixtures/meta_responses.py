@@ -1,5 +1,7 @@
 """Mock Meta (Facebook & Instagram) API responses for testing."""
 
+import json
+
 # Facebook Post Responses
 FACEBOOK_POST_SUCCESS = {
     "id": "123456789_987654321",
@@ -85,6 +87,45 @@ INSTAGRAM_VIDEO_INSIGHTS_SUCCESS = {
     ]
 }
 
+# Graph API batch response: Facebook post, Instagram media, deleted post
+META_BATCH_SUCCESS = [
+    {
+        "code": 200,
+        "body": json.dumps({**FACEBOOK_POST_SUCCESS, "insights": FACEBOOK_INSIGHTS_SUCCESS})
+    },
+    {
+        "code": 200,
+        "body": json.dumps({**INSTAGRAM_MEDIA_SUCCESS, "insights": INSTAGRAM_INSIGHTS_SUCCESS})
+    },
+    {
+        "code": 400,
+        "body": json.dumps({
+            "error": {
+                "message": "Unsupported get request. Object with ID '123456789_555' does not exist",
+                "type": "GraphMethodException",
+                "code": 100,
+                "error_subcode": 33,
+                "fbtrace_id": "PQR345STU"
+            }
+        })
+    }
+]
+
+# Graph API batch response: existing post whose insights expansion names an invalid metric
+META_BATCH_INVALID_METRIC = [
+    {
+        "code": 400,
+        "body": json.dumps({
+            "error": {
+                "message": "(#100) The value must be a valid insights metric",
+                "type": "OAuthException",
+                "code": 100,
+                "fbtrace_id": "VWX678YZA"
+            }
+        })
+    }
+]
+
 # Error responses
 FACEBOOK_POST_NOT_FOUND = {
     "error": {
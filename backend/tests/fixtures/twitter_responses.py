@@ -71,6 +71,34 @@ TWITTER_USER_METRICS_SUCCESS = {
     }
 }
 
+TWITTER_MULTIPLE_TWEETS_PARTIAL = {
+    "data": [
+        {
+            "id": "1111111111111111111",
+            "text": "First test tweet",
+            "public_metrics": {
+                "like_count": 100,
+                "reply_count": 10,
+                "retweet_count": 20,
+                "quote_count": 5,
+                "bookmark_count": 8,
+                "impression_count": 5000
+            }
+        }
+    ],
+    "errors": [
+        {
+            "value": "3333333333333333333",
+            "detail": "Could not find tweet with ids: [3333333333333333333].",
+            "title": "Not Found Error",
+            "resource_type": "tweet",
+            "parameter": "ids",
+            "resource_id": "3333333333333333333",
+            "type": "https://api.twitter.com/2/problems/resource-not-found"
+        }
+    ]
+}
+
 # Error responses
 TWITTER_TWEET_NOT_FOUND = {
     "errors": [
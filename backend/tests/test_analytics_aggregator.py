@@ -0,0 +1,223 @@
+"""
+Unit tests for the analytics aggregator service.
+"""
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+
+# Register every model so the mappers can be configured
+from app.models import image, post_analytics, post_analytics_snapshot, analytics_summary, content_template  # noqa: F401
+from app.services.analytics_aggregator import AnalyticsAggregator
+
+
+def platform_row(platform, posts, likes, comments, shares, impressions, reach=0, clicks=0):
+    return SimpleNamespace(
+        platform=platform,
+        total_posts=posts,
+        total_likes=likes,
+        total_comments=comments,
+        total_shares=shares,
+        total_impressions=impressions,
+        total_reach=reach,
+        total_clicks=clicks,
+    )
+
+
+class TestAnalyticsAggregatorOverview:
+    """Test suite for AnalyticsAggregator.get_overview."""
+
+    @pytest.fixture
+    def aggregator(self):
+        """Aggregator whose grouped queries return canned rows."""
+        aggregator = AnalyticsAggregator(MagicMock())
+        aggregator.rollups.get_platform_totals = MagicMock(return_value=[
+            platform_row("twitter", 3, 30, 6, 4, 1000, reach=800, clicks=10),
+            platform_row("linkedin", 1, 50, 10, 0, 200, reach=150, clicks=5),
+        ])
+        aggregator.rollups.get_trends = MagicMock(return_value=[
+            SimpleNamespace(day=date(2025, 10, 1), posts_count=2, likes=40, comments=8, shares=2, impressions=600),
+            SimpleNamespace(day=date(2025, 10, 2), posts_count=2, likes=40, comments=8, shares=2, impressions=600),
+        ])
+        post_analytics_row = SimpleNamespace(
+            id=7, published_post_id=70, platform="linkedin", engagement_rate=Decimal("30.00"),
+            likes_count=50, comments_count=10, shares_count=0, impressions=200,
+            platform_post_url="https://linkedin.com/feed/update/1"
+        )
+        aggregator._query_top_posts = MagicMock(return_value=[
+            (post_analytics_row, "x" * 150, datetime(2025, 10, 1, 9))
+        ])
+        aggregator._query_posting_time_stats = MagicMock(return_value=(
+            [
+                SimpleNamespace(dow=1, posts_count=3, avg_engagement_rate=Decimal("4.5")),
+                SimpleNamespace(dow=3, posts_count=1, avg_engagement_rate=Decimal("30")),
+            ],
+            [
+                SimpleNamespace(dow=1, hour=9, avg_engagement_rate=Decimal("3")),
+                SimpleNamespace(dow=1, hour=17, avg_engagement_rate=Decimal("6")),
+                SimpleNamespace(dow=3, hour=9, avg_engagement_rate=Decimal("30")),
+            ]
+        ))
+        return aggregator
+
+    def test_overview_shape(self, aggregator):
+        """Test the overview is assembled from grouped rows in the existing shape."""
+        result = aggregator.get_overview(
+            business_id=1, start_date=date(2025, 10, 1), end_date=date(2025, 10, 31)
+        )
+
+        assert set(result) == {"period_start", "period_end", "summary", "by_platform", "trends", "top_posts", "best_times"}
+
+        summary = result["summary"]
+        assert summary["total_posts"] == 4
+        assert summary["total_likes"] == 80
+        assert summary["total_impressions"] == 1200
+        assert summary["total_reach"] == 950
+        assert summary["total_clicks"] == 15
+        assert summary["avg_engagement_rate"] == round((80 + 16 + 4) / 1200 * 100, 2)
+
+        # Sorted by engagement rate
+        assert [p["platform"] for p in result["by_platform"]] == ["linkedin", "twitter"]
+        assert result["by_platform"][0]["avg_engagement_rate"] == 30.0
+        assert result["by_platform"][1]["percentage_of_total"] == 75.0
+
+        assert result["trends"][0]["date"] == "2025-10-01"
+        assert result["trends"][0]["total_engagement"] == 50
+        assert result["trends"][0]["engagement_rate"] == round(50 / 600 * 100, 2)
+
+        top_post = result["top_posts"][0]
+        assert top_post["id"] == 70
+        assert top_post["engagement_rate"] == 30.0
+        assert top_post["content_preview"] == "x" * 100 + "..."
+
+        assert result["best_times"][0] == {
+            "day_of_week": "Wednesday",
+            "hour_of_day": 9,
+            "avg_engagement_rate": 30.0,
+            "posts_count": 1,
+            "confidence_score": 20.0,
+        }
+        assert result["best_times"][1]["day_of_week"] == "Monday"
+        assert result["best_times"][1]["hour_of_day"] == 17
+
+    def test_overview_empty(self, aggregator):
+        """Test an empty range returns the empty overview without further queries."""
+        aggregator.rollups.get_platform_totals.return_value = []
+
+        result = aggregator.get_overview(
+            business_id=1, start_date=date(2025, 10, 1), end_date=date(2025, 10, 31)
+        )
+
+        assert result == aggregator._empty_overview(date(2025, 10, 1), date(2025, 10, 31))
+        aggregator.rollups.get_trends.assert_not_called()
+        aggregator._query_top_posts.assert_not_called()
+
+    def _compiled_queries(self, method, *args):
+        db = MagicMock()
+        db.query.side_effect = lambda *entities: Query(entities)
+        aggregator = AnalyticsAggregator(db)
+        filters = aggregator._snapshot_filters(1, date(2025, 10, 1), date(2025, 10, 31), "twitter")
+
+        with patch.object(Query, "all", autospec=True, return_value=[]) as query_all:
+            getattr(aggregator, method)(filters, *args)
+
+        return [
+            str(call.args[0].statement.compile(dialect=postgresql.dialect()))
+            for call in query_all.call_args_list
+        ]
+
+    def test_heatmap_grouped_in_sql(self):
+        """Test posting times are grouped by extract(dow / hour)."""
+        day_sql, day_hour_sql = self._compiled_queries("_query_posting_time_stats")
+        assert "GROUP BY EXTRACT(dow FROM published_posts.published_at)" in day_sql
+        assert "EXTRACT(hour FROM published_posts.published_at)" in day_hour_sql.split("GROUP BY")[1]
+
+    def test_top_posts_read_snapshots(self):
+        """Test top posts read one snapshot per post, filtered by publish date."""
+        (sql,) = self._compiled_queries("_query_top_posts")
+
+        assert "FROM post_analytics_snapshots JOIN published_posts" in sql
+        assert "post_analytics." not in sql
+        # Sargable range on published_at, not DATE(published_at)
+        assert "published_posts.published_at >=" in sql
+        assert "ORDER BY post_analytics_snapshots.engagement_rate DESC" in sql
+
+    def test_post_analytics_reads_snapshot(self):
+        """Test a post's analytics come from its snapshot, not a history row."""
+        db = MagicMock()
+        db.query.side_effect = lambda *entities: Query(entities)
+        aggregator = AnalyticsAggregator(db)
+
+        with patch.object(Query, "first", autospec=True, return_value=None) as query_first:
+            assert aggregator.get_post_analytics(5) is None
+
+        sql = str(query_first.call_args.args[0].statement.compile(dialect=postgresql.dialect()))
+        assert "FROM post_analytics_snapshots" in sql
+        assert "post_analytics_snapshots.published_post_id = %(published_post_id_1)s" in sql
+
+    def test_best_times_select_published_at(self):
+        """Test best times read published_at from the join, not the lazy relationship."""
+        db = MagicMock()
+        db.query.side_effect = lambda *entities: Query(entities)
+        aggregator = AnalyticsAggregator(db)
+        snapshot = MagicMock()
+        snapshot.to_dict.return_value = {"engagement_rate": 5.0}
+        published_at = datetime(2025, 10, 22, 9, 0)
+
+        with patch.object(Query, "all", autospec=True, return_value=[(snapshot, published_at)]) as query_all, \
+             patch.object(aggregator.calculator, "find_best_posting_times", return_value={}) as find_best:
+            aggregator.get_best_times(business_id=1, platform="twitter")
+
+        sql = str(query_all.call_args.args[0].statement.compile(dialect=postgresql.dialect()))
+        assert "published_posts.published_at" in sql.split("FROM")[0]
+        assert "FROM post_analytics_snapshots JOIN published_posts" in sql
+        find_best.assert_called_once_with([{"engagement_rate": 5.0, "published_at": published_at}])
+
+
+class TestAnalyticsAggregatorRollupReads:
+    """Test suite for the endpoints served from rollups."""
+
+    def test_trends_pass_period(self):
+        """Test get_trends reads the rollups at the requested period."""
+        aggregator = AnalyticsAggregator(MagicMock())
+        aggregator.rollups.get_trends = MagicMock(return_value=[
+            SimpleNamespace(day=date(2025, 9, 29), posts_count=5, likes=90, comments=5, shares=5, impressions=1000),
+        ])
+
+        trends = aggregator.get_trends(
+            business_id=1, start_date=date(2025, 9, 29), end_date=date(2025, 10, 26), period="weekly"
+        )
+
+        aggregator.rollups.get_trends.assert_called_once_with(
+            1, date(2025, 9, 29), date(2025, 10, 26), None, period="weekly"
+        )
+        assert trends == [{
+            "date": "2025-09-29",
+            "engagement_rate": 10.0,
+            "total_engagement": 100,
+            "impressions": 1000,
+            "posts_count": 5,
+            "likes": 90,
+            "comments": 5,
+            "shares": 5,
+        }]
+
+    def test_platform_comparison_ranks_rollup_totals(self):
+        """Test platform comparison ranks per-platform rollup totals."""
+        aggregator = AnalyticsAggregator(MagicMock())
+        aggregator.rollups.get_platform_totals = MagicMock(return_value=[
+            platform_row("twitter", 3, 30, 6, 4, 1000),
+            platform_row("linkedin", 1, 50, 10, 0, 200),
+        ])
+
+        result = aggregator.get_platform_comparison(
+            business_id=1, start_date=date(2025, 10, 1), end_date=date(2025, 10, 31)
+        )
+
+        assert result["best_platform"] == "linkedin"
+        assert [r["platform"] for r in result["rankings"]] == ["linkedin", "twitter"]
+        assert result["rankings"][1]["avg_engagement_rate"] == 4.0
+        assert len(result["insights"]) == 2
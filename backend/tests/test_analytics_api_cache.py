@@ -0,0 +1,73 @@
+"""
+Unit tests for the cached analytics endpoints.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api import analytics as analytics_api
+
+
+def async_session(sync_session):
+    """Mock AsyncSession context manager whose run_sync uses sync_session."""
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    session.run_sync = AsyncMock(side_effect=lambda fn: fn(sync_session))
+    return session
+
+
+class TestCachedAnalytics:
+    """Test suite for the analytics response cache helper."""
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_business_version_and_params(self):
+        """Test responses are cached under the business's current data version."""
+        cache = MagicMock()
+        cache.aget_or_compute = AsyncMock(return_value={"summary": {}})
+
+        with patch.object(analytics_api, "analytics_cache", cache), \
+                patch.object(analytics_api, "abusiness_data_version", AsyncMock(return_value=17)):
+            result = await analytics_api._cached_analytics("overview", 42, {"platform": "all"}, AsyncMock())
+
+        assert result == {"summary": {}}
+        key = cache.aget_or_compute.call_args.args[0]
+        assert key.startswith("overview:42:v17:")
+        assert cache.aget_or_compute.call_args.kwargs["tags"] == ["business:42", "family:overview"]
+
+    @pytest.mark.asyncio
+    async def test_computes_with_own_session(self):
+        """Test uncached responses run on a fresh read session's connection."""
+        compute = MagicMock(return_value=[1, 2])
+        sync_session = MagicMock()
+        session = async_session(sync_session)
+
+        with patch.object(analytics_api, "abusiness_data_version", AsyncMock(return_value=None)), \
+                patch.object(analytics_api, "async_read_session", return_value=session):
+            result = await analytics_api._cached_analytics("trends", 42, {}, compute)
+
+        assert result == [1, 2]
+        assert compute.call_args.args[0].db is sync_session
+        session.__aexit__.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_fill_reads_primary(self):
+        """Test values cached under a data version are computed on the primary, never a replica."""
+        compute = MagicMock(return_value={"summary": {}})
+        sync_session = MagicMock()
+
+        async def fill(key, fn, tags):
+            return await fn()
+
+        cache = MagicMock()
+        cache.aget_or_compute = AsyncMock(side_effect=fill)
+        read_session = MagicMock()
+
+        with patch.object(analytics_api, "analytics_cache", cache), \
+                patch.object(analytics_api, "abusiness_data_version", AsyncMock(return_value=17)), \
+                patch.object(analytics_api, "new_async_session", return_value=async_session(sync_session)), \
+                patch.object(analytics_api, "async_read_session", read_session):
+            result = await analytics_api._cached_analytics("overview", 42, {}, compute)
+
+        assert result == {"summary": {}}
+        assert compute.call_args.args[0].db is sync_session
+        read_session.assert_not_called()
@@ -0,0 +1,101 @@
+"""
+Unit tests for post_analytics partition maintenance and downsampling.
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+
+# Register every model so the mappers can be configured
+from app.models import image, post_analytics, post_analytics_snapshot, analytics_summary, content_template  # noqa: F401
+from app.services.analytics_retention import AnalyticsRetentionService
+
+
+def compile_statement(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+class TestAnalyticsRetentionService:
+    """Test suite for AnalyticsRetentionService."""
+
+    def test_ensure_partitions(self):
+        """Test the current and upcoming monthly partitions are created."""
+        db = MagicMock()
+
+        names = AnalyticsRetentionService(db).ensure_partitions(months_ahead=2, now=datetime(2025, 11, 20))
+
+        assert names == ["post_analytics_2025_11", "post_analytics_2025_12", "post_analytics_2026_01"]
+        statements = [str(call.args[0]) for call in db.execute.call_args_list]
+        assert statements[1] == (
+            "CREATE TABLE IF NOT EXISTS post_analytics_2025_12 PARTITION OF post_analytics "
+            "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+        )
+        db.commit.assert_called_once()
+
+    def test_create_all_partitions_new_table(self):
+        """Test a post_analytics table built by create_all gets its default and monthly partitions."""
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+
+        post_analytics.create_initial_partitions(post_analytics.PostAnalytics.__table__, connection)
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert statements[0] == "CREATE TABLE IF NOT EXISTS post_analytics_default PARTITION OF post_analytics DEFAULT"
+        assert len(statements) == AnalyticsRetentionService.PARTITION_MONTHS_AHEAD + 2
+        assert all("PARTITION OF post_analytics FOR VALUES FROM" in statement for statement in statements[1:])
+
+    def test_create_all_skips_partitions_off_postgres(self):
+        """Test other dialects (the SQLite test database) are left alone."""
+        connection = MagicMock()
+        connection.dialect.name = "sqlite"
+
+        post_analytics.create_initial_partitions(post_analytics.PostAnalytics.__table__, connection)
+
+        connection.execute.assert_not_called()
+
+    def test_downsample_delete_keeps_last_point_per_bucket(self):
+        """Test only non-latest rows of each (post, bucket) are deleted."""
+        statement = AnalyticsRetentionService(MagicMock()).build_downsample_delete(
+            "week", end=datetime(2025, 7, 14)
+        )
+        sql = str(compile_statement(statement))
+
+        assert sql.startswith("DELETE FROM post_analytics USING")
+        assert "PARTITION BY post_analytics.published_post_id, date_trunc('week', post_analytics.fetched_at)" in sql
+        assert "ORDER BY post_analytics.fetched_at DESC, post_analytics.id DESC" in sql
+        assert "post_analytics.fetched_at = ranked.fetched_at" in sql
+        assert "ranked.position >" in sql
+        # No lower bound: all older history
+        assert "post_analytics.fetched_at >=" not in sql
+
+    def test_downsample_windows(self):
+        """Test each tier scans a bucket-aligned window below its cutoff."""
+        db = MagicMock()
+        db.execute.return_value.rowcount = 5
+        retention = AnalyticsRetentionService(db)
+
+        deleted = retention.downsample(now=datetime(2025, 10, 22, 15, 30), lookback_days=14)
+
+        assert deleted == {"day": 5, "week": 5}
+        assert db.commit.call_count == 2
+
+        day_params, week_params = (
+            compile_statement(call.args[0]).params for call in db.execute.call_args_list
+        )
+        # Hourly points older than 7 days: whole days only
+        assert day_params["fetched_at_1"] == datetime(2025, 10, 15)
+        assert day_params["fetched_at_2"] == datetime(2025, 10, 1)
+        # Daily points older than 90 days: whole (Monday) weeks only
+        assert week_params["fetched_at_1"] == datetime(2025, 7, 21)
+        assert week_params["fetched_at_2"] == datetime(2025, 7, 7)
+
+    def test_downsample_rolls_back_failed_tier(self):
+        """Test a failed tier is rolled back and raised."""
+        db = MagicMock()
+        db.execute.side_effect = Exception("canceling statement due to lock timeout")
+
+        with pytest.raises(Exception, match="lock timeout"):
+            AnalyticsRetentionService(db).downsample(now=datetime(2025, 10, 22))
+
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
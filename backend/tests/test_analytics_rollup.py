@@ -0,0 +1,157 @@
+"""
+Unit tests for the analytics rollup service.
+"""
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+
+# Register every model so the mappers can be configured
+from app.models import image, post_analytics, post_analytics_snapshot, analytics_summary, content_template  # noqa: F401
+from app.services.analytics_rollup import AnalyticsRollupService
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestRollupPeriods:
+    """Test suite for period arithmetic."""
+
+    def test_period_start_and_end(self):
+        """Test weeks start on Monday and months end on their last day."""
+        day = date(2025, 10, 16)  # Thursday
+
+        assert AnalyticsRollupService.period_start(day, "daily") == day
+        assert AnalyticsRollupService.period_start(day, "weekly") == date(2025, 10, 13)
+        assert AnalyticsRollupService.period_start(day, "monthly") == date(2025, 10, 1)
+
+        assert AnalyticsRollupService.period_end(date(2025, 10, 13), "weekly") == date(2025, 10, 19)
+        assert AnalyticsRollupService.period_end(date(2025, 2, 1), "monthly") == date(2025, 2, 28)
+        assert AnalyticsRollupService.period_end(date(2025, 12, 1), "monthly") == date(2025, 12, 31)
+
+    def test_is_aligned(self):
+        """Test only ranges covering whole periods are aligned."""
+        assert AnalyticsRollupService.is_aligned(date(2025, 10, 1), date(2025, 11, 30), "monthly")
+        assert not AnalyticsRollupService.is_aligned(date(2025, 10, 2), date(2025, 11, 30), "monthly")
+        assert AnalyticsRollupService.is_aligned(date(2025, 10, 13), date(2025, 10, 26), "weekly")
+        assert not AnalyticsRollupService.is_aligned(date(2025, 10, 13), date(2025, 10, 25), "weekly")
+
+
+class TestRollupMaintenance:
+    """Test suite for incremental rollup refreshes."""
+
+    def test_refresh_for_posts_touches_only_publish_days(self):
+        """Test the refreshed days are the publish days of the synced posts."""
+        rollups = AnalyticsRollupService(MagicMock())
+        rollups.refresh_days = MagicMock(side_effect=lambda business_id, days: len(days))
+
+        posts = [
+            SimpleNamespace(business_id=1, published_at=datetime(2025, 10, 1, 9)),
+            SimpleNamespace(business_id=1, published_at=datetime(2025, 10, 1, 18)),
+            SimpleNamespace(business_id=1, published_at=datetime(2025, 10, 3, 12)),
+            SimpleNamespace(business_id=2, published_at=datetime(2025, 9, 30, 8)),
+            SimpleNamespace(business_id=2, published_at=None),
+        ]
+
+        assert rollups.refresh_for_posts(posts) == 3
+        rollups.refresh_days.assert_any_call(1, {date(2025, 10, 1), date(2025, 10, 3)})
+        rollups.refresh_days.assert_any_call(2, {date(2025, 9, 30)})
+
+    def test_refresh_days_single_transaction(self):
+        """Test dailies, weeklies and monthlies are replaced in one commit."""
+        db = MagicMock()
+        rollups = AnalyticsRollupService(db)
+
+        assert rollups.refresh_days(1, [date(2025, 10, 3), date(2025, 9, 30)]) == 2
+
+        statements = [compile_sql(call.args[0]) for call in db.execute.call_args_list]
+        assert "pg_advisory_xact_lock" in statements[0]
+        # (delete, insert) for daily, weekly and monthly
+        assert len(statements) == 7
+        assert statements[1].startswith("DELETE FROM analytics_summaries")
+        assert statements[2].startswith("INSERT INTO analytics_summaries")
+        db.commit.assert_called_once()
+
+        # Both days fall in the same week, but in different months
+        weekly_params = db.execute.call_args_list[4].args[0].compile(dialect=postgresql.dialect()).params
+        monthly_params = db.execute.call_args_list[6].args[0].compile(dialect=postgresql.dialect()).params
+        assert [date(2025, 9, 29)] in weekly_params.values()
+        assert [date(2025, 9, 1), date(2025, 10, 1)] in monthly_params.values()
+
+    def test_refresh_days_rolls_back_on_error(self):
+        """Test a failed refresh leaves no partial rollups behind."""
+        db = MagicMock()
+        db.execute.side_effect = [None, Exception("deadlock detected")]
+        rollups = AnalyticsRollupService(db)
+
+        with pytest.raises(Exception, match="deadlock"):
+            rollups.refresh_days(1, [date(2025, 10, 3)])
+
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
+
+    def test_daily_insert_reads_snapshots(self):
+        """Test daily rollups count each post once, from its snapshot."""
+        sql = compile_sql(AnalyticsRollupService(MagicMock()).build_daily_insert(1, [date(2025, 10, 3)]))
+
+        assert "INSERT INTO analytics_summaries" in sql
+        assert "FROM post_analytics_snapshots JOIN published_posts" in sql
+        assert "post_analytics." not in sql
+        assert "GROUP BY latest.platform, latest.day" in sql
+
+    def test_period_insert_derived_from_dailies(self):
+        """Test weekly rollups are grouped from the daily rows."""
+        sql = compile_sql(
+            AnalyticsRollupService(MagicMock()).build_period_insert(1, "weekly", [date(2025, 9, 29)])
+        )
+
+        assert "FROM analytics_summaries" in sql
+        assert "post_analytics" not in sql
+        assert "GROUP BY analytics_summaries.platform, CAST(date_trunc('week', analytics_summaries.period_start) AS DATE)" in sql
+
+
+class TestRollupReads:
+    """Test suite for dashboard reads from rollups."""
+
+    def _compiled_queries(self, method, *args, **kwargs):
+        db = MagicMock()
+        db.query.side_effect = lambda *entities: Query(entities)
+        rollups = AnalyticsRollupService(db)
+
+        with patch.object(Query, "all", autospec=True, return_value=[]) as query_all:
+            getattr(rollups, method)(*args, **kwargs)
+
+        return [compile_sql(call.args[0].statement) for call in query_all.call_args_list]
+
+    def test_platform_totals_read_dailies(self):
+        """Test platform totals sum daily rollups, never post_analytics."""
+        (sql,) = self._compiled_queries("get_platform_totals", 1, date(2025, 10, 1), date(2025, 10, 31))
+
+        assert "FROM analytics_summaries" in sql
+        assert "post_analytics" not in sql
+        assert "GROUP BY analytics_summaries.platform" in sql
+        assert "analytics_summaries.platform != %(platform_1)s" in sql
+
+    def test_aligned_weekly_trends_read_weekly_rollups(self):
+        """Test whole weeks are read from the weekly rollups."""
+        db = MagicMock()
+        db.query.side_effect = lambda *entities: Query(entities)
+        rollups = AnalyticsRollupService(db)
+
+        with patch.object(Query, "all", autospec=True, return_value=[]) as query_all:
+            rollups.get_trends(1, date(2025, 9, 29), date(2025, 10, 26), period="weekly")
+
+        statement = query_all.call_args.args[0].statement
+        assert "weekly" in statement.compile(dialect=postgresql.dialect()).params.values()
+        assert "GROUP BY analytics_summaries.period_start" in compile_sql(statement)
+
+    def test_partial_monthly_trends_group_dailies(self):
+        """Test partial months are grouped from the daily rollups."""
+        (sql,) = self._compiled_queries(
+            "get_trends", 1, date(2025, 10, 15), date(2025, 11, 14), period="monthly"
+        )
+
+        assert "GROUP BY CAST(date_trunc('month', analytics_summaries.period_start) AS DATE)" in sql
@@ -54,7 +54,8 @@ class TestAnalyticsSyncService:
         # Verify LinkedIn fetcher was created
         mock_linkedin_class.assert_called_once_with(
             access_token=test_social_account_linkedin.access_token,
-            organization_id=test_social_account_linkedin.page_id
+            organization_id=test_social_account_linkedin.page_id,
+            transport=None
         )
         assert "linkedin" in service.fetchers
     
@@ -72,7 +73,8 @@ class TestAnalyticsSyncService:
         
         # Verify Twitter fetcher was created
         mock_twitter_class.assert_called_once_with(
-            access_token=test_social_account_twitter.access_token
+            access_token=test_social_account_twitter.access_token,
+            transport=None
         )
         assert "twitter" in service.fetchers
     
@@ -92,7 +94,8 @@ class TestAnalyticsSyncService:
         mock_meta_class.assert_called_once_with(
             access_token=test_social_account_facebook.access_token,
             page_id=test_social_account_facebook.page_id,
-            instagram_account_id=test_social_account_facebook.instagram_account_id
+            instagram_account_id=test_social_account_facebook.instagram_account_id,
+            transport=None
         )
         assert "facebook" in service.fetchers
     
@@ -879,3 +882,236 @@ class TestAnalyticsSyncService:
         test_db.refresh(linkedin_post)
         assert linkedin_post.likes_count == 200
         assert linkedin_post.comments_count == 20
+
+
+class TestAnalyticsSyncServiceAsync:
+    """Tests for the concurrent (asyncio) sync mode."""
+    
+    @staticmethod
+    def _make_posts(platform, count, start_id=1):
+        return [
+            Mock(id=start_id + i, business_id=1, platform=platform, platform_post_id=f"{platform}_{start_id + i}", published_at=None)
+            for i in range(count)
+        ]
+    
+    @staticmethod
+    def _make_service(posts, fetchers):
+        service = AnalyticsSyncService(MagicMock())
+        service._initialize_fetchers = Mock(side_effect=lambda business_id: service.fetchers.update(fetchers))
+        service._get_posts_to_sync = Mock(return_value=posts)
+        service._save_analytics = Mock()
+        service._save_analytics_bulk = Mock(side_effect=len)
+        return service
+    
+    @staticmethod
+    def _saved_count(service):
+        return sum(len(call.args[0]) for call in service._save_analytics_bulk.call_args_list)
+    
+    @pytest.mark.asyncio
+    async def test_sync_business_analytics_async_summary(self):
+        """Test async sync reports the same by_platform summary as the serial mode."""
+        linkedin_fetcher = MagicMock(MAX_CONCURRENT_REQUESTS=2)
+        linkedin_fetcher.fetch_post_analytics.return_value = {"likes_count": 1}
+        twitter_fetcher = MagicMock(MAX_CONCURRENT_REQUESTS=10)
+        twitter_fetcher.fetch_post_analytics.return_value = {"likes_count": 2}
+        
+        posts = self._make_posts("linkedin", 3) + self._make_posts("twitter", 4, start_id=10)
+        service = self._make_service(posts, {"linkedin": linkedin_fetcher, "twitter": twitter_fetcher})
+        
+        result = await service.sync_business_analytics_async(business_id=1)
+        
+        assert result["total_posts"] == 7
+        assert result["synced"] == 7
+        assert result["failed"] == 0
+        assert result["rate_limited"] == 0
+        assert result["by_platform"]["linkedin"] == {"synced": 3, "failed": 0, "rate_limited": 0}
+        assert result["by_platform"]["twitter"] == {"synced": 4, "failed": 0, "rate_limited": 0}
+        assert self._saved_count(service) == 7
+    
+    @pytest.mark.asyncio
+    async def test_sync_business_analytics_async_bounded_concurrency(self):
+        """Test in-flight fetches never exceed the fetcher's concurrency limit."""
+        import threading
+        import time
+        
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+        
+        def slow_fetch(post_id, platform_post_id=None):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return {"likes_count": 1}
+        
+        fetcher = MagicMock(MAX_CONCURRENT_REQUESTS=2)
+        fetcher.fetch_post_analytics.side_effect = slow_fetch
+        
+        service = self._make_service(self._make_posts("linkedin", 6), {"linkedin": fetcher})
+        result = await service.sync_business_analytics_async(business_id=1)
+        
+        assert result["synced"] == 6
+        assert state["peak"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_sync_business_analytics_async_rate_limit_stops_platform(self):
+        """Test a rate limit stops further fetches for that platform only."""
+        linkedin_fetcher = MagicMock(MAX_CONCURRENT_REQUESTS=1)
+        linkedin_fetcher.fetch_post_analytics.side_effect = RateLimitError("Rate limit exceeded")
+        twitter_fetcher = MagicMock(MAX_CONCURRENT_REQUESTS=10)
+        twitter_fetcher.fetch_post_analytics.return_value = {"likes_count": 2}
+        
+        posts = self._make_posts("linkedin", 3) + self._make_posts("twitter", 2, start_id=10)
+        service = self._make_service(posts, {"linkedin": linkedin_fetcher, "twitter": twitter_fetcher})
+        
+        result = await service.sync_business_analytics_async(business_id=1)
+        
+        assert linkedin_fetcher.fetch_post_analytics.call_count == 1
+        assert result["rate_limited"] == 1
+        assert result["by_platform"]["linkedin"]["failed"] == 2
+        assert result["by_platform"]["twitter"]["synced"] == 2
+        assert "linkedin" not in service.fetchers
+        assert "twitter" in service.fetchers
+    
+    @pytest.mark.asyncio
+    async def test_sync_business_analytics_async_uses_batch_lookup(self):
+        """Test platforms with a batch size fetch posts in chunks."""
+        twitter_fetcher = MagicMock(MAX_CONCURRENT_REQUESTS=10, MAX_BATCH_SIZE=2)
+        twitter_fetcher.fetch_posts_analytics_batch.side_effect = lambda ids: {
+            platform_post_id: (
+                PostNotFoundError("Tweet deleted", post_id=platform_post_id)
+                if platform_post_id == "twitter_2" else {"likes_count": 3}
+            )
+            for platform_post_id in ids
+        }
+        twitter_fetcher.fetch_post_analytics.return_value = {"likes_count": 1}
+        
+        service = self._make_service(self._make_posts("twitter", 5), {"twitter": twitter_fetcher})
+        result = await service.sync_business_analytics_async(business_id=1)
+        
+        # Chunks of 2, 2 and a single leftover post
+        assert twitter_fetcher.fetch_posts_analytics_batch.call_count == 2
+        assert twitter_fetcher.fetch_post_analytics.call_count == 1
+        assert result["synced"] == 4
+        assert result["failed"] == 1
+        assert self._saved_count(service) == 4
+    
+    def test_sync_business_analytics_batch_missing_ids(self):
+        """Test posts missing from a batch response are recorded as failed."""
+        fetcher = MagicMock(MAX_BATCH_SIZE=50)
+        fetcher.fetch_posts_analytics_batch.return_value = {"facebook_1": {"likes_count": 3}}
+        
+        service = self._make_service(self._make_posts("facebook", 3), {"facebook": fetcher})
+        result = service.sync_business_analytics(business_id=1)
+        
+        assert fetcher.fetch_posts_analytics_batch.call_count == 1
+        assert result["synced"] == 1
+        assert result["failed"] == 2
+        assert "facebook" in service.fetchers
+    
+    def test_save_analytics_bulk_single_transaction(self):
+        """Test bulk write issues one multi-row INSERT, one UPDATE ... FROM VALUES and one commit."""
+        from sqlalchemy.dialects import postgresql
+        
+        db = MagicMock()
+        service = AnalyticsSyncService(db)
+        posts = self._make_posts("twitter", 3)
+        for post in posts:
+            post.business_id = 1
+        
+        written = service._save_analytics_bulk([
+            (post, {"likes_count": post.id * 10, "impressions": 100}) for post in posts
+        ])
+        
+        assert written == 3
+        assert db.execute.call_count == 3
+        assert db.commit.call_count == 1
+        
+        insert_sql, snapshot_sql, update_sql = (
+            str(call.args[0].compile(dialect=postgresql.dialect()))
+            for call in db.execute.call_args_list
+        )
+        assert insert_sql.startswith("INSERT INTO post_analytics ")
+        assert insert_sql.count("%(published_post_id_m") == 3
+        assert snapshot_sql.startswith("INSERT INTO post_analytics_snapshots")
+        assert snapshot_sql.count("%(published_post_id_m") == 3
+        assert "ON CONFLICT (published_post_id) DO UPDATE" in snapshot_sql
+        assert "WHERE post_analytics_snapshots.fetched_at <= excluded.fetched_at" in snapshot_sql
+        assert update_sql.startswith("UPDATE published_posts SET likes_count=post_metrics.likes_count")
+        assert "FROM (VALUES" in update_sql
+        assert "WHERE published_posts.id = post_metrics.id" in update_sql
+    
+    def test_bulk_write_failure_falls_back_per_post(self):
+        """Test a failed bulk write is rolled back and retried row by row."""
+        fetcher = MagicMock(MAX_BATCH_SIZE=50)
+        fetcher.fetch_posts_analytics_batch.side_effect = lambda ids: {
+            platform_post_id: {"likes_count": 1} for platform_post_id in ids
+        }
+        
+        service = self._make_service(self._make_posts("twitter", 3), {"twitter": fetcher})
+        service._save_analytics_bulk = Mock(side_effect=Exception("deadlock detected"))
+        service._save_analytics = Mock(side_effect=[None, Exception("value out of range"), None])
+        
+        result = service.sync_business_analytics(business_id=1)
+        
+        assert service.db.rollback.call_count == 2
+        assert service._save_analytics.call_count == 3
+        assert result["synced"] == 2
+        assert result["failed"] == 1
+    
+    def test_rollups_refreshed_for_written_posts(self):
+        """Test rollups are refreshed once per run, for the posts written."""
+        fetcher = MagicMock(MAX_BATCH_SIZE=50)
+        fetcher.fetch_posts_analytics_batch.side_effect = lambda ids: {
+            platform_post_id: {"likes_count": 1} for platform_post_id in ids[:-1]
+        }
+        
+        posts = self._make_posts("twitter", 3)
+        service = self._make_service(posts, {"twitter": fetcher})
+        
+        with patch(
+            "app.services.platform_fetchers.analytics_sync_service.AnalyticsRollupService"
+        ) as rollup_service:
+            result = service.sync_business_analytics(business_id=1)
+        
+        assert result["synced"] == 2
+        rollup_service.return_value.refresh_for_posts.assert_called_once_with(posts[:2])
+    
+    def test_rollup_failure_does_not_fail_sync(self):
+        """Test a failed rollup refresh is logged, not raised."""
+        fetcher = MagicMock(MAX_BATCH_SIZE=50)
+        fetcher.fetch_posts_analytics_batch.side_effect = lambda ids: {
+            platform_post_id: {"likes_count": 1} for platform_post_id in ids
+        }
+        
+        service = self._make_service(self._make_posts("twitter", 2), {"twitter": fetcher})
+        
+        with patch(
+            "app.services.platform_fetchers.analytics_sync_service.AnalyticsRollupService"
+        ) as rollup_service:
+            rollup_service.return_value.refresh_for_posts.side_effect = Exception("lock timeout")
+            result = service.sync_business_analytics(business_id=1)
+        
+        assert result["synced"] == 2
+        assert service._rollup_posts == []
+    
+    def test_data_version_bumped_for_written_posts(self):
+        """Test the business data version is bumped even if rollups fail."""
+        fetcher = MagicMock(MAX_BATCH_SIZE=50)
+        fetcher.fetch_posts_analytics_batch.side_effect = lambda ids: {
+            platform_post_id: {"likes_count": 1} for platform_post_id in ids
+        }
+        
+        service = self._make_service(self._make_posts("twitter", 2), {"twitter": fetcher})
+        
+        with patch(
+            "app.services.platform_fetchers.analytics_sync_service.AnalyticsRollupService"
+        ) as rollup_service, patch(
+            "app.services.platform_fetchers.analytics_sync_service.bump_business_data_version"
+        ) as bump:
+            rollup_service.return_value.refresh_for_posts.side_effect = Exception("lock timeout")
+            service.sync_business_analytics(business_id=1)
+        
+        bump.assert_called_once_with(1)
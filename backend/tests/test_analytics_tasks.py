@@ -0,0 +1,144 @@
+"""
+Unit tests for the distributed analytics sync Celery tasks.
+"""
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.tasks import analytics_tasks
+from app.tasks.analytics_tasks import (
+    acquire_dispatch_lock,
+    dispatch_analytics_sync,
+    get_run_key,
+    shard_business_ids,
+    summarize_analytics_sync,
+    sync_business_shard,
+)
+
+
+class TestAnalyticsTasks:
+    """Test suite for analytics sync tasks."""
+
+    @pytest.fixture
+    def redis(self):
+        """Mock Redis client returned by the tasks module."""
+        redis = MagicMock()
+        with patch.object(analytics_tasks, "_get_redis", return_value=redis):
+            yield redis
+
+    def test_shard_business_ids(self):
+        """Test businesses are split into shards of the requested size."""
+        assert shard_business_ids(list(range(1, 8)), shard_size=3) == [[1, 2, 3], [4, 5, 6], [7]]
+        assert shard_business_ids([], shard_size=3) == []
+        assert shard_business_ids([1, 2], shard_size=0) == [[1], [2]]
+
+    def test_acquire_dispatch_lock(self, redis):
+        """Test the dispatch lock is a SET NX with a TTL keyed by run."""
+        redis.set.return_value = True
+        assert acquire_dispatch_lock("2025102014") is True
+
+        args, kwargs = redis.set.call_args
+        assert args[0] == "analytics:sync:dispatch:2025102014"
+        assert kwargs["nx"] is True
+        assert kwargs["ex"] == analytics_tasks.DISPATCH_LOCK_TTL
+
+        redis.set.return_value = None
+        assert acquire_dispatch_lock("2025102014") is False
+
+    def test_dispatch_skipped_without_lock(self, redis):
+        """Test only the lock holder enqueues a run."""
+        redis.set.return_value = None
+
+        with patch.object(analytics_tasks, "SessionLocal") as session_local, \
+                patch.object(analytics_tasks, "chord") as mock_chord:
+            result = dispatch_analytics_sync(run_key="2025102014")
+
+        assert result == {"success": True, "dispatched": False, "run_key": "2025102014"}
+        session_local.assert_not_called()
+        mock_chord.assert_not_called()
+
+    def test_dispatch_enqueues_one_task_per_shard(self, redis):
+        """Test the lock holder enqueues a chord of shard tasks with a report callback."""
+        redis.set.return_value = True
+
+        db = MagicMock()
+        db.query.return_value.order_by.return_value.all.return_value = [(i,) for i in range(1, 26)]
+
+        with patch.object(analytics_tasks, "SessionLocal", return_value=db), \
+                patch.object(analytics_tasks, "chord") as mock_chord:
+            mock_chord.return_value.return_value.id = "report-task"
+            result = dispatch_analytics_sync(shard_size=10, run_key="2025102014")
+
+        header = list(mock_chord.call_args[0][0])
+        assert [signature.args[0] for signature in header] == [
+            list(range(1, 11)), list(range(11, 21)), list(range(21, 26))
+        ]
+        assert all(signature.task == "app.tasks.analytics_tasks.sync_business_shard" for signature in header)
+
+        callback = mock_chord.return_value.call_args[0][0]
+        assert callback.task == "app.tasks.analytics_tasks.summarize_analytics_sync"
+        assert callback.kwargs["run_key"] == "2025102014"
+
+        assert result["dispatched"] is True
+        assert result["businesses"] == 25
+        assert result["shards"] == 3
+        assert result["report_task_id"] == "report-task"
+        db.close.assert_called_once()
+
+    def test_sync_business_shard_isolates_failures(self):
+        """Test one failing business does not fail the rest of the shard."""
+        db = MagicMock()
+
+        async def sync(business_id, due_only):
+            if business_id == 2:
+                raise ValueError("Business 2 not found")
+            return {"total_posts": 5, "synced": 4, "failed": 1, "rate_limited": 0}
+
+        service = MagicMock()
+        service.sync_business_analytics_async.side_effect = sync
+
+        with patch.object(analytics_tasks, "SessionLocal", return_value=db), \
+                patch.object(analytics_tasks, "AnalyticsSyncService", return_value=service), \
+                patch.object(analytics_tasks, "get_shared_transport"):
+            result = sync_business_shard([1, 2, 3])
+
+        assert result == {
+            "businesses": 3,
+            "total_posts": 10,
+            "synced": 8,
+            "failed": 2,
+            "rate_limited": 0,
+            "failed_businesses": [2],
+        }
+        db.rollback.assert_called_once()
+        db.close.assert_called_once()
+
+    def test_summarize_analytics_sync(self, redis):
+        """Test shard results are aggregated and stored as the last report."""
+        shard_results = [
+            {"businesses": 10, "total_posts": 100, "synced": 90, "failed": 5, "rate_limited": 5, "failed_businesses": []},
+            {"businesses": 3, "total_posts": 20, "synced": 20, "failed": 0, "rate_limited": 0, "failed_businesses": [12]},
+        ]
+
+        report = summarize_analytics_sync(
+            shard_results, run_key="2025102014", started_at="2025-10-20T14:00:00"
+        )
+
+        assert report["shards"] == 2
+        assert report["businesses"] == 13
+        assert report["total_posts"] == 120
+        assert report["synced"] == 110
+        assert report["failed"] == 5
+        assert report["rate_limited"] == 5
+        assert report["failed_businesses"] == [12]
+
+        key, value = redis.set.call_args[0]
+        assert key == analytics_tasks.LAST_REPORT_KEY
+        assert json.loads(value)["synced"] == 110
+
+    def test_run_key_is_hourly(self):
+        """Test schedulers firing within the same hour share a run key."""
+        from datetime import datetime
+
+        assert get_run_key(datetime(2025, 10, 20, 14, 0, 5)) == get_run_key(datetime(2025, 10, 20, 14, 59, 0))
+        assert get_run_key(datetime(2025, 10, 20, 14, 0)) != get_run_key(datetime(2025, 10, 20, 15, 0))
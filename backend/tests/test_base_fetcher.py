@@ -349,3 +349,62 @@ class TestBasePlatformFetcher:
         
         # (5000 + 800 + 300) / 10000 * 100 = 61%
         assert engagement_rate == 61.0
+    
+    def test_make_request_uses_shared_transport(self):
+        """Test requests go through the shared transport when one is provided."""
+        mock_transport = Mock()
+        mock_transport.request.return_value = Mock(status_code=200, json=lambda: {"data": "pooled"})
+        
+        fetcher = TestFetcher(access_token="test_token", transport=mock_transport)
+        
+        with patch('requests.Session.request') as mock_session_request:
+            result = fetcher._make_request(
+                method="GET",
+                url="https://api.test.com/endpoint",
+                params={"id": "1"}
+            )
+        
+        assert result == {"data": "pooled"}
+        mock_session_request.assert_not_called()
+        
+        call_args, call_kwargs = mock_transport.request.call_args
+        assert call_args == ("GET", "https://api.test.com/endpoint")
+        assert call_kwargs["headers"]["Authorization"] == "Bearer test_token"
+        assert call_kwargs["params"] == {"id": "1"}
+        assert call_kwargs["timeout"] == 30
+    
+    @patch('time.sleep')
+    def test_shared_transport_rate_limit_and_timeout(self, mock_sleep):
+        """Test 429 and timeout handling are unchanged with the shared transport."""
+        import httpx
+        
+        rate_limit_response = Mock(status_code=429, headers={"Retry-After": "5"})
+        success_response = Mock(status_code=200, json=lambda: {"data": "success"})
+        
+        mock_transport = Mock()
+        mock_transport.request.side_effect = [
+            httpx.ReadTimeout("timed out"),
+            rate_limit_response,
+            success_response
+        ]
+        
+        fetcher = TestFetcher(access_token="test_token", transport=mock_transport)
+        result = fetcher._make_request(method="GET", url="https://api.test.com/endpoint")
+        
+        assert result == {"data": "success"}
+        assert mock_transport.request.call_count == 3
+        mock_sleep.assert_any_call(5.0)
+    
+    def test_shared_transport_connection_error(self):
+        """Test httpx errors are raised as PlatformAPIError."""
+        import httpx
+        
+        mock_transport = Mock()
+        mock_transport.request.side_effect = httpx.ConnectError("Connection refused")
+        
+        fetcher = TestFetcher(access_token="test_token", transport=mock_transport)
+        
+        with pytest.raises(PlatformAPIError) as exc_info:
+            fetcher._make_request(method="GET", url="https://api.test.com/endpoint")
+        
+        assert "Connection refused" in str(exc_info.value)
@@ -0,0 +1,77 @@
+"""
+Unit tests for the query cache payload codecs.
+"""
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.core.cache_codec import (
+    CacheCodec,
+    CacheCodecError,
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    COMPRESSION_ZSTD,
+    SERIALIZER_JSON,
+    SERIALIZER_MSGPACK,
+    MSGPACK_AVAILABLE,
+    ZSTD_AVAILABLE,
+)
+
+
+OVERVIEW = {
+    "summary": {"total_posts": 12, "avg_engagement_rate": Decimal("4.25")},
+    "trends": [{"date": date(2025, 10, 1), "likes": 10}, {"date": date(2025, 10, 2), "likes": 12}],
+    "generated_at": datetime(2025, 10, 22, 9, 30, 15),
+}
+
+
+class TestCacheCodec:
+    """Test suite for CacheCodec."""
+
+    @pytest.mark.parametrize("serializer", [
+        SERIALIZER_JSON,
+        pytest.param(SERIALIZER_MSGPACK, marks=pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")),
+    ])
+    def test_round_trip_keeps_types(self, serializer):
+        """Test dates, datetimes and Decimals come back with their types."""
+        codec = CacheCodec(serializer=serializer)
+
+        assert codec.decode(codec.encode(OVERVIEW)) == OVERVIEW
+
+    def test_header_byte(self):
+        """Test the header names the serializer and (absent) compression."""
+        payload = CacheCodec(serializer=SERIALIZER_JSON, compress_threshold=1024).encode({"a": 1})
+
+        assert payload[0] == (SERIALIZER_JSON << 4) | COMPRESSION_NONE
+        assert json.loads(payload[1:]) == {"a": 1}
+
+    def test_compresses_above_threshold(self):
+        """Test large payloads are compressed and still decode."""
+        value = {"top_posts": [{"content": "Launch day! " * 20, "likes": i} for i in range(100)]}
+        codec = CacheCodec(serializer=SERIALIZER_JSON, compression=COMPRESSION_ZLIB, compress_threshold=256)
+
+        payload = codec.encode(value)
+
+        assert payload[0] & 0x0F == COMPRESSION_ZLIB
+        assert len(payload) < len(json.dumps(value))
+        assert codec.decode(payload) == value
+
+    @pytest.mark.skipif(not (MSGPACK_AVAILABLE and ZSTD_AVAILABLE), reason="msgpack/zstandard not installed")
+    def test_decodes_any_configuration(self):
+        """Test payloads written with another codec configuration still decode."""
+        value = {"trends": [{"day": date(2025, 10, i), "likes": i} for i in range(1, 29)]}
+        old = CacheCodec(serializer=SERIALIZER_JSON, compression=COMPRESSION_ZLIB, compress_threshold=0)
+        new = CacheCodec(serializer=SERIALIZER_MSGPACK, compression=COMPRESSION_ZSTD, compress_threshold=0)
+
+        assert new.decode(old.encode(value)) == value
+        assert old.decode(new.encode(value)) == value
+
+    def test_decodes_headerless_json(self):
+        """Test plain JSON written before the codec existed is readable."""
+        assert CacheCodec().decode(b'{"value": 1, "fresh_until": 0}') == {"value": 1, "fresh_until": 0}
+
+    def test_unknown_format(self):
+        """Test an unknown header is reported rather than misread."""
+        with pytest.raises(CacheCodecError):
+            CacheCodec().decode(bytes([0xF0]) + b"data")
@@ -0,0 +1,145 @@
+"""
+Unit tests for the content library listing.
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+
+# Register every model so the mappers can be configured
+from app.models import image, post_analytics, post_analytics_snapshot, analytics_summary, content_template  # noqa: F401
+from app.models.content import Platform
+from app.api import content_library
+from app.api.content_library import decode_cursor, encode_cursor
+
+
+def key_row(source, item_id, saved_at):
+    return SimpleNamespace(source=source, id=item_id, saved_at=saved_at)
+
+
+def saved_content(item_id, saved_at):
+    return SimpleNamespace(
+        id=item_id, platform=Platform.LINKEDIN, text=f"content {item_id}", hashtags=None,
+        media_urls=None, library_saved_at=saved_at, created_at=saved_at
+    )
+
+
+def saved_post(item_id, saved_at):
+    return SimpleNamespace(
+        id=item_id, platform="twitter", content_text=f"post {item_id}", content_images=None,
+        library_saved_at=saved_at, created_at=saved_at,
+        likes_count=1, comments_count=0, shares_count=0, impressions_count=10
+    )
+
+
+class TestLibraryCursor:
+    """Test suite for the keyset cursor encoding."""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the key it was built from."""
+        saved_at = datetime(2025, 10, 20, 8, 30, 15, 123456)
+
+        cursor = encode_cursor(saved_at, 42, "published_post")
+
+        assert decode_cursor(cursor) == (saved_at, 42, "published_post", None)
+
+    def test_round_trip_with_rank(self):
+        """Test search cursors carry the relevance rank."""
+        cursor = encode_cursor(datetime(2025, 10, 20), 42, "content", 0.25)
+
+        assert decode_cursor(cursor) == (datetime(2025, 10, 20), 42, "content", 0.25)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", encode_cursor(datetime(2025, 1, 1), 1, "x")[:-4]])
+    def test_malformed_cursor_rejected(self, cursor):
+        """Test malformed cursors are a 400, not a 500."""
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor)
+
+        assert exc.value.status_code == 400
+
+
+class TestListLibraryItems:
+    """Test suite for the list_library_items endpoint."""
+
+    @pytest.fixture
+    def db(self):
+        """Session returning one page of keys (plus a lookahead row)."""
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[
+            key_row("published_post", 7, datetime(2025, 10, 3)),
+            key_row("content", 9, datetime(2025, 10, 2)),
+            key_row("content", 4, datetime(2025, 10, 1)),
+        ])))
+        db.scalars = AsyncMock(side_effect=[
+            [saved_content(9, datetime(2025, 10, 2))],
+            [saved_post(7, datetime(2025, 10, 3))],
+        ])
+        db.scalar = AsyncMock(return_value=57)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_page_in_key_order_with_next_cursor(self, db):
+        """Test items follow the union order and the lookahead row sets next_cursor."""
+        result = await content_library.list_library_items(
+            business_id=1, platform=None, search=None, page=1, page_size=2,
+            cursor=None, current_user={"sub": "user_1"}, db=db
+        )
+
+        assert [(item.source, item.id) for item in result.items] == [("published_post", 7), ("content", 9)]
+        assert result.total == 57
+        assert decode_cursor(result.next_cursor) == (datetime(2025, 10, 2), 9, "content", None)
+
+    @pytest.mark.asyncio
+    async def test_cursor_replaces_offset(self, db):
+        """Test a cursor page filters on the key instead of skipping rows."""
+        cursor = encode_cursor(datetime(2025, 10, 4), 11, "content")
+
+        await content_library.list_library_items(
+            business_id=1, platform=None, search=None, page=5, page_size=2,
+            cursor=cursor, current_user={"sub": "user_1"}, db=db
+        )
+
+        sql = str(db.execute.call_args.args[0])
+        assert "OFFSET" not in sql
+        assert "(library_items.saved_at, library_items.id, library_items.source) <" in sql
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, db):
+        """Test no next_cursor is returned once the keys run out."""
+        result = await content_library.list_library_items(
+            business_id=1, platform=None, search=None, page=1, page_size=3,
+            cursor=None, current_user={"sub": "user_1"}, db=db
+        )
+
+        assert result.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_search_ranked_by_relevance(self, db):
+        """Test searches use the search_vector index and order by rank first."""
+        rows = db.execute.return_value.all.return_value
+        for row, rank in zip(rows, [0.9, 0.5, 0.1]):
+            row.rank = rank
+
+        result = await content_library.list_library_items(
+            business_id=1, platform=None, search="launch", page=1, page_size=2,
+            cursor=None, current_user={"sub": "user_1"}, db=db
+        )
+
+        sql = str(db.execute.call_args.args[0])
+        assert "@@ websearch_to_tsquery" in sql
+        assert "ORDER BY library_items.rank DESC, library_items.saved_at DESC" in sql
+        assert decode_cursor(result.next_cursor)[3] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_search_rejects_cursor_without_rank(self, db):
+        """Test a listing cursor cannot continue a search."""
+        cursor = encode_cursor(datetime(2025, 10, 4), 11, "content")
+
+        with pytest.raises(HTTPException) as exc:
+            await content_library.list_library_items(
+                business_id=1, platform=None, search="launch", page=1, page_size=2,
+                cursor=cursor, current_user={"sub": "user_1"}, db=db
+            )
+
+        assert exc.value.status_code == 400
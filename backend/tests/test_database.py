@@ -0,0 +1,21 @@
+"""
+Unit tests for the database session helpers.
+"""
+from app.db.database import async_database_url
+
+
+class TestAsyncDatabaseUrl:
+    """Test suite for the sync-to-asyncpg URL conversion."""
+
+    def test_uses_asyncpg_driver(self):
+        """Test plain and psycopg2 URLs are switched to asyncpg."""
+        assert async_database_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+        assert async_database_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+
+    def test_sslmode_becomes_ssl(self):
+        """Test libpq's sslmode parameter is renamed for asyncpg."""
+        assert async_database_url("postgresql://u:p@db/app?sslmode=require") == "postgresql+asyncpg://u:p@db/app?ssl=require"
+
+    def test_other_databases_unchanged(self):
+        """Test non-PostgreSQL URLs are returned as-is."""
+        assert async_database_url("sqlite:///./test.db") == "sqlite:///./test.db"
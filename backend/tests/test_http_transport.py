@@ -0,0 +1,188 @@
+"""Unit tests for the shared platform HTTP transport."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.services.platform_fetchers.http_transport import AsyncHTTPTransport, PooledHTTPClient
+
+
+class TestAsyncHTTPTransport:
+    """Test suite for AsyncHTTPTransport."""
+
+    @pytest.fixture
+    def handled_requests(self):
+        """Requests seen by the mock upstream."""
+        return []
+
+    @pytest.fixture
+    def transport(self, handled_requests):
+        """Create a transport backed by an in-memory mock upstream."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            handled_requests.append(request)
+            return httpx.Response(200, json={"path": request.url.path})
+
+        transport = AsyncHTTPTransport(base_transport=httpx.MockTransport(handler))
+        yield transport
+        transport.close()
+
+    def test_blocking_request(self, transport, handled_requests):
+        """Test a blocking request returns the upstream response."""
+        response = transport.request(
+            "GET",
+            "https://api.twitter.com/2/tweets/1",
+            headers={"Authorization": "Bearer token"},
+            params={"tweet.fields": "public_metrics"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"path": "/2/tweets/1"}
+        assert handled_requests[0].headers["Authorization"] == "Bearer token"
+        assert handled_requests[0].url.params["tweet.fields"] == "public_metrics"
+
+    def test_one_client_per_host(self, transport):
+        """Test clients are pooled per host and reused across requests and threads."""
+        threads = [
+            threading.Thread(target=transport.request, args=("GET", "https://api.twitter.com/2/tweets/1"))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        transport.request("GET", "https://graph.facebook.com/v18.0/123")
+
+        stats = transport.get_stats()
+        assert set(stats) == {"api.twitter.com", "graph.facebook.com"}
+        assert stats["api.twitter.com"]["requests"] == 5
+        assert stats["graph.facebook.com"]["requests"] == 1
+        assert len(transport._clients) == 2
+
+    def test_async_request_from_separate_loops(self, transport):
+        """Test coroutines on different event loops share the same pool."""
+
+        async def fetch():
+            response = await transport.arequest("GET", "https://api.linkedin.com/v2/ugcPosts/1")
+            return response.json()
+
+        assert asyncio.run(fetch()) == {"path": "/v2/ugcPosts/1"}
+        assert asyncio.run(fetch()) == {"path": "/v2/ugcPosts/1"}
+        assert transport.get_stats()["api.linkedin.com"]["requests"] == 2
+
+    def test_retries_server_errors(self):
+        """Test 5xx responses are retried up to max_retries."""
+        statuses = iter([503, 502, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses), json={})
+
+        transport = AsyncHTTPTransport(base_transport=httpx.MockTransport(handler))
+        try:
+            response = transport.request(
+                "GET",
+                "https://api.twitter.com/2/tweets/1",
+                max_retries=3,
+                backoff_factor=0
+            )
+        finally:
+            transport.close()
+
+        assert response.status_code == 200
+        assert transport.get_stats()["api.twitter.com"]["requests"] == 3
+
+    def test_rate_limit_response_not_retried(self, handled_requests):
+        """Test 429 responses are returned to the fetcher for _handle_rate_limit."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            handled_requests.append(request)
+            return httpx.Response(429, headers={"Retry-After": "60"})
+
+        transport = AsyncHTTPTransport(base_transport=httpx.MockTransport(handler))
+        try:
+            response = transport.request("GET", "https://api.twitter.com/2/tweets/1", max_retries=3)
+        finally:
+            transport.close()
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "60"
+        assert len(handled_requests) == 1
+
+
+class TestPooledHTTPClient:
+    """Test suite for the httpx.AsyncClient-style view of the transport."""
+
+    @pytest.fixture
+    def handled_requests(self):
+        """Requests seen by the mock upstream."""
+        return []
+
+    @pytest.fixture
+    def transport(self, handled_requests):
+        """Create a transport backed by an in-memory mock upstream."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            handled_requests.append(request)
+            return httpx.Response(200, json={"method": request.method})
+
+        transport = AsyncHTTPTransport(base_transport=httpx.MockTransport(handler))
+        yield transport
+        transport.close()
+
+    def test_verbs_share_host_pool(self, transport, handled_requests):
+        """Test each verb goes through the transport and reuses one client per host."""
+
+        async def call_all():
+            async with PooledHTTPClient(transport) as client:
+                await client.get("https://api.linkedin.com/v2/userinfo")
+                await client.post("https://api.linkedin.com/v2/ugcPosts", json={"text": "hi"})
+                await client.put("https://api.linkedin.com/v2/assets/1")
+                await client.patch("https://api.linkedin.com/v2/assets/1")
+                await client.delete("https://api.linkedin.com/v2/ugcPosts/1")
+
+        asyncio.run(call_all())
+
+        assert [request.method for request in handled_requests] == ["GET", "POST", "PUT", "PATCH", "DELETE"]
+        assert transport.get_stats()["api.linkedin.com"]["requests"] == 5
+        assert len(transport._clients) == 1
+
+    def test_leaving_context_keeps_pool_open(self, transport):
+        """Test closing the view does not close the transport's clients."""
+
+        async def two_blocks():
+            async with PooledHTTPClient(transport) as client:
+                await client.get("https://api.twitter.com/2/users/me")
+            await client.aclose()
+            async with PooledHTTPClient(transport) as client:
+                await client.get("https://api.twitter.com/2/users/me")
+
+        asyncio.run(two_blocks())
+
+        assert not transport._clients["api.twitter.com"].is_closed
+        assert transport.get_stats()["api.twitter.com"]["requests"] == 2
+
+    def test_host_timeout_by_default(self, transport, handled_requests):
+        """Test requests without a timeout use the host's timeout."""
+
+        async def fetch():
+            await PooledHTTPClient(transport).post("https://openrouter.ai/api/v1/chat/completions")
+
+        asyncio.run(fetch())
+
+        assert handled_requests[0].extensions["timeout"]["read"] == 120.0
+
+    def test_view_timeout_overridable_per_call(self, transport, handled_requests):
+        """Test the view's timeout applies unless a call passes its own."""
+
+        async def fetch():
+            client = PooledHTTPClient(transport, timeout=15.0)
+            await client.get("https://graph.facebook.com/v18.0/me")
+            await client.get("https://graph.facebook.com/v18.0/me", timeout=5.0)
+
+        asyncio.run(fetch())
+
+        assert handled_requests[0].extensions["timeout"]["read"] == 15.0
+        assert handled_requests[1].extensions["timeout"]["read"] == 5.0
@@ -16,6 +16,7 @@ from app.services.platform_fetchers.exceptions import (
 )
 from tests.fixtures.linkedin_responses import (
     LINKEDIN_SHARE_STATISTICS_SUCCESS,
+    LINKEDIN_SHARE_STATISTICS_BATCH_SUCCESS,
     LINKEDIN_POST_DETAILS_SUCCESS,
     LINKEDIN_SHARE_NOT_FOUND,
     LINKEDIN_UNAUTHORIZED,
@@ -290,3 +291,44 @@ class TestLinkedInFetcher:
         assert "fetched_at" in result
         assert isinstance(result["fetched_at"], datetime)
 
+    @patch("requests.Session.request")
+    def test_batch_fetch_single_request(self, mock_request, fetcher):
+        """Test batch fetch requests statistics for all URNs at once."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = LINKEDIN_SHARE_STATISTICS_BATCH_SUCCESS
+        mock_request.return_value = mock_response
+
+        result = fetcher.fetch_posts_analytics_batch([
+            "urn:li:share:987654321",
+            "urn:li:ugcPost:555555555",
+            "urn:li:share:111111111",
+        ])
+
+        # One statistics request, no post details requests
+        assert mock_request.call_count == 1
+        params = mock_request.call_args[1]["params"]
+        assert params["shares[0]"] == "urn:li:share:987654321"
+        assert params["shares[1]"] == "urn:li:share:111111111"
+        assert params["ugcPosts[0]"] == "urn:li:ugcPost:555555555"
+
+        assert result["urn:li:share:987654321"]["likes_count"] == 150
+        assert result["urn:li:share:987654321"]["reach"] == 4800
+        assert result["urn:li:ugcPost:555555555"]["impressions"] == 1200
+        assert result["urn:li:ugcPost:555555555"]["platform_post_id"] == "urn:li:ugcPost:555555555"
+        assert isinstance(result["urn:li:share:111111111"], PostNotFoundError)
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_chunks_urns(self, mock_request, fetcher):
+        """Test batch fetch splits URNs into chunks of MAX_BATCH_SIZE."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = LINKEDIN_EMPTY_RESPONSE
+        mock_request.return_value = mock_response
+
+        urns = [f"urn:li:share:{i}" for i in range(120)]
+        result = fetcher.fetch_posts_analytics_batch(urns)
+
+        assert mock_request.call_count == 3
+        assert len(result) == 120
+        assert all(isinstance(error, PostNotFoundError) for error in result.values())
@@ -5,6 +5,7 @@ Tests Meta-specific API interactions, response parsing,
 and analytics data extraction with comprehensive mocking.
 """
 import pytest
+import json
 from unittest.mock import Mock, patch
 from datetime import datetime
 from app.services.platform_fetchers.meta_fetcher import MetaAnalyticsFetcher
@@ -24,6 +25,8 @@ from tests.fixtures.meta_responses import (
     INSTAGRAM_MINIMAL_MEDIA,
     FACEBOOK_HIGH_ENGAGEMENT_POST,
     INSTAGRAM_HIGH_ENGAGEMENT_MEDIA,
+    META_BATCH_SUCCESS,
+    META_BATCH_INVALID_METRIC,
 )
 
 
@@ -446,3 +449,108 @@ class TestMetaFetcher:
         assert result["platform_post_id"] == "17841234567890"
         assert "fetched_at" in result
         assert isinstance(result["fetched_at"], datetime)
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_single_request(self, mock_request, fetcher):
+        """Test batch fetch packs post data and insights into one batch call."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = META_BATCH_SUCCESS
+        mock_request.return_value = mock_response
+
+        result = fetcher.fetch_posts_analytics_batch(
+            ["123456789_987654321", "123456789", "123456789_555"]
+        )
+
+        assert mock_request.call_count == 1
+        call_args = mock_request.call_args[1]
+        assert call_args["method"] == "POST"
+        operations = call_args["json"]["batch"]
+        assert len(operations) == 3
+        assert operations[0]["relative_url"].startswith("v18.0/123456789_987654321?fields=")
+        assert "insights.metric(post_impressions," in operations[0]["relative_url"]
+        assert "insights.metric(impressions," in operations[1]["relative_url"]
+
+        # Demultiplexed into the same output as the per-post path
+        facebook = result["123456789_987654321"]
+        assert facebook["likes_count"] == 300
+        assert facebook["impressions"] == 8000
+        assert facebook["reach"] == 6500
+        assert facebook["platform"] == "facebook"
+
+        instagram = result["123456789"]
+        assert instagram["likes_count"] == 450
+        assert instagram["impressions"] == 9500
+        assert instagram["saved_count"] == 25
+        assert instagram["platform"] == "instagram"
+
+        assert isinstance(result["123456789_555"], PostNotFoundError)
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_chunks_posts(self, mock_request, fetcher):
+        """Test batch fetch sends at most MAX_BATCH_SIZE operations per call."""
+        def batch_response(**kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = [
+                {"code": 200, "body": json.dumps(FACEBOOK_MINIMAL_POST)}
+                for _ in kwargs["json"]["batch"]
+            ]
+            return response
+
+        mock_request.side_effect = batch_response
+
+        post_ids = [f"123456789_{i}" for i in range(120)]
+        result = fetcher.fetch_posts_analytics_batch(post_ids)
+
+        assert mock_request.call_count == 3
+        batch_sizes = [len(call[1]["json"]["batch"]) for call in mock_request.call_args_list]
+        assert batch_sizes == [50, 50, 20]
+        assert len(result) == 120
+        assert all(isinstance(analytics, dict) for analytics in result.values())
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_falls_back_for_failed_operation(self, mock_request, fetcher):
+        """Test operations Meta did not complete are fetched individually."""
+        batch_response = Mock()
+        batch_response.status_code = 200
+        batch_response.json.return_value = [None]
+
+        post_response = Mock()
+        post_response.status_code = 200
+        post_response.json.return_value = FACEBOOK_POST_SUCCESS
+
+        insights_response = Mock()
+        insights_response.status_code = 200
+        insights_response.json.return_value = FACEBOOK_INSIGHTS_SUCCESS
+
+        mock_request.side_effect = [batch_response, post_response, insights_response]
+
+        result = fetcher.fetch_posts_analytics_batch(["123456789_987654321"])
+
+        assert mock_request.call_count == 3
+        assert result["123456789_987654321"]["likes_count"] == 300
+        assert result["123456789_987654321"]["impressions"] == 8000
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_invalid_metric_not_treated_as_deleted(self, mock_request, fetcher):
+        """Test a code 100 insights error on an existing post falls back instead of reporting it missing."""
+        batch_response = Mock()
+        batch_response.status_code = 200
+        batch_response.json.return_value = META_BATCH_INVALID_METRIC
+
+        post_response = Mock()
+        post_response.status_code = 200
+        post_response.json.return_value = FACEBOOK_POST_SUCCESS
+
+        insights_response = Mock()
+        insights_response.status_code = 200
+        insights_response.json.return_value = FACEBOOK_INSIGHTS_SUCCESS
+
+        mock_request.side_effect = [batch_response, post_response, insights_response]
+
+        result = fetcher.fetch_posts_analytics_batch(["123456789_987654321"])
+
+        assert mock_request.call_count == 3
+        assert not isinstance(result["123456789_987654321"], PostNotFoundError)
+        assert result["123456789_987654321"]["likes_count"] == 300
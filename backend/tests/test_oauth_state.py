@@ -0,0 +1,94 @@
+"""
+Unit tests for the async OAuth state storage.
+"""
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.security import StateManager
+
+
+@pytest.fixture
+def manager():
+    """StateManager backed by a mock asyncio Redis client."""
+    manager = StateManager.__new__(StateManager)
+    manager.state_expiry_seconds = 600
+    manager._states = {}
+    manager.use_redis = True
+    manager.redis_client = MagicMock()
+    manager.async_redis_client = MagicMock()
+    manager.async_redis_client.setex = AsyncMock()
+    manager.async_redis_client.pipeline.return_value.execute = AsyncMock()
+    return manager
+
+
+def stored_state(business_id=1, platform="twitter", expires_in=600):
+    return json.dumps({
+        "business_id": business_id,
+        "platform": platform,
+        "code_verifier": "verifier",
+        "expires_at": (datetime.utcnow() + timedelta(seconds=expires_in)).isoformat()
+    })
+
+
+class TestStateManagerAsync:
+    """Test suite for the async StateManager methods."""
+
+    @pytest.mark.asyncio
+    async def test_astore_state(self, manager):
+        """Test state is stored with a TTL through the async client."""
+        await manager.astore_state("abc", business_id=1, platform="twitter", code_verifier="verifier")
+
+        key, ttl, payload = manager.async_redis_client.setex.call_args.args
+        assert (key, ttl) == ("oauth:state:abc", 600)
+        assert json.loads(payload)["code_verifier"] == "verifier"
+        manager.redis_client.setex.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_avalidate_state_is_one_time(self, manager):
+        """Test the state is read and deleted in one transaction."""
+        pipe = manager.async_redis_client.pipeline.return_value
+        pipe.execute.return_value = [stored_state(), 1]
+
+        data = await manager.avalidate_state_no_business("abc")
+
+        assert data["business_id"] == 1
+        manager.async_redis_client.pipeline.assert_called_once_with(transaction=True)
+        pipe.get.assert_called_once_with("oauth:state:abc")
+        pipe.delete.assert_called_once_with("oauth:state:abc")
+
+    @pytest.mark.asyncio
+    async def test_avalidate_state_unknown(self, manager):
+        """Test an unknown state is rejected."""
+        manager.async_redis_client.pipeline.return_value.execute.return_value = [None, 0]
+
+        with pytest.raises(ValueError, match="Invalid or expired"):
+            await manager.avalidate_state_no_business("abc")
+
+    @pytest.mark.asyncio
+    async def test_avalidate_state_checks_owner(self, manager):
+        """Test business and platform must match."""
+        manager.async_redis_client.pipeline.return_value.execute.return_value = [stored_state(), 1]
+
+        with pytest.raises(ValueError, match="Platform mismatch"):
+            await manager.avalidate_state("abc", business_id=1, platform="linkedin")
+
+    @pytest.mark.asyncio
+    async def test_avalidate_state_expired(self, manager):
+        """Test an expired state is rejected even if Redis still had it."""
+        manager.async_redis_client.pipeline.return_value.execute.return_value = [stored_state(expires_in=-5), 1]
+
+        with pytest.raises(ValueError, match="expired"):
+            await manager.avalidate_state("abc", business_id=1, platform="twitter")
+
+    @pytest.mark.asyncio
+    async def test_in_memory_fallback(self, manager):
+        """Test the in-memory store is used without Redis."""
+        manager.use_redis = False
+
+        await manager.astore_state("abc", business_id=2, platform="linkedin")
+        data = await manager.avalidate_state("abc", business_id=2, platform="linkedin")
+
+        assert data["platform"] == "linkedin"
+        assert manager._states == {}
@@ -0,0 +1,111 @@
+"""
+Unit tests for multi-platform publishing.
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+
+from app.api import publishing_v2
+from app.schemas.publishing_v2 import MultiPlatformPublishRequest, PublishResponse
+
+# The rate limit decorator is not under test
+publish_multi_platform = getattr(publishing_v2.publish_multi_platform, "__wrapped__", publishing_v2.publish_multi_platform)
+
+
+def session_factory():
+    """Patch target for new_async_session handing out a distinct session per call."""
+    sessions = []
+
+    def new_session():
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        sessions.append(session)
+        return session
+
+    return new_session, sessions
+
+
+def multi_request(*platforms):
+    return MultiPlatformPublishRequest(
+        content="Launching today!",
+        platforms=[{"platform": platform, "social_account_id": i + 1} for i, platform in enumerate(platforms)]
+    )
+
+
+class TestPublishMultiPlatform:
+    """Test suite for the /v2/publish/multi fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_platforms_published_concurrently_with_own_sessions(self):
+        """Test the call takes the slowest platform's time, not the sum."""
+        new_session, sessions = session_factory()
+
+        async def publish_now(request, publish_req, db, user_id):
+            await asyncio.sleep(0.2)
+            return PublishResponse(success=True, platform=publish_req.platform, post_id="1")
+
+        with patch.object(publishing_v2, "publish_now", side_effect=publish_now) as mock_publish, \
+                patch.object(publishing_v2, "new_async_session", side_effect=new_session):
+            started = time.monotonic()
+            result = await publish_multi_platform(MagicMock(), multi_request("linkedin", "twitter", "meta"), "user_1")
+            elapsed = time.monotonic() - started
+
+        assert elapsed < 0.5
+        assert result.successful_publishes == 3
+        assert [r.platform for r in result.results] == ["linkedin", "twitter", "meta"]
+        used_sessions = [call.args[2] for call in mock_publish.call_args_list]
+        assert len({id(session) for session in used_sessions}) == 3
+        assert all(session.__aexit__.await_count == 1 for session in sessions)
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts_isolated(self):
+        """Test a failing and a hanging platform do not affect the others."""
+        new_session, _ = session_factory()
+
+        async def publish_now(request, publish_req, db, user_id):
+            if publish_req.platform == "twitter":
+                raise HTTPException(status_code=403, detail="Access denied to this social account")
+            if publish_req.platform == "meta":
+                await asyncio.sleep(0.2)
+            return PublishResponse(success=True, platform=publish_req.platform)
+
+        with patch.object(publishing_v2, "publish_now", side_effect=publish_now), \
+                patch.object(publishing_v2, "new_async_session", side_effect=new_session), \
+                patch.dict(publishing_v2.PLATFORM_PUBLISH_TIMEOUTS, {"meta": 0.05}):
+            result = await publish_multi_platform(MagicMock(), multi_request("linkedin", "twitter", "meta"), "user_1")
+
+        linkedin, twitter, meta = result.results
+        assert linkedin.success
+        assert twitter.error == "Access denied to this social account"
+        assert not meta.success and "did not finish within" in meta.error
+        assert (result.successful_publishes, result.failed_publishes) == (1, 2)
+        await asyncio.gather(*publishing_v2._background_publishes)
+
+    @pytest.mark.asyncio
+    async def test_timed_out_publish_is_recorded(self):
+        """Test a publish outliving its timeout is not cancelled and keeps its session until done."""
+        new_session, sessions = session_factory()
+        finished = []
+
+        async def publish_now(request, publish_req, db, user_id):
+            await asyncio.sleep(0.2)
+            finished.append(db)
+            return PublishResponse(success=True, platform=publish_req.platform, post_id="1")
+
+        with patch.object(publishing_v2, "publish_now", side_effect=publish_now), \
+                patch.object(publishing_v2, "new_async_session", side_effect=new_session), \
+                patch.dict(publishing_v2.PLATFORM_PUBLISH_TIMEOUTS, {"meta": 0.05}):
+            result = await publish_multi_platform(MagicMock(), multi_request("meta"), "user_1")
+
+            assert not result.results[0].success
+            assert sessions[0].__aexit__.await_count == 0
+            assert len(publishing_v2._background_publishes) == 1
+
+            await asyncio.gather(*publishing_v2._background_publishes)
+
+        assert finished == [sessions[0]]
+        assert sessions[0].__aexit__.await_count == 1
+        assert not publishing_v2._background_publishes
@@ -0,0 +1,490 @@
+"""
+Unit tests for the Redis query cache and its in-process L1.
+"""
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core import query_cache as query_cache_module
+from app.core.cache_codec import default_codec
+from app.core.query_cache import (
+    INVALIDATION_CHANNEL,
+    LocalLRUCache,
+    QueryCache,
+    abusiness_data_version,
+    business_data_version,
+    business_tag,
+    bump_business_data_version,
+    invalidate_business_cache,
+    versioned_cache_key,
+)
+
+
+@pytest.fixture
+def redis_client():
+    """Mock Redis client with the L1 invalidation bus reset around each test."""
+    with patch.object(query_cache_module, "_invalidation_bus", None):
+        yield MagicMock()
+
+
+@pytest.fixture
+def async_redis_client():
+    """Mock asyncio Redis client (commands awaited, pipelines queued synchronously)."""
+    client = MagicMock()
+    for command in ("get", "set", "eval", "publish", "delete"):
+        setattr(client, command, AsyncMock())
+    client.pipeline.return_value.execute = AsyncMock()
+    return client
+
+
+def envelope(value, fresh_for=300, delta=0.0):
+    return default_codec.encode({"value": value, "fresh_until": time.time() + fresh_for, "delta": delta})
+
+
+def pipeline(redis_client):
+    return redis_client.pipeline.return_value
+
+
+def published_messages(redis_client):
+    return [json.loads(call.args[1]) for call in redis_client.publish.call_args_list]
+
+
+class TestLocalLRUCache:
+    """Test suite for LocalLRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently read entry is evicted first."""
+        local = LocalLRUCache(max_entries=2, ttl=30)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_entries_expire(self):
+        """Test entries are dropped after their TTL."""
+        local = LocalLRUCache(max_entries=10, ttl=30)
+
+        with patch("app.core.query_cache.time.monotonic", return_value=100.0):
+            local.set("a", 1)
+            local.set("b", 2, ttl=5)
+        with patch("app.core.query_cache.time.monotonic", return_value=110.0):
+            assert local.get("a") == 1
+            assert local.get("b") is None
+
+    def test_delete_matching(self):
+        """Test glob invalidation only removes matching keys."""
+        local = LocalLRUCache(max_entries=10, ttl=30)
+        local.set("summary:1:2025-10-01", 1)
+        local.set("summary:12:2025-10-01", 2)
+
+        assert local.delete_matching("*:1:*") == 1
+        assert local.get("summary:12:2025-10-01") == 2
+
+
+class TestQueryCacheLocalTier:
+    """Test suite for QueryCache with the in-process L1 enabled."""
+
+    def test_local_hit_skips_redis(self, redis_client):
+        """Test a value read from Redis is served locally afterwards."""
+        redis_client.get.return_value = envelope({"total": 3})
+        cache = QueryCache(ttl=300, prefix="test_cache", local_max_entries=10, redis_client=redis_client)
+
+        assert cache.get("summary:1") == {"total": 3}
+        assert cache.get("summary:1") == {"total": 3}
+        redis_client.get.assert_called_once_with("test_cache:summary:1")
+
+    def test_set_writes_both_tiers_and_publishes(self, redis_client):
+        """Test set updates Redis and the L1 and tells other workers."""
+        cache = QueryCache(ttl=300, prefix="test_cache", local_max_entries=10, redis_client=redis_client)
+
+        cache.set("summary:1", {"total": 3})
+
+        redis_key, redis_ttl, payload = pipeline(redis_client).setex.call_args.args
+        assert (redis_key, redis_ttl) == ("test_cache:summary:1", 300)
+        assert default_codec.decode(payload)["value"] == {"total": 3}
+        assert cache.local.get("summary:1")["value"] == {"total": 3}
+        message = published_messages(redis_client)[0]
+        assert message["prefix"] == "test_cache"
+        assert message["keys"] == ["summary:1"]
+
+    def test_invalidate_pattern_clears_local_tier(self, redis_client):
+        """Test pattern invalidation clears the L1 and is fanned out."""
+        redis_client.scan_iter.return_value = iter([])
+        cache = QueryCache(ttl=300, prefix="test_cache", local_max_entries=10, redis_client=redis_client)
+        cache.local.set("summary:1:today", default_codec.decode(envelope({"total": 3})))
+
+        cache.invalidate_pattern("*:1:*")
+
+        assert cache.local.get("summary:1:today") is None
+        assert published_messages(redis_client)[0]["pattern"] == "*:1:*"
+
+    def test_remote_invalidation_applied(self, redis_client):
+        """Test invalidations published by other workers clear this worker's L1."""
+        cache = QueryCache(ttl=300, prefix="test_cache", local_max_entries=10, redis_client=redis_client)
+        redis_client.pubsub.return_value.subscribe.assert_called_once()
+        handler = redis_client.pubsub.return_value.subscribe.call_args.kwargs[INVALIDATION_CHANNEL]
+        cache.local.set("summary:1", {"total": 3})
+        cache.local.set("summary:2:today", {"total": 4})
+
+        handler({"data": json.dumps({"origin": "other", "prefix": "test_cache", "keys": ["summary:1"], "pattern": None})})
+        handler({"data": json.dumps({"origin": "other", "prefix": "test_cache", "keys": [], "pattern": "*:2:*"})})
+
+        assert len(cache.local) == 0
+
+    def test_own_invalidation_ignored(self, redis_client):
+        """Test a worker does not drop the value it just cached when its own message echoes back."""
+        cache = QueryCache(ttl=300, prefix="test_cache", local_max_entries=10, redis_client=redis_client)
+        handler = redis_client.pubsub.return_value.subscribe.call_args.kwargs[INVALIDATION_CHANNEL]
+
+        cache.set("summary:1", {"total": 3})
+        handler({"data": redis_client.publish.call_args.args[1]})
+
+        assert cache.get("summary:1") == {"total": 3}
+
+    def test_local_tier_disabled_by_default(self, redis_client):
+        """Test caches without local_max_entries only use Redis."""
+        redis_client.get.return_value = envelope(1)
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+
+        cache.get("a")
+        cache.get("a")
+
+        assert cache.local is None
+        assert redis_client.get.call_count == 2
+        redis_client.pubsub.assert_not_called()
+
+    def test_disabled_without_redis(self):
+        """Test the cache is a no-op when Redis is unavailable."""
+        with patch.object(query_cache_module, "get_binary_redis_client", side_effect=ConnectionError("down")):
+            cache = QueryCache(ttl=300, prefix="test_cache", local_max_entries=10)
+
+        assert cache.enabled is False
+        assert cache.get("a") is None
+        assert cache.set("a", 1) is False
+
+
+class TestQueryCacheStampedeProtection:
+    """Test suite for single-flight recomputation and stale-while-revalidate."""
+
+    def test_miss_computes_under_lock(self, redis_client):
+        """Test the worker taking the lock computes, caches and releases it."""
+        redis_client.get.return_value = None
+        redis_client.set.return_value = True
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+        compute = MagicMock(return_value={"total": 3})
+
+        assert cache.get_or_compute("summary:1", compute) == {"total": 3}
+
+        compute.assert_called_once()
+        lock_key, token = redis_client.set.call_args.args
+        assert lock_key == "test_cache:lock:summary:1"
+        assert redis_client.set.call_args.kwargs == {"nx": True, "px": 30000}
+        assert redis_client.eval.call_args.args[1:] == (1, lock_key, token)
+        pipeline(redis_client).setex.assert_called_once()
+
+    def test_follower_waits_for_lock_holder(self, redis_client):
+        """Test a worker that cannot take the lock reuses the holder's result."""
+        redis_client.get.side_effect = [None, None, envelope({"total": 3})]
+        redis_client.set.return_value = None
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+        compute = MagicMock()
+
+        with patch("app.core.query_cache.time.sleep"):
+            assert cache.get_or_compute("summary:1", compute) == {"total": 3}
+
+        compute.assert_not_called()
+        pipeline(redis_client).setex.assert_not_called()
+
+    def test_follower_computes_after_wait_timeout(self, redis_client):
+        """Test a follower computes itself if the holder never delivers."""
+        redis_client.get.return_value = None
+        redis_client.set.return_value = None
+        cache = QueryCache(ttl=300, prefix="test_cache", lock_wait=0.0, redis_client=redis_client)
+
+        assert cache.get_or_compute("summary:1", lambda: 7) == 7
+        pipeline(redis_client).setex.assert_called_once()
+
+    def test_fresh_hit_does_not_compute(self, redis_client):
+        """Test a fresh entry far from expiry is served as is."""
+        redis_client.get.return_value = envelope({"total": 3}, fresh_for=300, delta=0.1)
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+        compute = MagicMock()
+
+        assert cache.get_or_compute("summary:1", compute) == {"total": 3}
+        compute.assert_not_called()
+        redis_client.set.assert_not_called()
+
+    def test_early_refresh_near_expiry(self, redis_client):
+        """Test an expensive entry about to expire is recomputed early."""
+        redis_client.get.return_value = envelope({"total": 3}, fresh_for=1, delta=5.0)
+        redis_client.set.return_value = True
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+
+        with patch("app.core.query_cache.random.random", return_value=0.5):
+            assert cache.get_or_compute("summary:1", lambda: {"total": 4}) == {"total": 4}
+        pipeline(redis_client).setex.assert_called_once()
+
+    def test_stale_entry_served_while_refreshing(self, redis_client):
+        """Test a stale entry is returned and refreshed in the background."""
+        redis_client.get.return_value = envelope({"total": 3}, fresh_for=-10)
+        redis_client.set.return_value = True
+        cache = QueryCache(ttl=300, prefix="test_cache", stale_ttl=60, redis_client=redis_client)
+
+        with patch.object(query_cache_module, "_refresh_executor") as executor:
+            assert cache.get_or_compute("summary:1", lambda: {"total": 4}) == {"total": 3}
+            refresh = executor.submit.call_args.args[0]
+
+        refresh()
+        payload = pipeline(redis_client).setex.call_args.args
+        assert payload[1] == 360
+        assert default_codec.decode(payload[2])["value"] == {"total": 4}
+        redis_client.eval.assert_called_once()
+
+    def test_stale_entry_not_refreshed_twice(self, redis_client):
+        """Test only the worker holding the lock starts a background refresh."""
+        redis_client.get.return_value = envelope({"total": 3}, fresh_for=-10)
+        redis_client.set.return_value = None
+        cache = QueryCache(ttl=300, prefix="test_cache", stale_ttl=60, redis_client=redis_client)
+
+        with patch.object(query_cache_module, "_refresh_executor") as executor:
+            assert cache.get_or_compute("summary:1", lambda: {"total": 4}) == {"total": 3}
+        executor.submit.assert_not_called()
+
+    def test_get_ignores_stale_entries(self, redis_client):
+        """Test plain get treats a stale entry as a miss."""
+        redis_client.get.return_value = envelope({"total": 3}, fresh_for=-10)
+        cache = QueryCache(ttl=300, prefix="test_cache", stale_ttl=60, redis_client=redis_client)
+
+        assert cache.get("summary:1") is None
+
+    def test_cached_decorator_uses_single_flight(self, redis_client):
+        """Test the decorator computes through get_or_compute."""
+        redis_client.get.return_value = None
+        redis_client.set.return_value = True
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+
+        @cache.cached(key_func=lambda business_id: f"summary:{business_id}")
+        def summary(business_id):
+            return {"business_id": business_id}
+
+        assert summary(1) == {"business_id": 1}
+        assert redis_client.set.call_args.args[0] == "test_cache:lock:summary:1"
+
+
+class TestQueryCacheTags:
+    """Test suite for tag-based invalidation."""
+
+    def test_set_registers_tags(self, redis_client):
+        """Test a tagged entry is added to each tag's member set."""
+        cache = QueryCache(ttl=300, prefix="test_cache", stale_ttl=60, redis_client=redis_client)
+
+        cache.set("summary:1", {"total": 3}, tags=[business_tag(1), "platform:twitter"])
+
+        pipe = pipeline(redis_client)
+        pipe.sadd.assert_any_call("test_cache:tag:business:1", "summary:1")
+        pipe.sadd.assert_any_call("test_cache:tag:platform:twitter", "summary:1")
+        pipe.expire.assert_any_call("test_cache:tag:business:1", 360)
+        pipe.execute.assert_called_once()
+
+    def test_invalidate_tags_deletes_members(self, redis_client):
+        """Test invalidation deletes exactly the tagged keys, without KEYS."""
+        pipe = pipeline(redis_client)
+        pipe.execute.side_effect = [[{b"a", b"b"}, {b"b", b"c"}], [3], [1, 1]]
+        cache = QueryCache(ttl=300, prefix="test_cache", local_max_entries=10, redis_client=redis_client)
+        cache.local.set("a", default_codec.decode(envelope(1)))
+
+        assert cache.invalidate_tags("business:1", "platform:twitter") == 3
+
+        pipe.smembers.assert_any_call("test_cache:tag:business:1")
+        pipe.delete.assert_called_once_with("test_cache:a", "test_cache:b", "test_cache:c")
+        pipe.srem.assert_any_call("test_cache:tag:platform:twitter", "a", "b", "c")
+        redis_client.keys.assert_not_called()
+        assert cache.local.get("a") is None
+        assert published_messages(redis_client)[0]["keys"] == ["a", "b", "c"]
+
+    def test_invalidate_tags_batches_deletes(self, redis_client):
+        """Test large tags are deleted in pipelined batches."""
+        pipe = pipeline(redis_client)
+        keys = {f"k{i}" for i in range(1200)}
+        pipe.execute.side_effect = [[keys], [500], [500], [200], [1]]
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+
+        assert cache.invalidate_tags("business:1") == 1200
+        assert pipe.delete.call_count == 3
+
+    def test_invalidate_pattern_uses_scan(self, redis_client):
+        """Test pattern invalidation walks the keyspace with SCAN."""
+        redis_client.scan_iter.return_value = iter(["test_cache:a", "test_cache:b"])
+        redis_client.delete.return_value = 2
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+
+        assert cache.invalidate_pattern("*") == 2
+        redis_client.scan_iter.assert_called_once_with(match="test_cache:*", count=500)
+        redis_client.keys.assert_not_called()
+
+    def test_cached_tags_from_arguments(self, redis_client):
+        """Test the decorator tags entries with the family and argument tags."""
+        redis_client.get.return_value = None
+        redis_client.set.return_value = True
+        cache = QueryCache(ttl=300, prefix="test_cache", redis_client=redis_client)
+
+        @cache.cached(tags=lambda business_id: [business_tag(business_id)])
+        def overview(business_id):
+            return {"business_id": business_id}
+
+        overview(7)
+
+        tagged = {call.args[0] for call in pipeline(redis_client).sadd.call_args_list}
+        assert tagged == {"test_cache:tag:family:overview", "test_cache:tag:business:7"}
+
+    def test_invalidate_business_cache(self):
+        """Test every cache drops the business's tag."""
+        caches = ["analytics_cache", "dashboard_cache", "strategy_cache", "posts_cache"]
+        with patch.multiple(query_cache_module, **{name: MagicMock() for name in caches}):
+            for name in caches:
+                getattr(query_cache_module, name).invalidate_tags.return_value = 2
+
+            assert invalidate_business_cache(5) == 8
+            query_cache_module.posts_cache.invalidate_tags.assert_called_once_with("business:5")
+
+
+class TestQueryCacheAsync:
+    """Test suite for the async QueryCache API."""
+
+    @pytest.mark.asyncio
+    async def test_aget_reads_async_client(self, redis_client, async_redis_client):
+        """Test aget goes through the asyncio client, not the sync one."""
+        async_redis_client.get.return_value = envelope({"total": 3})
+        cache = QueryCache(
+            ttl=300, prefix="test_cache", redis_client=redis_client, async_redis_client=async_redis_client
+        )
+
+        assert await cache.aget("summary:1") == {"total": 3}
+        async_redis_client.get.assert_awaited_once_with("test_cache:summary:1")
+        redis_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aset_writes_envelope_and_tags(self, redis_client, async_redis_client):
+        """Test aset pipelines the envelope and tag registrations."""
+        cache = QueryCache(
+            ttl=300, prefix="test_cache", local_max_entries=10,
+            redis_client=redis_client, async_redis_client=async_redis_client
+        )
+
+        assert await cache.aset("summary:1", {"total": 3}, tags=[business_tag(1)]) is True
+
+        pipe = async_redis_client.pipeline.return_value
+        redis_key, redis_ttl, payload = pipe.setex.call_args.args
+        assert (redis_key, redis_ttl) == ("test_cache:summary:1", 300)
+        assert default_codec.decode(payload)["value"] == {"total": 3}
+        pipe.sadd.assert_called_once_with("test_cache:tag:business:1", "summary:1")
+        pipe.execute.assert_awaited_once()
+        assert json.loads(async_redis_client.publish.call_args.args[1])["keys"] == ["summary:1"]
+        # The local tier is shared with the sync API
+        assert cache.get("summary:1") == {"total": 3}
+
+    @pytest.mark.asyncio
+    async def test_acached_computes_once_under_lock(self, redis_client, async_redis_client):
+        """Test the async decorator computes on a miss under the recompute lock."""
+        async_redis_client.get.return_value = None
+        async_redis_client.set.return_value = True
+        cache = QueryCache(
+            ttl=300, prefix="test_cache", redis_client=redis_client, async_redis_client=async_redis_client
+        )
+        calls = []
+
+        @cache.acached(key_func=lambda business_id: f"summary:{business_id}")
+        async def summary(business_id):
+            calls.append(business_id)
+            return {"business_id": business_id}
+
+        assert await summary(1) == {"business_id": 1}
+        assert calls == [1]
+        assert async_redis_client.set.call_args.args[0] == "test_cache:lock:summary:1"
+        async_redis_client.eval.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_refreshed_in_task(self, redis_client, async_redis_client):
+        """Test a stale entry is served while a task refreshes it."""
+        async_redis_client.get.return_value = envelope({"total": 3}, fresh_for=-10)
+        async_redis_client.set.return_value = True
+        cache = QueryCache(
+            ttl=300, prefix="test_cache", stale_ttl=60,
+            redis_client=redis_client, async_redis_client=async_redis_client
+        )
+
+        async def compute():
+            return {"total": 4}
+
+        assert await cache.aget_or_compute("summary:1", compute) == {"total": 3}
+        await asyncio.gather(*query_cache_module._refresh_tasks)
+
+        payload = async_redis_client.pipeline.return_value.setex.call_args.args[2]
+        assert default_codec.decode(payload)["value"] == {"total": 4}
+        async_redis_client.eval.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ainvalidate_tags(self, redis_client, async_redis_client):
+        """Test async tag invalidation deletes the tag's members."""
+        pipe = async_redis_client.pipeline.return_value
+        pipe.execute.side_effect = [[{"a", "b"}], [2], [1]]
+        cache = QueryCache(
+            ttl=300, prefix="test_cache", redis_client=redis_client, async_redis_client=async_redis_client
+        )
+
+        assert await cache.ainvalidate_tags("business:1") == 2
+        pipe.delete.assert_called_once_with("test_cache:a", "test_cache:b")
+
+
+class TestBusinessDataVersion:
+    """Test suite for the per-business data version."""
+
+    def test_version_initialised_then_read(self, redis_client):
+        """Test a missing version starts at a timestamp in one round trip."""
+        pipe = pipeline(redis_client)
+        pipe.execute.return_value = [True, b"1729584000123"]
+        cache = QueryCache(ttl=300, prefix="analytics_cache", redis_client=redis_client)
+
+        with patch.object(query_cache_module, "analytics_cache", cache):
+            assert business_data_version(42) == 1729584000123
+
+        key = "data_version:business:42"
+        assert pipe.set.call_args.args[0] == key
+        assert pipe.set.call_args.kwargs == {"nx": True}
+        pipe.get.assert_called_once_with(key)
+
+    def test_bump(self, redis_client):
+        """Test a bump increments the version."""
+        pipe = pipeline(redis_client)
+        pipe.execute.return_value = [None, 1729584000124]
+        cache = QueryCache(ttl=300, prefix="analytics_cache", redis_client=redis_client)
+
+        with patch.object(query_cache_module, "analytics_cache", cache):
+            assert bump_business_data_version(42) == 1729584000124
+
+        pipe.incr.assert_called_once_with("data_version:business:42")
+
+    @pytest.mark.asyncio
+    async def test_unavailable_version_bypasses_cache(self, redis_client, async_redis_client):
+        """Test a Redis error yields no version rather than a wrong one."""
+        async_redis_client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        cache = QueryCache(
+            ttl=300, prefix="analytics_cache", redis_client=redis_client, async_redis_client=async_redis_client
+        )
+
+        with patch.object(query_cache_module, "analytics_cache", cache):
+            assert await abusiness_data_version(42) is None
+
+    def test_versioned_key(self):
+        """Test keys change with the version and parameters only."""
+        key = versioned_cache_key("overview", 42, 7, {"platform": "all", "start_date": None})
+
+        assert key.startswith("overview:42:v7:")
+        assert key == versioned_cache_key("overview", 42, 7, {"start_date": None, "platform": "all"})
+        assert key != versioned_cache_key("overview", 42, 8, {"platform": "all", "start_date": None})
@@ -0,0 +1,83 @@
+"""
+Unit tests for read replica routing.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.db import replicas
+from app.db.replicas import ReplicaRouter
+
+
+def router_with_lags(*lags, max_lag=10.0):
+    """Router whose lag checks report the given lags, one per replica."""
+    router = ReplicaRouter([f"postgresql://u:p@replica-{i}/app" for i in range(len(lags))], max_lag=max_lag)
+    by_url = {replica.url: lag for replica, lag in zip(router.replicas, lags)}
+    router.check = MagicMock(side_effect=lambda replica: router._record(replica, by_url[replica.url]))
+    router.acheck = AsyncMock(side_effect=lambda replica: router._record(replica, by_url[replica.url]))
+    return router
+
+
+class TestReplicaRouter:
+    """Test suite for ReplicaRouter."""
+
+    def test_no_replicas_uses_primary(self):
+        """Test sessions go to the primary when no replicas are configured."""
+        router = ReplicaRouter([])
+
+        assert router.choose() is None
+        assert router.get_engine() is replicas.primary_engine
+
+    def test_round_robin_between_healthy_replicas(self):
+        """Test consecutive sessions rotate over in-budget replicas."""
+        router = router_with_lags(0.5, 2.0)
+
+        chosen = [router.choose().name for _ in range(4)]
+
+        assert chosen == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+    def test_lagging_and_unreachable_replicas_skipped(self):
+        """Test replicas over the lag budget or failing the check are skipped."""
+        router = router_with_lags(45.0, None, 1.0)
+
+        assert {router.choose().name for _ in range(3)} == {"replica-2"}
+
+    def test_falls_back_to_primary_when_all_lag(self):
+        """Test the primary is used when every replica is behind."""
+        router = router_with_lags(30.0, None)
+
+        assert router.choose() is None
+
+    def test_lag_checked_once_per_interval(self):
+        """Test a replica's lag is cached for the check interval."""
+        router = router_with_lags(1.0)
+
+        with patch.object(replicas.time, "monotonic", return_value=100.0):
+            router.choose()
+            router.choose()
+        assert router.check.call_count == 1
+
+        with patch.object(replicas.time, "monotonic", return_value=100.0 + router.check_interval):
+            router.choose()
+        assert router.check.call_count == 2
+
+    def test_check_failure_marks_replica_unusable(self):
+        """Test an unreachable replica records an unknown lag."""
+        router = ReplicaRouter(["postgresql://u:p@replica-0/app"])
+        engine = MagicMock()
+        engine.connect.side_effect = OSError("connection refused")
+
+        with patch.object(router, "_sync_engine", return_value=engine):
+            assert router.check(router.replicas[0]) is None
+
+        assert router.replicas[0].checked_at is not None
+        assert not router._usable(router.replicas[0])
+
+    @pytest.mark.asyncio
+    async def test_async_choose(self):
+        """Test the async path applies the same lag budget."""
+        router = router_with_lags(20.0, 3.0)
+
+        replica = await router.achoose()
+
+        assert replica.name == "replica-1"
+        router.check.assert_not_called()
@@ -0,0 +1,195 @@
+"""
+Unit tests for the scheduled post delayed-job store and its dispatcher.
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+import pytest
+from unittest.mock import MagicMock, patch
+
+# Register every model so the mappers can be configured
+from app.models import image, post_analytics, post_analytics_snapshot, analytics_summary, content_template  # noqa: F401
+from app.services import scheduled_post_queue
+from app.services.scheduled_post_queue import (
+    CLAIM_DUE_SCRIPT,
+    COMPARE_AND_SET_SCRIPT,
+    SCHEDULE_KEY,
+    claim_due_posts,
+    due_score,
+    reconcile_schedule,
+)
+from app.tasks import publishing_tasks, scheduled_post_dispatcher
+from app.tasks.publishing_tasks import MAX_DISPATCH_LATENESS, dispatch_due_posts
+
+DUE_AT = datetime(2025, 10, 23, 9, 0)
+
+
+@pytest.fixture
+def redis():
+    """Mock Redis client returned by the queue module."""
+    redis = MagicMock()
+    with patch.object(scheduled_post_queue, "_get_redis", return_value=redis):
+        yield redis
+
+
+class TestScheduledPostQueue:
+    """Test suite for the Redis sorted set store."""
+
+    def test_due_score_treats_naive_as_utc(self):
+        """Test naive and UTC-aware due times get the same millisecond score."""
+        aware = DUE_AT.replace(tzinfo=timezone.utc)
+
+        assert due_score(DUE_AT) == due_score(aware) == int(aware.timestamp() * 1000)
+        assert due_score(aware.astimezone(timezone(timedelta(hours=2)))) == due_score(aware)
+
+    def test_claim_due_posts(self, redis):
+        """Test claiming runs the atomic pop script up to now and parses its pairs."""
+        redis.eval.return_value = ["7", "1761210000000", "9", "1761210001500"]
+
+        claimed = claim_due_posts(now=DUE_AT, limit=50)
+
+        assert claimed == [(7, 1761210000000), (9, 1761210001500)]
+        assert redis.eval.call_args.args == (CLAIM_DUE_SCRIPT, 1, SCHEDULE_KEY, due_score(DUE_AT), 50)
+
+    def test_reconcile_schedule(self, redis):
+        """Test reconciliation adds, moves and removes members with compare-and-set writes."""
+        moved_to = DUE_AT + timedelta(hours=1)
+        redis.zscan_iter.return_value = [
+            ("1", float(due_score(DUE_AT))),   # in sync
+            ("2", float(due_score(DUE_AT))),   # rescheduled in the DB
+            ("3", float(due_score(DUE_AT)))    # no longer pending
+        ]
+        redis.eval.side_effect = [2, 1]
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.yield_per.return_value = [
+            (1, DUE_AT),
+            (2, moved_to),
+            (4, DUE_AT)                        # missing from Redis
+        ]
+
+        result = reconcile_schedule(db)
+
+        assert result == {"pending": 3, "added": 2, "removed": 1}
+
+        upserts, removals = redis.eval.call_args_list
+        assert upserts.args[:3] == (COMPARE_AND_SET_SCRIPT, 1, SCHEDULE_KEY)
+        assert upserts.args[3:] == (
+            "2", due_score(moved_to), due_score(DUE_AT),
+            "4", due_score(DUE_AT), ""
+        )
+        assert removals.args[3:] == ("3", "", due_score(DUE_AT))
+
+    def test_reconcile_schedule_in_sync(self, redis):
+        """Test nothing is written when Redis already matches the database."""
+        redis.zscan_iter.return_value = [("1", float(due_score(DUE_AT)))]
+        db = MagicMock()
+        db.query.return_value.filter.return_value.yield_per.return_value = [(1, DUE_AT)]
+
+        assert reconcile_schedule(db) == {"pending": 1, "added": 0, "removed": 0}
+        redis.eval.assert_not_called()
+
+
+class TestDispatchDuePosts:
+    """Test suite for dispatching claimed posts to Celery."""
+
+    @pytest.fixture
+    def db(self):
+        """Mock session returned by SessionLocal."""
+        db = MagicMock()
+        with patch.object(publishing_tasks, "SessionLocal", return_value=db):
+            yield db
+
+    def test_nothing_due(self, db):
+        """Test an empty claim does not touch the database."""
+        with patch.object(publishing_tasks, "claim_due_posts", return_value=[]):
+            assert dispatch_due_posts(now=DUE_AT) == 0
+
+        db.execute.assert_not_called()
+
+    def test_dispatches_only_posts_still_pending(self, db):
+        """Test posts cancelled after being scheduled are claimed but not sent."""
+        score = due_score(DUE_AT)
+        db.execute.return_value.scalars.return_value = [1]
+
+        with patch.object(publishing_tasks, "claim_due_posts", return_value=[(1, score), (2, score)]), \
+             patch.object(publishing_tasks.publish_scheduled_post, "apply_async") as apply_async:
+            apply_async.return_value.id = "task-1"
+
+            assert dispatch_due_posts(now=DUE_AT) == 1
+
+        apply_async.assert_called_once_with(args=[1])
+        db.close.assert_called_once()
+
+    def test_failed_send_requeues_post(self, db):
+        """Test a post the broker refused goes back to pending and into the store."""
+        score = due_score(DUE_AT)
+        db.execute.return_value.scalars.return_value = [1]
+
+        with patch.object(publishing_tasks, "claim_due_posts", return_value=[(1, score)]), \
+             patch.object(publishing_tasks, "requeue_post") as requeue_post, \
+             patch.object(publishing_tasks.publish_scheduled_post, "apply_async", side_effect=ConnectionError):
+            assert dispatch_due_posts(now=DUE_AT) == 0
+
+        requeue_post.assert_called_once_with(1, score)
+
+    def test_expires_posts_claimed_too_late(self, db):
+        """Test posts past MAX_DISPATCH_LATENESS are expired instead of published."""
+        late_score = due_score(DUE_AT - MAX_DISPATCH_LATENESS - timedelta(seconds=1))
+        score = due_score(DUE_AT)
+        expired, queued = MagicMock(), MagicMock()
+        expired.scalars.return_value = [1]
+        queued.scalars.return_value = [2]
+        db.execute.side_effect = [expired, queued, MagicMock()]
+
+        with patch.object(publishing_tasks, "claim_due_posts", return_value=[(1, late_score), (2, score)]), \
+             patch.object(publishing_tasks.publish_scheduled_post, "apply_async") as apply_async:
+            apply_async.return_value.id = "task-2"
+
+            assert dispatch_due_posts(now=DUE_AT) == 1
+
+        apply_async.assert_called_once_with(args=[2])
+        expire_update = db.execute.call_args_list[0].args[0]
+        assert expire_update.compile().params["status"] == "expired"
+
+    def test_failed_claim_update_requeues_all_posts(self, db):
+        """Test claimed posts go back to the store when marking them queued fails."""
+        score = due_score(DUE_AT)
+        db.execute.side_effect = ConnectionError
+
+        with patch.object(publishing_tasks, "claim_due_posts", return_value=[(1, score), (2, score)]), \
+             patch.object(publishing_tasks, "requeue_post") as requeue_post, \
+             patch.object(publishing_tasks.publish_scheduled_post, "apply_async") as apply_async:
+            with pytest.raises(ConnectionError):
+                dispatch_due_posts(now=DUE_AT)
+
+        assert [c.args for c in requeue_post.call_args_list] == [(1, score), (2, score)]
+        apply_async.assert_not_called()
+        db.rollback.assert_called_once()
+        db.close.assert_called_once()
+
+
+class TestRunDispatcher:
+    """Test suite for the dispatcher loop."""
+
+    def test_sleeps_until_next_due_post(self):
+        """Test the loop waits for the next due post, capped by the poll interval."""
+        stop_event = MagicMock(spec=threading.Event)
+        stop_event.is_set.side_effect = [False, False, True]
+
+        with patch.object(scheduled_post_dispatcher, "dispatch_due_posts") as dispatch, \
+             patch.object(scheduled_post_dispatcher, "next_due_at", side_effect=[1000.25, None]), \
+             patch.object(scheduled_post_dispatcher.time, "time", return_value=1000.0):
+            scheduled_post_dispatcher.run_dispatcher(stop_event, poll_interval=1.0)
+
+        assert dispatch.call_count == 2
+        assert [c.args[0] for c in stop_event.wait.call_args_list] == [0.25, 1.0]
+
+    def test_backs_off_after_errors(self):
+        """Test a failing pass waits DISPATCH_ERROR_BACKOFF instead of spinning."""
+        stop_event = MagicMock(spec=threading.Event)
+        stop_event.is_set.side_effect = [False, True]
+
+        with patch.object(scheduled_post_dispatcher, "dispatch_due_posts", side_effect=ConnectionError):
+            scheduled_post_dispatcher.run_dispatcher(stop_event)
+
+        stop_event.wait.assert_called_once_with(scheduled_post_dispatcher.DISPATCH_ERROR_BACKOFF)
@@ -0,0 +1,97 @@
+"""
+Unit tests for the staleness-driven analytics sync planner.
+"""
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql
+
+# Register every model so the PublishedPost mapper can be configured
+from app.models import image, post_analytics, analytics_summary, content_template  # noqa: F401
+from app.services.platform_fetchers.sync_planner import SyncPlanner
+
+
+NOW = datetime(2025, 10, 20, 12, 0, 0)
+
+
+class TestSyncPlanner:
+    """Test suite for SyncPlanner."""
+
+    @pytest.mark.parametrize("age, expected_interval", [
+        (timedelta(hours=1), timedelta(hours=1)),
+        (timedelta(hours=47), timedelta(hours=1)),
+        (timedelta(hours=49), timedelta(days=1)),
+        (timedelta(days=29), timedelta(days=1)),
+        (timedelta(days=31), timedelta(days=7)),
+        (timedelta(days=400), timedelta(days=7)),
+    ])
+    def test_sync_interval_by_age(self, age, expected_interval):
+        """Test the sync interval tier chosen for a post's age."""
+        assert SyncPlanner.sync_interval(NOW - age, now=NOW) == expected_interval
+
+    def test_sync_interval_without_published_at(self):
+        """Test posts without a publish time are treated as old."""
+        assert SyncPlanner.sync_interval(None, now=NOW) == timedelta(days=7)
+
+    def test_is_due(self):
+        """Test due checks against the post's tier interval."""
+        fresh = NOW - timedelta(hours=5)
+        month_old = NOW - timedelta(days=20)
+        ancient = NOW - timedelta(days=200)
+
+        assert SyncPlanner.is_due(fresh, None, now=NOW)
+        assert SyncPlanner.is_due(fresh, NOW - timedelta(minutes=61), now=NOW)
+        assert not SyncPlanner.is_due(fresh, NOW - timedelta(minutes=30), now=NOW)
+        assert not SyncPlanner.is_due(month_old, NOW - timedelta(hours=5), now=NOW)
+        assert SyncPlanner.is_due(month_old, NOW - timedelta(hours=25), now=NOW)
+        assert not SyncPlanner.is_due(ancient, NOW - timedelta(days=3), now=NOW)
+        assert SyncPlanner.is_due(ancient, NOW - timedelta(days=8), now=NOW)
+
+    def test_build_query_filters_and_orders(self):
+        """Test the query only selects due posts, youngest tier and stalest first."""
+        from sqlalchemy.orm import Query
+
+        db = MagicMock()
+        db.query.side_effect = lambda *entities: Query(entities)
+
+        query = SyncPlanner(db).build_query(business_id=1, platform="twitter", now=NOW)
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+        assert "published_posts.last_metrics_sync IS NULL" in sql
+        assert "published_posts.last_metrics_sync <=" in sql
+        assert "ORDER BY CASE WHEN" in sql
+        assert "published_posts.last_metrics_sync ASC NULLS FIRST" in sql
+
+    def test_plan_applies_platform_budgets(self):
+        """Test each platform is capped at its own per-run budget."""
+        planner = SyncPlanner(MagicMock())
+        queries = {}
+
+        def build_query(business_id, platform, due_only=True, now=None):
+            query = MagicMock()
+            query.limit.return_value.all.return_value = [platform]
+            query.all.return_value = [platform]
+            queries[platform] = query
+            return query
+
+        planner.build_query = build_query
+
+        posts = planner.plan(business_id=1, platforms=["twitter", "linkedin", "tiktok"], now=NOW)
+
+        assert posts == ["twitter", "linkedin", "tiktok"]
+        queries["twitter"].limit.assert_called_once_with(300)
+        queries["linkedin"].limit.assert_called_once_with(50)
+        queries["tiktok"].limit.assert_called_once_with(SyncPlanner.DEFAULT_BUDGET)
+
+    def test_plan_without_due_filter_is_unbounded(self):
+        """Test a manual (non due-only) plan has no budget unless a limit is given."""
+        planner = SyncPlanner(MagicMock())
+        query = MagicMock()
+        planner.build_query = MagicMock(return_value=query)
+
+        planner.plan(business_id=1, platforms=["twitter"], due_only=False, now=NOW)
+        query.limit.assert_not_called()
+
+        planner.plan(business_id=1, platforms=["twitter"], limit=10, due_only=False, now=NOW)
+        query.limit.assert_called_once_with(10)
+        assert planner.build_query.call_args[1]["due_only"] is False
@@ -0,0 +1,53 @@
+"""
+Unit tests for the text search query builders.
+"""
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+# Register every model so the mappers can be configured
+from app.models import image, post_analytics, post_analytics_snapshot, analytics_summary, content_template  # noqa: F401
+from app.models.content import Content
+from app.models.image import Image
+from app.services.text_search import fuzzy_match, fuzzy_rank, text_match, text_rank
+
+
+def compile_sql(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+class TestTextSearch:
+    """Test suite for the search query builders."""
+
+    def test_text_match_uses_search_vector(self):
+        """Test text search matches the generated tsvector column."""
+        sql, params = compile_sql(select(Content.id).where(text_match(Content.search_vector, "spring launch")))
+
+        assert "content.search_vector @@ websearch_to_tsquery(" in sql
+        assert sorted(params.values()) == ["english", "spring launch"]
+
+    def test_text_rank(self):
+        """Test relevance is ts_rank_cd over the same query."""
+        sql, _ = compile_sql(select(text_rank(Content.search_vector, "launch")))
+
+        assert "ts_rank_cd(content.search_vector, websearch_to_tsquery(" in sql
+
+    def test_fuzzy_match_escapes_wildcards(self):
+        """Test LIKE wildcards in the term are matched literally, similarity gets it raw."""
+        sql, params = compile_sql(select(Image.id).where(fuzzy_match(Image.original_filename, "50%_off")))
+
+        assert "images.original_filename ILIKE" in sql and "ESCAPE '/'" in sql
+        assert "images.original_filename %% " in sql
+        assert sorted(params.values()) == ["50%_off", "50/%/_off"]
+
+    def test_fuzzy_rank(self):
+        """Test filename results are ranked by trigram similarity."""
+        sql, _ = compile_sql(select(fuzzy_rank(Image.original_filename, "logo")))
+
+        assert "similarity(images.original_filename, " in sql
+
+    def test_search_vector_not_loaded_by_default(self):
+        """Test the tsvector column is deferred from ordinary entity loads."""
+        sql, _ = compile_sql(select(Content))
+
+        assert "search_vector" not in sql
@@ -11,10 +11,12 @@ from app.services.platform_fetchers.twitter_fetcher import TwitterAnalyticsFetch
 from app.services.platform_fetchers.exceptions import (
     PlatformAPIError,
     PostNotFoundError,
+    RateLimitError,
 )
 from tests.fixtures.twitter_responses import (
     TWITTER_TWEET_SUCCESS,
     TWITTER_MULTIPLE_TWEETS_SUCCESS,
+    TWITTER_MULTIPLE_TWEETS_PARTIAL,
     TWITTER_USER_METRICS_SUCCESS,
     TWITTER_TWEET_NOT_FOUND,
     TWITTER_MINIMAL_RESPONSE,
@@ -350,3 +352,71 @@ class TestTwitterFetcher:
         # Twitter provides bookmark count in public metrics
         assert "bookmarks_count" in result
         assert result["bookmarks_count"] == 15  # Fixed to match fixture
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_single_request(self, mock_request, fetcher):
+        """Test batch fetch looks up all tweets in one request."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = TWITTER_MULTIPLE_TWEETS_SUCCESS
+        mock_request.return_value = mock_response
+
+        result = fetcher.fetch_posts_analytics_batch(
+            ["1111111111111111111", "2222222222222222222"]
+        )
+
+        assert mock_request.call_count == 1
+        call_args = mock_request.call_args[1]
+        assert call_args["url"].endswith("/2/tweets")
+        assert call_args["params"]["ids"] == "1111111111111111111,2222222222222222222"
+        assert "non_public_metrics" in call_args["params"]["tweet.fields"]
+
+        assert result["1111111111111111111"]["likes_count"] == 100
+        assert result["2222222222222222222"]["likes_count"] == 150
+        assert result["2222222222222222222"]["platform_post_id"] == "2222222222222222222"
+        assert result["2222222222222222222"]["platform"] == "twitter"
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_partial_errors(self, mock_request, fetcher):
+        """Test deleted tweets in a batch map to PostNotFoundError per ID."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = TWITTER_MULTIPLE_TWEETS_PARTIAL
+        mock_request.return_value = mock_response
+
+        result = fetcher.fetch_posts_analytics_batch(
+            ["1111111111111111111", "3333333333333333333", "4444444444444444444"]
+        )
+
+        assert result["1111111111111111111"]["likes_count"] == 100
+        # Reported in "errors"
+        assert isinstance(result["3333333333333333333"], PostNotFoundError)
+        assert "3333333333333333333" in str(result["3333333333333333333"])
+        # Silently missing from the response
+        assert isinstance(result["4444444444444444444"], PostNotFoundError)
+
+    @patch("requests.Session.request")
+    def test_batch_fetch_chunks_ids(self, mock_request, fetcher):
+        """Test batch fetch splits IDs into chunks of MAX_BATCH_SIZE."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": []}
+        mock_request.return_value = mock_response
+
+        tweet_ids = [str(i) for i in range(250)]
+        result = fetcher.fetch_posts_analytics_batch(tweet_ids + ["0"])
+
+        assert mock_request.call_count == 3
+        chunk_sizes = [
+            len(call[1]["params"]["ids"].split(","))
+            for call in mock_request.call_args_list
+        ]
+        assert chunk_sizes == [100, 100, 50]
+        assert len(result) == 250
+
+    def test_batch_fetch_rate_limited(self, fetcher):
+        """Test rate limiting aborts the whole batch."""
+        fetcher._make_request = Mock(side_effect=RateLimitError("Rate limit exceeded", retry_after=60))
+
+        with pytest.raises(RateLimitError):
+            fetcher.fetch_posts_analytics_batch(["1111111111111111111"])